@@ -15,8 +15,15 @@ setup(
     packages=find_packages(),
     python_requires=">=3.10",
     install_requires=[
-        # Runtime dependencies (minimal for now)
+        # Headless engine (Blender bundles its own NumPy)
+        "numpy>=1.24",
     ],
+    entry_points={
+        "console_scripts": [
+            # Headless generation and export (src/cli.py)
+            "ifs-gen=src.cli:main",
+        ],
+    },
     extras_require={
         "dev": [
             "pytest>=7.4.0",
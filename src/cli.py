@@ -0,0 +1,240 @@
+"""``ifs-gen``: headless generation and export from the shell.
+
+Loads a preset, generates it with the chosen engine and writes every
+output in one pass (``src.utils.export_pipeline``), or streams binary
+chunks to stdout for pipelines::
+
+    ifs-gen barnsley -o fern.ply -o fern.glb --iterations 10
+    ifs-gen sierpinski --engine chaos --points 1000000 --format raw | consumer
+
+Orchestration spawns many short invocations, so start-up is kept to the
+standard library: NumPy, the engine and the exporters are imported only
+once generation is actually needed. With ``--cache`` (or
+``IFS_GEN_CACHE``), outputs are stored under a key of the preset content
+and generation options, and a repeated request is answered by copying the
+cached file without importing NumPy at all.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Mapping, Optional, Sequence
+
+# Generation engines (``export_preset`` modes)
+ENGINES = ("exhaustive", "chaos", "stratified")
+
+# Formats for stdout (file outputs use their extension)
+STREAM_FORMATS = ("raw", "npy", "ply")
+
+# Environment variable naming the default cache directory
+CACHE_ENV = "IFS_GEN_CACHE"
+
+# Bumped when cached outputs of the same request would change
+CACHE_VERSION = 1
+
+# ``plan_generation`` policies, listed here to keep NumPy out of start-up
+MEMORY_POLICIES = ("reduce_iterations", "points", "raise")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Argument parser for ``ifs-gen``."""
+    parser = argparse.ArgumentParser(
+        prog="ifs-gen",
+        description="Generate an IFS preset headlessly and export or stream it.",
+    )
+    parser.add_argument("preset", help="Preset name or path to a preset JSON file")
+    parser.add_argument(
+        "-o",
+        "--output",
+        action="append",
+        default=[],
+        help="Output file (.ply .glb .npy .png), repeatable; '-' or none "
+        "streams to stdout",
+    )
+    parser.add_argument("--engine", choices=ENGINES, default="exhaustive")
+    parser.add_argument("--iterations", type=int, default=None)
+    parser.add_argument("--points", type=int, default=None, help="Point budget")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--format",
+        choices=STREAM_FORMATS,
+        default="raw",
+        help="stdout format: raw little-endian float32 XYZ, npy or ply",
+    )
+    parser.add_argument(
+        "--cache",
+        default=os.environ.get(CACHE_ENV),
+        help=f"Output cache directory (default: ${CACHE_ENV})",
+    )
+    parser.add_argument("--chunk-points", type=int, default=None)
+    parser.add_argument(
+        "--memory-limit",
+        type=int,
+        default=None,
+        help="Memory limit in MiB (default: half the available memory)",
+    )
+    parser.add_argument(
+        "--memory-policy",
+        choices=MEMORY_POLICIES,
+        default="reduce_iterations",
+        help="What to do when a request would exceed the memory limit",
+    )
+    parser.add_argument("-q", "--quiet", action="store_true")
+    return parser
+
+
+def cache_key(preset: Mapping[str, Any], args: argparse.Namespace) -> str:
+    """Key of a request: preset content and every option affecting output."""
+    # The chunk size is the chaos game's RNG block size, so it shapes the output
+    chunk_points = args.chunk_points if args.engine == "chaos" else None
+    request = {
+        "version": CACHE_VERSION,
+        "preset": preset,
+        "engine": args.engine,
+        "iterations": args.iterations,
+        "points": args.points,
+        "seed": args.seed,
+        "chunk_points": chunk_points,
+        "memory_limit": args.memory_limit,
+        "memory_policy": args.memory_policy,
+    }
+    payload = json.dumps(request, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _suffix(output: str, stream_format: str) -> str:
+    """Cache file suffix of an output (``.raw`` for raw streams)."""
+    return f".{stream_format}" if output == "-" else Path(output).suffix.lower()
+
+
+def _deliver(source: Path, output: str, stdout: BinaryIO) -> int:
+    """Copy a cached file to an output; returns bytes copied."""
+    if output == "-":
+        with open(source, "rb") as f:
+            shutil.copyfileobj(f, stdout)
+        stdout.flush()
+    else:
+        shutil.copyfile(source, output)
+    return source.stat().st_size
+
+
+def _generate(
+    preset: Mapping[str, Any],
+    outputs: Sequence[str],
+    args: argparse.Namespace,
+    stdout: BinaryIO,
+    cache_files: Sequence[Path],
+) -> Dict[str, Any]:
+    """Generate once into every output and every missing cache file.
+
+    Cache files are written under temporary names and renamed into place
+    only after the whole export succeeded without a memory downgrade.
+    """
+    # Heavy imports happen here, on cache misses only
+    from src.utils.export_pipeline import (
+        DEFAULT_CHUNK_POINTS,
+        StreamSink,
+        export_preset,
+        sink_for_path,
+    )
+    from src.utils.validator import assert_valid_preset
+
+    assert_valid_preset(preset)
+    parts = {
+        path: path.with_name(f"{path.stem}.{os.getpid()}.part{path.suffix}")
+        for path in cache_files
+    }
+    try:
+        with ExitStack() as stack:
+            sinks = [
+                (
+                    StreamSink(stdout, args.format)
+                    if output == "-"
+                    else sink_for_path(output)
+                )
+                for output in outputs
+            ]
+            for part in parts.values():
+                if part.suffix == ".raw":
+                    sinks.append(StreamSink(stack.enter_context(open(part, "wb"))))
+                else:
+                    sinks.append(sink_for_path(part))
+            result = export_preset(
+                preset,
+                sinks,
+                mode=args.engine,
+                iterations=args.iterations,
+                n_points=args.points,
+                seed=args.seed,
+                chunk_points=args.chunk_points or DEFAULT_CHUNK_POINTS,
+                memory_limit=(
+                    None if args.memory_limit is None else args.memory_limit * 2**20
+                ),
+                memory_policy=args.memory_policy,
+            )
+    except BaseException:
+        for part in parts.values():
+            part.unlink(missing_ok=True)
+        raise
+    for path, part in parts.items():
+        # A downgrade depends on the memory free now, not on the request
+        if result["downgrade"]:
+            part.unlink(missing_ok=True)
+        else:
+            os.replace(part, path)
+    result["outputs"] = result["outputs"][: len(outputs)]
+    return result
+
+
+def main(
+    argv: Optional[Sequence[str]] = None, stdout: Optional[BinaryIO] = None
+) -> int:
+    """Console entry point (``ifs-gen``)."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    outputs: List[str] = args.output or ["-"]
+    if outputs.count("-") > 1:
+        parser.error("stdout ('-') can only be given once")
+    stdout = stdout or sys.stdout.buffer
+
+    def log(message: str) -> None:
+        if not args.quiet:
+            print(message, file=sys.stderr)
+
+    from src.utils.preset_loader import load_preset
+
+    try:
+        preset = load_preset(args.preset)
+        cached: Dict[str, Path] = {}
+        if args.cache:
+            key = cache_key(preset, args)
+            cached = {
+                output: Path(args.cache) / f"{key}{_suffix(output, args.format)}"
+                for output in outputs
+            }
+            if all(path.exists() for path in cached.values()):
+                for output, path in cached.items():
+                    _deliver(path, output, stdout)
+                log(f"{args.preset}: cache hit ({key[:12]})")
+                return 0
+            Path(args.cache).mkdir(parents=True, exist_ok=True)
+        missing = sorted({path for path in cached.values() if not path.exists()})
+        result = _generate(preset, outputs, args, stdout, missing)
+    except (ValueError, OSError, MemoryError) as e:
+        print(f"ifs-gen: error: {e}", file=sys.stderr)
+        return 1
+    if result["downgrade"]:
+        log(f"{args.preset}: {result['downgrade']}")
+    for output in result["outputs"]:
+        log(f"{output['path']}  {output['bytes']} bytes")
+    log(f"{result['point_count']} points in {result['elapsed']:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
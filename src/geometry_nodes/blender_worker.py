@@ -0,0 +1,238 @@
+"""Long-lived background Blender worker for the warm worker pool.
+
+Started by ``src.utils.blender_pool.WorkerPool`` with ``ifs_generator.blend``
+already loaded, then serves preset-apply, render and export jobs read from
+stdin until shut down, so Blender start-up is paid once per worker instead
+of once per job.
+
+Usage (normally via ``blender_command()``):
+    blender --background src/geometry_nodes/ifs_generator.blend \\
+        --python src/geometry_nodes/blender_worker.py
+
+See src/utils/blender_pool.py for the protocol.
+"""
+
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+import bpy
+
+# Blender runs this file as a script; make the repository importable
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.mcp.tools import resolve_preset  # noqa: E402
+from src.utils.bake_cache import (  # noqa: E402
+    bake_modifier,
+    ifs_modifiers,
+    refresh_bake,
+)
+from src.utils.blender_pool import serve_worker  # noqa: E402
+from src.utils.bulk_apply import bulk_apply  # noqa: E402
+from src.utils.memory_guard import (  # noqa: E402
+    DEFAULT_INSTANCE_VERTICES,
+    plan_modifier_inputs,
+)
+from src.utils.parameter_injector import (  # noqa: E402
+    OPTIONAL_INPUT_PREFIXES,
+    ParameterInjector,
+    preset_inputs,
+)
+
+NODE_GROUP_NAME = "IFS_Generator"
+
+
+def find_ifs_modifier(object_name=None):
+    """Find the Geometry Nodes modifier using IFS_Generator.
+
+    Args:
+        object_name: Object to search (default: first object using the group)
+
+    Returns:
+        tuple: (object, modifier)
+
+    Raises:
+        LookupError: If no matching modifier exists
+    """
+    objects = [bpy.data.objects[object_name]] if object_name else bpy.data.objects
+    for obj in objects:
+        for modifier in obj.modifiers:
+            if (
+                modifier.type == "NODES"
+                and modifier.node_group is not None
+                and modifier.node_group.name == NODE_GROUP_NAME
+            ):
+                return obj, modifier
+    raise LookupError(f"No object uses the {NODE_GROUP_NAME} node group")
+
+
+def _input_identifier(modifier, name):
+    """Identifier of a modifier input by its interface socket name."""
+    for item in modifier.node_group.interface.items_tree:
+        if getattr(item, "in_out", None) == "INPUT" and item.name == name:
+            return item.identifier
+    raise KeyError(f"{NODE_GROUP_NAME} has no input named '{name}'")
+
+
+def set_modifier_input(modifier, name, value):
+    """Set a modifier input by its interface socket name."""
+    modifier[_input_identifier(modifier, name)] = value
+
+
+def get_modifier_input(modifier, name):
+    """Read a modifier input by its interface socket name."""
+    return modifier[_input_identifier(modifier, name)]
+
+
+def apply_modifier_inputs(object_name, values):
+    """Write a batch of inputs to an object's IFS modifier, then tag it once.
+
+    ID property writes do not re-evaluate on their own; the single
+    ``update_tag`` afterwards triggers one evaluation for the whole batch.
+    Optional inputs (per-transform and preview sockets) the node group
+    does not expose are skipped. A baked modifier is moved to the bake
+    cache entry of its new inputs, so it does not keep returning the old
+    geometry.
+
+    Args:
+        object_name: Object carrying the modifier
+        values: Input name to value
+    """
+    obj, modifier = find_ifs_modifier(object_name)
+    identifiers = {
+        item.name: item.identifier
+        for item in modifier.node_group.interface.items_tree
+        if getattr(item, "in_out", None) == "INPUT"
+    }
+    for name, value in values.items():
+        if name in identifiers:
+            modifier[identifiers[name]] = value
+        elif not name.startswith(OPTIONAL_INPUT_PREFIXES):
+            raise KeyError(f"{NODE_GROUP_NAME} has no input named '{name}'")
+    obj.update_tag()
+    refresh_bake(obj, modifier)
+
+
+# Remembers applied values, so re-applying a preset only writes what changed
+INJECTOR = ParameterInjector(apply_modifier_inputs, min_interval=0.0)
+
+
+def apply_preset(params):
+    """Validate a preset and apply its settings to the IFS modifier."""
+    preset = resolve_preset(params["preset"])
+    obj, modifier = find_ifs_modifier(params.get("object"))
+    values = preset_inputs(preset)
+    output_mode = params.get("output_mode", values.get("Output Mode"))
+    if output_mode is None:
+        output_mode = get_modifier_input(modifier, "Output Mode")
+    # Downgrade before Blender evaluates, rather than letting it run out of
+    # memory mid-render and take the worker down
+    plans = plan_modifier_inputs(
+        values,
+        len(preset["transforms"]),
+        output_mode,
+        instance_vertices=params.get("instance_vertices", DEFAULT_INSTANCE_VERTICES),
+        limit_bytes=params.get("memory_limit"),
+    )
+    INJECTOR.submit(obj.name, values)
+    INJECTOR.flush(force=True)
+    return {
+        "name": preset["name"],
+        "object": obj.name,
+        "iterations": plans["final"].iterations,
+        "output_mode": plans["final"].output_mode,
+        "preview_iterations": plans["preview"].iterations,
+        "preview_output_mode": plans["preview"].output_mode,
+        "downgrade": plans["final"].downgrade,
+        "preview_downgrade": plans["preview"].downgrade,
+    }
+
+
+def bulk_apply_presets(params):
+    """Apply presets to many objects: ``items`` of ``{"object", "preset"}``."""
+    presets = {}
+    items = []
+    for item in params["items"]:
+        # Named presets repeated across objects are loaded and validated once
+        key = json.dumps(item["preset"], sort_keys=True)
+        if key not in presets:
+            presets[key] = resolve_preset(item["preset"])
+        items.append((bpy.data.objects[item["object"]], presets[key]))
+    result = bulk_apply(
+        items,
+        output_mode=params.get("output_mode"),
+        instance_vertices=params.get("instance_vertices", DEFAULT_INSTANCE_VERTICES),
+        memory_limit=params.get("memory_limit"),
+    )
+    # Written around the injector, so its record of applied values is stale
+    for obj, _ in items:
+        INJECTOR.forget(obj.name)
+    return asdict(result)
+
+
+def render(params):
+    """Render the scene to ``filepath``."""
+    scene = bpy.context.scene
+    if "resolution" in params:
+        scene.render.resolution_x, scene.render.resolution_y = params["resolution"]
+    scene.render.filepath = params["filepath"]
+    bpy.ops.render.render(write_still=True)
+    return {"filepath": params["filepath"]}
+
+
+def export(params):
+    """Export the evaluated scene geometry to ``filepath``."""
+    filepath = params["filepath"]
+    fmt = params.get("format") or Path(filepath).suffix.lstrip(".").lower()
+    if fmt == "ply":
+        bpy.ops.wm.ply_export(filepath=filepath, apply_modifiers=True)
+    elif fmt == "obj":
+        bpy.ops.wm.obj_export(filepath=filepath, apply_modifiers=True)
+    elif fmt in ("glb", "gltf"):
+        export_format = "GLB" if fmt == "glb" else "GLTF_SEPARATE"
+        bpy.ops.export_scene.gltf(filepath=filepath, export_format=export_format)
+    else:
+        raise ValueError(f"Unsupported export format '{fmt}'")
+    return {"filepath": filepath, "format": fmt}
+
+
+def bake(params):
+    """Bake IFS modifiers into ``cache_dir``, reusing entries that match.
+
+    ``force`` re-bakes matching entries too, after edits the fingerprint
+    does not see (materials, images, collections).
+    """
+    objects = [bpy.data.objects[params["object"]]] if "object" in params else None
+    force = bool(params.get("force", False))
+    results = [
+        {
+            "object": obj.name,
+            **bake_modifier(obj, modifier, params["cache_dir"], force=force),
+        }
+        for obj, modifier in ifs_modifiers(objects or bpy.data.objects)
+    ]
+    return {"bakes": results, "reused": sum(r["reused"] for r in results)}
+
+
+def reload(params):
+    """Revert to the saved .blend file, discarding changes from earlier jobs."""
+    bpy.ops.wm.revert_mainfile()
+    INJECTOR.forget()
+    return {"filepath": bpy.data.filepath}
+
+
+HANDLERS = {
+    "apply_preset": apply_preset,
+    "bulk_apply": bulk_apply_presets,
+    "render": render,
+    "export": export,
+    "bake": bake,
+    "reload": reload,
+}
+
+
+if __name__ == "__main__":
+    serve_worker(HANDLERS)
@@ -31,6 +31,7 @@ def create_ifs_generator_node_group():
     - Repeat Zone structure with iteration counter
     - Single point initialization
     - Iteration attribute storage on point domain
+    - Output stage selected by Output Mode (points / instances / realized)
     
     Returns:
         bpy.types.GeometryNodeTree: The created node group
@@ -55,7 +56,7 @@ def create_ifs_generator_node_group():
     group_input.name = "Group Input"
     
     group_output = nodes.new('NodeGroupOutput')
-    group_output.location = (400, 0)
+    group_output.location = (600, 0)
     group_output.name = "Group Output"
     
     # Create Mesh Line node for single point initialization
@@ -96,8 +97,11 @@ def create_ifs_generator_node_group():
     # Group Input → Mesh Line (single point)
     links.new(mesh_line.outputs['Mesh'], repeat_input.inputs['Geometry'])
     
-    # Group Input → Repeat Input (Iterations)
-    links.new(group_input.outputs['Iterations'], repeat_input.inputs['Iterations'])
+    # Group Input → Quality Switch → Repeat Input (Iterations)
+    iterations_switch, output_mode_switch = create_quality_switch(
+        node_group, group_input
+    )
+    links.new(iterations_switch.outputs['Output'], repeat_input.inputs['Iterations'])
     
     # Inside Repeat Zone: Geometry → Store Attr → Output
     links.new(repeat_input.outputs['Geometry'], store_attr.inputs['Geometry'])
@@ -108,8 +112,16 @@ def create_ifs_generator_node_group():
     # Store Attr → Repeat Output
     links.new(store_attr.outputs['Geometry'], repeat_output.inputs['Geometry'])
     
-    # Repeat Output → Group Output
-    links.new(repeat_output.outputs['Geometry'], group_output.inputs['Geometry'])
+    # Repeat Output → Output Stage (points / instances / realized)
+    output_stage = create_output_stage(
+        node_group, group_input, output_mode_switch, repeat_output.outputs['Geometry']
+    )
+
+    # Output Stage → Bake → Group Output
+    # The bake stage lets src/utils/bake_cache.py reuse evaluated output
+    bake = create_bake_stage(node_group)
+    links.new(output_stage.outputs['Output'], bake.inputs['Geometry'])
+    links.new(bake.outputs['Geometry'], group_output.inputs['Geometry'])
     
     # Organize with frames (optional, for visual clarity)
     create_node_frames(node_group)
@@ -127,10 +139,12 @@ def create_node_group_interface(node_group):
     
     Inputs:
     - Geometry (standard)
-    - Iterations (Int, 1-12)
+    - Iterations (Int, 1-12, render)
+    - Preview Iterations (Int, 1-12, viewport)
     - Seed (Int)
     - Instance Mesh (Geometry)
-    - Output Mode (Int, 0-2)
+    - Output Mode (Int, 0-2, render)
+    - Preview Output Mode (Int, 0-2, viewport)
     
     Outputs:
     - Geometry
@@ -157,6 +171,16 @@ def create_node_group_interface(node_group):
     iterations.min_value = 1
     iterations.max_value = 12
     
+    # Add input: Preview Iterations (used while the viewport evaluates)
+    preview_iterations = interface.new_socket(
+        name="Preview Iterations",
+        in_out='INPUT',
+        socket_type='NodeSocketInt'
+    )
+    preview_iterations.default_value = 6
+    preview_iterations.min_value = 1
+    preview_iterations.max_value = 12
+
     # Add input: Seed
     seed = interface.new_socket(
         name="Seed",
@@ -182,6 +206,16 @@ def create_node_group_interface(node_group):
     output_mode.min_value = 0
     output_mode.max_value = 2
     
+    # Add input: Preview Output Mode (used while the viewport evaluates)
+    preview_output_mode = interface.new_socket(
+        name="Preview Output Mode",
+        in_out='INPUT',
+        socket_type='NodeSocketInt'
+    )
+    preview_output_mode.default_value = 0  # Points
+    preview_output_mode.min_value = 0
+    preview_output_mode.max_value = 2
+
     # Add output: Geometry
     interface.new_socket(
         name="Geometry",
@@ -192,6 +226,114 @@ def create_node_group_interface(node_group):
     print(f"✓ Created interface with {len([i for i in interface.items_tree if i.in_out == 'INPUT'])} inputs")
 
 
+def create_quality_switch(node_group, group_input):
+    """Create the viewport/render quality switches.
+
+    An Is Viewport node selects the Preview inputs while the viewport
+    evaluates and the full-quality inputs at render time, so artists get
+    interactive rates without editing parameters.
+
+    Returns:
+        tuple: (iterations switch, output mode switch)
+    """
+    nodes = node_group.nodes
+    links = node_group.links
+
+    is_viewport = nodes.new('GeometryNodeIsViewport')
+    is_viewport.location = (-800, -300)
+    is_viewport.name = "Is Viewport"
+
+    switches = []
+    for offset, name in enumerate(("Iterations", "Output Mode")):
+        switch = nodes.new('GeometryNodeSwitch')
+        switch.input_type = 'INT'
+        switch.location = (-600, 200 - 150 * offset)
+        switch.name = f"{name} Quality Switch"
+        links.new(is_viewport.outputs['Is Viewport'], switch.inputs['Switch'])
+        links.new(group_input.outputs[name], switch.inputs['False'])
+        links.new(group_input.outputs[f"Preview {name}"], switch.inputs['True'])
+        switches.append(switch)
+
+    return tuple(switches)
+
+
+def create_output_stage(node_group, group_input, output_mode_switch, geometry):
+    """Create the Output Mode stage after the Repeat Zone.
+
+    The selected Output Mode picks the geometry leaving the group:
+    0 = points, 1 = Instance Mesh instanced on every point,
+    2 = those instances realized into one mesh.
+
+    Args:
+        node_group: The IFS_Generator node group
+        group_input: Group Input node (provides Instance Mesh)
+        output_mode_switch: Output Mode quality switch
+        geometry: Repeat Zone geometry output socket
+
+    Returns:
+        bpy.types.Node: Switch node whose Output is the selected geometry
+    """
+    nodes = node_group.nodes
+    links = node_group.links
+
+    to_points = nodes.new('GeometryNodeMeshToPoints')
+    to_points.location = (250, -250)
+    to_points.name = "Output Points"
+    links.new(geometry, to_points.inputs['Mesh'])
+
+    instance = nodes.new('GeometryNodeInstanceOnPoints')
+    instance.location = (400, -250)
+    instance.name = "Output Instances"
+    links.new(to_points.outputs['Points'], instance.inputs['Points'])
+    links.new(group_input.outputs['Instance Mesh'], instance.inputs['Instance'])
+
+    realize = nodes.new('GeometryNodeRealizeInstances')
+    realize.location = (550, -250)
+    realize.name = "Output Realized"
+    links.new(instance.outputs['Instances'], realize.inputs['Geometry'])
+
+    # Mode > 0.5 leaves points; mode > 1.5 realizes the instances
+    switches = []
+    for offset, (name, threshold) in enumerate(
+        (("Instances or Points", 0.5), ("Realized or Instances", 1.5))
+    ):
+        compare = nodes.new('ShaderNodeMath')
+        compare.operation = 'GREATER_THAN'
+        compare.location = (250, -450 - 100 * offset)
+        compare.name = f"Output Mode > {threshold}"
+        links.new(output_mode_switch.outputs['Output'], compare.inputs[0])
+        compare.inputs[1].default_value = threshold
+        switch = nodes.new('GeometryNodeSwitch')
+        switch.input_type = 'GEOMETRY'
+        switch.location = (700, -250 - 150 * offset)
+        switch.name = name
+        links.new(compare.outputs['Value'], switch.inputs['Switch'])
+        switches.append(switch)
+    mode_switch, realize_switch = switches
+
+    links.new(instance.outputs['Instances'], realize_switch.inputs['False'])
+    links.new(realize.outputs['Geometry'], realize_switch.inputs['True'])
+    links.new(to_points.outputs['Points'], mode_switch.inputs['False'])
+    links.new(realize_switch.outputs['Output'], mode_switch.inputs['True'])
+    return mode_switch
+
+
+def create_bake_stage(node_group):
+    """Create the Bake node that stores evaluated output (Blender 4.1+).
+
+    The node name must match BAKE_NODE_NAME in src/utils/bake_cache.py,
+    which points the bake at a cache entry keyed by the input values.
+
+    Returns:
+        bpy.types.Node: The Bake node
+    """
+    bake = node_group.nodes.new('GeometryNodeBake')
+    bake.location = (400, 0)
+    bake.name = "IFS Bake"
+    bake.label = "Bake (parameter cache)"
+    return bake
+
+
 def create_node_frames(node_group):
     """Create organizational frames for node groups.
     
@@ -48,7 +48,7 @@ def create_ifs_generator_node_group():
     group_input.name = "Group Input"
     
     group_output = nodes.new('NodeGroupOutput')
-    group_output.location = (600, 0)
+    group_output.location = (800, 0)
     group_output.name = "Group Output"
     
     # Create Points node for single point initialization (simpler for Blender 5.0)
@@ -115,8 +115,13 @@ def create_ifs_generator_node_group():
             print(f"  ⚠ Could not find geometry input on Repeat Input node")
             print(f"     Available inputs: {[s.name for s in repeat_input.inputs]}")
         
-        # Group Input → Repeat Input (Iterations)
-        iterations_out = next((s for s in group_input.outputs if 'Iteration' in s.name), None)
+        # Group Input → Quality Switch → Repeat Input (Iterations)
+        iterations_switch, output_mode_switch = create_quality_switch(
+            node_group, group_input
+        )
+        iterations_out = next(
+            (s for s in iterations_switch.outputs if s.type == 'INT'), None
+        )
         iterations_in = next((s for s in repeat_input.inputs if 'Iteration' in s.name), None)
         
         if iterations_out and iterations_in:
@@ -147,13 +152,26 @@ def create_ifs_generator_node_group():
             links.new(store_out_geom, repeat_end_geom)
             print(f"  ✓ Connected Store Attr → Repeat Output ({store_out_geom.name} → {repeat_end_geom.name})")
         
-        # Repeat Output → Group Output
-        final_out = next((s for s in repeat_output.outputs if s.type == 'GEOMETRY'), None)
+        # Repeat Output → Output Stage (points / instances / realized)
+        repeat_geometry = next(
+            (s for s in repeat_output.outputs if s.type == 'GEOMETRY'), None
+        )
+        output_stage = create_output_stage(
+            node_group, group_input, output_mode_switch, repeat_geometry
+        )
+
+        # Output Stage → Bake → Group Output
+        # The bake stage lets src/utils/bake_cache.py reuse evaluated output
+        bake = create_bake_stage(node_group)
+        final_out = output_stage.outputs['Output']
+        bake_in = next((s for s in bake.inputs if s.type == 'GEOMETRY'), None)
+        bake_out = next((s for s in bake.outputs if s.type == 'GEOMETRY'), None)
         group_out_geom = next((s for s in group_output.inputs if s.type == 'GEOMETRY'), None)
         
-        if final_out and group_out_geom:
-            links.new(final_out, group_out_geom)
-            print(f"  ✓ Connected Repeat Output → Group Output ({final_out.name} → {group_out_geom.name})")
+        if final_out and bake_in and bake_out and group_out_geom:
+            links.new(final_out, bake_in)
+            links.new(bake_out, group_out_geom)
+            print("  ✓ Connected Output Stage → Bake → Group Output")
         
     except Exception as e:
         print(f"  ⚠ Error creating links: {e}")
@@ -168,6 +186,99 @@ def create_ifs_generator_node_group():
     return node_group
 
 
+def create_quality_switch(node_group, group_input):
+    """Create Is Viewport switches between the Preview and render inputs.
+
+    Returns:
+        tuple: (iterations switch, output mode switch)
+    """
+    nodes = node_group.nodes
+    links = node_group.links
+
+    is_viewport = nodes.new('GeometryNodeIsViewport')
+    is_viewport.location = (-800, -300)
+    is_viewport.name = "Is Viewport"
+
+    switches = []
+    for offset, name in enumerate(("Iterations", "Output Mode")):
+        switch = nodes.new('GeometryNodeSwitch')
+        switch.input_type = 'INT'
+        switch.location = (-600, 200 - 150 * offset)
+        switch.name = f"{name} Quality Switch"
+        sockets = {s.name: s for s in switch.inputs}
+        links.new(is_viewport.outputs[0], sockets['Switch'])
+        links.new(group_input.outputs[name], sockets['False'])
+        links.new(group_input.outputs[f"Preview {name}"], sockets['True'])
+        switches.append(switch)
+
+    print("✓ Created viewport/render quality switches")
+    return tuple(switches)
+
+
+def create_output_stage(node_group, group_input, output_mode_switch, geometry):
+    """Create the Output Mode stage after the Repeat Zone.
+
+    0 = points, 1 = Instance Mesh instanced on every point,
+    2 = those instances realized into one mesh.
+
+    Returns:
+        bpy.types.Node: Switch node whose Output is the selected geometry
+    """
+    nodes = node_group.nodes
+    links = node_group.links
+
+    instance = nodes.new('GeometryNodeInstanceOnPoints')
+    instance.location = (400, -250)
+    instance.name = "Output Instances"
+    links.new(geometry, instance.inputs['Points'])
+    links.new(group_input.outputs['Instance Mesh'], instance.inputs['Instance'])
+
+    realize = nodes.new('GeometryNodeRealizeInstances')
+    realize.location = (550, -250)
+    realize.name = "Output Realized"
+    links.new(instance.outputs['Instances'], realize.inputs['Geometry'])
+
+    # Mode > 0.5 leaves points; mode > 1.5 realizes the instances
+    switches = []
+    for offset, (name, threshold) in enumerate(
+        (("Instances or Points", 0.5), ("Realized or Instances", 1.5))
+    ):
+        compare = nodes.new('ShaderNodeMath')
+        compare.operation = 'GREATER_THAN'
+        compare.location = (250, -450 - 100 * offset)
+        compare.name = f"Output Mode > {threshold}"
+        links.new(output_mode_switch.outputs[0], compare.inputs[0])
+        compare.inputs[1].default_value = threshold
+        switch = nodes.new('GeometryNodeSwitch')
+        switch.input_type = 'GEOMETRY'
+        switch.location = (700, -250 - 150 * offset)
+        switch.name = name
+        sockets = {s.name: s for s in switch.inputs}
+        links.new(compare.outputs[0], sockets['Switch'])
+        switches.append((switch, sockets))
+    (mode_switch, mode_sockets), (realize_switch, realize_sockets) = switches
+
+    links.new(instance.outputs['Instances'], realize_sockets['False'])
+    links.new(realize.outputs['Geometry'], realize_sockets['True'])
+    links.new(geometry, mode_sockets['False'])
+    links.new(realize_switch.outputs[0], mode_sockets['True'])
+    print("✓ Created output stage (points / instances / realized)")
+    return mode_switch
+
+
+def create_bake_stage(node_group):
+    """Create the Bake node that stores evaluated output.
+
+    The node name must match BAKE_NODE_NAME in src/utils/bake_cache.py.
+    """
+    bake = node_group.nodes.new('GeometryNodeBake')
+    bake.location = (600, 0)
+    bake.name = "IFS Bake"
+    bake.label = "Bake (parameter cache)"
+    print("✓ Created Bake node")
+    return bake
+
+
 def create_node_group_interface(node_group):
     """Create the input/output interface for IFS_Generator."""
     interface = node_group.interface
@@ -192,6 +303,16 @@ def create_node_group_interface(node_group):
     iterations.min_value = 1
     iterations.max_value = 12
     
+    # Add input: Preview Iterations (used while the viewport evaluates)
+    preview_iterations = interface.new_socket(
+        name="Preview Iterations",
+        in_out='INPUT',
+        socket_type='NodeSocketInt'
+    )
+    preview_iterations.default_value = 6
+    preview_iterations.min_value = 1
+    preview_iterations.max_value = 12
+
     # Add input: Seed
     seed = interface.new_socket(
         name="Seed",
@@ -217,6 +338,16 @@ def create_node_group_interface(node_group):
     output_mode.min_value = 0
     output_mode.max_value = 2
     
+    # Add input: Preview Output Mode (used while the viewport evaluates)
+    preview_output_mode = interface.new_socket(
+        name="Preview Output Mode",
+        in_out='INPUT',
+        socket_type='NodeSocketInt'
+    )
+    preview_output_mode.default_value = 0  # Points
+    preview_output_mode.min_value = 0
+    preview_output_mode.max_value = 2
+
     # Add output: Geometry
     interface.new_socket(
         name="Geometry",
@@ -1,8 +1,11 @@
 """MCP (Model Context Protocol) integration.
 
-This package will contain the MCP server implementation for AI agent
-interaction with the fractal generator.
+This package contains the MCP server that lets AI agents drive the fractal
+generator:
 
-MCP integration is planned for Phase 5.
-"""
+- ``tools``: ``generate_fractal``, ``modify_preset`` and ``export_geometry``
+- ``server``: Asyncio JSON-RPC server with a bounded, deduplicating job
+  queue (run with ``python -m src.mcp.server``)
 
+See docs/architecture.md §5.3 for the integration design.
+"""
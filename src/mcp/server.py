@@ -0,0 +1,471 @@
+"""Asyncio MCP server for the IFS Fractal Generator.
+
+Speaks newline-delimited JSON-RPC 2.0 (the MCP stdio transport) over stdin/
+stdout, a Unix socket or a localhost TCP port, and exposes the tools in
+``src.mcp.tools``. Expensive tools run in a worker pool behind a
+``JobQueue`` that provides:
+
+- **Bounded concurrency**: at most ``max_concurrent`` jobs execute at once;
+  the rest wait without blocking the event loop or other clients.
+- **Per-request timeouts**: ``params._meta.timeout`` (seconds) or the
+  server default, one deadline for every refinement level of a request.
+- **Deduplication**: identical in-flight tool calls share one job, so
+  parallel agents never start the same 4^12 expansion twice.
+- **Cancellation**: ``notifications/cancelled`` cancels a request, and a
+  request carrying ``params._meta.supersedeKey`` cancels the previous
+  request with the same key. A shared job keeps running while any other
+  request still waits on it.
+- **Progressive refinement**: a ``generate_fractal`` call carrying
+  ``params._meta.progressToken`` runs at increasing fidelity; every coarser
+  level (statistics plus preview image) arrives as a
+  ``notifications/progress`` message before the final response, and the
+  client cancels the request once a level is good enough.
+
+Usage:
+    python -m src.mcp.server                     # stdio
+    python -m src.mcp.server --socket /tmp/ifs.sock
+    python -m src.mcp.server --port 8765
+
+See docs/architecture.md §5.3 for the MCP integration design.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Set, Tuple
+
+from src.mcp.tools import TOOLS
+
+PROTOCOL_VERSION = "2024-11-05"
+SERVER_INFO = {"name": "ifs-fractal-generator", "version": "0.1.0"}
+
+# Seconds a request may run before it fails with a timeout error
+DEFAULT_TIMEOUT = 300.0
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+REQUEST_TIMEOUT = -32001
+REQUEST_CANCELLED = -32800
+
+
+@dataclass
+class _Job:
+    """A running job and the number of requests waiting on it."""
+
+    task: "asyncio.Task[Any]"
+    waiters: int = 0
+
+
+class JobQueue:
+    """Run blocking jobs in an executor with dedup, limits and timeouts.
+
+    Args:
+        executor: Executor for job functions (defaults to a process pool
+            with ``max_concurrent`` workers)
+        max_concurrent: Maximum jobs executing at once
+        default_timeout: Seconds before a waiting request gives up
+
+    Note:
+        A job already running in a worker process cannot be interrupted;
+        cancelling it releases its concurrency slot for queued work only
+        once the worker returns. Jobs still queued are dropped immediately.
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        max_concurrent: Optional[int] = None,
+        default_timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.max_concurrent = max_concurrent or max(1, (os.cpu_count() or 2) // 2)
+        self._owns_executor = executor is None
+        self._executor = executor or ProcessPoolExecutor(self.max_concurrent)
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._jobs: Dict[str, _Job] = {}
+        self.default_timeout = default_timeout
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct jobs queued or running."""
+        return len(self._jobs)
+
+    async def _execute(self, fn: Callable[..., Any], args: Sequence[Any]) -> Any:
+        async with self._slots:
+            job = self._executor.submit(fn, *args)
+            future = asyncio.wrap_future(job)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # A running job cannot be interrupted: hold the slot until
+                # its worker is actually free again
+                if not job.cancel():
+                    await asyncio.wait([future])
+                raise
+
+    async def submit(
+        self,
+        key: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Run ``fn(*args)``, sharing the job with identical in-flight calls.
+
+        Args:
+            key: Deduplication key; calls with the same key share one job
+            fn: Picklable function to run in the executor
+            *args: Arguments for ``fn``
+            timeout: Seconds to wait (defaults to ``default_timeout``)
+
+        Returns:
+            The job's result
+
+        Raises:
+            asyncio.TimeoutError: If the job does not finish in time
+            asyncio.CancelledError: If this request is cancelled
+        """
+        job = self._jobs.get(key)
+        if job is None:
+            job = _Job(asyncio.ensure_future(self._execute(fn, args)))
+            self._jobs[key] = job
+            job.task.add_done_callback(lambda _: self._forget(key, job))
+        job.waiters += 1
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(job.task),
+                self.default_timeout if timeout is None else timeout,
+            )
+        finally:
+            job.waiters -= 1
+            if job.waiters == 0 and not job.task.done():
+                job.task.cancel()
+                self._forget(key, job)
+
+    def _forget(self, key: str, job: _Job) -> None:
+        if self._jobs.get(key) is job:
+            del self._jobs[key]
+
+    def shutdown(self) -> None:
+        """Cancel pending jobs and stop the executor if this queue owns it."""
+        for job in list(self._jobs.values()):
+            job.task.cancel()
+        self._jobs.clear()
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def request_key(tool: str, arguments: Dict[str, Any]) -> str:
+    """Deduplication key for a tool call: hash of its canonical JSON."""
+    canonical = json.dumps([tool, arguments], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {"code": code, "message": message},
+    }
+
+
+def _result(request_id: Any, result: Dict[str, Any]) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+def _tool_content(payload: Dict[str, Any], is_error: bool = False) -> Dict[str, Any]:
+    payload = dict(payload)
+    preview = payload.pop("preview_png", None)
+    content = [{"type": "text", "text": json.dumps(payload)}]
+    if preview is not None:
+        content.append({"type": "image", "data": preview, "mimeType": "image/png"})
+    return {"content": content, "structuredContent": payload, "isError": is_error}
+
+
+Notify = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class FractalServer:
+    """JSON-RPC front end dispatching MCP tool calls to a ``JobQueue``.
+
+    Args:
+        jobs: Queue that runs offloaded tools
+    """
+
+    def __init__(self, jobs: JobQueue) -> None:
+        self.jobs = jobs
+        self._supersede: Dict[str, "asyncio.Task[Any]"] = {}
+        self._superseded: Set["asyncio.Task[Any]"] = set()
+
+    async def call_tool(
+        self, params: Dict[str, Any], notify: Optional[Notify] = None
+    ) -> Dict[str, Any]:
+        """Execute a ``tools/call`` request and return its MCP result.
+
+        Args:
+            params: ``tools/call`` parameters
+            notify: Sends a JSON-RPC notification to the client; enables
+                progressive refinement for requests with a progress token
+
+        Raises:
+            KeyError: If the tool does not exist
+        """
+        name = params["name"]
+        spec = TOOLS[name]
+        arguments = params.get("arguments") or {}
+        meta = params.get("_meta") or {}
+        token = meta.get("progressToken")
+        try:
+            if spec.offload:
+                levels = [arguments]
+                if spec.progressive is not None and token is not None and notify:
+                    levels = spec.progressive(arguments)
+                timeout = meta.get("timeout")
+                if timeout is None:
+                    timeout = self.jobs.default_timeout
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + timeout
+                for level, level_arguments in enumerate(levels, start=1):
+                    payload = await self.jobs.submit(
+                        request_key(name, level_arguments),
+                        _call,
+                        spec.function,
+                        level_arguments,
+                        timeout=max(0.0, deadline - loop.time()),
+                    )
+                    if level < len(levels) and notify is not None:
+                        await notify(
+                            {
+                                "jsonrpc": "2.0",
+                                "method": "notifications/progress",
+                                "params": {
+                                    "progressToken": token,
+                                    "progress": level,
+                                    "total": len(levels),
+                                    "result": _tool_content(payload),
+                                },
+                            }
+                        )
+            else:
+                payload = spec.function(**arguments)
+        except asyncio.TimeoutError:
+            raise
+        except (
+            ValueError,
+            KeyError,
+            TypeError,
+            IndexError,
+            OSError,
+            MemoryError,
+        ) as e:
+            return _tool_content({"error": f"{type(e).__name__}: {e}"}, is_error=True)
+        return _tool_content(payload)
+
+    async def handle_message(
+        self, message: Any, notify: Optional[Notify] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Handle one JSON-RPC message.
+
+        Args:
+            message: Decoded JSON-RPC request or notification
+            notify: Sends notifications (e.g. progress) to the client
+
+        Returns:
+            Response to send, or ``None`` for notifications
+        """
+        if not isinstance(message, dict) or message.get("jsonrpc") != "2.0":
+            return _error(None, INVALID_REQUEST, "Invalid JSON-RPC 2.0 message")
+        request_id = message.get("id")
+        method = message.get("method")
+        params = message.get("params") or {}
+
+        if method == "initialize":
+            return _result(
+                request_id,
+                {
+                    "protocolVersion": PROTOCOL_VERSION,
+                    "capabilities": {"tools": {}},
+                    "serverInfo": SERVER_INFO,
+                },
+            )
+        if method == "ping":
+            return _result(request_id, {})
+        if method == "tools/list":
+            tools = [
+                {
+                    "name": name,
+                    "description": spec.description,
+                    "inputSchema": spec.input_schema,
+                }
+                for name, spec in TOOLS.items()
+            ]
+            return _result(request_id, {"tools": tools})
+        if method == "tools/call":
+            if params.get("name") not in TOOLS:
+                return _error(
+                    request_id, INVALID_PARAMS, f"Unknown tool: {params.get('name')}"
+                )
+            try:
+                return _result(request_id, await self.call_tool(params, notify))
+            except asyncio.TimeoutError:
+                return _error(request_id, REQUEST_TIMEOUT, "Request timed out")
+        if request_id is None:
+            return None  # unknown notification
+        return _error(request_id, METHOD_NOT_FOUND, f"Method not found: {method}")
+
+    async def serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one connection until EOF.
+
+        Each request runs in its own task, so slow tool calls never block
+        later requests on the same or other connections.
+        """
+        write_lock = asyncio.Lock()
+        pending: Dict[Any, "asyncio.Task[Any]"] = {}
+
+        async def send(response: Optional[Dict[str, Any]]) -> None:
+            if response is None:
+                return
+            async with write_lock:
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+
+        async def run(message: Dict[str, Any]) -> None:
+            request_id = message.get("id")
+            try:
+                await send(await self.handle_message(message, send))
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if task in self._superseded:
+                    self._superseded.discard(task)
+                    await send(
+                        _error(
+                            request_id,
+                            REQUEST_CANCELLED,
+                            "Superseded by a newer request",
+                        )
+                    )
+            except Exception as e:  # noqa: BLE001 - keep the connection alive
+                await send(_error(request_id, INTERNAL_ERROR, str(e)))
+            finally:
+                pending.pop(request_id, None)
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    await send(_error(None, PARSE_ERROR, "Parse error"))
+                    continue
+                if not isinstance(message, dict):
+                    await send(await self.handle_message(message))
+                    continue
+                params = message.get("params") or {}
+
+                if message.get("method") == "notifications/cancelled":
+                    target = pending.get(params.get("requestId"))
+                    if target is not None:
+                        target.cancel()
+                    continue
+
+                task = asyncio.ensure_future(run(message))
+                if message.get("id") is not None:
+                    pending[message["id"]] = task
+                key = (params.get("_meta") or {}).get("supersedeKey")
+                if key is not None:
+                    self._supersede_with(key, task)
+        finally:
+            for task in list(pending.values()):
+                task.cancel()
+            writer.close()
+
+    def _supersede_with(self, key: str, task: "asyncio.Task[Any]") -> None:
+        """Cancel the previous request under ``key`` and record ``task``."""
+        previous = self._supersede.get(key)
+        if previous is not None and not previous.done():
+            self._superseded.add(previous)
+            previous.cancel()
+        self._supersede[key] = task
+        task.add_done_callback(
+            lambda t: (
+                self._supersede.pop(key, None)
+                if self._supersede.get(key) is t
+                else None
+            )
+        )
+
+
+def _call(function: Callable[..., Dict[str, Any]], arguments: Dict[str, Any]) -> Any:
+    """Worker-side trampoline: call a tool with keyword arguments."""
+    return function(**arguments)
+
+
+async def _stdio_streams() -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), sys.stdin
+    )
+    transport, protocol = await loop.connect_write_pipe(
+        asyncio.streams.FlowControlMixin, sys.stdout
+    )
+    writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+    return reader, writer
+
+
+async def run_server(
+    socket_path: Optional[str] = None,
+    port: Optional[int] = None,
+    max_concurrent: Optional[int] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> None:
+    """Run the server on stdio, a Unix socket or a localhost TCP port."""
+    jobs = JobQueue(max_concurrent=max_concurrent, default_timeout=timeout)
+    server = FractalServer(jobs)
+    try:
+        if socket_path is not None:
+            listener = await asyncio.start_unix_server(server.serve, path=socket_path)
+        elif port is not None:
+            listener = await asyncio.start_server(server.serve, "127.0.0.1", port)
+        else:
+            await server.serve(*await _stdio_streams())
+            return
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        jobs.shutdown()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.mcp.server",
+        description="MCP server for the IFS Fractal Generator.",
+    )
+    transport = parser.add_mutually_exclusive_group()
+    transport.add_argument("--socket", help="Listen on this Unix socket path")
+    transport.add_argument("--port", type=int, help="Listen on 127.0.0.1:PORT")
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent jobs")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(run_server(args.socket, args.port, args.workers, args.timeout))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,409 @@
+"""Tool implementations exposed by the MCP server.
+
+Each tool is a plain synchronous function taking and returning
+JSON-serialisable values, so the server can run the expensive ones in
+worker processes. Presets may be passed inline (a dictionary) or by name
+(resolved through ``load_preset``) and are validated before any work.
+
+Tools (docs/architecture.md §5.3):
+    - ``generate_fractal``: Evaluate a preset headlessly and return statistics
+    - ``modify_preset``: Apply changes to a preset and re-validate it
+    - ``export_geometry``: Evaluate a preset and write the points to a file
+"""
+
+import base64
+import copy
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+from src.utils.math_helpers import enforce_iteration_limits
+from src.utils.preset_loader import load_preset
+from src.utils.validator import assert_valid_preset, validate_preset
+
+PresetArg = Union[str, Mapping[str, Any]]
+
+GENERATION_MODES = ("exhaustive", "chaos", "stratified")
+
+
+def resolve_preset(preset: PresetArg) -> Dict[str, Any]:
+    """Load (by name) or copy (inline) a preset and validate it.
+
+    Args:
+        preset: Preset name or preset dictionary
+
+    Returns:
+        Independent, validated preset dictionary
+
+    Raises:
+        PresetNotFoundError: If a named preset does not exist
+        PresetValidationError: If the preset is invalid
+    """
+    data = (
+        load_preset(preset) if isinstance(preset, str) else copy.deepcopy(dict(preset))
+    )
+    assert_valid_preset(data)
+    return data
+
+
+def _check_request(
+    compiled: Any,
+    iterations: Optional[int],
+    mode: str,
+    n_points: Optional[int],
+    bytes_per_point: Optional[int] = None,
+) -> int:
+    """Validate a generation request and check it against memory.
+
+    Requests that would exhaust the server's memory fail cleanly up front.
+
+    Returns:
+        The expansion depth
+
+    Raises:
+        ValueError: If the mode is unknown or limits are exceeded
+        MemoryLimitExceeded: If the request does not fit in memory
+    """
+    from src.utils.ifs_engine import DEFAULT_CHAOS_POINTS
+    from src.utils.memory_guard import BYTES_PER_POINT, plan_generation
+
+    if mode not in GENERATION_MODES:
+        raise ValueError(f"Mode must be one of {list(GENERATION_MODES)} (got {mode!r})")
+    depth = compiled.iterations if iterations is None else iterations
+    if mode == "exhaustive":
+        enforce_iteration_limits(compiled.transform_count, depth)
+    plan_generation(
+        compiled.transform_count,
+        depth,
+        mode,
+        n_points or DEFAULT_CHAOS_POINTS,
+        policy="raise",
+        bytes_per_point=bytes_per_point or BYTES_PER_POINT,
+    )
+    return depth
+
+
+def _generate_points(
+    preset: Mapping[str, Any],
+    iterations: Optional[int],
+    mode: str,
+    n_points: Optional[int],
+    seed: Optional[int],
+) -> Any:
+    # NumPy is imported here so modify_preset and server start-up stay light
+    from src.utils.ifs_engine import (
+        DEFAULT_CHAOS_POINTS,
+        chaos_game,
+        compile_preset,
+        expand_stratified,
+    )
+    from src.utils.memory_guard import MemoryGuard, guarded_expand
+
+    compiled = compile_preset(preset)
+    depth = _check_request(compiled, iterations, mode, n_points)
+    # Runs that outgrow the prediction stop instead of being killed
+    with MemoryGuard() as guard:
+        if mode == "exhaustive":
+            points, _ = guarded_expand(compiled.matrices, depth, guard, downgrade=False)
+        elif mode == "chaos":
+            points = chaos_game(
+                compiled.matrices,
+                compiled.weights,
+                n_points or DEFAULT_CHAOS_POINTS,
+                seed=compiled.seed if seed is None else seed,
+            )
+        else:
+            points = expand_stratified(
+                compiled.matrices, compiled.weights, n_points or DEFAULT_CHAOS_POINTS
+            )
+        guard.check()
+    return points
+
+
+def _colored_points(
+    preset: Mapping[str, Any],
+    iterations: Optional[int],
+    mode: str,
+    n_points: Optional[int],
+    seed: Optional[int],
+) -> Tuple[Any, Any]:
+    from src.utils.color import palette_colors
+    from src.utils.ifs_engine import (
+        DEFAULT_CHAOS_POINTS,
+        compile_preset,
+        expand_stratified,
+    )
+    from src.utils.memory_guard import (
+        BYTES_PER_POINT,
+        MemoryGuard,
+        guarded_levels,
+    )
+
+    palette = preset.get("color_palette")
+    compiled = compile_preset(preset)
+    # Colored points also carry an int32 depth and uint8 RGBA
+    depth = _check_request(
+        compiled, iterations, mode, n_points, bytes_per_point=BYTES_PER_POINT + 8
+    )
+    depths = None
+    palette_mode = palette["mode"] if palette else "iteration_depth"
+    by_depth = palette_mode == "iteration_depth"
+    if by_depth and mode == "exhaustive":
+        with MemoryGuard() as guard:
+            points, depths = guarded_levels(compiled.matrices, depth, guard)
+    elif by_depth and mode == "stratified":
+        with MemoryGuard() as guard:
+            points, depths = expand_stratified(
+                compiled.matrices,
+                compiled.weights,
+                n_points or DEFAULT_CHAOS_POINTS,
+                return_depths=True,
+            )
+            guard.check()
+        depth = int(depths.max())
+    elif palette_mode == "transform_index" and mode != "exhaustive":
+        # Transform indices are recovered from the exhaustive address order
+        raise ValueError("transform_index coloring requires exhaustive mode")
+    else:
+        points = _generate_points(preset, iterations, mode, n_points, seed)
+    rgba = palette_colors(
+        palette,
+        points,
+        depths=depths,
+        iterations=depth,
+        transform_count=compiled.transform_count,
+    )
+    return points, rgba
+
+
+def generate_fractal(
+    preset: PresetArg,
+    iterations: Optional[int] = None,
+    mode: str = "exhaustive",
+    n_points: Optional[int] = None,
+    seed: Optional[int] = None,
+    preview: bool = False,
+) -> Dict[str, Any]:
+    """Evaluate a preset and summarise the resulting point cloud.
+
+    Args:
+        preset: Preset name or dictionary
+        iterations: Override the preset's iterations (exhaustive mode)
+        mode: ``"exhaustive"`` (T^n expansion), ``"chaos"`` (sampling) or
+            ``"stratified"`` (deterministic weighted point budget)
+        n_points: Point count for chaos and stratified modes
+        seed: Override the preset's seed (chaos mode)
+        preview: Include a base64 PNG density preview as ``preview_png``
+
+    Returns:
+        Point statistics plus the preset name and mode
+    """
+    from src.utils.ifs_engine import summarize_points
+
+    data = resolve_preset(preset)
+    points = _generate_points(data, iterations, mode, n_points, seed)
+    result = {"name": data["name"], "mode": mode, **summarize_points(points)}
+    if preview:
+        from src.utils.preview import render_preview
+
+        result["preview_png"] = base64.b64encode(render_preview(points)).decode("ascii")
+    return result
+
+
+def refinement_levels(arguments: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """Split a ``generate_fractal`` call into progressive-refinement levels.
+
+    Args:
+        arguments: ``generate_fractal`` keyword arguments
+
+    Returns:
+        Argument dictionaries at increasing fidelity; the coarser levels
+        request a preview, the last one is the original request unchanged
+
+    Raises:
+        PresetValidationError: If the preset is invalid
+    """
+    from src.utils.ifs_engine import DEFAULT_CHAOS_POINTS
+    from src.utils.progressive import chaos_schedule, exhaustive_schedule
+
+    data = resolve_preset(arguments["preset"])
+    mode = arguments.get("mode", "exhaustive")
+    if mode in ("chaos", "stratified"):
+        budgets = chaos_schedule(arguments.get("n_points") or DEFAULT_CHAOS_POINTS)
+        coarser = [{**arguments, "n_points": n, "preview": True} for n in budgets]
+    else:
+        final = arguments.get("iterations") or data["iterations"]
+        depths = exhaustive_schedule(len(data["transforms"]), final)
+        coarser = [{**arguments, "iterations": d, "preview": True} for d in depths]
+    return coarser[:-1] + [dict(arguments)]
+
+
+def modify_preset(preset: PresetArg, changes: Mapping[str, Any]) -> Dict[str, Any]:
+    """Apply changes to a preset and report any validation issues.
+
+    Args:
+        preset: Preset name or dictionary (need not be valid)
+        changes: Mapping of slash-separated paths to new values, using the
+            same paths as validation issues, e.g.
+            ``{"iterations": 6, "transforms/0/scale": [0.4, 0.4, 0.4]}``
+
+    Returns:
+        ``{"preset": modified preset, "issues": [issue dicts]}``
+
+    Raises:
+        KeyError: If a path does not address an existing container
+    """
+    data = (
+        load_preset(preset) if isinstance(preset, str) else copy.deepcopy(dict(preset))
+    )
+    for path, value in changes.items():
+        keys: List[Any] = path.split("/")
+        target: Any = data
+        for key in keys[:-1]:
+            target = target[int(key)] if isinstance(target, list) else target[key]
+        last = keys[-1]
+        if isinstance(target, list):
+            target[int(last)] = value
+        else:
+            target[last] = value
+    return {
+        "preset": data,
+        "issues": [issue._asdict() for issue in validate_preset(data)],
+    }
+
+
+def export_geometry(
+    preset: PresetArg,
+    path: str,
+    format: Optional[str] = None,
+    iterations: Optional[int] = None,
+    mode: str = "exhaustive",
+    n_points: Optional[int] = None,
+    seed: Optional[int] = None,
+    colors: bool = False,
+) -> Dict[str, Any]:
+    """Evaluate a preset and write its points to a file.
+
+    Args:
+        preset: Preset name or dictionary
+        path: Output file
+        format: Export format (defaults to the file extension)
+        iterations: Override the preset's iterations (exhaustive mode)
+        mode: ``"exhaustive"``, ``"chaos"`` or ``"stratified"``
+        n_points: Point count for chaos and stratified modes
+        seed: Override the preset's seed (chaos mode)
+        colors: Add per-point RGBA from the preset's ``color_palette``.
+            In exhaustive ``iteration_depth`` mode the points of every
+            iteration are exported, like the node group's merged output
+
+    Returns:
+        Output path, point count, bytes written and whether the points of
+        every iteration were merged (``merged_iterations``)
+    """
+    from src.utils.exporters import export_points
+
+    data = resolve_preset(preset)
+    if colors:
+        points, rgba = _colored_points(data, iterations, mode, n_points, seed)
+    else:
+        points = _generate_points(data, iterations, mode, n_points, seed)
+        rgba = None
+    palette = data.get("color_palette") or {}
+    merged = (
+        colors
+        and mode == "exhaustive"
+        and palette.get("mode", "iteration_depth") == "iteration_depth"
+    )
+    size = export_points(path, points, colors=rgba, fmt=format)
+    return {
+        "path": path,
+        "point_count": int(len(points)),
+        "bytes": size,
+        "merged_iterations": merged,
+    }
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """Server-side description of a tool.
+
+    Attributes:
+        function: Implementation
+        description: Shown to agents in ``tools/list``
+        input_schema: JSON schema of the arguments
+        offload: Run in the worker pool (expensive) rather than inline
+        progressive: Splits the arguments into refinement levels; when set,
+            requests carrying a progress token receive each level as a
+            progress notification before the final result
+    """
+
+    function: Callable[..., Dict[str, Any]]
+    description: str
+    input_schema: Dict[str, Any]
+    offload: bool
+    progressive: Optional[Callable[[Mapping[str, Any]], List[Dict[str, Any]]]] = None
+
+
+_PRESET_SCHEMA = {
+    "oneOf": [
+        {"type": "string", "description": "Bundled preset name"},
+        {"type": "object", "description": "Inline preset"},
+    ]
+}
+_GENERATION_PROPERTIES = {
+    "preset": _PRESET_SCHEMA,
+    "iterations": {"type": "integer", "minimum": 1, "maximum": 12},
+    "mode": {"type": "string", "enum": list(GENERATION_MODES)},
+    "n_points": {"type": "integer", "minimum": 1},
+    "seed": {"type": "integer"},
+}
+
+TOOLS: Dict[str, ToolSpec] = {
+    "generate_fractal": ToolSpec(
+        function=generate_fractal,
+        description=(
+            "Evaluate a preset headlessly and return point statistics. With a "
+            "progress token, coarser results stream back first."
+        ),
+        input_schema={
+            "type": "object",
+            "required": ["preset"],
+            "properties": {**_GENERATION_PROPERTIES, "preview": {"type": "boolean"}},
+        },
+        offload=True,
+        progressive=refinement_levels,
+    ),
+    "modify_preset": ToolSpec(
+        function=modify_preset,
+        description="Apply path-based changes to a preset and re-validate it.",
+        input_schema={
+            "type": "object",
+            "required": ["preset", "changes"],
+            "properties": {"preset": _PRESET_SCHEMA, "changes": {"type": "object"}},
+        },
+        offload=False,
+    ),
+    "export_geometry": ToolSpec(
+        function=export_geometry,
+        description="Evaluate a preset and export its points (PLY or NPY).",
+        input_schema={
+            "type": "object",
+            "required": ["preset", "path"],
+            "properties": {
+                **_GENERATION_PROPERTIES,
+                "path": {"type": "string"},
+                "format": {"type": "string", "enum": ["ply", "npy"]},
+                "colors": {
+                    "type": "boolean",
+                    "description": (
+                        "Add RGBA colors from the preset's color_palette. With "
+                        "an iteration_depth palette in exhaustive mode this "
+                        "exports the points of every iteration (sum of T^d "
+                        "for d = 0..n, like the node group's merged output) "
+                        "instead of only the final T^n points"
+                    ),
+                },
+            },
+        },
+        offload=True,
+    ),
+}
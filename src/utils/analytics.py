@@ -0,0 +1,296 @@
+"""Fractal dimension and coverage analytics for point clouds and presets.
+
+Box counting is done in one pass over the points. They are quantized
+once onto a ``2**max_bits`` grid over their bounding cube and encoded as
+uint64 Morton keys, which are then sorted and deduplicated. A Morton key
+shifted right by ``3 * s`` bits is the key of the enclosing cell ``s``
+levels coarser, and shifting keeps the keys sorted, so every coarser
+scale is counted from the previous scale's unique keys with a shift and
+one comparison of neighbours.
+
+The box-counting estimate is cross-checked against the similarity
+dimension of the transform set, the root ``D`` of ``sum(r_i ** D) = 1``
+over the transforms' contraction ratios.
+
+Command-line use:
+
+    python -m src.utils.analytics sierpinski barnsley --points 2000000
+"""
+
+import argparse
+import math
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.ifs_engine import chaos_game, compile_preset
+from src.utils.preset_loader import load_preset
+from src.utils.spatial_index import morton_codes, point_bounds
+
+# Finest grid: cells per axis is 2**MAX_GRID_BITS (at most 21 for Morton keys)
+MAX_GRID_BITS = 12
+
+# Levels whose occupied-cell count exceeds this fraction of the point count
+# are undersampled (most points sit alone in a cell) and are not fitted
+SATURATION_FRACTION = 0.1
+
+# Coarsest level used in the dimension fit (1-2 bits is dominated by the
+# bounding-box shape rather than the fractal)
+MIN_FIT_BITS = 2
+
+# Level at which ``coverage`` is reported
+COVERAGE_BITS = 6
+
+# Chaos-game points sampled per preset by ``analyze_preset``
+ANALYSIS_POINTS = 1_000_000
+
+# Points quantized per chunk (bounds float temporaries)
+QUANTIZE_CHUNK_POINTS = 1 << 22
+
+
+@dataclass
+class BoxCounting:
+    """Box counts over a range of grid levels.
+
+    Attributes:
+        bits: Grid levels; level ``b`` has ``2**b`` cells along the
+            largest bounding-box axis
+        counts: Occupied cells per level
+        coverage: Occupied fraction of the cells overlapping the bounding box
+        dimension: Slope of ``log2(count)`` against ``b`` over the fitted
+            levels (``nan`` if fewer than two qualify)
+        r_squared: Goodness of the fit
+        fit_bits: ``(first, last)`` fitted level
+    """
+
+    bits: np.ndarray
+    counts: np.ndarray
+    coverage: np.ndarray
+    dimension: float
+    r_squared: float
+    fit_bits: Tuple[int, int]
+
+
+def _sorted_unique_keys(
+    points: np.ndarray, lo: np.ndarray, scale: float, max_bits: int
+) -> np.ndarray:
+    """Sorted unique Morton keys of the points on the finest grid."""
+    top = (1 << max_bits) - 1
+    # float32 clouds quantize in float32, avoiding float64 temporaries
+    dtype = np.dtype(np.float32 if points.dtype == np.float32 else np.float64)
+    lo, scale = lo.astype(dtype), dtype.type(scale)
+    keys = np.empty(len(points), dtype=np.uint64)
+    for start in range(0, len(points), QUANTIZE_CHUNK_POINTS):
+        chunk = points[start : start + QUANTIZE_CHUNK_POINTS]
+        cells = np.minimum(((chunk - lo) * scale).astype(np.int32), top)
+        keys[start : start + len(chunk)] = morton_codes(cells)
+    keys.sort()
+    return keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+
+
+def box_counting(
+    points: np.ndarray,
+    max_bits: int = MAX_GRID_BITS,
+    min_bits: int = 0,
+    fit_bits: Optional[Tuple[int, int]] = None,
+) -> BoxCounting:
+    """Count occupied grid cells at every level from ``max_bits`` down.
+
+    Args:
+        points: ``(N, 3)`` points (planar clouds work unchanged)
+        max_bits: Finest level (1-21)
+        min_bits: Coarsest level
+        fit_bits: ``(first, last)`` levels to fit; by default every level
+            from ``MIN_FIT_BITS`` whose count stays within
+            ``SATURATION_FRACTION`` of the point count
+
+    Returns:
+        Counts, coverage and the fitted box-counting dimension
+
+    Raises:
+        ValueError: If the cloud is empty, non-finite or a single point, or
+            the levels are out of range
+    """
+    if not 0 <= min_bits <= max_bits <= 21:
+        raise ValueError(
+            f"Need 0 <= min_bits <= max_bits <= 21 (got {min_bits}, {max_bits})"
+        )
+    points = np.asarray(points)
+    if not len(points):
+        raise ValueError("Points must be a non-empty array of finite values")
+    lo, hi = point_bounds(points)
+    lo = lo.astype(float)
+    extent = hi - lo
+    if not np.isfinite(extent).all():
+        raise ValueError("Points must be a non-empty array of finite values")
+    largest = float(extent.max())
+    if largest == 0:
+        raise ValueError("Points must not all coincide")
+    scale = (1 << max_bits) / largest
+
+    # Cells along each non-degenerate axis of the finest grid
+    spans = np.minimum(
+        (extent[extent > 0] * scale).astype(np.int64), (1 << max_bits) - 1
+    )
+    keys = _sorted_unique_keys(points, lo, scale, max_bits)
+    bits = np.arange(max_bits, min_bits - 1, -1)
+    counts = np.empty(len(bits), dtype=np.int64)
+    boxes = np.empty(len(bits))
+    for i, level in enumerate(bits):
+        if i:
+            keys = keys >> np.uint64(3)
+            keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+        counts[i] = len(keys)
+        boxes[i] = np.prod(((spans >> (max_bits - level)) + 1).astype(float))
+    bits, counts, boxes = bits[::-1], counts[::-1], boxes[::-1]
+
+    if fit_bits is None:
+        fitted = (bits >= MIN_FIT_BITS) & (counts <= SATURATION_FRACTION * len(points))
+    else:
+        fitted = (bits >= fit_bits[0]) & (bits <= fit_bits[1])
+    dimension, r_squared = math.nan, math.nan
+    if fitted.sum() >= 2:
+        x, y = bits[fitted].astype(float), np.log2(counts[fitted])
+        slope, intercept = np.polyfit(x, y, 1)
+        residual = y - (slope * x + intercept)
+        spread = float(((y - y.mean()) ** 2).sum())
+        dimension = float(slope)
+        r_squared = 1.0 - float((residual**2).sum()) / spread if spread else 1.0
+    fit_range = (
+        (int(bits[fitted][0]), int(bits[fitted][-1])) if fitted.any() else (0, -1)
+    )
+    return BoxCounting(bits, counts, counts / boxes, dimension, r_squared, fit_range)
+
+
+def contraction_ratios(matrices: np.ndarray) -> np.ndarray:
+    """Contraction ratio of each transform.
+
+    The ratio is the geometric mean of the singular values of the linear
+    part, ``|det A| ** (1/d)``, over the attractor's ``d`` dimensions (XY
+    when every transform maps the XY plane to itself). This is exact for
+    similarities and an estimate for anisotropic maps.
+
+    Args:
+        matrices: ``(T, 4, 4)`` transform matrices
+
+    Returns:
+        ``(T,)`` ratios
+    """
+    planar = (
+        np.allclose(matrices[:, 2, :2], 0)
+        and np.allclose(matrices[:, :2, 2], 0)
+        and np.allclose(matrices[:, 2, 3], 0)
+    )
+    d = 2 if planar else 3
+    return np.abs(np.linalg.det(matrices[:, :d, :d])) ** (1.0 / d)
+
+
+def similarity_dimension(ratios: Sequence[float], tolerance: float = 1e-12) -> float:
+    """Solve ``sum(r_i ** D) = 1`` for ``D`` by bisection.
+
+    Args:
+        ratios: Contraction ratios in ``[0, 1)``
+        tolerance: Width of the final bracket
+
+    Returns:
+        Similarity dimension (0 if fewer than two ratios are non-zero)
+
+    Raises:
+        ValueError: If any ratio is not below 1
+
+    Examples:
+        >>> round(similarity_dimension([0.5, 0.5, 0.5]), 6)  # log 3 / log 2
+        1.584963
+    """
+    ratios = np.asarray(ratios, dtype=float)
+    if np.any(ratios >= 1) or np.any(ratios < 0):
+        raise ValueError("Contraction ratios must be in [0, 1)")
+    ratios = ratios[ratios > 0]
+    if len(ratios) < 2:
+        return 0.0
+    low, high = 0.0, 1.0
+    while np.sum(ratios**high) > 1:
+        low, high = high, high * 2
+    while high - low > tolerance:
+        middle = 0.5 * (low + high)
+        if np.sum(ratios**middle) > 1:
+            low = middle
+        else:
+            high = middle
+    return 0.5 * (low + high)
+
+
+def analyze_preset(
+    preset: Mapping[str, Any],
+    n_points: int = ANALYSIS_POINTS,
+    seed: Optional[int] = None,
+    max_bits: int = MAX_GRID_BITS,
+) -> Dict[str, Any]:
+    """Report dimension and coverage analytics for a preset.
+
+    Args:
+        preset: Preset dictionary
+        n_points: Chaos-game points to sample
+        seed: Override the preset's seed
+        max_bits: Finest box-counting level
+
+    Returns:
+        JSON-serialisable report
+    """
+    compiled = compile_preset(preset)
+    points = chaos_game(
+        compiled.matrices,
+        compiled.weights,
+        n_points,
+        seed=compiled.seed if seed is None else seed,
+    )
+    result = box_counting(points, max_bits=max_bits)
+    coverage_level = min(COVERAGE_BITS, max_bits)
+    return {
+        "name": preset.get("name"),
+        "point_count": int(len(points)),
+        "box_dimension": result.dimension,
+        "r_squared": result.r_squared,
+        "fit_bits": list(result.fit_bits),
+        "similarity_dimension": similarity_dimension(
+            contraction_ratios(compiled.matrices)
+        ),
+        "coverage": float(result.coverage[result.bits == coverage_level][0]),
+        "coverage_bits": coverage_level,
+        "counts": {int(b): int(c) for b, c in zip(result.bits, result.counts)},
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point: print analytics for presets."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.utils.analytics",
+        description="Report box-counting and similarity dimensions of presets.",
+    )
+    parser.add_argument("presets", nargs="+", help="Preset names or paths")
+    parser.add_argument("--points", type=int, default=ANALYSIS_POINTS)
+    parser.add_argument("--max-bits", type=int, default=MAX_GRID_BITS)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    rows: List[Dict[str, Any]] = [
+        analyze_preset(
+            load_preset(name), args.points, seed=args.seed, max_bits=args.max_bits
+        )
+        for name in args.presets
+    ]
+    for row in rows:
+        first, last = row["fit_bits"]
+        print(
+            f"{row['name']}: box={row['box_dimension']:.3f} "
+            f"(levels {first}-{last}, r2={row['r_squared']:.4f})  "
+            f"similarity={row['similarity_dimension']:.3f}  "
+            f"coverage@{row['coverage_bits']}={row['coverage']:.3f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
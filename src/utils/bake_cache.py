@@ -0,0 +1,268 @@
+"""Bake-and-reuse cache for IFS_Generator output.
+
+Blender re-evaluates the Repeat Zone on file load, on frame changes and
+for every render layer, even when no input has changed. The node group
+builders end the tree in a Bake node (``BAKE_NODE_NAME``); this module
+points each modifier's bake directory at a cache entry named by a
+fingerprint of everything that determines the output:
+
+- the modifier's input values (iterations, seed, output mode, transforms);
+  object and mesh inputs by name plus their content (transform, element
+  counts and a hash of coordinates and topology), so editing an instanced
+  mesh invalidates entries
+- a signature of the node tree, so editing the group invalidates entries
+- ``BAKE_FORMAT_VERSION``
+
+When the entry already holds a bake, Blender loads it instead of
+evaluating; otherwise the modifier is baked into it once. Identical
+fractals share one entry, across objects and files.
+
+A bake holds one geometry for both the viewport and renders, so it is
+made at render quality: the ``Preview`` inputs are set to their render
+counterparts while baking (and restored afterwards), whichever depsgraph
+the bake operator evaluates in. Code that writes inputs to a baked
+modifier calls ``refresh_bake``, which moves it to the entry of its new
+fingerprint (baking that entry if needed) instead of letting the Bake
+node keep returning the old geometry.
+
+Other data-block inputs (materials, images, collections) are fingerprinted
+by name only; after editing one, re-bake with ``bake_modifier(...,
+force=True)`` (the worker's ``bake`` job takes ``force`` too).
+
+Example (inside Blender):
+    >>> for obj, modifier in ifs_modifiers(bpy.data.objects):
+    ...     bake_modifier(obj, modifier, "//bake_cache")
+"""
+
+import hashlib
+import json
+import shutil
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Tuple, Union
+
+# Bake node appended to IFS_Generator by the node group builders
+BAKE_NODE_NAME = "IFS Bake"
+
+# Bumped when the cache layout or fingerprint contents change
+BAKE_FORMAT_VERSION = 2
+
+# Node group the modifiers use
+NODE_GROUP_NAME = "IFS_Generator"
+
+# Hex digits of the fingerprint used in directory names
+FINGERPRINT_LENGTH = 24
+
+
+def _mesh_signature(mesh: Any) -> str:
+    """Hash of a mesh's element counts, coordinates and face topology."""
+    coordinates = array("f", bytes(12 * len(mesh.vertices)))
+    mesh.vertices.foreach_get("co", coordinates)
+    corners = array("i", bytes(4 * len(mesh.loops)))
+    mesh.loops.foreach_get("vertex_index", corners)
+    digest = hashlib.sha256()
+    for count in (mesh.vertices, mesh.edges, mesh.polygons, mesh.loops):
+        digest.update(len(count).to_bytes(8, "little"))
+    digest.update(coordinates.tobytes())
+    digest.update(corners.tobytes())
+    return digest.hexdigest()[:FINGERPRINT_LENGTH]
+
+
+def _id_signature(value: Any) -> str:
+    """Name of a data-block input plus, for objects and meshes, its content."""
+    parts = [f"<{type(value).__name__} {value.name}>"]
+    matrix = getattr(value, "matrix_world", None)
+    if matrix is not None:
+        parts.append(json.dumps(_plain(matrix)))
+    mesh = getattr(value, "data", value)
+    if hasattr(mesh, "vertices") and hasattr(mesh, "loops"):
+        parts.append(_mesh_signature(mesh))
+    return " ".join(parts)
+
+
+def _plain(value: Any) -> Any:
+    """JSON-compatible copy of an input value (ID property arrays to lists)."""
+    if isinstance(value, (str, bool, int, float)) or value is None:
+        return value
+    if isinstance(value, Mapping):
+        return {str(k): _plain(v) for k, v in value.items()}
+    if hasattr(value, "name") and hasattr(value, "session_uid"):
+        return _id_signature(value)
+    try:
+        return [_plain(v) for v in value]
+    except TypeError:
+        return repr(value)
+
+
+def parameter_fingerprint(values: Mapping[str, Any], tree_signature: str = "") -> str:
+    """Stable hash of input values and node tree.
+
+    Args:
+        values: Modifier input name to value
+        tree_signature: ``node_tree_signature`` of the node group
+
+    Returns:
+        Hex fingerprint, independent of key order
+    """
+    payload = json.dumps(
+        {
+            "version": BAKE_FORMAT_VERSION,
+            "tree": tree_signature,
+            "inputs": _plain(values),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:FINGERPRINT_LENGTH]
+
+
+def node_tree_signature(node_group: Any) -> str:
+    """Hash of a node tree's nodes, links and unlinked input defaults."""
+    nodes = []
+    for node in node_group.nodes:
+        defaults = [
+            (socket.identifier, _plain(getattr(socket, "default_value", None)))
+            for socket in node.inputs
+            if not socket.is_linked
+        ]
+        nodes.append((node.name, node.bl_idname, defaults))
+    links = [
+        (link.from_node.name, link.from_socket.identifier)
+        + (link.to_node.name, link.to_socket.identifier)
+        for link in node_group.links
+    ]
+    payload = json.dumps([sorted(nodes), sorted(links)], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def bake_directory(cache_dir: Union[str, Path], fingerprint: str) -> Path:
+    """Cache entry directory for a fingerprint."""
+    return Path(cache_dir) / fingerprint
+
+
+def is_baked(directory: Union[str, Path]) -> bool:
+    """Whether a cache entry holds a finished bake (Blender bake metadata)."""
+    return any(Path(directory).glob("**/meta/*.json"))
+
+
+def modifier_values(modifier: Any) -> Dict[str, Any]:
+    """Input values stored on a Geometry Nodes modifier, by socket name."""
+    values = {}
+    for item in modifier.node_group.interface.items_tree:
+        if getattr(item, "in_out", None) == "INPUT" and item.identifier in modifier:
+            values[item.name] = _plain(modifier[item.identifier])
+    return values
+
+
+def ifs_modifiers(objects: Iterable[Any]) -> Iterator[Tuple[Any, Any]]:
+    """``(object, modifier)`` for every modifier using IFS_Generator."""
+    for obj in objects:
+        for modifier in obj.modifiers:
+            if (
+                modifier.type == "NODES"
+                and modifier.node_group is not None
+                and modifier.node_group.name == NODE_GROUP_NAME
+            ):
+                yield obj, modifier
+
+
+def modifier_fingerprint(modifier: Any) -> str:
+    """Fingerprint of a modifier's current inputs and node tree."""
+    return parameter_fingerprint(
+        modifier_values(modifier), node_tree_signature(modifier.node_group)
+    )
+
+
+def bake_root(modifier: Any) -> Optional[Path]:
+    """Cache root of a modifier baked by ``bake_modifier`` (``None`` if not)."""
+    directory = getattr(modifier, "bake_directory", "")
+    if not directory or len(Path(directory).name) != FINGERPRINT_LENGTH:
+        return None
+    return Path(directory).parent
+
+
+def _render_quality_inputs(modifier: Any) -> Dict[str, Any]:
+    """Set every ``Preview`` input to its render input; returns the originals."""
+    identifiers = {
+        item.name: item.identifier
+        for item in modifier.node_group.interface.items_tree
+        if getattr(item, "in_out", None) == "INPUT"
+    }
+    originals = {}
+    for name, identifier in identifiers.items():
+        if not name.startswith("Preview "):
+            continue
+        render = identifiers.get(name[len("Preview ") :])
+        if identifier in modifier and render in modifier:
+            originals[identifier] = modifier[identifier]
+            modifier[identifier] = modifier[render]
+    return originals
+
+
+def bake_modifier(
+    obj: Any, modifier: Any, cache_dir: Union[str, Path], force: bool = False
+) -> Dict[str, Any]:
+    """Point a modifier at its cache entry, baking it if the entry is empty.
+
+    Args:
+        obj: Object carrying the modifier
+        modifier: IFS_Generator modifier
+        cache_dir: Cache root (``//`` paths are relative to the .blend file)
+        force: Discard the entry's bake and bake again, for edits the
+            fingerprint does not see (materials, images, collections)
+
+    Returns:
+        Fingerprint, entry directory and whether an existing bake was reused
+
+    Raises:
+        LookupError: If the node group has no ``BAKE_NODE_NAME`` node
+    """
+    import bpy
+
+    node = modifier.node_group.nodes.get(BAKE_NODE_NAME)
+    if node is None:
+        raise LookupError(
+            f"{NODE_GROUP_NAME} has no '{BAKE_NODE_NAME}' node; "
+            "rebuild it with the node group builder"
+        )
+    fingerprint = modifier_fingerprint(modifier)
+    directory = bake_directory(bpy.path.abspath(str(cache_dir)), fingerprint)
+    modifier.bake_directory = str(directory)
+    bake = next(b for b in modifier.bakes if b.node == node)
+    bake.bake_mode = "STILL"
+    bake.use_custom_path = False
+    if force and directory.exists():
+        shutil.rmtree(directory)
+    reused = is_baked(directory)
+    if not reused:
+        directory.mkdir(parents=True, exist_ok=True)
+        originals = _render_quality_inputs(modifier)
+        try:
+            bpy.ops.object.geometry_node_bake_single(
+                session_uid=obj.session_uid,
+                modifier_name=modifier.name,
+                bake_id=bake.bake_id,
+            )
+        finally:
+            for identifier, value in originals.items():
+                modifier[identifier] = value
+    return {"fingerprint": fingerprint, "directory": str(directory), "reused": reused}
+
+
+def refresh_bake(obj: Any, modifier: Any) -> Optional[Dict[str, Any]]:
+    """Keep a baked modifier's output in step with its inputs.
+
+    Call after writing inputs. A modifier whose inputs no longer match its
+    cache entry is moved to the entry of its new fingerprint, which is
+    baked if empty. Entries are shared, so the old one is left in place.
+
+    Returns:
+        ``bake_modifier`` result, or ``None`` if the modifier is not baked
+        or its entry still matches
+    """
+    root = bake_root(modifier)
+    if root is None:
+        return None
+    if Path(modifier.bake_directory).name == modifier_fingerprint(modifier):
+        return None
+    return bake_modifier(obj, modifier, root)
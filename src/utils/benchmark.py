@@ -0,0 +1,514 @@
+"""Evaluation benchmarks for IFS_Generator and the headless engine.
+
+Both backends time the same grid of configurations (transform count,
+iterations, output mode) on the same synthetic presets and produce the
+same ``BenchmarkRecord``, so a Blender run and a headless run (or two runs
+before and after a node graph change) can be compared entry by entry:
+
+- ``headless`` times ``expand_levels``, which mirrors the node group's
+  per-iteration merge, and measures its peak with ``tracemalloc``. It has
+  no instancing, so only ``Output Mode`` 0 (points) is timed.
+- ``blender`` applies each configuration to one object with
+  ``bulk_apply`` (viewport and render inputs set alike), forces a depsgraph
+  evaluation and counts the evaluated points, instances and vertices.
+  Memory is the growth of the process RSS over the first evaluation.
+
+Every record is checked against the viewport frame budget of
+architecture.md §7 (60fps).
+
+Example:
+    Headless::
+
+        python -m src.utils.benchmark --json headless.json
+
+    Inside Blender, comparing with an earlier run::
+
+        blender --background src/geometry_nodes/ifs_generator.blend \\
+            --python-expr "import sys; sys.path.insert(0, '.'); \\
+            from src.utils.benchmark import main; \\
+            main(['--backend', 'blender', '--json', 'blender.json', \\
+                  '--baseline', 'headless.json'])"
+"""
+
+import argparse
+import copy
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from itertools import product
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from src.utils.bake_cache import NODE_GROUP_NAME
+from src.utils.math_helpers import enforce_iteration_limits
+from src.utils.memory_guard import (
+    BLENDER_OUTPUT_MODES,
+    DEFAULT_INSTANCE_VERTICES,
+    blender_bytes_per_point,
+    predict_generation_bytes,
+    process_rss,
+)
+from src.utils.preset_loader import load_preset
+
+# Result file layout version
+BENCHMARK_FORMAT_VERSION = 1
+
+# Seconds per frame for the 60fps viewport target (architecture.md §7)
+FRAME_BUDGET = 1.0 / 60.0
+
+# Default grid
+DEFAULT_ITERATIONS = (4, 6, 8)
+DEFAULT_TRANSFORM_COUNTS = (2, 3, 4)
+DEFAULT_OUTPUT_MODES = (0, 1, 2)
+DEFAULT_REPEATS = 5
+
+BACKENDS = ("headless", "blender")
+
+# Name of the object created for Blender runs
+BENCHMARK_OBJECT_NAME = "IFS Benchmark"
+
+Config = Tuple[int, int, int]
+
+
+@dataclass
+class BenchmarkRecord:
+    """Timing of one configuration on one backend.
+
+    Attributes:
+        backend: ``"headless"`` or ``"blender"``
+        transform_count: Transforms ``T``
+        iterations: Depth
+        output_mode: ``Output Mode`` (0 points, 1 instanced, 2 realized)
+        seconds: Median evaluation time
+        runs: Every timed evaluation, in seconds
+        points: Points in the result
+        instances: Instances in the result
+        vertices: Mesh vertices in the result
+        memory_bytes: Measured memory (tracemalloc peak headless, RSS
+            growth in Blender; ``None`` if unavailable)
+        predicted_bytes: ``memory_guard`` prediction for the configuration
+        downgrade: Memory downgrade applied instead of the requested inputs
+    """
+
+    backend: str
+    transform_count: int
+    iterations: int
+    output_mode: int
+    seconds: float
+    runs: List[float] = field(default_factory=list)
+    points: int = 0
+    instances: int = 0
+    vertices: int = 0
+    memory_bytes: Optional[int] = None
+    predicted_bytes: int = 0
+    downgrade: Optional[str] = None
+
+    @property
+    def config(self) -> Config:
+        """``(transform_count, iterations, output_mode)``."""
+        return (self.transform_count, self.iterations, self.output_mode)
+
+    @property
+    def meets_frame_budget(self) -> bool:
+        """Whether the evaluation fits one 60fps frame."""
+        return self.seconds <= FRAME_BUDGET
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable form, with the frame budget check."""
+        data = asdict(self)
+        data["meets_frame_budget"] = self.meets_frame_budget
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BenchmarkRecord":
+        """Inverse of ``to_dict``."""
+        fields = set(cls.__dataclass_fields__)
+        return cls(**{key: value for key, value in data.items() if key in fields})
+
+
+def benchmark_grid(
+    iterations: Iterable[int] = DEFAULT_ITERATIONS,
+    transform_counts: Iterable[int] = DEFAULT_TRANSFORM_COUNTS,
+    output_modes: Iterable[int] = DEFAULT_OUTPUT_MODES,
+) -> List[Config]:
+    """Configurations to time, in ``(transform_count, iterations, mode)`` order.
+
+    Raises:
+        ValueError: If a transform count, depth or output mode is out of range
+    """
+    configs = []
+    for count, depth, mode in product(transform_counts, iterations, output_modes):
+        enforce_iteration_limits(count, depth)
+        if mode not in BLENDER_OUTPUT_MODES:
+            raise ValueError(f"Unknown output mode {mode}")
+        configs.append((count, depth, mode))
+    return configs
+
+
+def synthetic_preset(
+    transform_count: int, iterations: int, output_mode: int = 0
+) -> Dict[str, Any]:
+    """Preset with ``transform_count`` half-scale copies on a circle.
+
+    Built from the Sierpiński preset so it carries every field a real
+    preset has; both stages use the same depth and output mode, so the
+    viewport and a render evaluate the same geometry.
+    """
+    preset = copy.deepcopy(load_preset("sierpinski"))
+    transforms = []
+    for index in range(transform_count):
+        angle = 2 * math.pi * index / transform_count
+        translation = [0.5 * math.cos(angle), 0.5 * math.sin(angle), 0.0]
+        transforms.append(
+            {
+                "scale": [0.5, 0.5, 0.5],
+                "rotation": [0, 0, 0],
+                "translation": [round(value, 6) for value in translation],
+                "weight": 1.0 / transform_count,
+            }
+        )
+    preset["name"] = f"Benchmark T={transform_count}"
+    preset["transforms"] = transforms
+    preset["iterations"] = iterations
+    preset["performance"] = {
+        "preview_iterations": iterations,
+        "final_iterations": iterations,
+        "preview_output_mode": output_mode,
+        "final_output_mode": output_mode,
+    }
+    return preset
+
+
+def _median_time(run: Callable[[], Any], repeats: int) -> Tuple[float, List[float]]:
+    runs = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs), runs
+
+
+def benchmark_headless(
+    configs: Sequence[Config], repeats: int = DEFAULT_REPEATS
+) -> List[BenchmarkRecord]:
+    """Time the headless engine on the point configurations of a grid.
+
+    Args:
+        configs: ``(transform_count, iterations, output_mode)`` entries;
+            instanced and realized modes are skipped
+        repeats: Timed evaluations per configuration
+
+    Returns:
+        One record per point configuration
+    """
+    from src.utils.ifs_engine import compile_preset, expand_levels
+
+    records = []
+    for count, depth, mode in configs:
+        if mode != 0:
+            continue
+        matrices = compile_preset(synthetic_preset(count, depth)).matrices
+        expand_levels(matrices, depth)  # warm-up
+        seconds, runs = _median_time(lambda: expand_levels(matrices, depth), repeats)
+        tracemalloc.start()
+        try:
+            points, _ = expand_levels(matrices, depth)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        records.append(
+            BenchmarkRecord(
+                backend="headless",
+                transform_count=count,
+                iterations=depth,
+                output_mode=mode,
+                seconds=seconds,
+                runs=runs,
+                points=len(points),
+                memory_bytes=peak,
+                predicted_bytes=predict_generation_bytes(count, depth),
+            )
+        )
+    return records
+
+
+def _evaluated_counts(evaluated: Any) -> Tuple[int, int, int]:
+    """``(points, instances, vertices)`` of an evaluated object."""
+    geometry_for = getattr(evaluated, "evaluated_geometry", None)
+    if geometry_for is None:
+        # Before Blender 4.3 only the realized mesh is reachable
+        mesh = evaluated.to_mesh()
+        try:
+            return 0, 0, len(mesh.vertices) if mesh is not None else 0
+        finally:
+            evaluated.to_mesh_clear()
+    geometry = geometry_for()
+    pointcloud = geometry.pointcloud
+    mesh = geometry.mesh
+    instances = geometry.instances_pointcloud()
+    return (
+        len(pointcloud.points) if pointcloud is not None else 0,
+        len(instances.points) if instances is not None else 0,
+        len(mesh.vertices) if mesh is not None else 0,
+    )
+
+
+def _benchmark_object(bpy: Any) -> Any:
+    obj = bpy.data.objects.get(BENCHMARK_OBJECT_NAME)
+    if obj is None:
+        mesh = bpy.data.meshes.new(BENCHMARK_OBJECT_NAME)
+        obj = bpy.data.objects.new(BENCHMARK_OBJECT_NAME, mesh)
+        bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def load_node_group() -> Any:
+    """The ``IFS_Generator`` group of the open file, built if missing."""
+    import bpy
+
+    group = bpy.data.node_groups.get(NODE_GROUP_NAME)
+    if group is None:
+        from src.geometry_nodes.create_ifs_generator import (
+            create_ifs_generator_node_group,
+        )
+
+        group = create_ifs_generator_node_group()
+    return group
+
+
+def benchmark_blender(
+    configs: Sequence[Config],
+    repeats: int = DEFAULT_REPEATS,
+    instance_vertices: int = DEFAULT_INSTANCE_VERTICES,
+    memory_limit: Optional[int] = None,
+) -> List[BenchmarkRecord]:
+    """Time depsgraph evaluations of IFS_Generator for each configuration.
+
+    Args:
+        configs: ``(transform_count, iterations, output_mode)`` entries
+        repeats: Timed evaluations per configuration
+        instance_vertices: Vertices of the instance mesh, for predictions
+        memory_limit: Per-stage limit passed to ``bulk_apply``; a
+            configuration that does not fit is recorded with its downgrade
+
+    Returns:
+        One record per configuration
+    """
+    import bpy
+
+    from src.utils.bulk_apply import bulk_apply
+
+    group = load_node_group()
+    obj = _benchmark_object(bpy)
+    records = []
+    for count, depth, mode in configs:
+        applied = bulk_apply(
+            [(obj, synthetic_preset(count, depth, mode))],
+            node_group_for=lambda shape: group,
+            instance_vertices=instance_vertices,
+            memory_limit=memory_limit,
+            undo_message=None,
+            evaluate=False,
+        )
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        before = process_rss()
+        depsgraph.update()
+        after = process_rss()
+
+        def evaluate() -> None:
+            obj.update_tag()
+            depsgraph.update()
+
+        seconds, runs = _median_time(evaluate, repeats)
+        points, instances, vertices = _evaluated_counts(obj.evaluated_get(depsgraph))
+        records.append(
+            BenchmarkRecord(
+                backend="blender",
+                transform_count=count,
+                iterations=depth,
+                output_mode=mode,
+                seconds=seconds,
+                runs=runs,
+                points=points,
+                instances=instances,
+                vertices=vertices,
+                memory_bytes=(
+                    max(0, after - before) if None not in (before, after) else None
+                ),
+                predicted_bytes=predict_generation_bytes(
+                    count,
+                    depth,
+                    bytes_per_point=blender_bytes_per_point(mode, instance_vertices),
+                ),
+                downgrade=applied.downgrades.get(obj.name),
+            )
+        )
+    return records
+
+
+def _environment(backend: str) -> Dict[str, Any]:
+    environment = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+    try:
+        import numpy
+
+        environment["numpy"] = numpy.__version__
+    except ImportError:
+        pass
+    if backend == "blender":
+        import bpy
+
+        group = bpy.data.node_groups.get(NODE_GROUP_NAME)
+        environment["blender"] = bpy.app.version_string
+        if group is not None:
+            environment["node_group_inputs"] = [
+                item.name
+                for item in group.interface.items_tree
+                if getattr(item, "in_out", None) == "INPUT"
+            ]
+    return environment
+
+
+def write_results(
+    records: Sequence[BenchmarkRecord],
+    path: Union[str, Path],
+    backend: str = "headless",
+) -> Dict[str, Any]:
+    """Write records and the environment they were measured in as JSON.
+
+    Returns:
+        The written document
+    """
+    document = {
+        "version": BENCHMARK_FORMAT_VERSION,
+        "backend": backend,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "frame_budget": FRAME_BUDGET,
+        "environment": _environment(backend),
+        "records": [record.to_dict() for record in records],
+    }
+    Path(path).write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+    return document
+
+
+def load_results(path: Union[str, Path]) -> List[BenchmarkRecord]:
+    """Records of a file written by ``write_results``.
+
+    Raises:
+        ValueError: If the file has a different layout version
+    """
+    document = json.loads(Path(path).read_text(encoding="utf-8"))
+    if document.get("version") != BENCHMARK_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported benchmark format {document.get('version')!r} in {path}"
+        )
+    return [BenchmarkRecord.from_dict(data) for data in document["records"]]
+
+
+def compare_results(
+    baseline: Sequence[BenchmarkRecord], current: Sequence[BenchmarkRecord]
+) -> List[Dict[str, Any]]:
+    """Match records by configuration and compare their timings.
+
+    Args:
+        baseline: Earlier run (any backend)
+        current: Run to compare
+
+    Returns:
+        One entry per configuration present in both, with ``ratio``
+        (current / baseline seconds; below 1 is faster), both budget
+        checks and whether the point counts agree
+    """
+    earlier = {record.config: record for record in baseline}
+    comparison = []
+    for record in current:
+        before = earlier.get(record.config)
+        if before is None:
+            continue
+        comparison.append(
+            {
+                "transform_count": record.transform_count,
+                "iterations": record.iterations,
+                "output_mode": record.output_mode,
+                "baseline_seconds": before.seconds,
+                "seconds": record.seconds,
+                "ratio": record.seconds / before.seconds if before.seconds else None,
+                "baseline_meets_frame_budget": before.meets_frame_budget,
+                "meets_frame_budget": record.meets_frame_budget,
+                "same_points": before.points == record.points,
+            }
+        )
+    return comparison
+
+
+def format_records(records: Sequence[BenchmarkRecord]) -> str:
+    """Table of records for the console."""
+    lines = [f"{'T':>2} {'iter':>4} {'mode':>10} {'points':>9} {'ms':>9}  60fps"]
+    for record in records:
+        count = record.points or record.instances or record.vertices
+        lines.append(
+            f"{record.transform_count:>2} {record.iterations:>4} "
+            f"{BLENDER_OUTPUT_MODES[record.output_mode]:>10} {count:>9} "
+            f"{record.seconds * 1000:>9.2f}  "
+            f"{'yes' if record.meets_frame_budget else 'no'}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run a benchmark from the command line (or Blender's ``--python-expr``)."""
+    if argv is None:
+        # Blender passes its own arguments before ``--``
+        argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else None
+    parser = argparse.ArgumentParser(
+        prog="python -m src.utils.benchmark",
+        description="Time IFS evaluation over a grid of configurations.",
+    )
+    parser.add_argument("--backend", choices=BACKENDS, default="headless")
+    parser.add_argument(
+        "--iterations", type=int, nargs="+", default=list(DEFAULT_ITERATIONS)
+    )
+    parser.add_argument(
+        "--transforms", type=int, nargs="+", default=list(DEFAULT_TRANSFORM_COUNTS)
+    )
+    parser.add_argument(
+        "--output-modes", type=int, nargs="+", default=list(DEFAULT_OUTPUT_MODES)
+    )
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--json", type=Path, help="Write the results to this file")
+    parser.add_argument("--baseline", type=Path, help="Compare with an earlier file")
+    args = parser.parse_args(argv)
+
+    try:
+        configs = benchmark_grid(args.iterations, args.transforms, args.output_modes)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.backend == "blender":
+        records = benchmark_blender(configs, repeats=args.repeats)
+    else:
+        records = benchmark_headless(configs, repeats=args.repeats)
+    print(format_records(records))
+    if args.json:
+        write_results(records, args.json, backend=args.backend)
+        print(f"Wrote {len(records)} records to {args.json}")
+    if args.baseline:
+        for entry in compare_results(load_results(args.baseline), records):
+            ratio = "n/a" if entry["ratio"] is None else f"x{entry['ratio']:.2f}"
+            print(
+                f"T={entry['transform_count']} iter={entry['iterations']} "
+                f"mode={entry['output_mode']}: {ratio}"
+                + ("" if entry["same_points"] else " (point counts differ)")
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
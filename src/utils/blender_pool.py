@@ -0,0 +1,505 @@
+"""Warm pool of long-lived background Blender workers.
+
+A cold ``blender --background --python ...`` invocation pays for Blender
+start-up and ``.blend`` loading on every job, which dominates small jobs.
+``WorkerPool`` instead keeps ``size`` worker processes running with
+``ifs_generator.blend`` already loaded and hands them jobs (apply preset,
+render, export) over their stdin/stdout pipes.
+
+Protocol (one JSON object per line):
+    - Request: ``{"id": 3, "op": "render", "params": {...}}``
+    - Response: ``{"id": 3, "ok": true, "result": {...}}`` or
+      ``{"id": 3, "ok": false, "error": "..."}``
+    - On start-up the worker announces ``{"ready": true, "pid": ...}``
+
+Worker output lines carry ``RESPONSE_PREFIX`` so that Blender's own log
+output on stdout is ignored. ``serve_worker`` implements the worker side
+for any handler table: ``src/geometry_nodes/blender_worker.py`` runs it
+inside Blender, and ``src/utils/fake_blender_worker.py`` runs it without
+Blender for tests and development.
+
+Pool behaviour:
+    - Workers are recycled after ``max_jobs_per_worker`` jobs to bound
+      memory growth inside Blender.
+    - Idle workers are pinged before reuse (health check) and replaced if
+      they fail to answer; dead workers are replaced automatically.
+    - A job whose worker crashes is retried on a fresh worker up to
+      ``retries`` times. A job that exceeds its timeout kills its worker.
+
+Example:
+    >>> with WorkerPool(blender_command(), size=2) as pool:
+    ...     pool.run("apply_preset", {"preset": "sierpinski"})
+    ...     pool.run("render", {"filepath": "/tmp/sierpinski.png"})
+"""
+
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+# Marks protocol lines in worker output
+RESPONSE_PREFIX = "@@ifs-worker "
+
+GEOMETRY_NODES_DIR = Path(__file__).parent.parent / "geometry_nodes"
+DEFAULT_BLEND_PATH = GEOMETRY_NODES_DIR / "ifs_generator.blend"
+WORKER_SCRIPT = GEOMETRY_NODES_DIR / "blender_worker.py"
+
+# Jobs a worker runs before it is replaced
+DEFAULT_MAX_JOBS_PER_WORKER = 50
+
+# Seconds a job may run before its worker is killed
+DEFAULT_JOB_TIMEOUT = 600.0
+
+# Seconds a worker may take to start and load the .blend file
+DEFAULT_STARTUP_TIMEOUT = 120.0
+
+# Idle seconds after which a worker is pinged before reuse
+DEFAULT_HEALTH_CHECK_INTERVAL = 30.0
+
+# Seconds a health-check ping may take
+PING_TIMEOUT = 10.0
+
+Handler = Callable[[Dict[str, Any]], Any]
+
+
+class WorkerError(RuntimeError):
+    """Raised when a job fails inside a worker."""
+
+
+class WorkerCrashed(WorkerError):
+    """Raised when a worker exits or stops responding during a job."""
+
+
+def blender_command(
+    blender: str = "blender",
+    blend_path: Optional[Path] = None,
+    worker_script: Optional[Path] = None,
+) -> List[str]:
+    """Build the command line that starts one Blender worker.
+
+    Args:
+        blender: Blender executable
+        blend_path: ``.blend`` file to keep loaded (defaults to
+            ``ifs_generator.blend``)
+        worker_script: Worker script (defaults to ``blender_worker.py``)
+
+    Returns:
+        Command suitable for ``WorkerPool``
+    """
+    return [
+        blender,
+        "--background",
+        str(blend_path or DEFAULT_BLEND_PATH),
+        "--python",
+        str(worker_script or WORKER_SCRIPT),
+    ]
+
+
+def _emit(stream: IO[str], message: Mapping[str, Any]) -> None:
+    stream.write(RESPONSE_PREFIX + json.dumps(message) + "\n")
+    stream.flush()
+
+
+def serve_worker(
+    handlers: Mapping[str, Handler],
+    stdin: Optional[IO[str]] = None,
+    stdout: Optional[IO[str]] = None,
+) -> int:
+    """Run the worker side of the protocol until shutdown or EOF.
+
+    ``ping`` and ``shutdown`` are built in; every other op is looked up in
+    ``handlers``. Handler exceptions are reported to the pool as job errors
+    and the worker keeps serving.
+
+    Args:
+        handlers: Mapping of op name to handler taking the params dict
+        stdin: Request stream (defaults to ``sys.stdin``)
+        stdout: Response stream (defaults to ``sys.stdout``)
+
+    Returns:
+        Number of jobs served
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    jobs = 0
+    _emit(stdout, {"ready": True, "pid": os.getpid()})
+    for line in stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        request_id = request.get("id")
+        op = request.get("op")
+        if op == "shutdown":
+            _emit(stdout, {"id": request_id, "ok": True, "result": {"jobs": jobs}})
+            break
+        if op == "ping":
+            result: Any = {"pid": os.getpid(), "jobs": jobs}
+            _emit(stdout, {"id": request_id, "ok": True, "result": result})
+            continue
+        jobs += 1
+        handler = handlers.get(op)
+        if handler is None:
+            _emit(stdout, {"id": request_id, "ok": False, "error": f"Unknown op: {op}"})
+            continue
+        try:
+            result = handler(request.get("params") or {})
+        except Exception as e:  # noqa: BLE001 - report and keep serving
+            error = f"{type(e).__name__}: {e}"
+            _emit(stdout, {"id": request_id, "ok": False, "error": error})
+        else:
+            _emit(stdout, {"id": request_id, "ok": True, "result": result})
+    return jobs
+
+
+class BlenderWorker:
+    """One worker process and its request pipe.
+
+    Args:
+        command: Command line starting the worker
+        cwd: Working directory for the process
+        env: Extra environment variables
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        cwd: Optional[str] = None,
+        env: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self.command = list(command)
+        self.cwd = cwd
+        self.env = dict(env) if env else None
+        self.pid: Optional[int] = None
+        self.jobs_done = 0
+        self.last_used = time.monotonic()
+        self._process: Optional["subprocess.Popen[str]"] = None
+        self._messages: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._next_id = 0
+
+    @property
+    def alive(self) -> bool:
+        """Whether the worker process is running."""
+        return self._process is not None and self._process.poll() is None
+
+    def start(self, timeout: float = DEFAULT_STARTUP_TIMEOUT) -> None:
+        """Start the process and wait for its ready announcement.
+
+        Raises:
+            WorkerCrashed: If the worker exits or does not announce itself
+                within ``timeout`` seconds
+        """
+        env = {**os.environ, **self.env} if self.env else None
+        self._process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            cwd=self.cwd,
+            env=env,
+        )
+        threading.Thread(
+            target=self._read, args=(self._process.stdout,), daemon=True
+        ).start()
+        try:
+            message = self._receive(timeout)
+        except TimeoutError as e:
+            raise WorkerCrashed(f"Worker did not start: {e}") from e
+        if not message.get("ready"):
+            self.kill()
+            raise WorkerCrashed(f"Unexpected start-up message: {message}")
+        self.pid = message.get("pid")
+        self.last_used = time.monotonic()
+
+    def _read(self, stream: IO[str]) -> None:
+        for line in stream:
+            if line.startswith(RESPONSE_PREFIX):
+                try:
+                    self._messages.put(json.loads(line[len(RESPONSE_PREFIX) :]))
+                except ValueError:
+                    continue
+        self._messages.put(None)  # EOF: the process exited
+
+    def _receive(self, timeout: float) -> Dict[str, Any]:
+        try:
+            message = self._messages.get(timeout=timeout)
+        except queue.Empty:
+            self.kill()
+            raise TimeoutError(f"Worker did not respond within {timeout}s") from None
+        if message is None:
+            self.kill()
+            raise WorkerCrashed("Worker process exited")
+        return message
+
+    def request(
+        self,
+        op: str,
+        params: Optional[Mapping[str, Any]] = None,
+        timeout: float = DEFAULT_JOB_TIMEOUT,
+    ) -> Any:
+        """Send one request and wait for its response.
+
+        Args:
+            op: Operation name
+            params: Operation parameters
+            timeout: Seconds to wait; the worker is killed on expiry
+
+        Returns:
+            The handler's result
+
+        Raises:
+            WorkerError: If the job fails inside the worker
+            WorkerCrashed: If the worker exits during the job
+            TimeoutError: If the job exceeds ``timeout``
+        """
+        if self._process is None or self._process.stdin is None:
+            raise WorkerCrashed("Worker is not running")
+        self._next_id += 1
+        request_id = self._next_id
+        try:
+            self._process.stdin.write(
+                json.dumps({"id": request_id, "op": op, "params": dict(params or {})})
+                + "\n"
+            )
+            self._process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            self.kill()
+            raise WorkerCrashed(f"Worker pipe closed: {e}") from e
+        deadline = time.monotonic() + timeout
+        while True:
+            message = self._receive(max(0.0, deadline - time.monotonic()))
+            if message.get("id") == request_id:
+                break
+        self.last_used = time.monotonic()
+        if op not in ("ping", "shutdown"):
+            self.jobs_done += 1
+        if not message.get("ok"):
+            raise WorkerError(message.get("error", "Unknown worker error"))
+        return message.get("result")
+
+    def ping(self, timeout: float = PING_TIMEOUT) -> bool:
+        """Health check: whether the worker answers a ping in time."""
+        try:
+            self.request("ping", timeout=timeout)
+        except (WorkerError, TimeoutError):
+            return False
+        return True
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Ask the worker to exit, killing it if it does not."""
+        if self.alive:
+            try:
+                self.request("shutdown", timeout=timeout)
+                assert self._process is not None
+                self._process.wait(timeout)
+            except (WorkerError, TimeoutError, subprocess.TimeoutExpired):
+                pass
+        self.kill()
+
+    def kill(self) -> None:
+        """Terminate the process immediately."""
+        if self._process is None:
+            return
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+        for stream in (self._process.stdin, self._process.stdout):
+            if stream is not None:
+                stream.close()
+
+
+class _Job:
+    def __init__(
+        self, op: str, params: Dict[str, Any], timeout: float, future: "Future[Any]"
+    ) -> None:
+        self.op = op
+        self.params = params
+        self.timeout = timeout
+        self.future = future
+
+
+class WorkerPool:
+    """Schedule jobs onto a fixed number of warm worker processes.
+
+    Args:
+        command: Command starting one worker (see ``blender_command``)
+        size: Number of worker processes
+        max_jobs_per_worker: Jobs before a worker is recycled
+        job_timeout: Default seconds per job
+        startup_timeout: Seconds a worker may take to become ready
+        health_check_interval: Idle seconds before a worker is pinged
+        retries: Extra attempts for a job whose worker crashed
+        cwd: Working directory for worker processes
+        env: Extra environment variables for worker processes
+        prewarm: Start all workers immediately rather than on first use
+    """
+
+    def __init__(
+        self,
+        command: Sequence[str],
+        size: int = 2,
+        max_jobs_per_worker: int = DEFAULT_MAX_JOBS_PER_WORKER,
+        job_timeout: float = DEFAULT_JOB_TIMEOUT,
+        startup_timeout: float = DEFAULT_STARTUP_TIMEOUT,
+        health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+        retries: int = 1,
+        cwd: Optional[str] = None,
+        env: Optional[Mapping[str, str]] = None,
+        prewarm: bool = True,
+    ) -> None:
+        if size < 1:
+            raise ValueError(f"Pool size must be at least 1 (got {size})")
+        self.command = list(command)
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.job_timeout = job_timeout
+        self.startup_timeout = startup_timeout
+        self.health_check_interval = health_check_interval
+        self.retries = retries
+        self.cwd = cwd
+        self.env = env
+        self.stats = {"started": 0, "recycled": 0, "replaced": 0, "completed": 0}
+        self._stats_lock = threading.Lock()
+        self._jobs: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._workers: List[Optional[BlenderWorker]] = [None] * size
+        self._closed = False
+        self._threads = []
+        for slot in range(size):
+            thread = threading.Thread(
+                target=self._dispatch, args=(slot, prewarm), daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _count(self, stat: str) -> None:
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def _start_worker(self, slot: int) -> BlenderWorker:
+        worker = BlenderWorker(self.command, cwd=self.cwd, env=self.env)
+        worker.start(self.startup_timeout)
+        self._workers[slot] = worker
+        self._count("started")
+        return worker
+
+    def _ready_worker(self, slot: int) -> BlenderWorker:
+        """Return a healthy worker for ``slot``, replacing it if needed."""
+        worker = self._workers[slot]
+        if worker is not None and worker.alive:
+            idle = time.monotonic() - worker.last_used
+            if idle < self.health_check_interval or worker.ping():
+                return worker
+        if worker is not None:
+            worker.kill()
+            self._count("replaced")
+        return self._start_worker(slot)
+
+    def _dispatch(self, slot: int, prewarm: bool) -> None:
+        if prewarm:
+            try:
+                self._start_worker(slot)
+            except (WorkerError, TimeoutError, OSError):
+                pass  # retried when the first job arrives
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            self._run_job(slot, job)
+        worker = self._workers[slot]
+        if worker is not None:
+            worker.close()
+
+    def _run_job(self, slot: int, job: _Job) -> None:
+        for attempt in range(self.retries + 1):
+            try:
+                worker = self._ready_worker(slot)
+                result = worker.request(job.op, job.params, job.timeout)
+            except WorkerCrashed as e:
+                if attempt == self.retries:
+                    job.future.set_exception(e)
+                continue
+            except Exception as e:  # noqa: BLE001 - resolve the job, keep the slot
+                job.future.set_exception(e)
+            else:
+                self._count("completed")
+                job.future.set_result(result)
+            break
+        worker = self._workers[slot]
+        if worker is not None and worker.jobs_done >= self.max_jobs_per_worker:
+            worker.close()
+            self._workers[slot] = None
+            self._count("recycled")
+            try:
+                self._start_worker(slot)
+            except (WorkerError, TimeoutError, OSError):
+                pass  # retried when the next job arrives
+
+    def submit(
+        self,
+        op: str,
+        params: Optional[Mapping[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> "Future[Any]":
+        """Queue a job for the next free worker.
+
+        Args:
+            op: Operation name (e.g. ``"apply_preset"``, ``"render"``)
+            params: Operation parameters
+            timeout: Seconds the job may run (defaults to ``job_timeout``)
+
+        Returns:
+            Future resolving to the job's result
+
+        Raises:
+            RuntimeError: If the pool is closed
+            TypeError: If ``params`` cannot be encoded as JSON
+        """
+        if self._closed:
+            raise RuntimeError("Worker pool is closed")
+        job_params = dict(params or {})
+        try:
+            json.dumps(job_params)
+        except (TypeError, ValueError) as e:
+            raise TypeError(f"Job parameters must be JSON-serialisable: {e}") from e
+        future: "Future[Any]" = Future()
+        self._jobs.put(_Job(op, job_params, timeout or self.job_timeout, future))
+        return future
+
+    def run(
+        self,
+        op: str,
+        params: Optional[Mapping[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Run a job and wait for its result (see ``submit``)."""
+        return self.submit(op, params, timeout).result()
+
+    @property
+    def pids(self) -> List[Optional[int]]:
+        """Process IDs of the current workers (``None`` for empty slots)."""
+        return [w.pid if w is not None and w.alive else None for w in self._workers]
+
+    def close(self) -> None:
+        """Finish queued jobs, then shut every worker down."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
@@ -0,0 +1,212 @@
+"""Apply presets to many objects in one pass.
+
+Setting up a scene of hundreds of fractal objects (a forest of fern
+variants) one ``apply_preset`` call at a time repeats the same work for
+every object: walking the node group interface to map input names to
+identifiers, computing the preset's inputs and memory plan, and
+triggering an evaluation. ``bulk_apply`` does each of those once:
+
+- inputs and memory plans are computed once per distinct preset;
+- node groups are resolved once per preset shape (transform count) and
+  their input identifiers read once per group, so objects of the same
+  shape share one group;
+- per object only the modifier lookup (or creation), one ID property
+  write per input and one ``update_tag`` touch ``bpy``;
+- the whole batch is one undo step and one depsgraph update.
+
+Everything is checked (unknown presets, missing inputs, memory limits)
+before the first object is modified.
+
+Example (inside Blender):
+    >>> bulk_apply([(bpy.data.objects[f"Fern {i}"], fern) for i in range(500)])
+"""
+
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from src.utils.bake_cache import NODE_GROUP_NAME, refresh_bake
+from src.utils.memory_guard import DEFAULT_INSTANCE_VERTICES, plan_modifier_inputs
+from src.utils.parameter_injector import OPTIONAL_INPUT_PREFIXES, preset_inputs
+
+# Name given to modifiers added by ``bulk_apply``
+MODIFIER_NAME = "IFS_Generator"
+
+# ``Output Mode`` socket default (points), used when nothing else sets it
+DEFAULT_OUTPUT_MODE = 0
+
+# Undo step pushed after a bulk application
+DEFAULT_UNDO_MESSAGE = "Apply IFS presets"
+
+NodeGroupResolver = Callable[[int], Any]
+
+
+@dataclass
+class BulkApplyResult:
+    """Summary of a ``bulk_apply`` call.
+
+    Attributes:
+        objects: Objects updated
+        modifiers_added: Modifiers created (the rest were reused)
+        node_groups: Transform count to the node group name used
+        distinct_presets: Presets whose inputs were computed
+        writes: Input values written
+        downgrades: Object name to the memory downgrade applied
+        rebaked: Baked modifiers moved to the cache entry of their new inputs
+        elapsed: Wall-clock seconds
+    """
+
+    objects: int = 0
+    modifiers_added: int = 0
+    node_groups: Dict[int, str] = field(default_factory=dict)
+    distinct_presets: int = 0
+    writes: int = 0
+    downgrades: Dict[str, str] = field(default_factory=dict)
+    rebaked: int = 0
+    elapsed: float = 0.0
+
+
+def preset_shape(preset: Mapping[str, Any]) -> int:
+    """Shape of a preset as seen by the node group: its transform count."""
+    return len(preset["transforms"])
+
+
+def input_identifiers(node_group: Any) -> Dict[str, str]:
+    """Modifier input name to ID property identifier of a node group."""
+    return {
+        item.name: item.identifier
+        for item in node_group.interface.items_tree
+        if getattr(item, "in_out", None) == "INPUT"
+    }
+
+
+def _default_node_group(transform_count: int) -> Any:
+    """The scene's ``IFS_Generator`` group, shared by every shape."""
+    import bpy
+
+    return bpy.data.node_groups[NODE_GROUP_NAME]
+
+
+def _ifs_modifier(obj: Any, names: Set[str]) -> Optional[Any]:
+    """First Geometry Nodes modifier of an object using a group in ``names``."""
+    for modifier in obj.modifiers:
+        if (
+            modifier.type == "NODES"
+            and modifier.node_group is not None
+            and modifier.node_group.name in names
+        ):
+            return modifier
+    return None
+
+
+def _finish_in_blender(
+    objects: List[Any], undo_message: Optional[str], evaluate: bool
+) -> None:
+    """Evaluate the depsgraph once and push a single undo step."""
+    try:
+        import bpy
+    except ImportError:
+        return
+    if objects and evaluate:
+        bpy.context.view_layer.update()
+    if undo_message and bpy.ops.ed.undo_push.poll():
+        bpy.ops.ed.undo_push(message=undo_message)
+
+
+def bulk_apply(
+    items: Iterable[Tuple[Any, Mapping[str, Any]]],
+    node_group_for: Optional[NodeGroupResolver] = None,
+    output_mode: Optional[int] = None,
+    instance_vertices: int = DEFAULT_INSTANCE_VERTICES,
+    memory_limit: Optional[int] = None,
+    undo_message: Optional[str] = DEFAULT_UNDO_MESSAGE,
+    evaluate: bool = True,
+) -> BulkApplyResult:
+    """Apply a preset to each object, adding or reusing IFS modifiers.
+
+    Args:
+        items: ``(object, preset)`` pairs; presets should be validated
+        node_group_for: Node group for a transform count (default: the
+            ``IFS_Generator`` group for every count)
+        output_mode: Render ``Output Mode`` for presets without
+            ``performance.final_output_mode`` (default: points)
+        instance_vertices: Vertices of the instance mesh, for memory plans
+        memory_limit: Per-object evaluation limit in bytes (default:
+            ``default_limit()``)
+        undo_message: Name of the undo step (``None`` to push none)
+        evaluate: Update the view layer once at the end; otherwise the
+            objects are only tagged and evaluate on the next redraw
+
+    Returns:
+        Counts of objects, modifiers, presets and writes
+
+    Raises:
+        KeyError: If a node group lacks a required input
+        MemoryLimitExceeded: If a preset does not fit even as bare points
+    """
+    start = time.perf_counter()
+    resolve = node_group_for or _default_node_group
+    result = BulkApplyResult()
+    groups: Dict[int, Tuple[Any, Dict[str, str]]] = {}
+    inputs: Dict[str, Tuple[List[Tuple[str, Any]], Optional[str]]] = {}
+    # Shared preset dicts are serialised once; holding the dict keeps its id
+    keys: Dict[int, Tuple[Mapping[str, Any], str]] = {}
+
+    # Plan everything before touching the scene
+    plan: List[Tuple[Any, Any, List[Tuple[str, Any]], Optional[str]]] = []
+    for obj, preset in items:
+        if id(preset) not in keys:
+            keys[id(preset)] = (preset, json.dumps(preset, sort_keys=True))
+        key = keys[id(preset)][1]
+        shape = preset_shape(preset)
+        if shape not in groups:
+            group = resolve(shape)
+            groups[shape] = (group, input_identifiers(group))
+            result.node_groups[shape] = group.name
+        group, identifiers = groups[shape]
+        if key not in inputs:
+            values = preset_inputs(preset)
+            mode = values.get("Output Mode", output_mode)
+            stages = plan_modifier_inputs(
+                values,
+                shape,
+                DEFAULT_OUTPUT_MODE if mode is None else mode,
+                instance_vertices=instance_vertices,
+                limit_bytes=memory_limit,
+            )
+            writes = []
+            for name, value in values.items():
+                if name in identifiers:
+                    writes.append((identifiers[name], value))
+                elif not name.startswith(OPTIONAL_INPUT_PREFIXES):
+                    raise KeyError(f"{group.name} has no input named '{name}'")
+            inputs[key] = (writes, stages["final"].downgrade)
+        plan.append((obj, group, *inputs[key]))
+    result.distinct_presets = len(inputs)
+
+    names = set(result.node_groups.values())
+    touched = []
+    for obj, group, writes, downgrade in plan:
+        modifier = _ifs_modifier(obj, names)
+        if modifier is None:
+            modifier = obj.modifiers.new(MODIFIER_NAME, "NODES")
+            result.modifiers_added += 1
+        if modifier.node_group is None or modifier.node_group.name != group.name:
+            modifier.node_group = group
+        for identifier, value in writes:
+            modifier[identifier] = value
+        # ID property writes do not tag the object on their own
+        obj.update_tag()
+        # A baked modifier would otherwise keep returning its old geometry
+        if refresh_bake(obj, modifier) is not None:
+            result.rebaked += 1
+        touched.append(obj)
+        result.writes += len(writes)
+        if downgrade:
+            result.downgrades[obj.name] = downgrade
+    result.objects = len(touched)
+
+    _finish_in_blender(touched, undo_message, evaluate)
+    result.elapsed = time.perf_counter() - start
+    return result
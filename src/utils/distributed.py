@@ -0,0 +1,406 @@
+"""Distributed exhaustive generation over a local TCP worker protocol.
+
+The ``T^n`` expansion is a tree: the subtree below an address prefix
+``(a1, ..., ad)`` is the depth ``n - d`` expansion transformed by the
+prefix's composed matrix. The coordinator splits the tree into ``T^d``
+shards by prefix, sends shard jobs to worker processes over TCP, and
+writes every returned chunk straight into that shard's slice of the output,
+so results are in address order no matter which worker answers first.
+Shards whose worker fails or disconnects are retried on another worker.
+
+Wire format (both directions): a frame is ``>II`` (header length, payload
+length), a JSON header, then a binary payload. Workers stream each shard
+as zlib-compressed point chunks followed by a ``done`` frame.
+
+Usage:
+    python -m src.utils.distributed worker --port 9100
+    python -m src.utils.distributed generate sierpinski \\
+        --workers 127.0.0.1:9100,127.0.0.1:9101 --output points.npy
+"""
+
+import argparse
+import json
+import queue
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.ifs_engine import compile_preset, compose_table, iter_exhaustive_chunks
+from src.utils.math_helpers import enforce_iteration_limits
+from src.utils.preset_loader import load_preset
+
+Address = Tuple[str, int]
+
+_FRAME = struct.Struct(">II")
+
+# Points per streamed chunk
+DEFAULT_CHUNK_POINTS = 1 << 16
+
+# Shards per worker aimed for when choosing the prefix depth
+SHARDS_PER_WORKER = 4
+
+# Seconds a coordinator waits on a silent worker
+DEFAULT_SOCKET_TIMEOUT = 60.0
+
+
+class DistributedError(RuntimeError):
+    """Raised when shards cannot be completed by any worker."""
+
+
+def send_frame(
+    sock: socket.socket, header: Dict[str, Any], payload: bytes = b""
+) -> None:
+    """Send one frame (JSON header plus binary payload)."""
+    data = json.dumps(header).encode("utf-8")
+    sock.sendall(_FRAME.pack(len(data), len(payload)) + data + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            raise ConnectionError("Connection closed mid-frame")
+        buffer += chunk
+    return bytes(buffer)
+
+
+def recv_frame(sock: socket.socket) -> Tuple[Dict[str, Any], bytes]:
+    """Receive one frame.
+
+    Returns:
+        ``(header, payload)``
+
+    Raises:
+        ConnectionError: If the connection closes before a full frame
+    """
+    header_size, payload_size = _FRAME.unpack(_recv_exact(sock, _FRAME.size))
+    header = json.loads(_recv_exact(sock, header_size))
+    return header, _recv_exact(sock, payload_size)
+
+
+def choose_prefix_depth(transform_count: int, iterations: int, workers: int) -> int:
+    """Shallowest prefix depth giving ``SHARDS_PER_WORKER`` shards per worker.
+
+    Args:
+        transform_count: Transforms in the set
+        iterations: Total expansion depth
+        workers: Number of workers
+
+    Returns:
+        Prefix depth in ``[0, iterations]``
+    """
+    depth = 0
+    target = SHARDS_PER_WORKER * workers
+    while depth < iterations and transform_count**depth < target:
+        depth += 1
+    return depth
+
+
+# --- Worker side ---------------------------------------------------------
+
+
+class _ShardHandler(socketserver.BaseRequestHandler):
+    """Serve shard requests on one coordinator connection."""
+
+    server: "WorkerServer"
+
+    def handle(self) -> None:
+        while True:
+            try:
+                request, _ = recv_frame(self.request)
+            except ConnectionError:
+                return
+            if request.get("op") == "close":
+                return
+            if not self.server.run_shard(self.request, request):
+                return
+
+
+class WorkerServer(socketserver.ThreadingTCPServer):
+    """TCP worker that expands subtree shards for a coordinator.
+
+    Args:
+        address: ``(host, port)`` to listen on (port 0 picks a free port)
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: Address) -> None:
+        super().__init__(address, _ShardHandler)
+        self.shards_served = 0
+
+    @property
+    def address(self) -> Address:
+        """The ``(host, port)`` actually bound."""
+        host, port = self.server_address[:2]
+        return str(host), int(port)
+
+    def run_shard(self, sock: socket.socket, request: Dict[str, Any]) -> bool:
+        """Expand one shard and stream it back.
+
+        The shard is expanded chunk by chunk, so a worker holds one chunk
+        rather than the whole shard.
+
+        Returns:
+            Whether the connection is still usable
+        """
+        shard = int(request["shard"])
+        count = 0
+        try:
+            matrices = np.array(request["matrices"], dtype=float)
+            prefix = np.array(request["prefix"], dtype=float)
+            dtype = np.dtype(request.get("dtype", "float32"))
+            chunk_points = int(request.get("chunk_points", DEFAULT_CHUNK_POINTS))
+            chunks = iter_exhaustive_chunks(
+                matrices, int(request["depth"]), chunk_points
+            )
+            for points in chunks:
+                points = points @ prefix[:3, :3].T + prefix[:3, 3]
+                chunk = np.ascontiguousarray(points, dtype=dtype)
+                send_frame(
+                    sock,
+                    {"shard": shard, "offset": count, "count": len(chunk)},
+                    zlib.compress(chunk.tobytes(), 1),
+                )
+                count += len(chunk)
+        except (KeyError, TypeError, ValueError) as e:
+            send_frame(sock, {"shard": shard, "error": f"{type(e).__name__}: {e}"})
+            return True
+        send_frame(sock, {"shard": shard, "done": True, "count": count})
+        self.shards_served += 1
+        return True
+
+    def start_background(self) -> threading.Thread:
+        """Serve on a daemon thread (used by tests and local clusters)."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+# --- Coordinator side ----------------------------------------------------
+
+
+def _receive_shard(
+    sock: socket.socket, shard: int, out: np.ndarray, dtype: np.dtype
+) -> None:
+    """Write one streamed shard into ``out`` (its slice of the result)."""
+    received = 0
+    while True:
+        header, payload = recv_frame(sock)
+        if header.get("shard") != shard:
+            raise ConnectionError(f"Expected shard {shard}, got {header}")
+        if "error" in header:
+            raise DistributedError(f"Shard {shard} failed: {header['error']}")
+        if header.get("done"):
+            if received != len(out):
+                raise ConnectionError(f"Shard {shard} incomplete")
+            return
+        chunk = np.frombuffer(zlib.decompress(payload), dtype=dtype).reshape(-1, 3)
+        offset = int(header["offset"])
+        out[offset : offset + len(chunk)] = chunk
+        received += len(chunk)
+
+
+def generate_distributed(
+    matrices: np.ndarray,
+    iterations: int,
+    workers: Sequence[Address],
+    prefix_depth: Optional[int] = None,
+    dtype: str = "float32",
+    chunk_points: int = DEFAULT_CHUNK_POINTS,
+    retries: int = 2,
+    timeout: float = DEFAULT_SOCKET_TIMEOUT,
+) -> np.ndarray:
+    """Expand ``T^n`` across TCP workers, assembled in address order.
+
+    Args:
+        matrices: ``(T, 4, 4)`` transform matrices
+        iterations: Expansion depth ``n``
+        workers: Worker ``(host, port)`` addresses
+        prefix_depth: Shard prefix length (default: ``choose_prefix_depth``)
+        dtype: Point dtype on the wire and in the result
+        chunk_points: Points per streamed chunk
+        retries: Extra attempts per shard after a failure
+        timeout: Seconds to wait on a silent worker
+
+    Returns:
+        ``(T**n, 3)`` points, identical in order to ``expand_exhaustive``
+
+    Raises:
+        DistributedError: If a shard fails on every attempt or no worker is
+            reachable
+    """
+    if not workers:
+        raise ValueError("At least one worker address is required")
+    transform_count = len(matrices)
+    if prefix_depth is None:
+        prefix_depth = choose_prefix_depth(transform_count, iterations, len(workers))
+    if not 0 <= prefix_depth <= iterations:
+        raise ValueError(f"Prefix depth must be in [0, {iterations}]")
+    prefixes = compose_table(matrices, prefix_depth)
+    shard_size = transform_count ** (iterations - prefix_depth)
+    result = np.empty((len(prefixes) * shard_size, 3), dtype=dtype)
+
+    pending: "queue.Queue[Tuple[int, int]]" = queue.Queue()
+    for shard in range(len(prefixes)):
+        pending.put((shard, 0))
+    remaining = [len(prefixes)]
+    failures: List[str] = []
+    lock = threading.Lock()
+    finished = threading.Event()
+    live_workers = [len(workers)]
+    common = {
+        "op": "expand",
+        "matrices": matrices.tolist(),
+        "depth": iterations - prefix_depth,
+        "dtype": dtype,
+        "chunk_points": chunk_points,
+    }
+
+    def drive(address: Address) -> None:
+        sock: Optional[socket.socket] = None
+        strikes = 0  # consecutive connection failures
+        try:
+            while not finished.is_set():
+                try:
+                    shard, attempt = pending.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                try:
+                    if sock is None:
+                        sock = socket.create_connection(address, timeout=timeout)
+                    send_frame(
+                        sock,
+                        {**common, "shard": shard, "prefix": prefixes[shard].tolist()},
+                    )
+                    _receive_shard(
+                        sock,
+                        shard,
+                        result[shard * shard_size : (shard + 1) * shard_size],
+                        np.dtype(dtype),
+                    )
+                except (OSError, ConnectionError, DistributedError) as e:
+                    with lock:
+                        if attempt < retries:
+                            pending.put((shard, attempt + 1))
+                        else:
+                            failures.append(f"shard {shard}: {e}")
+                            finished.set()
+                    if sock is not None:
+                        sock.close()
+                    sock = None
+                    if not isinstance(e, DistributedError):
+                        strikes += 1
+                        if strikes > 1:
+                            return  # give up on a worker that keeps failing
+                    continue
+                strikes = 0
+                with lock:
+                    remaining[0] -= 1
+                    if remaining[0] == 0:
+                        finished.set()
+        finally:
+            if sock is not None:
+                try:
+                    send_frame(sock, {"op": "close"})
+                except OSError:
+                    pass
+                sock.close()
+            with lock:
+                live_workers[0] -= 1
+                if live_workers[0] == 0:
+                    finished.set()
+
+    threads = [
+        threading.Thread(target=drive, args=(address,), daemon=True)
+        for address in workers
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if failures:
+        raise DistributedError("; ".join(failures))
+    if remaining[0]:
+        raise DistributedError(f"{remaining[0]} shards left with no reachable worker")
+    return result
+
+
+def generate_preset_distributed(
+    preset: Dict[str, Any],
+    workers: Sequence[Address],
+    iterations: Optional[int] = None,
+    **options: Any,
+) -> np.ndarray:
+    """Distributed exhaustive expansion of a validated preset.
+
+    Args:
+        preset: Preset dictionary
+        workers: Worker ``(host, port)`` addresses
+        iterations: Override the preset's iterations
+        **options: Passed to ``generate_distributed``
+
+    Returns:
+        ``(T**n, 3)`` points in address order
+    """
+    compiled = compile_preset(preset)
+    depth = compiled.iterations if iterations is None else iterations
+    enforce_iteration_limits(compiled.transform_count, depth)
+    return generate_distributed(compiled.matrices, depth, workers, **options)
+
+
+def parse_address(text: str) -> Address:
+    """Parse ``host:port``."""
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.utils.distributed",
+        description="Distributed IFS generation over TCP.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    worker = commands.add_parser("worker", help="Run a shard worker")
+    worker.add_argument("--host", default="127.0.0.1")
+    worker.add_argument("--port", type=int, default=9100)
+    generate = commands.add_parser("generate", help="Coordinate a generation")
+    generate.add_argument("preset", help="Preset name or path")
+    generate.add_argument(
+        "--workers", required=True, help="Comma-separated host:port list"
+    )
+    generate.add_argument("--iterations", type=int, default=None)
+    generate.add_argument("--output", required=True, help="Output .npy or .ply")
+    args = parser.parse_args(argv)
+
+    if args.command == "worker":
+        with WorkerServer((args.host, args.port)) as server:
+            print(f"Worker listening on {server.address[0]}:{server.address[1]}")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+        return 0
+
+    from src.utils.exporters import export_points
+
+    addresses = [parse_address(a) for a in args.workers.split(",") if a]
+    points = generate_preset_distributed(
+        load_preset(args.preset), addresses, iterations=args.iterations
+    )
+    export_points(args.output, points)
+    print(f"Wrote {len(points)} points to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,384 @@
+"""Batched random exploration of new IFS presets.
+
+Mines candidate presets for the "autonomous fractal exploration" workflow
+(docs/architecture.md §5.3). Candidates are sampled as stacked arrays, so a
+whole batch is filtered and scored with a handful of vectorised operations:
+
+1. **Sample** ``B`` random transform sets as ``(B, T, 3)`` scale, rotation
+   and translation arrays.
+2. **Reject** non-contractive or degenerate sets from the singular values
+   of the ``(B, T, d, d)`` linear parts, computed in one batched SVD.
+3. **Score** survivors with a short, low-point-count chaos game: points are
+   binned on a grid over their bounding box and scored by coverage and
+   fill ratio.
+4. **Emit** the top-K as schema-valid preset JSON.
+
+Command-line use:
+
+    python -m src.utils.explorer --count 100000 --top-k 20 --output-dir out/
+"""
+
+import argparse
+import json
+import math
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from src.utils.ifs_engine import affine_matrices, chaos_game_batched
+from src.utils.validator import assert_valid_preset
+
+# Singular-value bounds for accepted transforms: below MIN the map collapses
+# its image onto a line or point, at or above MAX convergence is too slow
+# for a short chaos game to reach the attractor
+MIN_SINGULAR_VALUE = 0.05
+MAX_SINGULAR_VALUE = 0.9
+
+# Scoring chaos game: walkers x steps points per candidate
+SCORE_WALKERS = 32
+SCORE_STEPS = 32
+SCORE_BURN_IN = 24
+
+# Fine occupancy grid cells per axis for 2D and 3D candidates; the coarse
+# grid merges COARSE_FACTOR fine cells per axis
+GRID_RESOLUTION = {2: 32, 3: 16}
+COARSE_FACTOR = 4
+
+# Candidates whose bounding box is thinner than this fraction of its
+# largest extent along any axis are treated as degenerate (line-like)
+MIN_ASPECT = 0.05
+
+# Emitted presets are sized so final_iterations stays under this point count
+FINAL_POINT_BUDGET = 1_000_000
+
+# Candidates processed per vectorised chunk (bounds peak memory)
+DEFAULT_BATCH_SIZE = 4096
+
+
+@dataclass
+class CandidateBatch:
+    """Stacked transform sets for ``B`` candidates of ``T`` transforms.
+
+    Attributes:
+        scale: ``(B, T, 3)``
+        rotation: ``(B, T, 3)`` XYZ Euler degrees
+        translation: ``(B, T, 3)``
+        weights: ``(B, T)`` selection probabilities
+    """
+
+    scale: np.ndarray
+    rotation: np.ndarray
+    translation: np.ndarray
+    weights: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.scale)
+
+    def select(self, mask: np.ndarray) -> "CandidateBatch":
+        """Return the candidates where ``mask`` is true."""
+        return CandidateBatch(
+            self.scale[mask],
+            self.rotation[mask],
+            self.translation[mask],
+            self.weights[mask],
+        )
+
+    def matrices(self) -> np.ndarray:
+        """Return ``(B, T, 4, 4)`` transform matrices."""
+        return affine_matrices(self.scale, self.rotation, self.translation)
+
+
+@dataclass
+class ExplorerResult:
+    """A scored candidate emitted as a preset.
+
+    Attributes:
+        preset: Schema-valid preset dictionary
+        score: Combined score (higher is better)
+        coverage: Fraction of bounding-box grid cells touched
+        fill_ratio: Fine-grid occupancy relative to a solid shape (0-1)
+    """
+
+    preset: Dict[str, Any]
+    score: float
+    coverage: float
+    fill_ratio: float
+
+
+def sample_candidates(
+    rng: np.random.Generator, count: int, transform_count: int, dimensions: int
+) -> CandidateBatch:
+    """Sample random transform sets.
+
+    Scale magnitudes are drawn from [0, 1) with random sign (allowing
+    reflections), so some candidates fail the contractivity and degeneracy
+    checks by design. Rotations are drawn uniformly over a full turn and
+    translations within ±1. Planar (2D) candidates rotate only about Z and
+    keep Z translation at zero.
+    Weights are proportional to each transform's area (2D) or volume (3D)
+    scale factor, the usual heuristic for an even chaos-game density.
+
+    Args:
+        rng: Random generator
+        count: Number of candidates ``B``
+        transform_count: Transforms per candidate ``T``
+        dimensions: 2 or 3
+
+    Returns:
+        Stacked candidate arrays
+    """
+    shape = (count, transform_count, 3)
+    magnitude = rng.uniform(0.0, 1.0, shape)
+    scale = magnitude * rng.choice([-1.0, 1.0], shape)
+    rotation = rng.uniform(-180.0, 180.0, shape)
+    translation = rng.uniform(-1.0, 1.0, shape)
+    if dimensions == 2:
+        rotation[..., :2] = 0.0
+        translation[..., 2] = 0.0
+        scale[..., 2] = np.abs(scale[..., :2]).mean(axis=-1)
+    weights = np.prod(np.abs(scale[..., :dimensions]), axis=-1)
+    weights /= weights.sum(axis=-1, keepdims=True)
+    return CandidateBatch(scale, rotation, translation, weights)
+
+
+def contractive_mask(matrices: np.ndarray, dimensions: int) -> np.ndarray:
+    """Flag candidates whose transforms are all contractive and non-degenerate.
+
+    Args:
+        matrices: ``(B, T, 4, 4)`` transform matrices
+        dimensions: 2 or 3; only the leading ``d x d`` block is inspected
+
+    Returns:
+        ``(B,)`` boolean mask of accepted candidates
+    """
+    linear = matrices[..., :dimensions, :dimensions]
+    singular = np.linalg.svd(linear, compute_uv=False)
+    return (singular.max(axis=(1, 2)) < MAX_SINGULAR_VALUE + 1e-9) & (
+        singular.min(axis=(1, 2)) > MIN_SINGULAR_VALUE - 1e-9
+    )
+
+
+def score_points(points: np.ndarray, dimensions: int) -> Dict[str, np.ndarray]:
+    """Score point clouds by coverage and fill ratio.
+
+    Each cloud is normalised to its own bounding box and binned on a fine
+    ``G^d`` grid and on a coarse grid with ``COARSE_FACTOR`` fine cells per
+    axis. Coverage is the fraction of coarse cells touched (how much of its
+    box the shape spans). Fill ratio compares the fine cells touched inside
+    those coarse cells with the count ``N`` uniform points would touch if
+    the region were solid, ``K(1 - exp(-N/K))`` for ``K`` fine cells, so it
+    is about 1 for solid shapes regardless of sample size. The score
+    ``coverage * 4f(1 - f)`` favours shapes that span their box with
+    fractal detail rather than collapsing to dust or filling it solid.
+
+    Args:
+        points: ``(B, N, 3)`` sampled points
+        dimensions: 2 or 3
+
+    Returns:
+        ``score``, ``coverage`` and ``fill_ratio`` arrays of shape ``(B,)``;
+        degenerate or non-finite clouds score ``-inf``
+    """
+    resolution = GRID_RESOLUTION[dimensions]
+    coords = points[..., :dimensions]
+    finite = np.isfinite(coords).all(axis=(1, 2))
+    coords = np.where(finite[:, None, None], coords, 0.0)
+    lo = coords.min(axis=1, keepdims=True)
+    extent = coords.max(axis=1, keepdims=True) - lo
+    largest = extent.max(axis=-1)[:, 0]
+    valid = finite & (largest > 0)
+    valid &= extent.min(axis=-1)[:, 0] >= MIN_ASPECT * largest
+
+    safe_extent = np.where(extent > 0, extent, 1.0)
+    cells = np.clip(
+        ((coords - lo) / safe_extent * resolution).astype(np.int64), 0, resolution - 1
+    )
+
+    def occupied(grid: np.ndarray, size: int) -> np.ndarray:
+        keys = np.sort(grid @ (size ** np.arange(dimensions)), axis=1)
+        return 1 + (np.diff(keys, axis=1) != 0).sum(axis=1)
+
+    coarse_size = resolution // COARSE_FACTOR
+    fine = occupied(cells, resolution)
+    coarse = occupied(cells // COARSE_FACTOR, coarse_size)
+
+    coverage = coarse / coarse_size**dimensions
+    region = coarse * COARSE_FACTOR**dimensions
+    solid = region * -np.expm1(-points.shape[1] / region)
+    fill_ratio = np.minimum(fine / solid, 1.0)
+    score = np.where(valid, coverage * 4 * fill_ratio * (1 - fill_ratio), -np.inf)
+    return {"score": score, "coverage": coverage, "fill_ratio": fill_ratio}
+
+
+def _final_iterations(transform_count: int) -> int:
+    """Deepest iteration count within the final point budget (max 12)."""
+    if transform_count == 1:
+        return 12
+    depth = int(math.log(FINAL_POINT_BUDGET) / math.log(transform_count))
+    return max(1, min(12, depth))
+
+
+def candidate_to_preset(
+    batch: CandidateBatch, index: int, name: str, seed: int, dimensions: int
+) -> Dict[str, Any]:
+    """Convert one candidate into a schema-valid preset dictionary.
+
+    Args:
+        batch: Candidate arrays
+        index: Candidate to convert
+        name: Preset name
+        seed: Seed stored in the preset
+        dimensions: 2 or 3, used for the category
+
+    Returns:
+        Preset dictionary
+    """
+
+    def rounded(values: np.ndarray) -> List[float]:
+        return [round(float(v), 4) for v in values]
+
+    transform_count = batch.scale.shape[1]
+    transforms = [
+        {
+            "scale": rounded(batch.scale[index, t]),
+            "rotation": rounded(batch.rotation[index, t]),
+            "translation": rounded(batch.translation[index, t]),
+            "weight": round(float(batch.weights[index, t]), 4),
+        }
+        for t in range(transform_count)
+    ]
+    final = _final_iterations(transform_count)
+    return {
+        "name": name,
+        "description": f"Explorer candidate with {transform_count} transforms",
+        "category": f"explored_{dimensions}d",
+        "iterations": final,
+        "seed": seed,
+        "instance_base": "Cube",
+        "transforms": transforms,
+        "color_palette": {
+            "mode": "iteration_depth",
+            "stops": [[0, "#311B92"], [1, "#FFD54F"]],
+        },
+        "performance": {
+            "preview_iterations": max(1, min(6, final - 2)),
+            "final_iterations": final,
+        },
+    }
+
+
+def explore(
+    count: int,
+    *,
+    transform_counts: Union[int, Sequence[int]] = (3, 4),
+    dimensions: int = 2,
+    top_k: int = 10,
+    seed: int = 0,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> List[ExplorerResult]:
+    """Sample, filter and score random transform sets; return the best.
+
+    Candidates are split evenly across ``transform_counts`` and processed
+    in chunks of ``batch_size``; only the running top-K survive between
+    chunks, so memory does not grow with ``count``.
+
+    Args:
+        count: Total candidates to sample
+        transform_counts: Transform count(s) to explore (1-8)
+        dimensions: 2 for planar fractals, 3 for volumetric
+        top_k: Number of presets to return
+        seed: Seed for the whole exploration run
+        batch_size: Candidates per vectorised chunk
+
+    Returns:
+        Up to ``top_k`` results, best first
+
+    Raises:
+        ValueError: If ``dimensions`` is not 2 or 3
+    """
+    if dimensions not in GRID_RESOLUTION:
+        raise ValueError(f"Dimensions must be 2 or 3 (got {dimensions})")
+    if isinstance(transform_counts, int):
+        transform_counts = [transform_counts]
+    rng = np.random.default_rng(seed)
+
+    best: List[tuple] = []  # (score, coverage, fill, batch, index)
+    per_count = -(-count // len(transform_counts))
+    for transform_count in transform_counts:
+        remaining = per_count
+        while remaining > 0:
+            size = min(batch_size, remaining)
+            remaining -= size
+            batch = sample_candidates(rng, size, transform_count, dimensions)
+            batch = batch.select(contractive_mask(batch.matrices(), dimensions))
+            if not len(batch):
+                continue
+            points = chaos_game_batched(
+                batch.matrices(),
+                batch.weights,
+                SCORE_STEPS,
+                rng,
+                walkers=SCORE_WALKERS,
+                burn_in=SCORE_BURN_IN,
+            )
+            scores = score_points(points, dimensions)
+            keep = min(top_k, len(batch))
+            top = np.argpartition(-scores["score"], keep - 1)[:keep]
+            best.extend(
+                (
+                    float(scores["score"][i]),
+                    float(scores["coverage"][i]),
+                    float(scores["fill_ratio"][i]),
+                    batch,
+                    int(i),
+                )
+                for i in top
+                if np.isfinite(scores["score"][i])
+            )
+            best.sort(key=lambda entry: -entry[0])
+            del best[top_k:]
+
+    results = []
+    for rank, (score, coverage, fill, batch, index) in enumerate(best):
+        preset = candidate_to_preset(
+            batch, index, f"Explored {seed}-{rank + 1:03d}", seed + rank, dimensions
+        )
+        assert_valid_preset(preset)
+        results.append(ExplorerResult(preset, score, coverage, fill))
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point: explore and write the top-K presets."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.utils.explorer",
+        description="Mine random transform sets for interesting new presets.",
+    )
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--transforms", type=int, nargs="+", default=[3, 4])
+    parser.add_argument("--dimensions", type=int, choices=(2, 3), default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output-dir", type=Path, required=True)
+    args = parser.parse_args(argv)
+
+    results = explore(
+        args.count,
+        transform_counts=args.transforms,
+        dimensions=args.dimensions,
+        top_k=args.top_k,
+        seed=args.seed,
+    )
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    for rank, result in enumerate(results, start=1):
+        path = args.output_dir / f"explored_{args.seed}_{rank:03d}.json"
+        path.write_text(json.dumps(result.preset, indent=2) + "\n", encoding="utf-8")
+        print(f"{path}  score={result.score:.3f}  coverage={result.coverage:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
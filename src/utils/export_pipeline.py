@@ -0,0 +1,621 @@
+"""Single-pass export to several formats at once.
+
+A multi-format delivery (PLY, GLB, thumbnail, NPY cache) is produced from
+one generation. The calling thread generates the cloud chunk by chunk
+(``iter_exhaustive_chunks`` / ``iter_chaos_blocks``) and hands each
+read-only chunk to every sink through the sink's own bounded queue; each
+sink drains its queue on a pool thread. Generation therefore overlaps
+with I/O, and a slow sink applies backpressure: once its queue is full
+the producer waits, so at most ``queue_chunks + 1`` chunks per sink are
+alive at any time.
+
+Sinks (chosen by file extension in ``export_preset``):
+    - ``.ply``: ``PlySink``, binary little-endian PLY
+    - ``.glb``: ``GlbSink``, glTF 2.0 binary with a POINTS primitive
+    - ``.npy``: ``NpySink``, float32 array (memory-mappable cache file)
+    - ``.png``: ``ThumbnailSink``, density preview of a strided subsample
+
+Command-line use:
+
+    python -m src.utils.export_pipeline barnsley out/fern.ply out/fern.glb \\
+        out/fern.png out/fern.npy --iterations 10
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import numpy as np
+
+from src.utils.exporters import PathLike, ply_header, ply_vertex_bytes
+from src.utils.ifs_engine import (
+    DEFAULT_CHAOS_POINTS,
+    compile_preset,
+    expand_stratified,
+    iter_chaos_blocks,
+    iter_exhaustive_chunks,
+)
+from src.utils.math_helpers import enforce_iteration_limits
+from src.utils.memory_guard import (
+    POLICIES,
+    MemoryGuard,
+    guard_chunks,
+    plan_generation,
+)
+from src.utils.preset_loader import load_preset
+from src.utils.preview import DEFAULT_PREVIEW_SIZE, render_preview
+from src.utils.spatial_index import point_bounds
+
+# Upper bound on points per generated chunk
+DEFAULT_CHUNK_POINTS = 1 << 18
+
+# Chunks buffered per sink before the producer blocks
+DEFAULT_QUEUE_CHUNKS = 4
+
+# Points kept for the thumbnail (strided subsample of the cloud)
+THUMBNAIL_POINTS = 1 << 20
+
+# glTF 2.0 binary constants
+GLB_MAGIC = 0x46546C67
+GLB_JSON_CHUNK = 0x4E4F534A
+GLB_BIN_CHUNK = 0x004E4942
+GLTF_FLOAT = 5126
+GLTF_ARRAY_BUFFER = 34962
+GLTF_POINTS = 0
+
+# Widest "%.9g" rendering of a float32, reserved for the GLB bounds
+_GLB_NUMBER_PLACEHOLDER = -1.23456789e-38
+
+
+def npy_header(total: int) -> bytes:
+    """``.npy`` header of a ``(total, 3)`` float32 array."""
+    header = {"descr": "<f4", "fortran_order": False, "shape": (total, 3)}
+    buffer = io.BytesIO()
+    np.lib.format.write_array_header_1_0(buffer, header)
+    return buffer.getvalue()
+
+
+class ExportSink:
+    """Consumer of a chunked point cloud.
+
+    ``open`` is called once with the final point count, ``write`` once per
+    chunk in order (``start`` is the chunk's first point index) and
+    ``close`` after the last chunk. If the export fails, ``abort`` is
+    called instead of ``close``. All of them run on the sink's thread.
+    """
+
+    def __init__(self, path: PathLike) -> None:
+        self.path = Path(path)
+
+    def open(self, total: int) -> None:
+        """Prepare for ``total`` points."""
+
+    def write(self, points: np.ndarray, start: int) -> None:
+        """Consume one chunk."""
+        raise NotImplementedError
+
+    def close(self) -> Dict[str, Any]:
+        """Finish the output.
+
+        Returns:
+            Description of the output (at least ``path`` and ``bytes``)
+        """
+        raise NotImplementedError
+
+    def abort(self) -> None:
+        """Discard a partial output after a failed export."""
+
+
+class _FileSink(ExportSink):
+    """Sink writing a header followed by streamed records.
+
+    Records go to a temporary file next to ``path``, which replaces
+    ``path`` only once the output is complete, so a failed export never
+    leaves a file whose header promises points it does not hold.
+    """
+
+    def __init__(self, path: PathLike) -> None:
+        super().__init__(path)
+        self._file: Optional[BinaryIO] = None
+        self._partial = self.path.with_name(
+            f"{self.path.stem}.{os.getpid()}.part{self.path.suffix}"
+        )
+
+    def header(self, total: int) -> bytes:
+        raise NotImplementedError
+
+    def open(self, total: int) -> None:
+        self._file = open(self._partial, "wb")
+        self._file.write(self.header(total))
+
+    def write(self, points: np.ndarray, start: int) -> None:
+        self._file.write(np.ascontiguousarray(points, dtype="<f4").tobytes())
+
+    def _commit(self) -> None:
+        """Close the temporary file and move it to ``path``."""
+        self._file.close()
+        os.replace(self._partial, self.path)
+
+    def close(self) -> Dict[str, Any]:
+        size = self._file.tell()
+        self._commit()
+        return {"path": str(self.path), "bytes": size}
+
+    def abort(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._partial.unlink(missing_ok=True)
+
+
+class PlySink(_FileSink):
+    """Binary little-endian PLY, as ``exporters.write_ply``."""
+
+    def header(self, total: int) -> bytes:
+        return ply_header(total)
+
+    def write(self, points: np.ndarray, start: int) -> None:
+        self._file.write(ply_vertex_bytes(points))
+
+
+class NpySink(_FileSink):
+    """float32 ``.npy`` array, as ``exporters.write_npy``."""
+
+    def header(self, total: int) -> bytes:
+        return npy_header(total)
+
+
+class GlbSink(_FileSink):
+    """glTF 2.0 binary with one POINTS primitive.
+
+    The accessor bounds are only known after the last chunk, so the JSON
+    chunk is written with room for the widest bounds and rewritten (padded
+    with spaces) on close; positions stream straight into the BIN chunk.
+    """
+
+    def __init__(self, path: PathLike) -> None:
+        super().__init__(path)
+        self._total = 0
+        self._json_size = 0
+        self._lo = np.full(3, np.inf, dtype=np.float32)
+        self._hi = np.full(3, -np.inf, dtype=np.float32)
+
+    def _json(self, lo: Sequence[float], hi: Sequence[float]) -> bytes:
+        byte_length = self._total * 12
+        document = {
+            "asset": {"version": "2.0", "generator": "IFS Fractal Generator"},
+            "scene": 0,
+            "scenes": [{"nodes": [0]}],
+            "nodes": [{"mesh": 0}],
+            "meshes": [
+                {"primitives": [{"attributes": {"POSITION": 0}, "mode": GLTF_POINTS}]}
+            ],
+            "buffers": [{"byteLength": byte_length}],
+            "bufferViews": [
+                {
+                    "buffer": 0,
+                    "byteOffset": 0,
+                    "byteLength": byte_length,
+                    "target": GLTF_ARRAY_BUFFER,
+                }
+            ],
+            "accessors": [
+                {
+                    "bufferView": 0,
+                    "componentType": GLTF_FLOAT,
+                    "count": self._total,
+                    "type": "VEC3",
+                    "min": "@MIN@",
+                    "max": "@MAX@",
+                }
+            ],
+        }
+        text = json.dumps(document, separators=(",", ":"))
+        for name, values in (("@MIN@", lo), ("@MAX@", hi)):
+            numbers = ",".join(f"{float(v):.9g}" for v in values)
+            text = text.replace(f'"{name}"', f"[{numbers}]")
+        return text.encode("ascii")
+
+    def _write_head(self, json_bytes: bytes) -> None:
+        padded = json_bytes.ljust(self._json_size, b" ")
+        bin_size = self._total * 12
+        total = 12 + 8 + self._json_size + 8 + bin_size
+        self._file.write(struct.pack("<III", GLB_MAGIC, 2, total))
+        self._file.write(struct.pack("<II", self._json_size, GLB_JSON_CHUNK))
+        self._file.write(padded)
+        self._file.write(struct.pack("<II", bin_size, GLB_BIN_CHUNK))
+
+    def open(self, total: int) -> None:
+        self._total = total
+        widest = self._json(
+            [_GLB_NUMBER_PLACEHOLDER] * 3, [_GLB_NUMBER_PLACEHOLDER] * 3
+        )
+        self._json_size = -(-len(widest) // 4) * 4
+        self._file = open(self._partial, "wb")
+        self._write_head(widest)
+
+    def write(self, points: np.ndarray, start: int) -> None:
+        data = np.ascontiguousarray(points, dtype="<f4")
+        if len(data):
+            lo, hi = point_bounds(data)
+            np.minimum(self._lo, lo, out=self._lo)
+            np.maximum(self._hi, hi, out=self._hi)
+        self._file.write(data.tobytes())
+
+    def close(self) -> Dict[str, Any]:
+        size = self._file.tell()
+        if not self._total:
+            self._lo[:] = self._hi[:] = 0
+        self._file.seek(0)
+        self._write_head(self._json(self._lo, self._hi))
+        self._commit()
+        return {"path": str(self.path), "bytes": size}
+
+
+class ThumbnailSink(ExportSink):
+    """PNG density preview of an evenly strided subsample of the cloud."""
+
+    def __init__(
+        self,
+        path: PathLike,
+        size: int = DEFAULT_PREVIEW_SIZE,
+        max_points: int = THUMBNAIL_POINTS,
+    ) -> None:
+        super().__init__(path)
+        self.size = size
+        self.max_points = max_points
+        self._stride = 1
+        self._kept: List[np.ndarray] = []
+
+    def open(self, total: int) -> None:
+        self._stride = max(1, math.ceil(total / self.max_points))
+
+    def write(self, points: np.ndarray, start: int) -> None:
+        # Keep global indices that are multiples of the stride
+        self._kept.append(np.array(points[(-start) % self._stride :: self._stride]))
+
+    def close(self) -> Dict[str, Any]:
+        points = np.concatenate(self._kept) if self._kept else np.zeros((0, 3))
+        data = render_preview(points, self.size)
+        self.path.write_bytes(data)
+        self._kept = []
+        return {"path": str(self.path), "bytes": len(data), "sampled": len(points)}
+
+    def abort(self) -> None:
+        self._kept = []
+
+
+class StreamSink(ExportSink):
+    """Headed or raw float32 records written to an open binary stream.
+
+    Formats: ``"raw"`` (bare little-endian float32 XYZ triples), ``"npy"``
+    and ``"ply"``. Every format streams, since the point count is known
+    before the first chunk. The stream is flushed per chunk and left open.
+    """
+
+    FORMATS = ("raw", "npy", "ply")
+
+    def __init__(self, stream: BinaryIO, fmt: str = "raw") -> None:
+        if fmt not in self.FORMATS:
+            raise ValueError(
+                f"Stream format must be one of {list(self.FORMATS)} (got {fmt!r})"
+            )
+        super().__init__("-")
+        self.stream = stream
+        self.fmt = fmt
+        self._bytes = 0
+
+    def _send(self, data: bytes) -> None:
+        self.stream.write(data)
+        self.stream.flush()
+        self._bytes += len(data)
+
+    def open(self, total: int) -> None:
+        if self.fmt == "ply":
+            self._send(ply_header(total))
+        elif self.fmt == "npy":
+            self._send(npy_header(total))
+
+    def write(self, points: np.ndarray, start: int) -> None:
+        if self.fmt == "ply":
+            self._send(ply_vertex_bytes(points))
+        else:
+            self._send(np.ascontiguousarray(points, dtype="<f4").tobytes())
+
+    def close(self) -> Dict[str, Any]:
+        return {"path": "-", "bytes": self._bytes, "format": self.fmt}
+
+
+# Sink class for each supported output extension
+SINKS_BY_SUFFIX = {
+    ".ply": PlySink,
+    ".glb": GlbSink,
+    ".npy": NpySink,
+    ".png": ThumbnailSink,
+}
+
+
+def sink_for_path(path: PathLike) -> ExportSink:
+    """Create the sink matching a file extension.
+
+    Raises:
+        ValueError: If the extension is not supported
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in SINKS_BY_SUFFIX:
+        raise ValueError(
+            f"Unsupported output '{path}' (supported: {sorted(SINKS_BY_SUFFIX)})"
+        )
+    return SINKS_BY_SUFFIX[suffix](path)
+
+
+class PipelineAborted(RuntimeError):
+    """Raised in the producer when a sink has failed."""
+
+
+def _drain(
+    sink: ExportSink,
+    chunks: "queue.Queue",
+    total: int,
+    failed: threading.Event,
+    aborted: threading.Event,
+) -> Optional[Dict[str, Any]]:
+    """Sink thread: open, write every queued chunk, then close or abort."""
+    try:
+        sink.open(total)
+        while True:
+            item = chunks.get()
+            if item is None:
+                break
+            start, points = item
+            sink.write(points, start)
+        if aborted.is_set():
+            sink.abort()
+            return None
+        return sink.close()
+    except BaseException:
+        failed.set()
+        sink.abort()
+        raise
+
+
+def run_pipeline(
+    chunks: Iterable[np.ndarray],
+    total: int,
+    sinks: Sequence[ExportSink],
+    queue_chunks: int = DEFAULT_QUEUE_CHUNKS,
+) -> List[Dict[str, Any]]:
+    """Fan generated chunks out to sinks running on a thread pool.
+
+    Args:
+        chunks: Point chunks in order, generated lazily on this thread
+        total: Total point count (sinks may write it in headers)
+        sinks: Outputs, each fed through its own bounded queue
+        queue_chunks: Chunks buffered per sink before generation waits
+
+    Returns:
+        Each sink's ``close`` result, in sink order
+
+    Raises:
+        Exception: The first sink error; generation stops once any sink fails
+        ValueError: If the chunks do not add up to ``total``
+
+    Note:
+        Unless every chunk reached the sinks, each sink is aborted rather
+        than closed, so no output is left truncated.
+    """
+    failed = threading.Event()
+    aborted = threading.Event()
+    queues = [queue.Queue(maxsize=queue_chunks) for _ in sinks]
+
+    def put(target: "queue.Queue", item: Any) -> None:
+        while True:
+            try:
+                target.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                if failed.is_set():
+                    raise PipelineAborted("An export sink failed")
+
+    with ThreadPoolExecutor(max_workers=max(1, len(sinks))) as pool:
+        futures = [
+            pool.submit(_drain, sink, chunk_queue, total, failed, aborted)
+            for sink, chunk_queue in zip(sinks, queues)
+        ]
+        written = 0
+        complete = False
+        try:
+            for points in chunks:
+                points = np.asarray(points)
+                points.flags.writeable = False
+                for chunk_queue in queues:
+                    put(chunk_queue, (written, points))
+                written += len(points)
+                if failed.is_set():
+                    raise PipelineAborted("An export sink failed")
+            complete = written == total
+        except PipelineAborted:
+            pass
+        finally:
+            if not complete:
+                aborted.set()
+            for chunk_queue in queues:
+                if aborted.is_set():
+                    _unblock(chunk_queue)
+                    continue
+                try:
+                    put(chunk_queue, None)
+                except PipelineAborted:
+                    _unblock(chunk_queue)
+        results = [future.result() for future in futures]
+    if written != total:
+        raise ValueError(f"Chunks held {written} points, expected {total}")
+    return results
+
+
+def _unblock(chunk_queue: "queue.Queue") -> None:
+    """Empty a queue and post the end marker so its sink thread exits."""
+    while True:
+        try:
+            chunk_queue.get_nowait()
+        except queue.Empty:
+            break
+    chunk_queue.put(None)
+
+
+def export_preset(
+    preset: Mapping[str, Any],
+    paths: Sequence[Union[PathLike, ExportSink]],
+    mode: str = "exhaustive",
+    iterations: Optional[int] = None,
+    n_points: Optional[int] = None,
+    seed: Optional[int] = None,
+    chunk_points: int = DEFAULT_CHUNK_POINTS,
+    queue_chunks: int = DEFAULT_QUEUE_CHUNKS,
+    memory_limit: Optional[int] = None,
+    memory_policy: str = "reduce_iterations",
+) -> Dict[str, Any]:
+    """Generate a preset once and write it to every path.
+
+    The request is planned with ``plan_generation`` first (the exported
+    cloud is loaded whole by its consumers, so it is held to the same limit
+    as an in-memory generation) and the run is monitored by a
+    ``MemoryGuard`` between chunks.
+
+    Args:
+        preset: Preset dictionary
+        paths: Outputs; the extension selects the sink (``SINKS_BY_SUFFIX``).
+            Sink instances are used as given.
+        mode: ``"exhaustive"``, ``"chaos"`` or ``"stratified"``
+        iterations: Override the preset's iterations (exhaustive mode)
+        n_points: Point count for chaos and stratified modes
+        seed: Override the preset's seed (chaos mode)
+        chunk_points: Upper bound on points per chunk
+        queue_chunks: Chunks buffered per sink
+        memory_limit: Limit in bytes (default: ``default_limit()``)
+        memory_policy: ``plan_generation`` policy for requests over the limit
+
+    Returns:
+        Point count, elapsed seconds, the memory downgrade applied (or
+        ``None``) and one result per output
+
+    Raises:
+        ValueError: For unknown modes or unsupported extensions
+        MemoryLimitExceeded: If the request does not fit the limit under
+            ``memory_policy`` or the run exceeds it
+    """
+    if mode not in ("exhaustive", "chaos", "stratified"):
+        raise ValueError(
+            f"Mode must be 'exhaustive', 'chaos' or 'stratified' (got {mode!r})"
+        )
+    sinks = [
+        path if isinstance(path, ExportSink) else sink_for_path(path) for path in paths
+    ]
+    compiled = compile_preset(preset)
+    depth = compiled.iterations if iterations is None else iterations
+    if mode == "exhaustive":
+        enforce_iteration_limits(compiled.transform_count, depth)
+    plan = plan_generation(
+        compiled.transform_count,
+        depth,
+        mode,
+        n_points or DEFAULT_CHAOS_POINTS,
+        limit_bytes=memory_limit,
+        policy=memory_policy,
+    )
+    if plan.mode == "exhaustive":
+        total = compiled.transform_count**plan.iterations
+        chunks = iter_exhaustive_chunks(
+            compiled.matrices, plan.iterations, chunk_points
+        )
+    elif plan.mode == "chaos":
+        total = plan.n_points or DEFAULT_CHAOS_POINTS
+        chunks = iter_chaos_blocks(
+            compiled.matrices,
+            compiled.weights,
+            total,
+            seed=compiled.seed if seed is None else seed,
+            block_points=chunk_points,
+        )
+    else:
+        # Stratified placement is not chunked; the budget is one chunk,
+        # generated lazily so the guard sees it
+        total = plan.n_points or DEFAULT_CHAOS_POINTS
+
+        def stratified() -> Iterator[np.ndarray]:
+            yield expand_stratified(compiled.matrices, compiled.weights, total)
+
+        chunks = stratified()
+    start = time.perf_counter()
+    with MemoryGuard(memory_limit) as guard:
+        outputs = run_pipeline(guard_chunks(chunks, guard), total, sinks, queue_chunks)
+    return {
+        "point_count": total,
+        "elapsed": time.perf_counter() - start,
+        "downgrade": plan.downgrade,
+        "outputs": outputs,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point: export one preset to several formats."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.utils.export_pipeline",
+        description="Generate a preset once and write every requested format.",
+    )
+    parser.add_argument("preset", help="Preset name or path")
+    parser.add_argument("outputs", nargs="+", help="Output files (.ply .glb .npy .png)")
+    parser.add_argument(
+        "--mode", choices=("exhaustive", "chaos", "stratified"), default="exhaustive"
+    )
+    parser.add_argument("--iterations", type=int, default=None)
+    parser.add_argument("--points", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--memory-limit", type=int, default=None, help="Memory limit in MiB"
+    )
+    parser.add_argument(
+        "--memory-policy", choices=POLICIES, default="reduce_iterations"
+    )
+    args = parser.parse_args(argv)
+
+    result = export_preset(
+        load_preset(args.preset),
+        args.outputs,
+        mode=args.mode,
+        iterations=args.iterations,
+        n_points=args.points,
+        seed=args.seed,
+        memory_limit=None if args.memory_limit is None else args.memory_limit * 2**20,
+        memory_policy=args.memory_policy,
+    )
+    if result["downgrade"]:
+        print(result["downgrade"])
+    for output in result["outputs"]:
+        print(f"{output['path']}  {output['bytes']} bytes")
+    print(f"{result['point_count']} points in {result['elapsed']:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
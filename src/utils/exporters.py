@@ -0,0 +1,143 @@
+"""Point cloud exporters for headless generation.
+
+Writes engine output to interchange formats without Blender. Every writer
+takes an ``(N, 3)`` point array and an optional ``(N, 4)`` uint8 RGBA color
+array and returns the number of bytes written.
+
+Formats:
+    - ``ply``: Binary little-endian PLY (float32 XYZ, optional uchar RGBA)
+    - ``npy``: NumPy array file (float32 XYZ)
+
+See docs/architecture.md §2.3 for the export pipeline targets.
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+
+PathLike = Union[str, Path]
+
+
+def ply_header(point_count: int, with_colors: bool = False) -> bytes:
+    """Build the header for a binary little-endian PLY point cloud.
+
+    Args:
+        point_count: Number of vertices that will follow
+        with_colors: Whether vertices carry RGBA colors
+
+    Returns:
+        ASCII header bytes, ending with ``end_header\\n``
+    """
+    lines = [
+        "ply",
+        "format binary_little_endian 1.0",
+        "comment IFS Fractal Generator",
+        f"element vertex {point_count}",
+        "property float x",
+        "property float y",
+        "property float z",
+    ]
+    if with_colors:
+        lines += [
+            "property uchar red",
+            "property uchar green",
+            "property uchar blue",
+            "property uchar alpha",
+        ]
+    lines.append("end_header")
+    return ("\n".join(lines) + "\n").encode("ascii")
+
+
+def ply_vertex_bytes(points: np.ndarray, colors: Optional[np.ndarray] = None) -> bytes:
+    """Encode vertices in PLY binary little-endian layout.
+
+    Args:
+        points: ``(N, 3)`` points
+        colors: Optional ``(N, 4)`` uint8 RGBA
+
+    Returns:
+        Packed vertex records
+    """
+    if colors is None:
+        return np.ascontiguousarray(points, dtype="<f4").tobytes()
+    record = np.empty(len(points), dtype=[("xyz", "<f4", 3), ("rgba", "u1", 4)])
+    record["xyz"] = points
+    record["rgba"] = colors
+    return record.tobytes()
+
+
+def write_ply(
+    path: PathLike, points: np.ndarray, colors: Optional[np.ndarray] = None
+) -> int:
+    """Write a binary little-endian PLY point cloud.
+
+    Args:
+        path: Output file
+        points: ``(N, 3)`` points
+        colors: Optional ``(N, 4)`` uint8 RGBA
+
+    Returns:
+        Bytes written
+    """
+    header = ply_header(len(points), with_colors=colors is not None)
+    body = ply_vertex_bytes(points, colors)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(body)
+    return len(header) + len(body)
+
+
+def write_npy(
+    path: PathLike, points: np.ndarray, colors: Optional[np.ndarray] = None
+) -> int:
+    """Write points as a float32 ``.npy`` array (colors are ignored).
+
+    Args:
+        path: Output file
+        points: ``(N, 3)`` points
+        colors: Unused; accepted for a uniform writer signature
+
+    Returns:
+        Bytes written
+    """
+    with open(path, "wb") as f:
+        np.save(f, np.asarray(points, dtype=np.float32))
+        return f.tell()
+
+
+Writer = Callable[[PathLike, np.ndarray, Optional[np.ndarray]], int]
+
+# Writer for each supported export format name
+EXPORT_FORMATS: Dict[str, Writer] = {
+    "ply": write_ply,
+    "npy": write_npy,
+}
+
+
+def export_points(
+    path: PathLike,
+    points: np.ndarray,
+    colors: Optional[np.ndarray] = None,
+    fmt: Optional[str] = None,
+) -> int:
+    """Write points in the format named by ``fmt`` or the file extension.
+
+    Args:
+        path: Output file
+        points: ``(N, 3)`` points
+        colors: Optional ``(N, 4)`` uint8 RGBA
+        fmt: Format name; defaults to the file extension
+
+    Returns:
+        Bytes written
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    fmt = (fmt or Path(path).suffix.lstrip(".")).lower()
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(
+            f"Unsupported export format '{fmt}' (supported: {sorted(EXPORT_FORMATS)})"
+        )
+    return EXPORT_FORMATS[fmt](path, points, colors)
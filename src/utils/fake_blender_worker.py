@@ -0,0 +1,127 @@
+"""Blender-free stand-in for the background Blender worker.
+
+Speaks the same protocol as ``src/geometry_nodes/blender_worker.py`` so
+``WorkerPool`` can be developed and tested without Blender. Jobs are
+served by the headless engine: ``render`` writes a density preview PNG
+and ``export`` writes the exhaustive point cloud.
+
+Extra ops for exercising the pool:
+    - ``sleep``: Block for ``params["seconds"]``
+    - ``fail``: Raise an error inside the handler
+    - ``crash``: Exit the process without responding
+
+Usage:
+    python -m src.utils.fake_blender_worker [--startup-delay SECONDS]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Optional, Sequence
+
+from src.mcp.tools import resolve_preset
+from src.utils.blender_pool import Handler, serve_worker
+
+
+class FakeBlenderScene:
+    """Scene state kept between jobs, like the loaded ``.blend`` file."""
+
+    def __init__(self) -> None:
+        self.preset: Optional[Dict[str, Any]] = None
+
+    def apply_preset(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate a preset (name or dict) and make it current."""
+        self.preset = resolve_preset(params["preset"])
+        return {
+            "name": self.preset["name"],
+            "iterations": self.preset["iterations"],
+            "transform_count": len(self.preset["transforms"]),
+        }
+
+    def bulk_apply(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate every ``{"object", "preset"}`` item; the last one is current."""
+        presets = [resolve_preset(item["preset"]) for item in params["items"]]
+        if presets:
+            self.preset = presets[-1]
+        return {
+            "objects": len(presets),
+            "distinct_presets": len({json.dumps(p, sort_keys=True) for p in presets}),
+        }
+
+    def _points(self) -> Any:
+        from src.utils.ifs_engine import compile_preset, expand_exhaustive
+
+        if self.preset is None:
+            raise RuntimeError("No preset applied")
+        compiled = compile_preset(self.preset)
+        return expand_exhaustive(compiled.matrices, compiled.iterations)
+
+    def render(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Write a density preview of the current preset to ``filepath``."""
+        from src.utils.preview import DEFAULT_PREVIEW_SIZE, render_preview
+
+        data = render_preview(self._points(), params.get("size", DEFAULT_PREVIEW_SIZE))
+        with open(params["filepath"], "wb") as f:
+            f.write(data)
+        return {"filepath": params["filepath"], "bytes": len(data)}
+
+    def export(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Export the current preset's points to ``filepath``."""
+        from src.utils.exporters import export_points
+
+        points = self._points()
+        size = export_points(params["filepath"], points, fmt=params.get("format"))
+        return {"filepath": params["filepath"], "bytes": size, "points": len(points)}
+
+
+def _sleep(params: Dict[str, Any]) -> Dict[str, Any]:
+    time.sleep(float(params.get("seconds", 0)))
+    return {"slept": params.get("seconds", 0)}
+
+
+def _fail(params: Dict[str, Any]) -> None:
+    raise RuntimeError(params.get("message", "Requested failure"))
+
+
+def _crash(params: Dict[str, Any]) -> None:
+    os._exit(int(params.get("code", 1)))
+
+
+def build_handlers() -> Dict[str, Handler]:
+    """Create the handler table for a fresh fake scene."""
+    scene = FakeBlenderScene()
+    return {
+        "apply_preset": scene.apply_preset,
+        "bulk_apply": scene.bulk_apply,
+        "render": scene.render,
+        "export": scene.export,
+        "sleep": _sleep,
+        "fail": _fail,
+        "crash": _crash,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.utils.fake_blender_worker",
+        description="Blender-free worker for the Blender worker pool.",
+    )
+    parser.add_argument(
+        "--startup-delay",
+        type=float,
+        default=0.0,
+        help="Seconds to wait before announcing readiness (simulates start-up)",
+    )
+    args = parser.parse_args(argv)
+    time.sleep(args.startup_delay)
+    # Blender logs to stdout too; the pool must ignore unprefixed lines
+    print("Fake Blender worker starting", flush=True)
+    serve_worker(build_handlers())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
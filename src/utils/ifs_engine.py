@@ -0,0 +1,729 @@
+"""Headless NumPy IFS engine.
+
+Evaluates presets outside Blender, mirroring what the IFS_Generator node
+group computes: every transform is the affine map
+``p -> T(translation) · R(rotation) · S(scale) · p`` with Blender's XYZ
+Euler convention (rotation in degrees), and generation starts from a single
+point at the origin.
+
+Transforms are handled as stacked ``(..., 4, 4)`` homogeneous matrices so
+that batches of transform sets can be built and applied without Python
+loops.
+
+See docs/architecture.md §2.1 for the node group this engine mirrors.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+# Walkers advanced in lock-step by the chaos game
+DEFAULT_WALKERS = 1024
+
+# Steps discarded before recording, letting walkers converge onto the
+# attractor (error shrinks by the contractivity factor every step)
+DEFAULT_BURN_IN = 20
+
+# Default sample count for chaos-game generation
+DEFAULT_CHAOS_POINTS = 100_000
+
+# Largest composed-matrix table used to batch levels in stratified expansion
+STRATIFIED_TABLE_SIZE = 4096
+
+# Points per independently seeded block in the parallel chaos game. Part of
+# the output's identity: changing it changes the points for a given seed.
+CHAOS_BLOCK_POINTS = 1 << 16
+
+
+@dataclass(frozen=True)
+class CompiledPreset:
+    """Preset reduced to the arrays the engine works on.
+
+    Attributes:
+        matrices: ``(T, 4, 4)`` homogeneous transform matrices
+        weights: ``(T,)`` selection probabilities (sum to 1)
+        iterations: Iteration count from the preset
+        seed: Random seed from the preset
+    """
+
+    matrices: np.ndarray
+    weights: np.ndarray
+    iterations: int
+    seed: int
+
+    @property
+    def transform_count(self) -> int:
+        """Number of transforms in the set."""
+        return len(self.matrices)
+
+
+def rotation_matrices(rotation: np.ndarray) -> np.ndarray:
+    """Build rotation matrices from XYZ Euler angles in degrees.
+
+    Matches Blender's ``'XYZ'`` order: ``R = Rz · Ry · Rx``.
+
+    Args:
+        rotation: ``(..., 3)`` Euler angles in degrees
+
+    Returns:
+        ``(..., 3, 3)`` rotation matrices
+    """
+    rx, ry, rz = np.moveaxis(np.radians(np.asarray(rotation, dtype=float)), -1, 0)
+    cx, sx = np.cos(rx), np.sin(rx)
+    cy, sy = np.cos(ry), np.sin(ry)
+    cz, sz = np.cos(rz), np.sin(rz)
+    return np.stack(
+        [
+            np.stack([cz * cy, cz * sy * sx - sz * cx, cz * sy * cx + sz * sx], -1),
+            np.stack([sz * cy, sz * sy * sx + cz * cx, sz * sy * cx - cz * sx], -1),
+            np.stack([-sy, cy * sx, cy * cx], -1),
+        ],
+        -2,
+    )
+
+
+def affine_matrices(
+    scale: np.ndarray, rotation: np.ndarray, translation: np.ndarray
+) -> np.ndarray:
+    """Build homogeneous transform matrices from stacked components.
+
+    Args:
+        scale: ``(..., 3)`` per-axis scale
+        rotation: ``(..., 3)`` XYZ Euler angles in degrees
+        translation: ``(..., 3)`` translation
+
+    Returns:
+        ``(..., 4, 4)`` matrices applying scale, then rotation, then
+        translation
+    """
+    linear = rotation_matrices(rotation) * np.asarray(scale, dtype=float)[..., None, :]
+    shape = linear.shape[:-2]
+    matrices = np.zeros(shape + (4, 4))
+    matrices[..., :3, :3] = linear
+    matrices[..., :3, 3] = translation
+    matrices[..., 3, 3] = 1.0
+    return matrices
+
+
+def compose_matrices(transforms: Sequence[Mapping[str, Any]]) -> np.ndarray:
+    """Build the matrix stack for a preset's transform list.
+
+    Args:
+        transforms: Transform dictionaries (``scale``, ``rotation``,
+            ``translation``)
+
+    Returns:
+        ``(T, 4, 4)`` homogeneous matrices in transform order
+    """
+    return affine_matrices(
+        np.array([t["scale"] for t in transforms], dtype=float),
+        np.array([t["rotation"] for t in transforms], dtype=float),
+        np.array([t["translation"] for t in transforms], dtype=float),
+    )
+
+
+def compile_preset(preset: Mapping[str, Any]) -> CompiledPreset:
+    """Reduce a (validated) preset to engine arrays.
+
+    Args:
+        preset: Parsed preset dictionary
+
+    Returns:
+        Compiled preset with normalised weights
+
+    Raises:
+        ValueError: If the transform weights do not sum to a positive value
+    """
+    transforms = preset["transforms"]
+    weights = np.array([t["weight"] for t in transforms], dtype=float)
+    total = weights.sum()
+    if not total > 0:
+        raise ValueError(
+            f"Transform weights must sum to a positive value (got {total})"
+        )
+    return CompiledPreset(
+        matrices=compose_matrices(transforms),
+        weights=weights / total,
+        iterations=int(preset["iterations"]),
+        seed=int(preset.get("seed", 0)),
+    )
+
+
+def _selection_cdf(weights: np.ndarray) -> np.ndarray:
+    """Cumulative selection thresholds for ``(B, T)`` weights.
+
+    Every bin from the last positive weight onwards is set to infinity, so
+    draws rounding past the total select the last real transform and
+    zero-weight padding at the end of a row is never chosen.
+    """
+    cdf = np.cumsum(weights, axis=-1)
+    count = weights.shape[-1]
+    last = count - 1 - np.argmax(weights[:, ::-1] > 0, axis=-1)
+    cdf[np.arange(count) >= last[:, None]] = np.inf
+    return cdf
+
+
+def chaos_game_batched(
+    matrices: np.ndarray,
+    weights: np.ndarray,
+    steps: int,
+    rng: Union[np.random.Generator, Sequence[np.random.Generator]],
+    walkers: int = DEFAULT_WALKERS,
+    burn_in: int = DEFAULT_BURN_IN,
+) -> np.ndarray:
+    """Run independent chaos games for a batch of transform sets.
+
+    Each transform set advances ``walkers`` points in lock-step; every step
+    picks one transform per walker according to the weights. All batches
+    and walkers move in a single vectorised update per step.
+
+    Args:
+        matrices: ``(B, T, 4, 4)`` transform matrices
+        weights: ``(B, T)`` selection probabilities (rows sum to 1)
+        steps: Recorded steps per walker
+        rng: Random generator supplying every selection, or one generator
+            per transform set; each then draws exactly what ``chaos_game``
+            would draw for that set alone
+        walkers: Points advanced in parallel per transform set
+        burn_in: Unrecorded steps taken first
+
+    Returns:
+        ``(B, steps * walkers, 3)`` points, step-major within each batch
+    """
+    batch = matrices.shape[0]
+    linear = matrices[:, :, :3, :3]
+    offset = matrices[:, :, :3, 3]
+    cdf = _selection_cdf(np.asarray(weights, dtype=float))
+    rows = np.arange(batch)[:, None]
+    single: Optional[np.random.Generator] = None
+    if isinstance(rng, np.random.Generator):
+        single = rng
+    else:
+        generators = list(rng)
+        if len(generators) != batch:
+            raise ValueError(f"Expected {batch} generators (got {len(generators)})")
+        # Row b is generator b's stream in step-major order
+        pregenerated = np.stack(
+            [g.random((burn_in + steps, walkers)) for g in generators], axis=1
+        )
+
+    points = np.zeros((batch, walkers, 3))
+    # Batch-major, so the result is a view rather than a transposed copy
+    out = np.empty((batch, steps, walkers, 3))
+    for step in range(burn_in + steps):
+        if single is not None:
+            draws = single.random((batch, walkers))
+        else:
+            draws = pregenerated[step]
+        choice = (draws[:, :, None] >= cdf[:, None, :]).sum(axis=-1)
+        points = (
+            np.einsum("bwij,bwj->bwi", linear[rows, choice], points)
+            + offset[rows, choice]
+        )
+        if step >= burn_in:
+            out[:, step - burn_in] = points
+    return out.reshape(batch, steps * walkers, 3)
+
+
+def chaos_game(
+    matrices: np.ndarray,
+    weights: np.ndarray,
+    n_points: int,
+    seed: int = 0,
+    walkers: Optional[int] = None,
+    burn_in: int = DEFAULT_BURN_IN,
+) -> np.ndarray:
+    """Sample points on the attractor of one transform set.
+
+    Args:
+        matrices: ``(T, 4, 4)`` transform matrices
+        weights: ``(T,)`` selection probabilities (sum to 1)
+        n_points: Number of points to return
+        seed: Random seed
+        walkers: Points advanced in parallel (default: up to 1024)
+        burn_in: Unrecorded steps taken first
+
+    Returns:
+        ``(n_points, 3)`` points
+    """
+    walkers = walkers or max(1, min(DEFAULT_WALKERS, n_points))
+    steps = -(-n_points // walkers)
+    points = chaos_game_batched(
+        matrices[None],
+        np.asarray(weights, dtype=float)[None],
+        steps,
+        np.random.default_rng(seed),
+        walkers=walkers,
+        burn_in=burn_in,
+    )
+    return points[0, :n_points]
+
+
+@dataclass(frozen=True)
+class PresetBatch:
+    """Compiled presets stacked along a leading batch axis.
+
+    Transform sets shorter than the longest one are padded with identity
+    matrices of weight zero, which the chaos game never selects.
+
+    Attributes:
+        matrices: ``(B, T, 4, 4)`` transform matrices, ``T`` the largest
+            transform count in the batch
+        weights: ``(B, T)`` selection probabilities, zero for padding
+        transform_counts: ``(B,)`` real transform count of each entry
+        seeds: ``(B,)`` random seed of each entry
+    """
+
+    matrices: np.ndarray
+    weights: np.ndarray
+    transform_counts: np.ndarray
+    seeds: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.matrices)
+
+
+def stack_presets(
+    presets: Sequence[CompiledPreset], seeds: Optional[Sequence[int]] = None
+) -> PresetBatch:
+    """Stack compiled presets (and seeds) into one batch.
+
+    A single preset is repeated for every seed, so a seed sweep is
+    ``stack_presets([compiled], seeds=range(1000))``.
+
+    Args:
+        presets: Compiled presets, one per entry or one for all entries
+        seeds: Seed of each entry (default: each preset's own seed)
+
+    Returns:
+        Batch ready for ``chaos_game_multi``
+
+    Raises:
+        ValueError: If the batch is empty or the lengths do not match
+    """
+    presets = list(presets)
+    if seeds is None:
+        seeds = [preset.seed for preset in presets]
+    seeds = [int(seed) for seed in seeds]
+    if len(presets) == 1:
+        presets = presets * len(seeds)
+    if not presets or len(presets) != len(seeds):
+        raise ValueError(
+            f"Need one seed per preset (got {len(presets)} presets, "
+            f"{len(seeds)} seeds)"
+        )
+    counts = np.array([preset.transform_count for preset in presets])
+    size = int(counts.max())
+    matrices = np.broadcast_to(np.eye(4), (len(presets), size, 4, 4)).copy()
+    weights = np.zeros((len(presets), size))
+    for index, preset in enumerate(presets):
+        matrices[index, : counts[index]] = preset.matrices
+        weights[index, : counts[index]] = preset.weights
+    return PresetBatch(matrices, weights, counts, np.array(seeds))
+
+
+def chaos_game_multi(
+    batch: PresetBatch,
+    n_points: int,
+    walkers: Optional[int] = None,
+    burn_in: int = DEFAULT_BURN_IN,
+) -> np.ndarray:
+    """Sample every entry of a batch in one vectorised chaos game.
+
+    Entry ``b`` is identical to ``chaos_game`` on that preset with seed
+    ``batch.seeds[b]``: each entry draws from its own generator, while all
+    entries advance together in every step.
+
+    Args:
+        batch: Stacked presets from ``stack_presets``
+        n_points: Points per entry
+        walkers: Points advanced in parallel per entry (default: up to 1024)
+        burn_in: Unrecorded steps taken first
+
+    Returns:
+        ``(B, n_points, 3)`` points
+    """
+    walkers = walkers or max(1, min(DEFAULT_WALKERS, n_points))
+    steps = -(-n_points // walkers)
+    points = chaos_game_batched(
+        batch.matrices,
+        batch.weights,
+        steps,
+        [np.random.default_rng(seed) for seed in batch.seeds.tolist()],
+        walkers=walkers,
+        burn_in=burn_in,
+    )
+    return points[:, :n_points]
+
+
+def block_rng(seed: int, block: int) -> np.random.Generator:
+    """Random stream for one chaos-game block.
+
+    Streams are spawned from ``SeedSequence(seed)`` keyed by block index, so
+    every block's draws depend only on the seed and the block number, never
+    on which worker runs it or how many workers there are.
+
+    Args:
+        seed: Preset seed
+        block: Block index
+
+    Returns:
+        Independent generator for the block
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(block,)))
+
+
+def _chaos_block(
+    args: Tuple[np.ndarray, np.ndarray, int, int, int, int, int],
+) -> np.ndarray:
+    """Worker entry point: sample one block (picklable for process pools)."""
+    matrices, weights, seed, block, count, walkers, burn_in = args
+    steps = -(-count // walkers)
+    points = chaos_game_batched(
+        matrices[None],
+        weights[None],
+        steps,
+        block_rng(seed, block),
+        walkers=walkers,
+        burn_in=burn_in,
+    )
+    return points[0, :count]
+
+
+def _chaos_jobs(
+    matrices: np.ndarray,
+    weights: np.ndarray,
+    n_points: int,
+    seed: int,
+    block_points: int,
+    burn_in: int,
+) -> List[Tuple[np.ndarray, np.ndarray, int, int, int, int, int]]:
+    """Arguments of ``_chaos_block`` for every block of a sample."""
+    weights = np.asarray(weights, dtype=float)
+    # Walker count depends only on the block size, so a short final block is
+    # a prefix of the full block and smaller samples prefix larger ones
+    walkers = min(DEFAULT_WALKERS, block_points)
+    return [
+        (matrices, weights, seed, block, min(block_points, n_points - start))
+        + (walkers, burn_in)
+        for block, start in enumerate(range(0, n_points, block_points))
+    ]
+
+
+def iter_chaos_blocks(
+    matrices: np.ndarray,
+    weights: np.ndarray,
+    n_points: int,
+    seed: int = 0,
+    block_points: int = CHAOS_BLOCK_POINTS,
+    burn_in: int = DEFAULT_BURN_IN,
+) -> Iterator[np.ndarray]:
+    """Yield the blocks of ``chaos_game_parallel`` one at a time.
+
+    Concatenated, the blocks equal ``chaos_game_parallel`` with the same
+    arguments, but only one block is held in memory.
+    """
+    if block_points < 1:
+        raise ValueError(f"Block size must be positive (got {block_points})")
+    for job in _chaos_jobs(matrices, weights, n_points, seed, block_points, burn_in):
+        yield _chaos_block(job)
+
+
+def chaos_game_parallel(
+    matrices: np.ndarray,
+    weights: np.ndarray,
+    n_points: int,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    block_points: int = CHAOS_BLOCK_POINTS,
+    burn_in: int = DEFAULT_BURN_IN,
+) -> np.ndarray:
+    """Sample the attractor in independently seeded blocks, in parallel.
+
+    The sample is split into fixed-size blocks, each drawing from its own
+    ``block_rng(seed, block)`` stream, and blocks are concatenated in index
+    order. The result is therefore bit-identical for any ``workers`` value
+    (architecture §4.3: reproducible across sessions and machines).
+
+    Args:
+        matrices: ``(T, 4, 4)`` transform matrices
+        weights: ``(T,)`` selection probabilities (sum to 1)
+        n_points: Number of points to return
+        seed: Random seed
+        workers: Worker processes (``None`` or 1 samples in-process)
+        block_points: Points per block; fixed for reproducibility
+        burn_in: Unrecorded steps taken first in every block
+
+    Returns:
+        ``(n_points, 3)`` points
+    """
+    if block_points < 1:
+        raise ValueError(f"Block size must be positive (got {block_points})")
+    jobs = _chaos_jobs(matrices, weights, n_points, seed, block_points, burn_in)
+    if not jobs:
+        return np.empty((0, 3))
+    if workers is None or workers <= 1 or len(jobs) == 1:
+        blocks = [_chaos_block(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(min(workers, len(jobs))) as pool:
+            blocks = list(pool.map(_chaos_block, jobs))
+    return np.concatenate(blocks)
+
+
+def compose_table(matrices: np.ndarray, depth: int) -> np.ndarray:
+    """Compose every address of a given depth into one matrix.
+
+    Entry ``k`` is ``M[a1] · M[a2] · ... · M[a_depth]`` where
+    ``(a1, ..., a_depth)`` is the base-``T`` expansion of ``k`` (``a1`` most
+    significant), i.e. addresses are in lexicographic order.
+
+    Args:
+        matrices: ``(T, 4, 4)`` transform matrices
+        depth: Address length (0 gives the identity)
+
+    Returns:
+        ``(T**depth, 4, 4)`` composed matrices
+    """
+    table = np.eye(4)[None]
+    for _ in range(depth):
+        table = (matrices[:, None] @ table[None]).reshape(-1, 4, 4)
+    return table
+
+
+def expand_step(matrices: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Apply every transform to every point once.
+
+    Args:
+        matrices: ``(T, 4, 4)`` transform matrices
+        points: ``(N, 3)`` points
+
+    Returns:
+        ``(T * N, 3)`` points; entry ``a * N + k`` is ``M[a] · points[k]``
+    """
+    # Batched matmul (BLAS) is several times faster than the equivalent einsum
+    linear = matrices[:, :3, :3].transpose(0, 2, 1)
+    return (points @ linear + matrices[:, None, :3, 3]).reshape(-1, 3)
+
+
+def expand_exhaustive(
+    matrices: np.ndarray, iterations: int, prefix: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Apply every transform to every point for ``iterations`` steps.
+
+    This is the deterministic ``T^n`` expansion the Repeat Zone performs,
+    starting from a single point at the origin. Points are ordered by
+    address: point ``k`` is ``M[a1] · ... · M[an] · origin`` for the
+    base-``T`` digits of ``k``.
+
+    Args:
+        matrices: ``(T, 4, 4)`` transform matrices
+        iterations: Expansion depth ``n``
+        prefix: Optional ``(4, 4)`` matrix applied to every point, used to
+            evaluate the subtree below a fixed address prefix
+
+    Returns:
+        ``(T**n, 3)`` points
+    """
+    points = np.zeros((1, 3))
+    for _ in range(iterations):
+        points = expand_step(matrices, points)
+    if prefix is not None:
+        points = points @ prefix[:3, :3].T + prefix[:3, 3]
+    return points
+
+
+def iter_exhaustive_chunks(
+    matrices: np.ndarray, iterations: int, chunk_points: int
+) -> Iterator[np.ndarray]:
+    """Yield the exhaustive expansion in address-ordered chunks.
+
+    The tree is cut at the shallowest prefix depth ``d`` whose subtrees
+    hold at most ``chunk_points`` points. The depth ``n - d`` subtree is
+    expanded once and every chunk is that subtree mapped by one prefix's
+    composed matrix, so the chunks concatenate to ``expand_exhaustive``.
+
+    Args:
+        matrices: ``(T, 4, 4)`` transform matrices
+        iterations: Expansion depth ``n``
+        chunk_points: Upper bound on points per chunk
+
+    Yields:
+        ``(T**(n - d), 3)`` point chunks
+    """
+    if chunk_points < 1:
+        raise ValueError(f"Chunk size must be positive (got {chunk_points})")
+    transform_count = len(matrices)
+    depth = 0
+    while depth < iterations and transform_count ** (iterations - depth) > chunk_points:
+        depth += 1
+    subtree = expand_exhaustive(matrices, iterations - depth)
+    for prefix in compose_table(matrices, depth):
+        yield subtree @ prefix[:3, :3].T + prefix[:3, 3]
+
+
+def expand_levels(
+    matrices: np.ndarray, iterations: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Points created at every iteration, with their iteration index.
+
+    Mirrors the node group's merge of each iteration's output: the cloud is
+    the concatenation of the expansions at depths ``0..iterations`` (the
+    origin, then ``T`` points, then ``T**2`` ...), each in address order.
+
+    Args:
+        matrices: ``(T, 4, 4)`` transform matrices
+        iterations: Final depth
+
+    Returns:
+        ``(points, depths)``: ``(N, 3)`` points and the ``(N,)`` iteration
+        that created each, where ``N = sum(T**d for d in 0..iterations)``
+    """
+    levels = [np.zeros((1, 3))]
+    for _ in range(iterations):
+        levels.append(expand_step(matrices, levels[-1]))
+    depths = np.repeat(
+        np.arange(iterations + 1, dtype=np.int32), [len(level) for level in levels]
+    )
+    return np.concatenate(levels), depths
+
+
+def fixed_point(matrix: np.ndarray) -> np.ndarray:
+    """Fixed point of a contractive affine map (it lies on the attractor).
+
+    Args:
+        matrix: ``(4, 4)`` transform matrix
+
+    Returns:
+        ``(3,)`` point ``x`` with ``M · x = x``
+    """
+    return np.linalg.solve(np.eye(3) - matrix[:3, :3], matrix[:3, 3])
+
+
+def expand_stratified(
+    matrices: np.ndarray,
+    weights: np.ndarray,
+    budget: int,
+    anchor: Optional[np.ndarray] = None,
+    max_depth: int = 256,
+    return_depths: bool = False,
+) -> Any:
+    """Deterministically distribute a point budget over the address tree.
+
+    The budget is split recursively among child branches in proportion to
+    their weights: point ``j`` takes the stratified value
+    ``u = (j + 0.5) / budget`` and descends the tree like an arithmetic
+    decoder, choosing at every node the child whose share of the node's
+    interval contains ``u``. A point stops once its node's interval
+    (the product of the weights along its address) is at most
+    ``1 / budget``, i.e. once no other point shares its branch, and is
+    placed at that address's image of ``anchor``.
+
+    The result has the density of a chaos game with the same weights but
+    no sampling noise, exactly ``budget`` points, and address order.
+
+    Args:
+        matrices: ``(T, 4, 4)`` transform matrices
+        weights: ``(T,)`` probabilities (sum to 1)
+        budget: Exact number of points to return
+        anchor: Point mapped through each address (default: fixed point of
+            the most probable transform, which lies on the attractor)
+        max_depth: Maximum address length
+        return_depths: Also return each point's address length
+
+    Returns:
+        ``(budget, 3)`` points, or ``(points, depths)`` with ``(budget,)``
+        int32 depths if ``return_depths`` is set
+
+    Raises:
+        ValueError: If ``budget`` is less than 1
+    """
+    if budget < 1:
+        raise ValueError(f"Point budget must be positive (got {budget})")
+    weights = np.asarray(weights, dtype=float)
+    if anchor is None:
+        anchor = fixed_point(matrices[int(np.argmax(weights))])
+    transform_count = len(matrices)
+    cdf = np.concatenate([[0.0], np.cumsum(weights)])
+    # Levels are processed in groups whose composed maps fit a small table
+    group = max(1, int(np.log(STRATIFIED_TABLE_SIZE) / np.log(max(transform_count, 2))))
+    tables = [compose_table(matrices, d) for d in range(group + 1)]
+    table_start = np.cumsum([0] + [len(t) for t in tables])
+    table = np.concatenate(tables)
+
+    u = (np.arange(budget) + 0.5) / budget
+    width = np.ones(budget)
+    # A point stops once its branch is narrower than this. The tolerance
+    # keeps exact splits (e.g. 3^n points over 3 equal weights) from
+    # descending one level too far through rounding.
+    limit = (1.0 + 1e-9) / budget
+    # Descend, recording per group which points keep splitting (relative to
+    # the previous group's survivors) and the sub-address each one takes
+    groups = []
+    for _ in range(-(-max_depth // group)):
+        keep = width > limit
+        if not keep.any():
+            break
+        u, width = u[keep], width[keep]
+        code = np.zeros(len(u), dtype=np.int64)
+        digits = np.zeros(len(u), dtype=np.int64)
+        splitting = np.arange(len(u))
+        for level in range(group):
+            if level:
+                splitting = splitting[width[splitting] > limit]
+            child = np.searchsorted(cdf[1:-1], u[splitting], side="right")
+            u[splitting] = (u[splitting] - cdf[child]) / weights[child]
+            width[splitting] *= weights[child]
+            code[splitting] = code[splitting] * transform_count + child
+            digits[splitting] += 1
+        groups.append((keep, table_start[digits] + code, digits))
+
+    # Evaluate M[a1] · ... · M[ad] · anchor, deepest group first
+    anchor = np.asarray(anchor, dtype=float)
+    points = np.tile(anchor, (budget, 1))
+    depths = np.zeros(budget, dtype=np.int32)
+    below: Optional[np.ndarray] = None
+    below_depths: Optional[np.ndarray] = None
+    for keep, entry, digits in reversed(groups):
+        if below is None:
+            below = np.broadcast_to(anchor, (len(entry), 3))
+            below_depths = np.zeros(len(entry), dtype=np.int32)
+        mapped = np.einsum("nij,nj->ni", table[entry, :3, :3], below)
+        mapped += table[entry, :3, 3]
+        points = np.tile(anchor, (len(keep), 1))
+        points[keep] = mapped
+        depths = np.zeros(len(keep), dtype=np.int32)
+        depths[keep] = below_depths + digits
+        below, below_depths = points, depths
+    return (points, depths) if return_depths else points
+
+
+def summarize_points(points: np.ndarray) -> Dict[str, Any]:
+    """Compute JSON-friendly statistics for a point cloud.
+
+    Args:
+        points: ``(N, 3)`` points
+
+    Returns:
+        ``point_count``, ``bbox_min``, ``bbox_max`` and ``centroid``
+        (bounds and centroid are ``None`` for an empty cloud)
+    """
+    if not len(points):
+        return {"point_count": 0, "bbox_min": None, "bbox_max": None, "centroid": None}
+    return {
+        "point_count": int(len(points)),
+        "bbox_min": points.min(axis=0).tolist(),
+        "bbox_max": points.max(axis=0).tolist(),
+        "centroid": points.mean(axis=0).tolist(),
+    }
@@ -7,7 +7,7 @@ See docs/architecture.md §4 for constraint details and rationale.
 See .cursorrules for implementation guidelines.
 """
 
-from typing import NoReturn
+from typing import Any, Mapping, NoReturn, Sequence
 
 
 def calculate_point_count(transform_count: int, iterations: int) -> int:
@@ -89,3 +89,59 @@ def enforce_iteration_limits(transform_count: int, iterations: int) -> None:
             f"Maximum 12 iterations (got {iterations})"
         )
 
+
+def calculate_contractivity(transforms: Sequence[Mapping[str, Any]]) -> float:
+    """Calculate the contraction factor of a transform set.
+
+    Each transform maps ``p -> R(rotation) · S(scale) · p + translation``.
+    Rotation matrices are orthogonal, so the singular values of the linear
+    part are exactly ``|scale_x|, |scale_y|, |scale_z|`` and the Lipschitz
+    constant of a single transform is its largest absolute scale component.
+    The IFS as a whole contracts with the largest factor over all transforms.
+
+    Args:
+        transforms: Transform dictionaries with a ``scale`` entry (XYZ)
+
+    Returns:
+        Contraction factor; values < 1 guarantee a bounded attractor
+
+    Examples:
+        >>> calculate_contractivity([{"scale": [0.5, 0.5, 0.5]}])
+        0.5
+        >>> calculate_contractivity([{"scale": [0.85, -0.9, 0.1]}])
+        0.9
+    """
+    if not transforms:
+        return 0.0
+    return max(
+        max(abs(float(component)) for component in transform["scale"])
+        for transform in transforms
+    )
+
+
+def infer_dimensionality(transforms: Sequence[Mapping[str, Any]]) -> int:
+    """Infer whether a transform set produces a 2D or 3D attractor.
+
+    Generation starts from a single point at the origin, so the attractor
+    stays in the XY plane exactly when every transform maps that plane to
+    itself: no Z translation and no rotation about the X or Y axes.
+
+    Args:
+        transforms: Transform dictionaries with ``rotation`` and
+            ``translation`` entries (XYZ); missing entries count as zero
+
+    Returns:
+        2 for planar transform sets, 3 otherwise
+
+    Examples:
+        >>> infer_dimensionality([{"rotation": [0, 0, 45], "translation": [1, 0, 0]}])
+        2
+        >>> infer_dimensionality([{"rotation": [30, 0, 0], "translation": [0, 0, 0]}])
+        3
+    """
+    for transform in transforms:
+        rotation = transform.get("rotation", (0, 0, 0))
+        translation = transform.get("translation", (0, 0, 0))
+        if rotation[0] or rotation[1] or translation[2]:
+            return 3
+    return 2
@@ -0,0 +1,539 @@
+"""Memory monitoring for generation (architecture §8: geometry explosion).
+
+Iteration caps alone do not stop a run from exhausting memory: 8
+transforms at 8 iterations is already 16.7M points, several times that
+in temporaries, and batch nodes run several jobs at once. This module
+adds two layers on top of the caps:
+
+1. **Prediction** (``plan_generation``): the peak memory of a request is
+   estimated before anything is allocated. Requests over the limit are
+   downgraded (fewer iterations, or a fixed point budget instead of the
+   full expansion) or rejected with ``MemoryLimitExceeded``.
+   ``plan_blender_output`` does the same for the Blender node group,
+   stepping realized geometry down to instances and points first.
+2. **Monitoring** (``MemoryGuard``): while a generation runs, a sampler
+   thread tracks process RSS (or ``tracemalloc``, which also sees NumPy
+   buffers) against the limit. ``guarded_expand`` consults the guard
+   before each level, so a runaway expansion stops at the last level that
+   fits instead of being killed by the OS; ``guarded_levels`` does the
+   same for the per-iteration merge and ``guard_chunks`` checks streamed
+   generations between chunks.
+
+The MCP tools, ``export_preset`` (and with it ``ifs-gen``), progressive
+refinement and parameter sweeps all plan first and run under a guard.
+
+Example:
+    >>> plan = plan_generation(8, 10, limit_bytes=2 * 1024**3)
+    >>> with MemoryGuard(plan.predicted_bytes * 2) as guard:
+    ...     points, depth = guarded_expand(matrices, plan.iterations, guard)
+"""
+
+import os
+import threading
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, MutableMapping, Optional, Tuple
+
+import numpy as np
+
+from src.utils.ifs_engine import expand_step
+
+# float64 XYZ per point
+BYTES_PER_POINT = 24
+
+# Peak over final size during an exhaustive step: the previous level, the
+# product and the translated result are alive at once
+EXPANSION_PEAK_FACTOR = 2.5
+
+# Peak over final size for sampled modes (walker state, stacked output)
+SAMPLING_PEAK_FACTOR = 2.0
+
+# Share of available memory a generation may use by default
+DEFAULT_MEMORY_FRACTION = 0.5
+
+# Seconds between RSS samples
+DEFAULT_SAMPLE_INTERVAL = 0.05
+
+# Downgrade policies for requests predicted to exceed the limit
+POLICIES = ("reduce_iterations", "points", "raise")
+
+# IFS_Generator "Output Mode" socket values
+BLENDER_OUTPUT_MODES = {0: "points", 1: "instanced", 2: "realized"}
+
+# Blender memory per point for points and instances (attributes, instance
+# transforms and the previous Repeat Zone iteration's geometry)
+BLENDER_POINT_BYTES = 64
+BLENDER_INSTANCE_BYTES = 160
+
+# Blender memory per realized vertex (position, attributes, topology)
+BLENDER_VERTEX_BYTES = 96
+
+# Vertices of the default instance mesh (a cube)
+DEFAULT_INSTANCE_VERTICES = 8
+
+# IFS_Generator input name prefix of the render and viewport stages
+BLENDER_STAGES = {"final": "", "preview": "Preview "}
+
+
+class MemoryLimitExceeded(MemoryError):
+    """Raised when a generation would exceed, or has exceeded, its memory limit."""
+
+
+def available_memory() -> Optional[int]:
+    """Memory available to new allocations, in bytes (``None`` if unknown).
+
+    Reads ``MemAvailable`` from ``/proc/meminfo`` (Linux).
+    """
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def process_rss() -> Optional[int]:
+    """Resident set size of this process, in bytes (``None`` if unknown)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def predict_generation_bytes(
+    transform_count: int,
+    iterations: int,
+    mode: str = "exhaustive",
+    n_points: Optional[int] = None,
+    bytes_per_point: int = BYTES_PER_POINT,
+) -> int:
+    """Estimate the peak memory of a generation.
+
+    Args:
+        transform_count: Transforms ``T``
+        iterations: Expansion depth (exhaustive mode)
+        mode: ``"exhaustive"``, ``"chaos"`` or ``"stratified"``
+        n_points: Point count for sampled modes
+        bytes_per_point: Storage per output point
+
+    Returns:
+        Predicted peak bytes
+    """
+    if mode == "exhaustive":
+        points = transform_count**iterations
+        return int(EXPANSION_PEAK_FACTOR * bytes_per_point * points)
+    return int(SAMPLING_PEAK_FACTOR * bytes_per_point * (n_points or 0))
+
+
+def default_limit(fraction: float = DEFAULT_MEMORY_FRACTION) -> Optional[int]:
+    """``fraction`` of the currently available memory (``None`` if unknown)."""
+    available = available_memory()
+    return None if available is None else int(available * fraction)
+
+
+@dataclass
+class GenerationPlan:
+    """Generation parameters after the memory check.
+
+    Attributes:
+        mode: Generation mode to run
+        iterations: Expansion depth (exhaustive mode)
+        n_points: Point budget (sampled modes)
+        predicted_bytes: Predicted peak of the planned run
+        downgrade: Description of the change made to fit the limit, or
+            ``None`` if the request fit as given
+    """
+
+    mode: str
+    iterations: int
+    n_points: Optional[int]
+    predicted_bytes: int
+    downgrade: Optional[str] = None
+
+
+def plan_generation(
+    transform_count: int,
+    iterations: int,
+    mode: str = "exhaustive",
+    n_points: Optional[int] = None,
+    limit_bytes: Optional[int] = None,
+    policy: str = "reduce_iterations",
+    bytes_per_point: int = BYTES_PER_POINT,
+) -> GenerationPlan:
+    """Check a request against a memory limit before running it.
+
+    Policies for requests over the limit:
+        - ``reduce_iterations``: Deepest exhaustive depth that fits
+          (sampled modes get the largest point budget that fits)
+        - ``points``: Replace the exhaustive expansion by a stratified
+          point budget that fits, keeping full-depth detail
+        - ``raise``: Reject the request
+
+    Args:
+        transform_count: Transforms ``T``
+        iterations: Requested depth
+        mode: Requested mode
+        n_points: Requested point budget (sampled modes)
+        limit_bytes: Limit (default: ``default_limit()``; no limit if unknown)
+        policy: One of ``POLICIES``
+        bytes_per_point: Storage per output point
+
+    Returns:
+        Plan to run
+
+    Raises:
+        MemoryLimitExceeded: If the policy is ``raise`` or nothing fits
+        ValueError: If the policy is unknown
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Policy must be one of {list(POLICIES)} (got {policy!r})")
+    if limit_bytes is None:
+        limit_bytes = default_limit()
+
+    def predict(depth: int, points: Optional[int], run_mode: str) -> int:
+        return predict_generation_bytes(
+            transform_count, depth, run_mode, points, bytes_per_point
+        )
+
+    predicted = predict(iterations, n_points, mode)
+    if limit_bytes is None or predicted <= limit_bytes:
+        return GenerationPlan(mode, iterations, n_points, predicted)
+    message = (
+        f"Generation needs about {predicted / 2**20:.0f} MiB "
+        f"(limit {limit_bytes / 2**20:.0f} MiB)"
+    )
+    if policy == "raise":
+        raise MemoryLimitExceeded(message)
+
+    if mode == "exhaustive" and policy == "reduce_iterations":
+        depth = iterations
+        while depth > 1 and predict(depth, None, mode) > limit_bytes:
+            depth -= 1
+        if predict(depth, None, mode) > limit_bytes:
+            raise MemoryLimitExceeded(message)
+        return GenerationPlan(
+            mode,
+            depth,
+            n_points,
+            predict(depth, None, mode),
+            f"{message}; reduced iterations from {iterations} to {depth}",
+        )
+
+    # Largest point budget that fits, never more than was asked for
+    run_mode = "stratified" if mode == "exhaustive" else mode
+    requested = transform_count**iterations if mode == "exhaustive" else n_points
+    budget = limit_bytes // predict(iterations, 1, run_mode)
+    if requested is not None:
+        budget = min(budget, requested)
+    if budget < 1:
+        raise MemoryLimitExceeded(message)
+    return GenerationPlan(
+        run_mode,
+        iterations,
+        int(budget),
+        predict(iterations, int(budget), run_mode),
+        f"{message}; using {budget} {run_mode} points",
+    )
+
+
+def blender_bytes_per_point(
+    output_mode: int, instance_vertices: int = DEFAULT_INSTANCE_VERTICES
+) -> int:
+    """Approximate Blender memory per IFS point for an output mode."""
+    if output_mode == 2:
+        return BLENDER_INSTANCE_BYTES + BLENDER_VERTEX_BYTES * instance_vertices
+    if output_mode == 1:
+        return BLENDER_INSTANCE_BYTES
+    return BLENDER_POINT_BYTES
+
+
+@dataclass
+class BlenderOutputPlan:
+    """IFS_Generator inputs after the memory check.
+
+    Attributes:
+        output_mode: ``Output Mode`` socket value to use
+        iterations: ``Iterations`` socket value to use
+        predicted_bytes: Predicted evaluation peak
+        downgrade: Description of the changes made, or ``None``
+    """
+
+    output_mode: int
+    iterations: int
+    predicted_bytes: int
+    downgrade: Optional[str] = None
+
+
+def plan_blender_output(
+    transform_count: int,
+    iterations: int,
+    output_mode: int = 0,
+    instance_vertices: int = DEFAULT_INSTANCE_VERTICES,
+    limit_bytes: Optional[int] = None,
+) -> BlenderOutputPlan:
+    """Fit a node-group evaluation into a memory limit.
+
+    Realized geometry is downgraded to instances, then instances to bare
+    points, and only then are iterations reduced.
+
+    Args:
+        transform_count: Transforms ``T``
+        iterations: Requested ``Iterations``
+        output_mode: Requested ``Output Mode`` (see ``BLENDER_OUTPUT_MODES``)
+        instance_vertices: Vertices of the instance mesh
+        limit_bytes: Limit (default: ``default_limit()``; no limit if unknown)
+
+    Returns:
+        Inputs to apply
+
+    Raises:
+        MemoryLimitExceeded: If one iteration of bare points does not fit
+    """
+    if limit_bytes is None:
+        limit_bytes = default_limit()
+
+    def predict(mode: int, depth: int) -> int:
+        return predict_generation_bytes(
+            transform_count,
+            depth,
+            bytes_per_point=blender_bytes_per_point(mode, instance_vertices),
+        )
+
+    requested = predict(output_mode, iterations)
+    if limit_bytes is None or requested <= limit_bytes:
+        return BlenderOutputPlan(output_mode, iterations, requested)
+    message = (
+        f"{BLENDER_OUTPUT_MODES[output_mode]} output needs about "
+        f"{requested / 2**20:.0f} MiB (limit {limit_bytes / 2**20:.0f} MiB)"
+    )
+    for mode in range(output_mode - 1, -1, -1):
+        if predict(mode, iterations) <= limit_bytes:
+            return BlenderOutputPlan(
+                mode,
+                iterations,
+                predict(mode, iterations),
+                f"{message}; switched to {BLENDER_OUTPUT_MODES[mode]} output",
+            )
+    depth = iterations
+    while depth > 1 and predict(0, depth) > limit_bytes:
+        depth -= 1
+    if predict(0, depth) > limit_bytes:
+        raise MemoryLimitExceeded(message)
+    return BlenderOutputPlan(
+        0,
+        depth,
+        predict(0, depth),
+        f"{message}; switched to points output with {depth} iterations",
+    )
+
+
+def plan_modifier_inputs(
+    values: MutableMapping[str, Any],
+    transform_count: int,
+    output_mode: int,
+    instance_vertices: int = DEFAULT_INSTANCE_VERTICES,
+    limit_bytes: Optional[int] = None,
+) -> Dict[str, BlenderOutputPlan]:
+    """Plan both stages of IFS_Generator inputs and apply the plans.
+
+    The ``Iterations``/``Output Mode`` inputs and their ``Preview``
+    counterparts in ``values`` are replaced by the planned ones.
+
+    Args:
+        values: Modifier inputs from ``preset_inputs``, updated in place
+        transform_count: Transforms ``T``
+        output_mode: Render-stage ``Output Mode`` (the viewport stage uses
+            ``Preview Output Mode`` from ``values``)
+        instance_vertices: Vertices of the instance mesh
+        limit_bytes: Limit per stage (default: ``default_limit()``)
+
+    Returns:
+        Plan of each stage in ``BLENDER_STAGES``
+
+    Raises:
+        MemoryLimitExceeded: If a stage does not fit even as bare points
+    """
+    requested = {"final": output_mode, "preview": values["Preview Output Mode"]}
+    plans = {
+        stage: plan_blender_output(
+            transform_count,
+            values[f"{prefix}Iterations"],
+            output_mode=requested[stage],
+            instance_vertices=instance_vertices,
+            limit_bytes=limit_bytes,
+        )
+        for stage, prefix in BLENDER_STAGES.items()
+    }
+    for stage, prefix in BLENDER_STAGES.items():
+        values[f"{prefix}Iterations"] = plans[stage].iterations
+        values[f"{prefix}Output Mode"] = plans[stage].output_mode
+    return plans
+
+
+class MemoryGuard:
+    """Track memory used by a generation against a limit.
+
+    Usage is measured relative to the moment the guard is entered, from
+    process RSS sampled on a background thread or, with
+    ``use_tracemalloc``, from ``tracemalloc`` (which NumPy reports its
+    buffers to; exact but slower, useful on platforms without RSS).
+
+    Args:
+        limit_bytes: Limit on additional memory (default: ``default_limit()``;
+            the guard only records usage if no limit is known)
+        interval: Seconds between samples
+        use_tracemalloc: Measure traced allocations instead of RSS
+    """
+
+    def __init__(
+        self,
+        limit_bytes: Optional[int] = None,
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
+        use_tracemalloc: bool = False,
+    ) -> None:
+        self.limit_bytes = default_limit() if limit_bytes is None else limit_bytes
+        self.interval = interval
+        self.use_tracemalloc = use_tracemalloc or process_rss() is None
+        self.peak = 0
+        self._baseline = 0
+        self._exceeded = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_tracemalloc = False
+
+    def usage(self) -> int:
+        """Bytes in use above the baseline."""
+        if self.use_tracemalloc:
+            current = tracemalloc.get_traced_memory()[0]
+        else:
+            current = process_rss() or 0
+        return max(0, current - self._baseline)
+
+    def sample(self) -> int:
+        """Measure usage now, updating the peak and the exceeded flag."""
+        used = self.usage()
+        self.peak = max(self.peak, used)
+        if self.limit_bytes is not None and used > self.limit_bytes:
+            self._exceeded.set()
+        return used
+
+    def allows(self, nbytes: int) -> bool:
+        """Whether ``nbytes`` more can be allocated within the limit."""
+        if self.limit_bytes is None:
+            return True
+        return self.sample() + nbytes <= self.limit_bytes
+
+    def check(self) -> None:
+        """Raise if the limit has been exceeded at any sample.
+
+        Raises:
+            MemoryLimitExceeded: With the peak and the limit
+        """
+        self.sample()
+        if self._exceeded.is_set():
+            raise MemoryLimitExceeded(
+                f"Generation used {self.peak / 2**20:.0f} MiB "
+                f"(limit {self.limit_bytes / 2**20:.0f} MiB)"
+            )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self) -> "MemoryGuard":
+        if self.use_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._baseline = 0
+        self._baseline = self.usage()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        self._thread.join()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+
+def guarded_expand(
+    matrices: np.ndarray,
+    iterations: int,
+    guard: MemoryGuard,
+    downgrade: bool = True,
+) -> Tuple[np.ndarray, int]:
+    """Exhaustive expansion that stops before a level would exceed the guard.
+
+    Args:
+        matrices: ``(T, 4, 4)`` transform matrices
+        iterations: Requested depth
+        guard: Active guard
+        downgrade: Return the deepest level that fits instead of raising
+
+    Returns:
+        ``(points, depth)``; ``depth < iterations`` if downgraded
+
+    Raises:
+        MemoryLimitExceeded: If a level does not fit and ``downgrade`` is
+            off (or not even the first level fits), or the guard tripped
+    """
+    points = np.zeros((1, 3))
+    for depth in range(iterations):
+        needed = predict_generation_bytes(len(matrices), 1) * len(points)
+        if not guard.allows(needed):
+            if downgrade and depth > 0:
+                return points, depth
+            raise MemoryLimitExceeded(
+                f"Iteration {depth + 1} needs about {needed / 2**20:.0f} MiB more "
+                f"(limit {guard.limit_bytes / 2**20:.0f} MiB)"
+            )
+        points = expand_step(matrices, points)
+        guard.check()
+    return points, iterations
+
+
+def guarded_levels(
+    matrices: np.ndarray, iterations: int, guard: MemoryGuard
+) -> Tuple[np.ndarray, np.ndarray]:
+    """``expand_levels`` that checks the guard before each level.
+
+    Args:
+        matrices: ``(T, 4, 4)`` transform matrices
+        iterations: Final depth
+        guard: Active guard
+
+    Returns:
+        ``(points, depths)`` as ``expand_levels``
+
+    Raises:
+        MemoryLimitExceeded: If a level does not fit or the guard tripped
+    """
+    levels = [np.zeros((1, 3))]
+    for depth in range(iterations):
+        needed = predict_generation_bytes(len(matrices), 1) * len(levels[-1])
+        if not guard.allows(needed):
+            raise MemoryLimitExceeded(
+                f"Iteration {depth + 1} needs about {needed / 2**20:.0f} MiB more "
+                f"(limit {guard.limit_bytes / 2**20:.0f} MiB)"
+            )
+        levels.append(expand_step(matrices, levels[-1]))
+        guard.check()
+    depths = np.repeat(
+        np.arange(iterations + 1, dtype=np.int32), [len(level) for level in levels]
+    )
+    return np.concatenate(levels), depths
+
+
+def guard_chunks(chunks: Iterable[np.ndarray], guard: MemoryGuard) -> Iterator[Any]:
+    """Pass streamed chunks through, checking the guard before each one.
+
+    Raises:
+        MemoryLimitExceeded: As soon as the guard has tripped
+    """
+    for chunk in chunks:
+        guard.check()
+        yield chunk
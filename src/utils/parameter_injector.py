@@ -0,0 +1,243 @@
+"""Coalesced, debounced parameter injection into IFS_Generator modifiers.
+
+The Python driver (architecture §3.1) pushes preset values into the node
+group's inputs, and every input write that reaches the depsgraph costs a
+full Repeat Zone re-evaluation. ``ParameterInjector`` sits between the
+writers (an agent, a UI slider, a preset loader) and the modifiers:
+
+- Changes are queued per modifier and merged, so a 20-transform preset is
+  written as one batch followed by a single update tag.
+- A newer value for an input replaces a queued older one; intermediate
+  values from bursts are dropped, never evaluated.
+- A flush waits until ``min_interval`` has passed since the last one and
+  the previous evaluation has finished, so writers never queue work
+  faster than Blender evaluates it.
+
+The injector itself does not import ``bpy``. It is driven by ``flush``
+calls, from ``install_blender_timer`` inside Blender or directly in
+headless jobs and tests.
+
+Example:
+    >>> injector = ParameterInjector(apply_to_modifier)
+    >>> injector.submit("Fractal", preset_inputs(preset))
+    >>> injector.flush(force=True)
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional
+
+# Minimum seconds between flushes (one evaluation per ~display frame)
+DEFAULT_DEBOUNCE = 0.05
+
+# Seconds after which an evaluation that never reported completion is
+# assumed finished (e.g. the flush changed nothing Blender re-evaluates)
+EVALUATION_TIMEOUT = 5.0
+
+# Modifier input names of per-transform sockets, 1-based like Blender's UI
+TRANSFORM_SOCKET = "Transform {index} {component}"
+
+# Preset transform keys and the socket component they map to
+TRANSFORM_COMPONENTS = {
+    "scale": "Scale",
+    "rotation": "Rotation",
+    "translation": "Translation",
+    "weight": "Weight",
+}
+
+# Output mode shown in the viewport unless the preset sets one (0 = points)
+DEFAULT_PREVIEW_OUTPUT_MODE = 0
+
+# Inputs missing from node groups built before they were added
+OPTIONAL_INPUT_PREFIXES = ("Transform ", "Preview ")
+
+Applier = Callable[[Hashable, Dict[str, Any]], Any]
+
+
+def preset_inputs(preset: Mapping[str, Any]) -> Dict[str, Any]:
+    """Modifier input values for a preset.
+
+    ``Iterations`` and ``Output Mode`` are the render-time values and the
+    ``Preview`` inputs are used in the viewport (the node group switches on
+    Is Viewport). Depths come from ``performance`` and default to the
+    preset's ``iterations``; ``Output Mode`` is only set if the preset
+    has ``final_output_mode``.
+
+    Args:
+        preset: Preset dictionary
+
+    Returns:
+        Input name to value: depths, output modes, ``Seed`` and one
+        ``Transform {i} {Component}`` entry per transform component
+    """
+    performance = preset.get("performance", {})
+    values: Dict[str, Any] = {
+        "Iterations": performance.get("final_iterations", preset["iterations"]),
+        "Preview Iterations": performance.get(
+            "preview_iterations", preset["iterations"]
+        ),
+        "Preview Output Mode": performance.get(
+            "preview_output_mode", DEFAULT_PREVIEW_OUTPUT_MODE
+        ),
+        "Seed": preset.get("seed", 0),
+    }
+    if "final_output_mode" in performance:
+        values["Output Mode"] = performance["final_output_mode"]
+    for index, transform in enumerate(preset.get("transforms", []), start=1):
+        for key, component in TRANSFORM_COMPONENTS.items():
+            if key in transform:
+                value = transform[key]
+                name = TRANSFORM_SOCKET.format(index=index, component=component)
+                values[name] = list(value) if isinstance(value, list) else value
+    return values
+
+
+class ParameterInjector:
+    """Queue modifier input changes and apply them in coalesced batches.
+
+    Thread-safe: ``submit`` may be called from any thread, while ``flush``
+    runs where the modifiers may be written (Blender's main thread).
+
+    Args:
+        apply: Writes a batch of ``{input name: value}`` to a target and
+            triggers one re-evaluation
+        min_interval: Minimum seconds between flushes
+        clock: Monotonic time source
+
+    Attributes:
+        submitted: Input values received
+        dropped: Values replaced before they were applied
+        applied: Values written
+        evaluations: ``apply`` calls (re-evaluations triggered)
+    """
+
+    def __init__(
+        self,
+        apply: Applier,
+        min_interval: float = DEFAULT_DEBOUNCE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.apply = apply
+        self.min_interval = min_interval
+        self.clock = clock
+        self.submitted = 0
+        self.dropped = 0
+        self.applied = 0
+        self.evaluations = 0
+        self._pending: Dict[Hashable, Dict[str, Any]] = {}
+        self._current: Dict[Hashable, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._last_flush = -float("inf")
+        self._busy_since: Optional[float] = None
+
+    @property
+    def pending(self) -> bool:
+        """Whether changes are waiting to be applied."""
+        with self._lock:
+            return bool(self._pending)
+
+    def submit(self, target: Hashable, values: Mapping[str, Any]) -> None:
+        """Queue input values for a target, replacing queued older values."""
+        with self._lock:
+            queued = self._pending.setdefault(target, {})
+            self.submitted += len(values)
+            self.dropped += len(queued.keys() & values.keys())
+            queued.update(values)
+
+    def evaluation_done(self) -> None:
+        """Report that the last triggered evaluation has finished."""
+        with self._lock:
+            self._busy_since = None
+
+    def due(self) -> float:
+        """Seconds until a flush may run (0 if now)."""
+        now = self.clock()
+        with self._lock:
+            wait = self._last_flush + self.min_interval - now
+            if self._busy_since is not None:
+                wait = max(wait, self._busy_since + EVALUATION_TIMEOUT - now)
+        return max(0.0, wait)
+
+    def flush(self, force: bool = False) -> int:
+        """Apply every queued change, one batch per target.
+
+        Values equal to those last applied are skipped, and targets left
+        with nothing to change are not re-evaluated.
+
+        Args:
+            force: Ignore the debounce interval and a running evaluation
+
+        Returns:
+            Targets re-evaluated
+        """
+        if not force and self.due() > 0:
+            return 0
+        with self._lock:
+            batches, self._pending = self._pending, {}
+            self._last_flush = self.clock()
+        evaluated = 0
+        for target, values in batches.items():
+            current = self._current.setdefault(target, {})
+            changed = {
+                name: value
+                for name, value in values.items()
+                if name not in current or current[name] != value
+            }
+            if not changed:
+                continue
+            self.apply(target, changed)
+            current.update(changed)
+            self.applied += len(changed)
+            self.evaluations += 1
+            evaluated += 1
+        if evaluated:
+            with self._lock:
+                self._busy_since = self.clock()
+        return evaluated
+
+    def forget(self, target: Optional[Hashable] = None) -> None:
+        """Drop the record of applied values (all targets by default).
+
+        Call after the scene is reloaded or edited elsewhere, so the next
+        flush writes every queued value again.
+        """
+        if target is None:
+            self._current.clear()
+        else:
+            self._current.pop(target, None)
+
+
+def install_blender_timer(
+    injector: ParameterInjector, interval: float = DEFAULT_DEBOUNCE
+) -> Callable[[], None]:
+    """Flush an injector from Blender's main loop.
+
+    Registers a ``bpy.app.timers`` callback that flushes when due, and a
+    ``depsgraph_update_post`` handler that reports finished evaluations.
+
+    Args:
+        injector: Injector to drive
+        interval: Timer period in seconds
+
+    Returns:
+        Function that unregisters both
+    """
+    import bpy
+
+    def tick() -> float:
+        injector.flush()
+        return max(interval, injector.due())
+
+    def evaluated(scene: Any, depsgraph: Any) -> None:
+        injector.evaluation_done()
+
+    bpy.app.timers.register(tick, persistent=True)
+    bpy.app.handlers.depsgraph_update_post.append(evaluated)
+
+    def uninstall() -> None:
+        if bpy.app.timers.is_registered(tick):
+            bpy.app.timers.unregister(tick)
+        if evaluated in bpy.app.handlers.depsgraph_update_post:
+            bpy.app.handlers.depsgraph_update_post.remove(evaluated)
+
+    return uninstall
@@ -0,0 +1,425 @@
+"""Persistent, indexed catalog of a preset library.
+
+Filtering a large preset library (by category, transform count,
+dimensionality or predicted point cost) would otherwise mean parsing every
+JSON file. The catalog keeps one SQLite row per preset with its metadata and
+derived fields, indexed for the common filters, and is refreshed
+incrementally: only files whose size or mtime changed are re-read.
+
+Example:
+    >>> catalog = PresetCatalog("presets.sqlite", "src/presets")
+    >>> catalog.refresh()
+    >>> catalog.query(dimensionality=3, max_points=1_000_000)
+
+See docs/architecture.md §2.2 for the preset schema and §4 for point counts.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from src.utils.math_helpers import (
+    calculate_contractivity,
+    calculate_point_count,
+    infer_dimensionality,
+)
+from src.utils.preset_loader import scan_preset_stats
+
+# Bump when the table layout or derived-field definitions change; a catalog
+# built with another version is rebuilt from scratch on open.
+CATALOG_SCHEMA_VERSION = 1
+
+# Largest value a SQLite INTEGER column holds
+SQLITE_MAX_INTEGER = 2**63 - 1
+
+# Columns derived from each preset, in table order
+_ENTRY_COLUMNS = (
+    "path",
+    "mtime_ns",
+    "size",
+    "content_hash",
+    "name",
+    "description",
+    "category",
+    "transform_count",
+    "dimensionality",
+    "contractivity",
+    "iterations",
+    "preview_iterations",
+    "final_iterations",
+    "preview_points",
+    "final_points",
+    "metadata",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS presets (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    name TEXT,
+    description TEXT,
+    category TEXT,
+    transform_count INTEGER NOT NULL,
+    dimensionality INTEGER NOT NULL,
+    contractivity REAL NOT NULL,
+    iterations INTEGER,
+    preview_iterations INTEGER,
+    final_iterations INTEGER,
+    preview_points INTEGER,
+    final_points INTEGER,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_presets_dim_final
+    ON presets (dimensionality, final_points);
+CREATE INDEX IF NOT EXISTS idx_presets_dim_preview
+    ON presets (dimensionality, preview_points);
+CREATE INDEX IF NOT EXISTS idx_presets_category ON presets (category);
+CREATE INDEX IF NOT EXISTS idx_presets_transforms ON presets (transform_count);
+CREATE INDEX IF NOT EXISTS idx_presets_hash ON presets (content_hash);
+"""
+
+# Point-count column for each ``points_at`` query option
+_POINT_COLUMNS = {"preview": "preview_points", "final": "final_points"}
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """One catalogued preset with its derived fields."""
+
+    path: str
+    content_hash: str
+    name: Optional[str]
+    description: Optional[str]
+    category: Optional[str]
+    transform_count: int
+    dimensionality: int
+    contractivity: float
+    iterations: Optional[int]
+    preview_iterations: Optional[int]
+    final_iterations: Optional[int]
+    preview_points: Optional[int]
+    final_points: Optional[int]
+
+
+@dataclass
+class CatalogUpdate:
+    """Summary of a catalog refresh.
+
+    Attributes:
+        added: Paths catalogued for the first time
+        updated: Paths whose content changed
+        removed: Paths no longer present on disk
+        errors: (path, message) pairs for files that could not be parsed
+    """
+
+    added: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        """Whether the refresh modified the catalog."""
+        return bool(self.added or self.updated or self.removed)
+
+
+def derive_catalog_fields(preset: Mapping[str, Any]) -> Dict[str, Any]:
+    """Compute the indexed fields for a parsed preset.
+
+    Preview and final iterations come from the preset's ``performance``
+    block and fall back to ``iterations`` when absent. Point counts too
+    large for a SQLite INTEGER are stored as ``None``; such presets never
+    match a ``max_points`` filter.
+
+    Args:
+        preset: Parsed preset dictionary
+
+    Returns:
+        Mapping of catalog column name to value (excluding file stats,
+        hash and metadata)
+
+    Raises:
+        ValueError: If the preset has no usable ``transforms`` list or its
+            ``performance`` entry is not an object
+    """
+    transforms = preset.get("transforms")
+    if not isinstance(transforms, list) or not transforms:
+        raise ValueError("Preset must define a non-empty 'transforms' list")
+    if not all(isinstance(transform, dict) for transform in transforms):
+        raise ValueError("Preset transforms must be objects")
+
+    transform_count = len(transforms)
+    iterations = preset.get("iterations")
+    performance = preset.get("performance") or {}
+    if not isinstance(performance, dict):
+        raise ValueError("Preset 'performance' must be an object")
+    preview_iterations = performance.get("preview_iterations", iterations)
+    final_iterations = performance.get("final_iterations", iterations)
+
+    def points(n: Optional[int]) -> Optional[int]:
+        if n is None:
+            return None
+        count = calculate_point_count(transform_count, n)
+        return count if count <= SQLITE_MAX_INTEGER else None
+
+    return {
+        "name": preset.get("name"),
+        "description": preset.get("description"),
+        "category": preset.get("category"),
+        "transform_count": transform_count,
+        "dimensionality": infer_dimensionality(transforms),
+        "contractivity": calculate_contractivity(transforms),
+        "iterations": iterations,
+        "preview_iterations": preview_iterations,
+        "final_iterations": final_iterations,
+        "preview_points": points(preview_iterations),
+        "final_points": points(final_iterations),
+    }
+
+
+class PresetCatalog:
+    """SQLite-backed index over a directory of preset JSON files.
+
+    Args:
+        db_path: Location of the SQLite file (``":memory:"`` for tests)
+        preset_dir: Root of the preset library to catalogue
+
+    Note:
+        Paths are stored relative to ``preset_dir`` in POSIX form, so a
+        catalog stays valid when the library is moved or checked out
+        elsewhere.
+    """
+
+    def __init__(self, db_path: Union[str, Path], preset_dir: Union[str, Path]) -> None:
+        self.db_path = str(db_path)
+        self.preset_dir = Path(preset_dir)
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.row_factory = sqlite3.Row
+        self._ensure_schema()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "PresetCatalog":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM presets").fetchone()[0]
+
+    def _ensure_schema(self) -> None:
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != CATALOG_SCHEMA_VERSION:
+            self._conn.execute("DROP TABLE IF EXISTS presets")
+        self._conn.executescript(_SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {CATALOG_SCHEMA_VERSION}")
+        self._conn.commit()
+
+    def _scan(
+        self, paths: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[str, os.stat_result]]:
+        """Yield (relative path, stat) for preset files on disk.
+
+        Args:
+            paths: Only stat these relative paths (default: scan everything)
+        """
+        if paths is None:
+            yield from scan_preset_stats(self.preset_dir)
+            return
+        for rel_path in paths:
+            try:
+                yield rel_path, (self.preset_dir / rel_path).stat()
+            except FileNotFoundError:
+                continue
+
+    def _read_entry(self, rel_path: str, stat: os.stat_result) -> Dict[str, Any]:
+        data = (self.preset_dir / rel_path).read_bytes()
+        preset = json.loads(data)
+        if not isinstance(preset, dict):
+            raise ValueError("Preset root must be a JSON object")
+        row = derive_catalog_fields(preset)
+        row.update(
+            path=rel_path,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            content_hash=hashlib.sha256(data).hexdigest(),
+            metadata=json.dumps(preset, sort_keys=True, separators=(",", ":")),
+        )
+        return row
+
+    def refresh(self, paths: Optional[Iterable[str]] = None) -> CatalogUpdate:
+        """Bring the catalog in line with the preset directory.
+
+        Files whose size and mtime match the stored row are skipped without
+        being opened. Changed files are re-hashed; if the content hash is
+        unchanged only the stored stat is updated.
+
+        Args:
+            paths: Relative paths known to have changed (e.g. from a
+                ``PresetWatcher``); only these are examined instead of the
+                whole directory
+
+        Returns:
+            Summary of added, updated and removed paths plus parse errors
+        """
+        query = "SELECT path, mtime_ns, size, content_hash FROM presets"
+        arguments: List[str] = []
+        if paths is not None:
+            paths = sorted(set(paths))
+            arguments = paths
+            query += f" WHERE path IN ({', '.join('?' * len(paths))})"
+        known = {
+            row["path"]: (row["mtime_ns"], row["size"], row["content_hash"])
+            for row in self._conn.execute(query, arguments)
+        }
+        update = CatalogUpdate()
+        upserts: List[Dict[str, Any]] = []
+        touched: List[Tuple[int, int, str]] = []
+        seen = set()
+
+        for rel_path, stat in self._scan(paths):
+            seen.add(rel_path)
+            previous = known.get(rel_path)
+            if previous and previous[:2] == (stat.st_mtime_ns, stat.st_size):
+                continue
+            try:
+                row = self._read_entry(rel_path, stat)
+            except (
+                OSError,
+                ValueError,
+                KeyError,
+                TypeError,
+                IndexError,
+                AttributeError,
+            ) as e:
+                update.errors.append((rel_path, str(e)))
+                continue
+            if previous is None:
+                update.added.append(rel_path)
+                upserts.append(row)
+            elif previous[2] == row["content_hash"]:
+                touched.append((row["mtime_ns"], row["size"], rel_path))
+            else:
+                update.updated.append(rel_path)
+                upserts.append(row)
+
+        # Files that disappeared or became unparseable drop out of the index
+        failed = {path for path, _ in update.errors}
+        update.removed = sorted(
+            path for path in known if path not in seen or path in failed
+        )
+
+        placeholders = ", ".join(f":{column}" for column in _ENTRY_COLUMNS)
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO presets ({', '.join(_ENTRY_COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                upserts,
+            )
+            self._conn.executemany(
+                "UPDATE presets SET mtime_ns = ?, size = ? WHERE path = ?", touched
+            )
+            self._conn.executemany(
+                "DELETE FROM presets WHERE path = ?",
+                [(path,) for path in update.removed],
+            )
+        return update
+
+    def query(
+        self,
+        *,
+        dimensionality: Optional[int] = None,
+        category: Optional[str] = None,
+        min_transforms: Optional[int] = None,
+        max_transforms: Optional[int] = None,
+        max_points: Optional[int] = None,
+        points_at: str = "final",
+        contractive_only: bool = False,
+        content_hash: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[CatalogEntry]:
+        """Return catalogued presets matching every given filter.
+
+        Args:
+            dimensionality: 2 or 3
+            category: Exact category match
+            min_transforms: Minimum transform count (inclusive)
+            max_transforms: Maximum transform count (inclusive)
+            max_points: Maximum predicted point count (inclusive)
+            points_at: Which iteration setting ``max_points`` applies to:
+                ``"preview"`` or ``"final"``
+            contractive_only: Only presets with contractivity < 1
+            content_hash: Exact SHA-256 of the preset file
+            limit: Maximum number of results
+
+        Returns:
+            Matching entries ordered by path
+
+        Raises:
+            ValueError: If ``points_at`` is not a known option
+        """
+        if points_at not in _POINT_COLUMNS:
+            raise ValueError(
+                f"points_at must be one of {sorted(_POINT_COLUMNS)} (got {points_at!r})"
+            )
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, op, value in (
+            ("dimensionality", "=", dimensionality),
+            ("category", "=", category),
+            ("transform_count", ">=", min_transforms),
+            ("transform_count", "<=", max_transforms),
+            (_POINT_COLUMNS[points_at], "<=", max_points),
+            ("content_hash", "=", content_hash),
+        ):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        if contractive_only:
+            clauses.append("contractivity < 1")
+
+        sql = "SELECT * FROM presets"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY path"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._entry(row) for row in self._conn.execute(sql, params)]
+
+    def get(self, path: str) -> Optional[CatalogEntry]:
+        """Return the entry for a relative preset path, if catalogued."""
+        row = self._conn.execute(
+            "SELECT * FROM presets WHERE path = ?", (path,)
+        ).fetchone()
+        return None if row is None else self._entry(row)
+
+    def load_metadata(self, path: str) -> Optional[Dict[str, Any]]:
+        """Return the full stored preset for a relative path, if catalogued."""
+        row = self._conn.execute(
+            "SELECT metadata FROM presets WHERE path = ?", (path,)
+        ).fetchone()
+        return None if row is None else json.loads(row["metadata"])
+
+    @staticmethod
+    def _entry(row: sqlite3.Row) -> CatalogEntry:
+        return CatalogEntry(**{f.name: row[f.name] for f in fields(CatalogEntry)})
@@ -0,0 +1,108 @@
+"""Preset loading utilities for IFS Fractal Generator.
+
+Presets are JSON files describing a complete fractal (transform set,
+iterations, seed, color palette, performance settings). This module locates
+and parses them; schema validation lives in a separate module.
+
+See docs/architecture.md §2.2 for the preset schema.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple, Union
+
+# Directory holding the bundled presets (src/presets/)
+PRESETS_DIR = Path(__file__).resolve().parent.parent / "presets"
+
+# Files in a preset directory that are not presets themselves
+NON_PRESET_FILES = frozenset({"schema.json"})
+
+
+class PresetNotFoundError(FileNotFoundError):
+    """Raised when a preset name or path does not resolve to a file."""
+
+
+def resolve_preset_path(preset: Union[str, Path]) -> Path:
+    """Resolve a preset name or path to an existing JSON file.
+
+    Bare names (e.g. ``"barnsley"``) are looked up in ``PRESETS_DIR``;
+    anything containing a path separator or a ``.json`` suffix is treated
+    as a filesystem path.
+
+    Args:
+        preset: Preset name (without extension) or path to a JSON file
+
+    Returns:
+        Path to the preset file
+
+    Raises:
+        PresetNotFoundError: If the preset file does not exist
+    """
+    path = Path(preset)
+    if path.suffix != ".json" and len(path.parts) == 1:
+        path = PRESETS_DIR / f"{path.name}.json"
+    if not path.is_file():
+        raise PresetNotFoundError(f"Preset not found: {preset}")
+    return path
+
+
+def load_preset(preset: Union[str, Path]) -> Dict[str, Any]:
+    """Load a fractal preset from JSON.
+
+    Args:
+        preset: Preset name (without extension) or path to a JSON file
+
+    Returns:
+        Parsed preset dictionary (not validated)
+
+    Raises:
+        PresetNotFoundError: If the preset file does not exist
+        json.JSONDecodeError: If the file is not valid JSON
+    """
+    path = resolve_preset_path(preset)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def iter_preset_files(directory: Union[str, Path]) -> Iterator[Path]:
+    """Yield every preset JSON file below a directory, recursively.
+
+    Traversal order is filesystem-dependent; callers that need a stable
+    order should sort the result.
+
+    Args:
+        directory: Root of the preset library
+
+    Yields:
+        Paths to ``*.json`` files, excluding ``schema.json``
+    """
+    for path in Path(directory).rglob("*.json"):
+        if path.name not in NON_PRESET_FILES and path.is_file():
+            yield path
+
+
+def scan_preset_stats(
+    directory: Union[str, Path],
+) -> Iterator[Tuple[str, os.stat_result]]:
+    """Yield ``(relative path, stat)`` for every preset file below a directory.
+
+    Uses ``os.scandir``, so no file is opened. Paths are POSIX and relative
+    to ``directory``; a missing directory yields nothing.
+
+    Args:
+        directory: Root of the preset library
+    """
+    root = Path(directory)
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = list(os.scandir(current))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            if entry.is_dir():
+                stack.append(Path(entry.path))
+            elif entry.name.endswith(".json") and entry.name not in NON_PRESET_FILES:
+                yield Path(entry.path).relative_to(root).as_posix(), entry.stat()
@@ -0,0 +1,320 @@
+"""Incremental hot reload of a preset directory.
+
+``PresetWatcher`` polls a preset library with ``os.scandir`` (standard
+library only, no inotify/FSEvents dependency) and compares each file's
+``(mtime_ns, size)`` with the previous poll. Only files that were added,
+changed or removed are read and validated, so editing one preset in a
+library of thousands costs one file's worth of work:
+
+- a changed file is hashed first; touching a file without changing its
+  content is not reported;
+- valid changes replace the cached preset and are pushed to every target
+  bound to that file (typically ``ParameterInjector.submit`` on the
+  modifier showing it);
+- invalid changes are reported and the last valid version is kept, so a
+  half-saved file never reaches the scene;
+- an optional ``PresetCatalog`` is refreshed for the changed paths only;
+  paths whose refresh failed are retried on the next poll.
+
+The background thread and the Blender timer log a failing poll (a catalog
+error, an ``on_update`` callback raising) and keep polling.
+
+Example:
+    >>> watcher = PresetWatcher(
+    ...     "src/presets",
+    ...     on_update=lambda obj, preset: INJECTOR.submit(obj, preset_inputs(preset)),
+    ... )
+    >>> watcher.bind("Fractal", "sierpinski.json")
+    >>> changes = watcher.poll()
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from src.utils.preset_loader import scan_preset_stats
+from src.utils.validator import ValidationIssue, validate_preset
+
+logger = logging.getLogger(__name__)
+
+# Seconds between polls of the background thread / Blender timer
+DEFAULT_POLL_INTERVAL = 0.5
+
+Updater = Callable[[Hashable, Dict[str, Any]], Any]
+
+
+@dataclass
+class PresetChanges:
+    """Result of one ``PresetWatcher.poll``.
+
+    Attributes:
+        added: New valid presets (relative paths)
+        modified: Presets whose content changed and is valid
+        removed: Presets deleted from disk
+        invalid: Added or modified files that failed to parse or validate,
+            with their issues
+        pushed: Bound targets that received an update
+    """
+
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    invalid: List[Tuple[str, List[ValidationIssue]]] = field(default_factory=list)
+    pushed: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.removed or self.invalid)
+
+    @property
+    def paths(self) -> List[str]:
+        """Every relative path touched by this poll."""
+        return (
+            self.added
+            + self.modified
+            + self.removed
+            + [path for path, _ in self.invalid]
+        )
+
+
+class PresetWatcher:
+    """Poll a preset directory and reload only what changed.
+
+    The first snapshot is taken on construction without opening any file;
+    presets are parsed lazily by ``get`` and on change.
+
+    Args:
+        preset_dir: Root of the preset library
+        on_update: Called as ``on_update(target, preset)`` for every target
+            bound to a preset that changed
+        catalog: ``PresetCatalog`` refreshed with the changed paths; it
+            must be used from the thread that calls ``poll``
+        interval: Seconds between polls for ``start``
+
+    Attributes:
+        reads: Preset files read since construction
+        last_error: Latest exception of a background poll, if any
+    """
+
+    def __init__(
+        self,
+        preset_dir: Union[str, Path],
+        on_update: Optional[Updater] = None,
+        catalog: Optional[Any] = None,
+        interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        self.preset_dir = Path(preset_dir)
+        self.on_update = on_update
+        self.catalog = catalog
+        self.interval = interval
+        self.reads = 0
+        self.last_error: Optional[Exception] = None
+        self._hashes: Dict[str, str] = {}
+        self._presets: Dict[str, Dict[str, Any]] = {}
+        self._bindings: Dict[str, Set[Hashable]] = {}
+        # Changed paths the catalog has not been refreshed with yet
+        self._unrefreshed: Set[str] = set()
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats: Dict[str, Tuple[int, int]] = self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        return {
+            rel_path: (stat.st_mtime_ns, stat.st_size)
+            for rel_path, stat in scan_preset_stats(self.preset_dir)
+        }
+
+    def _read(
+        self, rel_path: str
+    ) -> Tuple[str, Optional[Dict[str, Any]], List[ValidationIssue]]:
+        """Read, hash, parse and validate one file."""
+        self.reads += 1
+        try:
+            data = (self.preset_dir / rel_path).read_bytes()
+        except OSError as e:
+            return "", None, [ValidationIssue("", "json", str(e))]
+        content_hash = hashlib.sha256(data).hexdigest()
+        try:
+            preset = json.loads(data)
+        except ValueError as e:
+            return content_hash, None, [ValidationIssue("", "json", str(e))]
+        return content_hash, preset, validate_preset(preset)
+
+    def get(self, rel_path: str) -> Dict[str, Any]:
+        """Last valid version of a preset, reading it on first use.
+
+        Args:
+            rel_path: POSIX path relative to ``preset_dir``
+
+        Raises:
+            KeyError: If the file is not a preset in the library
+            ValueError: If it has never been valid
+        """
+        with self._lock:
+            if rel_path in self._presets:
+                return self._presets[rel_path]
+            if rel_path not in self._stats:
+                raise KeyError(rel_path)
+            content_hash, preset, issues = self._read(rel_path)
+            if preset is None or issues:
+                details = "; ".join(issue.message for issue in issues)
+                raise ValueError(f"Invalid preset {rel_path}: {details}")
+            self._hashes[rel_path] = content_hash
+            self._presets[rel_path] = preset
+            return preset
+
+    def bind(self, target: Hashable, rel_path: str) -> Dict[str, Any]:
+        """Push future changes of a preset to a target.
+
+        Returns:
+            The preset's current version, to apply to the target now
+        """
+        preset = self.get(rel_path)
+        with self._lock:
+            for targets in self._bindings.values():
+                targets.discard(target)
+            self._bindings.setdefault(rel_path, set()).add(target)
+        return preset
+
+    def unbind(self, target: Hashable) -> None:
+        """Stop pushing changes to a target."""
+        with self._lock:
+            for targets in self._bindings.values():
+                targets.discard(target)
+
+    def poll(self) -> PresetChanges:
+        """Detect changes since the last poll and reload only those files.
+
+        Bound targets are updated before the catalog is refreshed. If the
+        refresh fails, its paths are kept and refreshed by the next poll.
+
+        Returns:
+            Added, modified, removed and invalid paths
+
+        Raises:
+            Exception: Whatever ``on_update`` or the catalog refresh raised
+        """
+        changes = PresetChanges()
+        with self._lock:
+            current = self._snapshot()
+            for rel_path in sorted(self._stats.keys() - current.keys()):
+                self._hashes.pop(rel_path, None)
+                self._presets.pop(rel_path, None)
+                changes.removed.append(rel_path)
+            updates: List[Tuple[str, Dict[str, Any]]] = []
+            for rel_path, stat in sorted(current.items()):
+                previous = self._stats.get(rel_path)
+                if previous == stat:
+                    continue
+                content_hash, preset, issues = self._read(rel_path)
+                if content_hash and content_hash == self._hashes.get(rel_path):
+                    continue
+                if preset is None or issues:
+                    changes.invalid.append((rel_path, issues))
+                    continue
+                self._hashes[rel_path] = content_hash
+                if previous is None:
+                    changes.added.append(rel_path)
+                else:
+                    changes.modified.append(rel_path)
+                if rel_path in self._presets or rel_path in self._bindings:
+                    self._presets[rel_path] = preset
+                    updates.append((rel_path, preset))
+            self._stats = current
+            pushes = [
+                (target, preset)
+                for rel_path, preset in updates
+                for target in self._bindings.get(rel_path, ())
+            ]
+            if self.catalog is not None:
+                self._unrefreshed.update(changes.paths)
+            unrefreshed = sorted(self._unrefreshed)
+        if self.on_update is not None:
+            for target, preset in pushes:
+                self.on_update(target, preset)
+            changes.pushed = len(pushes)
+        if unrefreshed:
+            self.catalog.refresh(paths=unrefreshed)
+            with self._lock:
+                self._unrefreshed.difference_update(unrefreshed)
+        return changes
+
+    def poll_logged(self) -> Optional[PresetChanges]:
+        """``poll`` for background callers: errors are logged, not raised.
+
+        Returns:
+            The poll's changes, or ``None`` if it failed (see ``last_error``)
+        """
+        try:
+            return self.poll()
+        except Exception as e:  # noqa: BLE001 - a bad poll must not stop polling
+            self.last_error = e
+            logger.exception("Polling %s failed", self.preset_dir)
+            return None
+
+    def start(self) -> None:
+        """Poll every ``interval`` seconds on a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="preset-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.poll_logged()
+
+    def stop(self) -> None:
+        """Stop the polling thread and wait for it to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "PresetWatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def install_blender_timer(watcher: PresetWatcher) -> Callable[[], None]:
+    """Poll a watcher from Blender's main loop instead of a thread.
+
+    Use this when ``on_update`` writes to ``bpy`` data directly (or the
+    watcher has a catalog); pushing into a ``ParameterInjector`` is
+    thread-safe and works with ``start`` too.
+
+    Returns:
+        Function that unregisters the timer
+    """
+    import bpy
+
+    def tick() -> float:
+        watcher.poll_logged()
+        return watcher.interval
+
+    bpy.app.timers.register(tick, persistent=True)
+
+    def uninstall() -> None:
+        if bpy.app.timers.is_registered(tick):
+            bpy.app.timers.unregister(tick)
+
+    return uninstall
@@ -0,0 +1,105 @@
+"""Density preview images for headless generation.
+
+Renders a point cloud as a small grayscale PNG so agents and the UI can see
+a result without Blender (architecture §3.3: "success/error + preview
+image"). Points are projected onto the two axes with the largest extent,
+binned into a square grid and log-scaled, so both dense cores and sparse
+tips stay visible. PNG encoding uses only ``zlib``; no imaging library is
+required.
+"""
+
+import struct
+import zlib
+
+import numpy as np
+
+# Edge length in pixels of preview images
+DEFAULT_PREVIEW_SIZE = 128
+
+
+def project_points(points: np.ndarray) -> np.ndarray:
+    """Project points onto the two axes with the largest extent.
+
+    Axes keep their original order, so flat presets in the XY plane are
+    shown unrotated with X horizontal.
+
+    Args:
+        points: ``(N, 3)`` points
+
+    Returns:
+        ``(N, 2)`` projected points
+    """
+    extent = np.ptp(points, axis=0) if len(points) else np.zeros(3)
+    axes = np.sort(np.argsort(-extent, kind="stable")[:2])
+    return points[:, axes]
+
+
+def density_image(points: np.ndarray, size: int = DEFAULT_PREVIEW_SIZE) -> np.ndarray:
+    """Bin points into a log-scaled grayscale density image.
+
+    The larger projected extent fills the image; the other is centred.
+    Row 0 is the top of the image (largest second coordinate).
+
+    Args:
+        points: ``(N, 3)`` points
+        size: Image edge length in pixels
+
+    Returns:
+        ``(size, size)`` uint8 image (0 = empty, 255 = densest pixel)
+    """
+    image = np.zeros((size, size), dtype=np.uint8)
+    if not len(points):
+        return image
+    flat = project_points(points)
+    low = flat.min(axis=0)
+    span = float(np.ptp(flat, axis=0).max()) or 1.0
+    offset = (span - np.ptp(flat, axis=0)) / 2
+    cells = ((flat - low + offset) / span * (size - 1)).round().astype(np.intp)
+    counts = np.bincount(
+        (size - 1 - cells[:, 1]) * size + cells[:, 0], minlength=size * size
+    )
+    scaled = np.log1p(counts) / np.log1p(counts.max())
+    image[:] = (scaled * 255).round().reshape(size, size)
+    return image
+
+
+def encode_png(image: np.ndarray) -> bytes:
+    """Encode an 8-bit grayscale image as PNG.
+
+    Args:
+        image: ``(H, W)`` uint8 image
+
+    Returns:
+        PNG file contents
+    """
+    height, width = image.shape
+    # Filter type 0 (None) byte at the start of every scanline
+    raw = np.zeros((height, width + 1), dtype=np.uint8)
+    raw[:, 1:] = image
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        body = tag + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+    return b"".join(
+        [
+            b"\x89PNG\r\n\x1a\n",
+            chunk(b"IHDR", header),
+            chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)),
+            chunk(b"IEND", b""),
+        ]
+    )
+
+
+def render_preview(points: np.ndarray, size: int = DEFAULT_PREVIEW_SIZE) -> bytes:
+    """Render a point cloud as a grayscale density PNG.
+
+    Args:
+        points: ``(N, 3)`` points
+        size: Image edge length in pixels
+
+    Returns:
+        PNG file contents
+    """
+    return encode_png(density_image(points, size))
@@ -0,0 +1,243 @@
+"""Progressive-refinement generation.
+
+Instead of one full-depth evaluation, a generation request yields a
+sequence of results at increasing fidelity: a shallow expansion (or small
+chaos-game sample) first, then deeper refinements up to the requested
+depth or point budget. Every result carries its own statistics and
+preview image, and the caller stops early simply by not asking for the
+next one, so multi-turn refinement (architecture §3.3) gets a first answer
+in milliseconds.
+
+Each level is exactly what a one-shot request at that depth or budget
+returns, so the final level matches a plain ``generate_fractal`` call and
+intermediate levels can be shared with other requests.
+
+Example:
+    >>> for result in progressive_generate(preset):
+    ...     show(result.preview)
+    ...     if looks_good(result):
+    ...         break
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from src.utils.ifs_engine import (
+    DEFAULT_CHAOS_POINTS,
+    chaos_game,
+    compile_preset,
+    expand_step,
+    expand_stratified,
+    summarize_points,
+)
+from src.utils.math_helpers import enforce_iteration_limits
+from src.utils.memory_guard import (
+    MemoryGuard,
+    MemoryLimitExceeded,
+    plan_generation,
+    predict_generation_bytes,
+)
+from src.utils.preview import DEFAULT_PREVIEW_SIZE, render_preview
+
+# Smallest point count worth returning as a first result
+DEFAULT_FIRST_POINTS = 256
+
+# Point budget growth between chaos-game levels
+DEFAULT_GROWTH = 4
+
+
+@dataclass
+class Refinement:
+    """One result in a progressive-refinement sequence.
+
+    Attributes:
+        level: Position in the sequence (0 = coarsest)
+        total_levels: Number of levels in the sequence
+        points: ``(N, 3)`` points at this level
+        stats: ``summarize_points`` statistics plus ``iterations`` or
+            ``n_points``
+        preview: PNG density preview (``None`` if previews are disabled)
+        elapsed: Seconds since the sequence started
+    """
+
+    level: int
+    total_levels: int
+    points: np.ndarray
+    stats: Dict[str, Any]
+    preview: Optional[bytes]
+    elapsed: float
+
+    @property
+    def final(self) -> bool:
+        """Whether this is the full-fidelity result."""
+        return self.level == self.total_levels - 1
+
+
+def exhaustive_schedule(
+    transform_count: int, iterations: int, first_points: int = DEFAULT_FIRST_POINTS
+) -> List[int]:
+    """Expansion depths to report, coarsest first.
+
+    Starts at the shallowest depth with at least ``first_points`` points
+    and reports every depth from there to ``iterations``.
+
+    Args:
+        transform_count: Transforms in the set
+        iterations: Final depth
+        first_points: Minimum point count of the first level
+
+    Returns:
+        Increasing depths ending with ``iterations``
+    """
+    start = 1
+    while start < iterations and transform_count**start < first_points:
+        start += 1
+    return list(range(min(start, iterations), iterations + 1))
+
+
+def chaos_schedule(
+    n_points: int,
+    first_points: int = DEFAULT_FIRST_POINTS,
+    growth: int = DEFAULT_GROWTH,
+) -> List[int]:
+    """Point budgets to report (chaos and stratified modes), smallest first.
+
+    Args:
+        n_points: Final point budget
+        first_points: Budget of the first level
+        growth: Factor between consecutive budgets
+
+    Returns:
+        Increasing budgets ending with ``n_points``
+
+    Raises:
+        ValueError: If ``growth`` is less than 2
+    """
+    if growth < 2:
+        raise ValueError(f"Growth must be at least 2 (got {growth})")
+    budgets = []
+    budget = first_points
+    while budget < n_points:
+        budgets.append(budget)
+        budget *= growth
+    budgets.append(n_points)
+    return budgets
+
+
+def refine_exhaustive(
+    matrices: np.ndarray, depths: List[int], guard: Optional[MemoryGuard] = None
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """Yield the exhaustive expansion at each requested depth.
+
+    Each depth extends the previous one by a single ``expand_step``, so the
+    whole sequence costs no more than the final depth alone.
+
+    Args:
+        matrices: ``(T, 4, 4)`` transform matrices
+        depths: Increasing depths to report
+        guard: Active guard consulted before each step
+
+    Yields:
+        ``(depth, points)`` pairs
+
+    Raises:
+        MemoryLimitExceeded: If a step would exceed the guard's limit
+    """
+    points = np.zeros((1, 3))
+    depth = 0
+    for target in depths:
+        while depth < target:
+            needed = predict_generation_bytes(len(matrices), 1) * len(points)
+            if guard is not None and not guard.allows(needed):
+                raise MemoryLimitExceeded(
+                    f"Iteration {depth + 1} needs about {needed / 2**20:.0f} MiB "
+                    f"more (limit {guard.limit_bytes / 2**20:.0f} MiB)"
+                )
+            points = expand_step(matrices, points)
+            depth += 1
+        yield depth, points
+
+
+def progressive_generate(
+    preset: Mapping[str, Any],
+    mode: str = "exhaustive",
+    iterations: Optional[int] = None,
+    n_points: Optional[int] = None,
+    seed: Optional[int] = None,
+    first_points: int = DEFAULT_FIRST_POINTS,
+    preview_size: Optional[int] = DEFAULT_PREVIEW_SIZE,
+    memory_limit: Optional[int] = None,
+) -> Iterator[Refinement]:
+    """Generate a preset at increasing fidelity.
+
+    The final level is planned against the memory limit first (a request
+    over it ends at a shallower depth or smaller budget) and the levels
+    are generated under a ``MemoryGuard``.
+
+    Args:
+        preset: Validated preset dictionary
+        mode: ``"exhaustive"`` (deepen the T^n expansion), ``"chaos"``
+            (grow the sample) or ``"stratified"`` (grow the point budget)
+        iterations: Final depth (defaults to the preset's iterations)
+        n_points: Final chaos-game or stratified point budget
+        seed: Chaos-game seed (defaults to the preset's seed)
+        first_points: Minimum point count of the first level
+        preview_size: Preview edge length in pixels (``None`` disables
+            previews)
+        memory_limit: Limit in bytes (default: ``default_limit()``)
+
+    Yields:
+        Refinements, coarsest first; the last has ``final`` set
+
+    Raises:
+        ValueError: If the mode is unknown or limits are exceeded
+        MemoryLimitExceeded: If not even the first level fits, or a level
+            exceeds the limit while running
+    """
+    start = time.perf_counter()
+    compiled = compile_preset(preset)
+
+    def result(level: int, total: int, points: np.ndarray, **info: int) -> Refinement:
+        stats = {**info, **summarize_points(points)}
+        preview = None if preview_size is None else render_preview(points, preview_size)
+        return Refinement(
+            level, total, points, stats, preview, time.perf_counter() - start
+        )
+
+    if mode not in ("exhaustive", "chaos", "stratified"):
+        raise ValueError(
+            f"Mode must be 'exhaustive', 'chaos' or 'stratified' (got {mode!r})"
+        )
+    depth = compiled.iterations if iterations is None else iterations
+    if mode == "exhaustive":
+        enforce_iteration_limits(compiled.transform_count, depth)
+    plan = plan_generation(
+        compiled.transform_count,
+        depth,
+        mode,
+        n_points or DEFAULT_CHAOS_POINTS,
+        limit_bytes=memory_limit,
+    )
+    with MemoryGuard(memory_limit) as guard:
+        if mode == "exhaustive":
+            depths = exhaustive_schedule(
+                compiled.transform_count, plan.iterations, first_points
+            )
+            levels = refine_exhaustive(compiled.matrices, depths, guard)
+            for level, (depth, points) in enumerate(levels):
+                yield result(level, len(depths), points, iterations=depth)
+            return
+        budgets = chaos_schedule(plan.n_points or DEFAULT_CHAOS_POINTS, first_points)
+        seed = compiled.seed if seed is None else seed
+        for level, budget in enumerate(budgets):
+            if mode == "chaos":
+                points = chaos_game(
+                    compiled.matrices, compiled.weights, budget, seed=seed
+                )
+            else:
+                points = expand_stratified(compiled.matrices, compiled.weights, budget)
+            guard.check()
+            yield result(level, len(budgets), points, n_points=budget)
@@ -0,0 +1,411 @@
+"""Parameter sweeps over one base preset.
+
+A sweep varies preset parameters (one transform's scale or rotation, the
+iteration depth, ...) over ranges of values and evaluates every
+combination headlessly, returning per-variant statistics and preview
+thumbnails.
+
+In the exhaustive mode, variants share every subtree that does not involve
+a swept transform. With ``S`` the transforms whose matrices vary across the
+sweep and ``F`` the fixed ones, the depth-``k`` cloud splits into
+
+- ``L[k]``: addresses using only ``F``, expanded once for the whole sweep;
+- ``C[k] = expand_step(M, C[k-1]) + expand_step(M[S], L[k-1])``: addresses
+  containing a swept transform, the only part evaluated per variant.
+
+Variants with equal matrices (e.g. weight-only or depth-only sweeps) are
+evaluated once, and every depth of a depth sweep is read off the same
+levels. Clouds hold the same points as ``expand_exhaustive`` but grouped
+by subtree instead of in address order. The chaos mode instead samples all
+variants as one batched chaos game (``chaos_game_multi``) with a common
+seed.
+
+Parameters are addressed by dotted paths into the preset, with list
+indices as integers: ``iterations``, ``transforms.2.rotation`` or a
+single axis such as ``transforms.2.rotation.2``.
+
+Command-line use:
+
+    python -m src.utils.sweep barnsley transforms.2.rotation.2=-30:30:13 \\
+        --output sweep/
+"""
+
+import argparse
+import copy
+import itertools
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.ifs_engine import (
+    DEFAULT_CHAOS_POINTS,
+    CompiledPreset,
+    chaos_game_multi,
+    compile_preset,
+    expand_step,
+    stack_presets,
+    summarize_points,
+)
+from src.utils.memory_guard import MemoryGuard, plan_generation
+from src.utils.preset_loader import load_preset
+from src.utils.preview import DEFAULT_PREVIEW_SIZE, render_preview
+from src.utils.validator import assert_valid_preset
+
+# Sweep evaluation modes
+SWEEP_MODES = ("exhaustive", "chaos")
+
+# Variants sampled together by one batched chaos game
+DEFAULT_CHAOS_BATCH = 64
+
+
+@dataclass
+class SweepVariant:
+    """One evaluated combination of swept values.
+
+    Attributes:
+        parameters: Swept path to the value used
+        preset: Full preset of the variant
+        stats: ``summarize_points`` of the variant's cloud
+        thumbnail: Density preview PNG (``None`` if disabled)
+        points: Point cloud (``None`` unless requested)
+    """
+
+    parameters: Dict[str, Any]
+    preset: Dict[str, Any]
+    stats: Dict[str, Any]
+    thumbnail: Optional[bytes] = None
+    points: Optional[np.ndarray] = None
+
+
+@dataclass
+class SweepResult:
+    """Outcome of ``run_sweep``.
+
+    Attributes:
+        variants: Variants in sweep order (last parameter fastest)
+        swept_transforms: Indices of transforms whose matrices vary
+        computed: Points evaluated (exhaustive mode)
+        reused: Output points served from shared subtrees or from a variant
+            with equal matrices instead of being evaluated (exhaustive mode)
+        elapsed: Wall-clock seconds
+    """
+
+    variants: List[SweepVariant] = field(default_factory=list)
+    swept_transforms: List[int] = field(default_factory=list)
+    computed: int = 0
+    reused: int = 0
+    elapsed: float = 0.0
+
+
+def _split_path(path: str) -> List[Any]:
+    return [
+        int(part) if part.lstrip("-").isdigit() else part for part in path.split(".")
+    ]
+
+
+def set_parameter(preset: Mapping[str, Any], path: str, value: Any) -> Dict[str, Any]:
+    """Copy of a preset with one parameter replaced.
+
+    A scalar assigned to a vector (e.g. ``transforms.0.scale``) is
+    broadcast to every axis.
+
+    Args:
+        preset: Base preset
+        path: Dotted path, list indices as integers
+        value: New value
+
+    Returns:
+        New preset dictionary; ``preset`` is not modified
+
+    Raises:
+        KeyError: If the path does not exist in the preset
+    """
+    result = copy.deepcopy(dict(preset))
+    *parents, last = _split_path(path)
+    target: Any = result
+    try:
+        for key in parents:
+            target = target[key]
+        current = target[last]
+    except (KeyError, IndexError, TypeError):
+        raise KeyError(f"No parameter {path!r} in preset") from None
+    if isinstance(current, list) and not isinstance(value, (list, tuple)):
+        value = [value] * len(current)
+    target[last] = list(value) if isinstance(value, tuple) else value
+    return result
+
+
+def sweep_values(start: Any, stop: Any, count: int) -> List[Any]:
+    """Evenly spaced values from ``start`` to ``stop`` inclusive.
+
+    Works for scalars and for vectors such as rotations.
+    """
+    values = np.linspace(np.asarray(start, float), np.asarray(stop, float), count)
+    return values.tolist()
+
+
+def sweep_presets(
+    base: Mapping[str, Any], parameters: Mapping[str, Sequence[Any]]
+) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Every combination of swept values applied to a base preset.
+
+    Args:
+        base: Base preset
+        parameters: Path to the values it takes
+
+    Returns:
+        ``(swept values, preset)`` pairs, last parameter varying fastest
+    """
+    paths = list(parameters)
+    variants = []
+    for values in itertools.product(*(parameters[path] for path in paths)):
+        preset = dict(base)
+        for path, value in zip(paths, values):
+            preset = set_parameter(preset, path, value)
+        variants.append((dict(zip(paths, values)), preset))
+    return variants
+
+
+def swept_mask(compiled: Sequence[CompiledPreset]) -> Optional[np.ndarray]:
+    """Which transforms' matrices differ between variants.
+
+    Returns:
+        ``(T,)`` boolean mask, or ``None`` if the transform counts differ
+    """
+    if len({preset.transform_count for preset in compiled}) != 1:
+        return None
+    matrices = np.stack([preset.matrices for preset in compiled])
+    return np.any(matrices != matrices[:1], axis=(0, 2, 3))
+
+
+def _expand_into(matrices: np.ndarray, points: np.ndarray, out: np.ndarray) -> None:
+    """``expand_step`` writing into a preallocated ``(T * N, 3)`` view."""
+    blocks = out.reshape(len(matrices), len(points), 3)
+    np.matmul(points, matrices[:, :3, :3].transpose(0, 2, 1), out=blocks)
+    blocks += matrices[:, None, :3, 3]
+
+
+class SharedExpansion:
+    """Exhaustive clouds of sweep variants, sharing unswept subtrees.
+
+    Args:
+        compiled: Compiled variants
+
+    Attributes:
+        computed: Points evaluated so far, shared levels included
+    """
+
+    def __init__(self, compiled: Sequence[CompiledPreset]) -> None:
+        self.compiled = list(compiled)
+        self.swept = swept_mask(self.compiled)
+        fixed = np.empty((0, 4, 4))
+        if self.swept is not None:
+            fixed = self.compiled[0].matrices[~self.swept]
+        # L[k]: subtrees of fixed transforms only, shared by every variant
+        self.shared = [np.zeros((1, 3))]
+        for _ in range(max(preset.iterations for preset in self.compiled)):
+            self.shared.append(expand_step(fixed, self.shared[-1]))
+        self.computed = sum(len(level) for level in self.shared[1:])
+
+    def groups(self) -> Iterator[Tuple[List[int], Dict[int, np.ndarray]]]:
+        """Yield ``(variant indices, depth to cloud)`` per set of equal matrices."""
+        groups: Dict[bytes, List[int]] = {}
+        for index, preset in enumerate(self.compiled):
+            groups.setdefault(preset.matrices.tobytes(), []).append(index)
+        for indices in groups.values():
+            matrices = self.compiled[indices[0]].matrices
+            varying = matrices if self.swept is None else matrices[self.swept]
+            wanted = {self.compiled[index].iterations for index in indices}
+            clouds = {0: self.shared[0]}
+            # C[k]: addresses containing at least one swept transform, stored
+            # after room for L[k] so a wanted depth needs no concatenation
+            changed = np.empty((0, 3))
+            for k in range(1, max(wanted) + 1):
+                head = len(self.shared[k])
+                split = head + len(matrices) * len(changed)
+                level = np.empty((split + len(varying) * len(self.shared[k - 1]), 3))
+                _expand_into(matrices, changed, level[head:split])
+                _expand_into(varying, self.shared[k - 1], level[split:])
+                changed = level[head:]
+                self.computed += len(changed)
+                if k in wanted:
+                    level[:head] = self.shared[k]
+                    clouds[k] = level
+            yield indices, clouds
+
+
+def run_sweep(
+    base: Mapping[str, Any],
+    parameters: Mapping[str, Sequence[Any]],
+    mode: str = "exhaustive",
+    n_points: Optional[int] = None,
+    thumbnails: bool = True,
+    thumbnail_size: int = DEFAULT_PREVIEW_SIZE,
+    keep_points: bool = False,
+    memory_limit: Optional[int] = None,
+) -> SweepResult:
+    """Evaluate every combination of swept values.
+
+    Every variant is validated, and the largest one checked against the
+    memory limit, before anything is generated; generation then runs under
+    a ``MemoryGuard``.
+
+    Args:
+        base: Base preset
+        parameters: Path to the values it takes
+        mode: ``exhaustive`` (incremental, exact) or ``chaos`` (batched)
+        n_points: Points per variant in chaos mode
+        thumbnails: Render a density preview per variant
+        thumbnail_size: Preview edge length in pixels
+        keep_points: Keep every variant's point cloud in the result
+        memory_limit: Limit in bytes (default: ``default_limit()``)
+
+    Returns:
+        Variants in sweep order and the amount of shared work
+
+    Raises:
+        ValueError: If the mode is unknown or a variant is invalid
+        KeyError: If a parameter path does not exist
+        MemoryLimitExceeded: If the largest variant (chaos: batch) does not
+            fit or the sweep exceeds the limit while running
+    """
+    if mode not in SWEEP_MODES:
+        raise ValueError(f"Mode must be one of {list(SWEEP_MODES)} (got {mode!r})")
+    start = time.perf_counter()
+    variants = sweep_presets(base, parameters)
+    for _, preset in variants:
+        assert_valid_preset(preset)
+    compiled = [compile_preset(preset) for _, preset in variants]
+
+    result = SweepResult()
+    swept = swept_mask(compiled) if compiled else None
+    if swept is not None:
+        result.swept_transforms = np.flatnonzero(swept).tolist()
+
+    def record(index: int, points: np.ndarray) -> SweepVariant:
+        swept, preset = variants[index]
+        return SweepVariant(
+            parameters=swept,
+            preset=preset,
+            stats=summarize_points(points),
+            thumbnail=render_preview(points, thumbnail_size) if thumbnails else None,
+            points=points if keep_points else None,
+        )
+
+    n_points = n_points or DEFAULT_CHAOS_POINTS
+    if compiled:
+        largest = max(compiled, key=lambda c: c.transform_count**c.iterations)
+        plan_generation(
+            largest.transform_count,
+            largest.iterations,
+            mode,
+            n_points * min(len(compiled), DEFAULT_CHAOS_BATCH),
+            limit_bytes=memory_limit,
+            policy="raise",
+        )
+
+    evaluated: Dict[int, SweepVariant] = {}
+    with MemoryGuard(memory_limit) as guard:
+        if mode == "exhaustive" and compiled:
+            expansion = SharedExpansion(compiled)
+            for indices, clouds in expansion.groups():
+                guard.check()
+                served = set()
+                for index in indices:
+                    depth = compiled[index].iterations
+                    evaluated[index] = record(index, clouds[depth])
+                    shared = len(expansion.shared[depth])
+                    result.reused += len(clouds[depth]) if depth in served else shared
+                    served.add(depth)
+            result.computed = expansion.computed
+        elif mode == "chaos":
+            seed = int(base.get("seed", 0))
+            for first in range(0, len(compiled), DEFAULT_CHAOS_BATCH):
+                chunk = compiled[first : first + DEFAULT_CHAOS_BATCH]
+                batch = stack_presets(chunk, seeds=[seed] * len(chunk))
+                for offset, points in enumerate(chaos_game_multi(batch, n_points)):
+                    evaluated[first + offset] = record(first + offset, points)
+                guard.check()
+    result.variants = [evaluated[index] for index in range(len(variants))]
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def parse_parameter(spec: str) -> Tuple[str, List[Any]]:
+    """Parse a ``PATH=START:STOP:COUNT`` or ``PATH=V1;V2;...`` sweep.
+
+    Values are JSON, so vectors are written as ``[0,0,30]``.
+    """
+    path, separator, values = spec.partition("=")
+    if not separator:
+        raise argparse.ArgumentTypeError(
+            f"Parameter must be PATH=START:STOP:COUNT or PATH=V1;V2 (got {spec!r})"
+        )
+    try:
+        parts = values.split(":")
+        if len(parts) == 3:
+            start, stop, count = parts
+            return path, sweep_values(json.loads(start), json.loads(stop), int(count))
+        return path, [json.loads(value) for value in values.split(";")]
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"Invalid values in {spec!r}: {e}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point: sweep parameters of a preset."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.utils.sweep",
+        description="Evaluate a preset over ranges of parameter values.",
+    )
+    parser.add_argument("preset", help="Preset name or path to a preset JSON file")
+    parser.add_argument(
+        "parameters",
+        nargs="+",
+        type=parse_parameter,
+        help="PATH=START:STOP:COUNT or PATH=V1;V2;... sweeps",
+    )
+    parser.add_argument("--mode", choices=SWEEP_MODES, default="exhaustive")
+    parser.add_argument("--points", type=int, default=None)
+    parser.add_argument(
+        "--output", default=None, help="Directory for thumbnails and sweep.json"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        result = run_sweep(
+            load_preset(args.preset),
+            dict(args.parameters),
+            mode=args.mode,
+            n_points=args.points,
+            thumbnails=args.output is not None,
+        )
+    except (ValueError, KeyError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    summary = []
+    for index, variant in enumerate(result.variants):
+        entry = {"parameters": variant.parameters, "stats": variant.stats}
+        if args.output and variant.thumbnail is not None:
+            out = Path(args.output)
+            out.mkdir(parents=True, exist_ok=True)
+            entry["thumbnail"] = f"variant_{index:04d}.png"
+            (out / entry["thumbnail"]).write_bytes(variant.thumbnail)
+        summary.append(entry)
+    if args.output:
+        (Path(args.output) / "sweep.json").write_text(json.dumps(summary, indent=2))
+    total = result.computed + result.reused
+    print(
+        f"{len(result.variants)} variants in {result.elapsed:.2f}s "
+        f"(transforms swept: {result.swept_transforms or 'none'}; "
+        f"{result.reused / max(total, 1):.0%} of points reused)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
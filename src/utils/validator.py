@@ -0,0 +1,458 @@
+"""Preset validation for IFS Fractal Generator.
+
+Validates presets against ``src/presets/schema.json`` plus the semantic
+rules the schema cannot express:
+
+- Iteration and transform limits (``enforce_iteration_limits``), including
+  the ``performance`` preview/final iterations
+- Weights summing to a positive value
+- Contractivity below 1 (see ``calculate_contractivity``)
+
+Unlike a generic ``jsonschema`` run, every problem in a preset is collected
+instead of stopping at the first, and the schema is compiled once into plain
+Python checks. ``validate_files`` fans a batch out over worker processes and
+returns a single machine-readable report, which is what the command-line
+entry point prints:
+
+    python -m src.utils.validator src/presets/ --workers 8 --output report.json
+
+See docs/architecture.md §2.2 for the preset schema.
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from src.utils.math_helpers import calculate_contractivity, enforce_iteration_limits
+from src.utils.preset_loader import PRESETS_DIR, iter_preset_files
+
+SCHEMA_PATH = PRESETS_DIR / "schema.json"
+
+# Below this many files, process start-up costs more than it saves
+_MIN_FILES_PER_WORKER = 64
+
+
+class ValidationIssue(NamedTuple):
+    """A single problem found in a preset.
+
+    Attributes:
+        path: Slash-separated location inside the preset (``""`` for root)
+        rule: Rule family: ``json``, ``schema``, ``iteration_limits``,
+            ``weights`` or ``contractivity``
+        message: Human-readable description
+    """
+
+    path: str
+    rule: str
+    message: str
+
+
+class PresetValidationError(ValueError):
+    """Raised by ``assert_valid_preset`` when a preset has problems.
+
+    Attributes:
+        issues: Every problem found in the preset
+    """
+
+    def __init__(self, issues: Sequence[ValidationIssue]) -> None:
+        self.issues = list(issues)
+        details = "; ".join(
+            f"{issue.path or '<root>'}: {issue.message}" for issue in self.issues
+        )
+        super().__init__(f"Invalid preset ({len(self.issues)} issues): {details}")
+
+
+# A compiled check yields issues for a value at a given location
+Check = Callable[[Any, str], Iterator[ValidationIssue]]
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool))
+    or (isinstance(v, float) and v.is_integer()),
+}
+
+# Keywords that carry documentation only
+_ANNOTATIONS = frozenset({"$schema", "$id", "title", "description"})
+
+
+def _join(path: str, key: Union[str, int]) -> str:
+    return f"{path}/{key}" if path else str(key)
+
+
+def compile_schema(schema: Mapping[str, Any]) -> Check:
+    """Compile a JSON schema into a single checking function.
+
+    Only the keywords used by the preset schema are supported; any other
+    keyword raises so that schema changes cannot silently weaken validation.
+
+    Args:
+        schema: JSON schema (draft-07 subset)
+
+    Returns:
+        Function ``check(value, path)`` yielding every ``ValidationIssue``
+
+    Raises:
+        ValueError: If the schema uses an unsupported keyword
+    """
+    checks: List[Check] = []
+    unsupported = (
+        set(schema)
+        - _ANNOTATIONS
+        - {
+            "type",
+            "required",
+            "properties",
+            "items",
+            "minItems",
+            "maxItems",
+            "minimum",
+            "maximum",
+            "enum",
+            "pattern",
+            "minLength",
+        }
+    )
+    if unsupported:
+        raise ValueError(f"Unsupported schema keywords: {sorted(unsupported)}")
+
+    expected = schema.get("type")
+    type_check = _TYPE_CHECKS[expected] if expected else None
+
+    if "minimum" in schema or "maximum" in schema:
+        lo = schema.get("minimum", -math.inf)
+        hi = schema.get("maximum", math.inf)
+
+        def check_range(value: Any, path: str) -> Iterator[ValidationIssue]:
+            if _TYPE_CHECKS["number"](value) and not lo <= value <= hi:
+                yield ValidationIssue(
+                    path, "schema", f"Must be between {lo} and {hi} (got {value})"
+                )
+
+        checks.append(check_range)
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+
+        def check_enum(value: Any, path: str) -> Iterator[ValidationIssue]:
+            if value not in allowed:
+                yield ValidationIssue(
+                    path, "schema", f"Must be one of {allowed} (got {value!r})"
+                )
+
+        checks.append(check_enum)
+
+    if "pattern" in schema or "minLength" in schema:
+        pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+        min_length = schema.get("minLength", 0)
+
+        def check_string(value: Any, path: str) -> Iterator[ValidationIssue]:
+            if not isinstance(value, str):
+                return
+            if len(value) < min_length:
+                yield ValidationIssue(
+                    path, "schema", f"Must be at least {min_length} characters long"
+                )
+            if pattern is not None and not pattern.search(value):
+                yield ValidationIssue(
+                    path, "schema", f"Must match {pattern.pattern} (got {value!r})"
+                )
+
+        checks.append(check_string)
+
+    if "required" in schema or "properties" in schema:
+        required = list(schema.get("required", ()))
+        properties = {
+            key: compile_schema(sub)
+            for key, sub in schema.get("properties", {}).items()
+        }
+
+        def check_object(value: Any, path: str) -> Iterator[ValidationIssue]:
+            if not isinstance(value, dict):
+                return
+            for key in required:
+                if key not in value:
+                    yield ValidationIssue(
+                        path, "schema", f"Missing required field '{key}'"
+                    )
+            for key, sub_check in properties.items():
+                if key in value:
+                    yield from sub_check(value[key], _join(path, key))
+
+        checks.append(check_object)
+
+    if "items" in schema or "minItems" in schema or "maxItems" in schema:
+        items = schema.get("items")
+        if isinstance(items, list):
+            positional = [compile_schema(sub) for sub in items]
+            each = None
+        else:
+            positional = []
+            each = compile_schema(items) if items is not None else None
+        min_items = schema.get("minItems")
+        max_items = schema.get("maxItems")
+
+        def check_array(value: Any, path: str) -> Iterator[ValidationIssue]:
+            if not isinstance(value, list):
+                return
+            if min_items is not None and len(value) < min_items:
+                yield ValidationIssue(
+                    path,
+                    "schema",
+                    f"Must have at least {min_items} items (got {len(value)})",
+                )
+            if max_items is not None and len(value) > max_items:
+                yield ValidationIssue(
+                    path,
+                    "schema",
+                    f"Must have at most {max_items} items (got {len(value)})",
+                )
+            for index, item in enumerate(value):
+                if each is not None:
+                    yield from each(item, _join(path, index))
+                elif index < len(positional):
+                    yield from positional[index](item, _join(path, index))
+
+        checks.append(check_array)
+
+    def check(value: Any, path: str) -> Iterator[ValidationIssue]:
+        if type_check is not None and not type_check(value):
+            yield ValidationIssue(
+                path, "schema", f"Expected {expected} (got {type(value).__name__})"
+            )
+            return
+        for sub_check in checks:
+            yield from sub_check(value, path)
+
+    return check
+
+
+_compiled_schema: Optional[Check] = None
+
+
+def _default_check() -> Check:
+    """Compile the bundled schema once per process."""
+    global _compiled_schema
+    if _compiled_schema is None:
+        with open(SCHEMA_PATH, encoding="utf-8") as f:
+            _compiled_schema = compile_schema(json.load(f))
+    return _compiled_schema
+
+
+def _semantic_issues(
+    preset: Mapping[str, Any], flagged: Iterable[str]
+) -> Iterator[ValidationIssue]:
+    """Yield semantic issues for fields whose structure is schema-valid."""
+    flagged = set(flagged)
+
+    def clean(prefix: str) -> bool:
+        return not any(p == prefix or p.startswith(prefix + "/") for p in flagged)
+
+    transforms = preset.get("transforms")
+    if not clean("transforms") or not isinstance(transforms, list):
+        return
+
+    performance = preset.get("performance")
+    depths = [("iterations", preset.get("iterations"))]
+    if isinstance(performance, dict):
+        depths += [
+            (f"performance/{key}", performance.get(key))
+            for key in ("preview_iterations", "final_iterations")
+        ]
+    for path, iterations in depths:
+        if isinstance(iterations, int) and clean(path):
+            try:
+                enforce_iteration_limits(len(transforms), iterations)
+            except ValueError as e:
+                yield ValidationIssue(path, "iteration_limits", str(e))
+
+    if not transforms:
+        return
+    weight_sum = sum(t["weight"] for t in transforms)
+    if weight_sum <= 0:
+        yield ValidationIssue(
+            "transforms",
+            "weights",
+            f"Transform weights must sum to a positive value (got {weight_sum})",
+        )
+
+    contractivity = calculate_contractivity(transforms)
+    if contractivity >= 1:
+        yield ValidationIssue(
+            "transforms",
+            "contractivity",
+            f"Transform set must be contractive: largest scale must be < 1 "
+            f"(got {contractivity})",
+        )
+
+
+def validate_preset(
+    preset: Any, check: Optional[Check] = None
+) -> List[ValidationIssue]:
+    """Collect every schema and semantic problem in a preset.
+
+    Args:
+        preset: Parsed preset (any JSON value)
+        check: Compiled schema; defaults to ``src/presets/schema.json``
+
+    Returns:
+        All issues found, schema issues first; empty if the preset is valid
+    """
+    check = check or _default_check()
+    issues = list(check(preset, ""))
+    if isinstance(preset, dict):
+        issues.extend(_semantic_issues(preset, (issue.path for issue in issues)))
+    return issues
+
+
+def assert_valid_preset(preset: Any) -> None:
+    """Validate a preset and raise with all of its issues.
+
+    Args:
+        preset: Parsed preset
+
+    Raises:
+        PresetValidationError: If any issue is found
+    """
+    issues = validate_preset(preset)
+    if issues:
+        raise PresetValidationError(issues)
+
+
+def validate_file(path: Union[str, Path]) -> Tuple[str, List[ValidationIssue]]:
+    """Read, parse and validate a single preset file.
+
+    Args:
+        path: Preset JSON file
+
+    Returns:
+        (path, issues); unreadable or malformed files yield a ``json`` issue
+    """
+    try:
+        with open(path, "rb") as f:
+            preset = json.loads(f.read())
+    except (OSError, ValueError) as e:
+        return str(path), [ValidationIssue("", "json", str(e))]
+    return str(path), validate_preset(preset)
+
+
+def _validate_chunk(
+    paths: Sequence[str],
+) -> List[Tuple[str, List[ValidationIssue]]]:
+    return [validate_file(path) for path in paths]
+
+
+def validate_files(
+    paths: Iterable[Union[str, Path]], workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """Validate many preset files in parallel and aggregate the results.
+
+    Files are split into contiguous chunks, one task per chunk, so each
+    worker compiles the schema once and inter-process traffic stays small.
+    Small batches are validated in-process.
+
+    Args:
+        paths: Preset files to validate
+        workers: Worker process count (defaults to ``os.cpu_count()``)
+
+    Returns:
+        JSON-serialisable report::
+
+            {"summary": {"checked": N, "valid": V, "invalid": I, "issues": K},
+             "files": [{"path": ..., "issues": [{"path", "rule", "message"}]}]}
+
+        ``files`` lists only invalid files, in input order.
+    """
+    paths = [str(path) for path in paths]
+    workers = max(1, workers or os.cpu_count() or 1)
+    workers = min(workers, max(1, len(paths) // _MIN_FILES_PER_WORKER))
+
+    if workers == 1:
+        results = _validate_chunk(paths)
+    else:
+        chunk = -(-len(paths) // (workers * 4))
+        chunks = [paths[i : i + chunk] for i in range(0, len(paths), chunk)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = [r for part in pool.map(_validate_chunk, chunks) for r in part]
+
+    files = [
+        {"path": path, "issues": [issue._asdict() for issue in issues]}
+        for path, issues in results
+        if issues
+    ]
+    return {
+        "summary": {
+            "checked": len(results),
+            "valid": len(results) - len(files),
+            "invalid": len(files),
+            "issues": sum(len(entry["issues"]) for entry in files),
+        },
+        "files": files,
+    }
+
+
+def _expand_paths(targets: Iterable[str]) -> List[Path]:
+    paths: List[Path] = []
+    for target in targets:
+        path = Path(target)
+        if path.is_dir():
+            paths.extend(sorted(iter_preset_files(path)))
+        else:
+            paths.append(path)
+    return paths
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point for bulk validation.
+
+    Returns:
+        Exit status: 0 if every preset is valid, 1 otherwise
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.utils.validator",
+        description="Validate preset JSON files and report every problem.",
+    )
+    parser.add_argument(
+        "targets", nargs="+", help="Preset files or directories (searched recursively)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Write the JSON report here"
+    )
+    args = parser.parse_args(argv)
+
+    report = validate_files(_expand_paths(args.targets), workers=args.workers)
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(text + "\n")
+    return 1 if report["summary"]["invalid"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
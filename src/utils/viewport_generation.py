@@ -0,0 +1,299 @@
+"""Time-sliced viewport generation (architecture §7: interactive viewport).
+
+A full evaluation at high iteration counts blocks Blender's UI until it
+finishes. ``SlicedGeneration`` splits the work into small increments and
+runs as many as fit in a per-tick time budget, so a ``bpy.app.timers``
+callback can grow the fractal while the UI keeps redrawing:
+
+- Exhaustive mode shows every shallow level whole (each replaces the
+  last) while a level fits in one chunk, then streams the final level in
+  ``iter_exhaustive_chunks`` chunks on top of the last complete level.
+- Chaos mode appends ``iter_chaos_blocks`` blocks, so the sample
+  densifies uniformly; the finished cloud equals ``chaos_game_parallel``.
+
+The final cloud is held in one buffer, so the request is planned with
+``plan_generation`` before that buffer is allocated: over the memory
+limit, the depth (or chaos budget) is reduced or the request rejected.
+
+Pushing to the object rewrites its geometry, so pushes are throttled to
+geometric growth of the point count (``PUSH_GROWTH``) and their total cost
+stays linear in the final size. ``ViewportSession`` binds a generation to
+a Blender object and cancels it when parameters change.
+
+Example (inside Blender):
+    >>> session = ViewportSession(bpy.data.objects["Fractal"])
+    >>> session.start(preset)  # returns immediately
+    >>> session.start(edited)  # cancels the first and starts over
+"""
+
+import time
+from typing import Any, Callable, Iterator, Mapping, Optional, Tuple
+
+import numpy as np
+
+from src.utils.ifs_engine import (
+    CHAOS_BLOCK_POINTS,
+    DEFAULT_CHAOS_POINTS,
+    compile_preset,
+    expand_step,
+    iter_chaos_blocks,
+    iter_exhaustive_chunks,
+)
+from src.utils.math_helpers import enforce_iteration_limits
+from src.utils.memory_guard import plan_generation
+
+# Seconds of work per timer tick (half of a 60 fps frame)
+DEFAULT_TICK_BUDGET = 0.008
+
+# Upper bound on points computed per increment
+DEFAULT_CHUNK_POINTS = CHAOS_BLOCK_POINTS
+
+# Shown point count must grow by this factor between pushes
+PUSH_GROWTH = 1.5
+
+# Seconds between timer ticks
+DEFAULT_TICK_INTERVAL = 1 / 60
+
+Pusher = Callable[[np.ndarray], Any]
+
+
+class SlicedGeneration:
+    """A generation advanced in time-budgeted ticks.
+
+    Args:
+        preset: Validated preset dictionary
+        mode: ``"exhaustive"`` or ``"chaos"``
+        iterations: Final depth (defaults to the preset's iterations)
+        n_points: Chaos-game point budget
+        seed: Chaos-game seed (defaults to the preset's seed)
+        chunk_points: Upper bound on points per increment
+        tick_budget: Seconds of work per tick
+        push: Called with the points to show, throttled to ``PUSH_GROWTH``
+        clock: Monotonic time source
+        memory_limit: Limit in bytes (default: ``default_limit()``)
+        memory_policy: ``"reduce_iterations"`` or ``"raise"`` for requests
+            over the limit
+
+    Attributes:
+        downgrade: Memory downgrade applied to the request, or ``None``
+        done: All work finished and pushed
+        cancelled: Stopped by ``cancel``
+        ticks: Ticks run so far
+    """
+
+    def __init__(
+        self,
+        preset: Mapping[str, Any],
+        mode: str = "exhaustive",
+        iterations: Optional[int] = None,
+        n_points: Optional[int] = None,
+        seed: Optional[int] = None,
+        chunk_points: int = DEFAULT_CHUNK_POINTS,
+        tick_budget: float = DEFAULT_TICK_BUDGET,
+        push: Optional[Pusher] = None,
+        clock: Callable[[], float] = time.perf_counter,
+        memory_limit: Optional[int] = None,
+        memory_policy: str = "reduce_iterations",
+    ) -> None:
+        if mode not in ("exhaustive", "chaos"):
+            raise ValueError(f"Mode must be 'exhaustive' or 'chaos' (got {mode!r})")
+        if chunk_points < 1:
+            raise ValueError(f"Chunk size must be positive (got {chunk_points})")
+        # The stratified fallback of the "points" policy is not sliced
+        if memory_policy not in ("reduce_iterations", "raise"):
+            raise ValueError(
+                "Memory policy must be 'reduce_iterations' or 'raise' "
+                f"(got {memory_policy!r})"
+            )
+        compiled = compile_preset(preset)
+        self.mode = mode
+        self.tick_budget = tick_budget
+        self.push = push
+        self.clock = clock
+        self.done = False
+        self.cancelled = False
+        self.ticks = 0
+        self._preview = np.zeros((0, 3))
+        self._filled = 0
+        self._pushed = 0
+        depth = compiled.iterations if iterations is None else iterations
+        if mode == "exhaustive":
+            enforce_iteration_limits(compiled.transform_count, depth)
+        plan = plan_generation(
+            compiled.transform_count,
+            depth,
+            mode,
+            n_points or DEFAULT_CHAOS_POINTS,
+            limit_bytes=memory_limit,
+            policy=memory_policy,
+        )
+        self.downgrade = plan.downgrade
+        if mode == "exhaustive":
+            self.total = compiled.transform_count**plan.iterations
+            increments = self._exhaustive(
+                compiled.matrices, plan.iterations, chunk_points
+            )
+        else:
+            self.total = plan.n_points or DEFAULT_CHAOS_POINTS
+            increments = self._chaos(
+                compiled.matrices,
+                compiled.weights,
+                compiled.seed if seed is None else seed,
+                chunk_points,
+            )
+        self._buffer = np.empty((self.total, 3))
+        self._increments: Iterator[Tuple[Optional[np.ndarray], bool]] = increments
+
+    def _exhaustive(
+        self, matrices: np.ndarray, depth: int, chunk_points: int
+    ) -> Iterator[Tuple[Optional[np.ndarray], bool]]:
+        """Complete shallow levels, then the final level in chunks."""
+        level, k = np.zeros((1, 3)), 0
+        while k < depth and len(level) * len(matrices) <= chunk_points:
+            level, k = expand_step(matrices, level), k + 1
+            yield level, True
+        if k < depth:
+            for chunk in iter_exhaustive_chunks(matrices, depth, chunk_points):
+                yield chunk, False
+        else:
+            self._buffer[:] = level
+            self._filled = self.total
+            yield None, False
+
+    def _chaos(
+        self, matrices: np.ndarray, weights: np.ndarray, seed: int, chunk_points: int
+    ) -> Iterator[Tuple[Optional[np.ndarray], bool]]:
+        """Independently seeded blocks of the final sample."""
+        for block in iter_chaos_blocks(
+            matrices, weights, self.total, seed, chunk_points
+        ):
+            yield block, False
+
+    @property
+    def progress(self) -> float:
+        """Share of the final point count computed."""
+        return self._filled / self.total
+
+    @property
+    def shown(self) -> int:
+        """Number of points ``points`` returns."""
+        if self._filled == self.total:
+            return self.total
+        return len(self._preview) + self._filled
+
+    @property
+    def points(self) -> np.ndarray:
+        """Points to show now: the final result once complete."""
+        if self._filled == self.total:
+            return self._buffer
+        if not self._filled:
+            return self._preview
+        return np.concatenate([self._preview, self._buffer[: self._filled]])
+
+    def _advance(self) -> bool:
+        """Run one increment; False when none are left."""
+        try:
+            points, replaces = next(self._increments)
+        except StopIteration:
+            return False
+        if points is None:
+            pass
+        elif replaces:
+            self._preview = points
+        else:
+            self._buffer[self._filled : self._filled + len(points)] = points
+            self._filled += len(points)
+        return True
+
+    def tick(self) -> bool:
+        """Run increments until the time budget is spent.
+
+        At least one increment runs per tick, so progress is guaranteed
+        even when a single increment exceeds the budget.
+
+        Returns:
+            Whether more work remains
+        """
+        if self.done or self.cancelled:
+            return False
+        self.ticks += 1
+        deadline = self.clock() + self.tick_budget
+        remaining = self._advance()
+        while remaining and self.clock() < deadline:
+            remaining = self._advance()
+        if not remaining:
+            self.done = True
+        shown = self.shown
+        if self.push is not None and (
+            self.done or shown >= max(1, self._pushed) * PUSH_GROWTH
+        ):
+            self.push(self.points)
+            self._pushed = shown
+        return not self.done
+
+    def run(self) -> np.ndarray:
+        """Run every remaining tick and return the final points."""
+        while self.tick():
+            pass
+        return self.points
+
+    def cancel(self) -> None:
+        """Stop before the next increment; the shown geometry is kept."""
+        self.cancelled = True
+        self._increments.close()
+
+
+def mesh_pusher(obj: Any) -> Pusher:
+    """Pusher replacing a Blender mesh object's vertices with the points."""
+
+    def push(points: np.ndarray) -> None:
+        mesh = obj.data
+        mesh.clear_geometry()
+        mesh.vertices.add(len(points))
+        mesh.vertices.foreach_set("co", points.astype(np.float32).ravel())
+        mesh.update()
+
+    return push
+
+
+class ViewportSession:
+    """Grow a preset in a Blender object from ``bpy.app.timers`` ticks.
+
+    Starting a new generation cancels the running one, so parameter
+    changes (e.g. a ``ParameterInjector`` flush) never wait for stale work.
+
+    Args:
+        obj: Mesh object receiving the points
+        interval: Seconds between ticks
+        **options: ``SlicedGeneration`` options for every generation
+    """
+
+    def __init__(
+        self, obj: Any, interval: float = DEFAULT_TICK_INTERVAL, **options: Any
+    ) -> None:
+        self.obj = obj
+        self.interval = interval
+        self.options = options
+        self.generation: Optional[SlicedGeneration] = None
+
+    def start(self, preset: Mapping[str, Any], **overrides: Any) -> SlicedGeneration:
+        """Cancel the running generation and start ``preset``."""
+        import bpy
+
+        self.cancel()
+        options = {**self.options, **overrides}
+        generation = SlicedGeneration(preset, push=mesh_pusher(self.obj), **options)
+        self.generation = generation
+
+        def tick() -> Optional[float]:
+            # Returning None unregisters the timer
+            return self.interval if generation.tick() else None
+
+        bpy.app.timers.register(tick, first_interval=0.0)
+        return generation
+
+    def cancel(self) -> None:
+        """Cancel the running generation (its timer stops on its next tick)."""
+        if self.generation is not None:
+            self.generation.cancel()
+            self.generation = None
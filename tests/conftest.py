@@ -16,3 +16,8 @@ def project_root() -> Path:
     """Return the project root directory."""
     return PROJECT_ROOT
 
+
+@pytest.fixture
+def valid_presets_dir() -> Path:
+    """Return the directory of valid preset fixtures."""
+    return PROJECT_ROOT / "tests" / "fixtures" / "valid_presets"
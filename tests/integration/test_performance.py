@@ -0,0 +1,67 @@
+"""Evaluation benchmarks of IFS_Generator inside Blender.
+
+Times depsgraph evaluations over a small grid of Iterations, transform
+count and Output Mode and writes the records as JSON, in the same format
+as the headless benchmark (``python -m src.utils.benchmark``) so the two
+can be compared. Tests are skipped if bpy is unavailable.
+
+To run these tests:
+    blender --background src/geometry_nodes/ifs_generator.blend --python-expr \
+        "import pytest; pytest.main(['tests/integration/test_performance.py'])"
+
+Set IFS_BENCHMARK_JSON to keep the results file.
+
+See architecture.md §7 for the 60fps viewport target.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+# Skip all tests in this module if bpy (Blender Python API) is not available
+bpy = pytest.importorskip("bpy")
+
+from src.utils.benchmark import (  # noqa: E402
+    benchmark_blender,
+    benchmark_grid,
+    benchmark_headless,
+    compare_results,
+    write_results,
+)
+
+GRID = benchmark_grid(
+    iterations=[2, 4], transform_counts=[2, 3], output_modes=[0, 1, 2]
+)
+
+
+@pytest.fixture(scope="module")
+def records():
+    """Provide Blender benchmark records for the grid."""
+    return benchmark_blender(GRID, repeats=3)
+
+
+class TestBlenderBenchmark:
+    """Test depsgraph evaluation timing of the node group."""
+
+    def test_every_configuration_recorded(self, records):
+        """Test each configuration is evaluated and timed."""
+        assert [record.config for record in records] == GRID
+        for record in records:
+            assert len(record.runs) == 3
+            assert record.seconds > 0
+
+    def test_evaluations_produce_geometry(self, records):
+        """Test every evaluation yields points, instances or vertices."""
+        for record in records:
+            assert record.points + record.instances + record.vertices > 0, record
+
+    def test_results_written_and_comparable(self, records, tmp_path):
+        """Test results are written as JSON and match headless configurations."""
+        path = os.environ.get("IFS_BENCHMARK_JSON") or tmp_path / "blender.json"
+        document = write_results(records, path, backend="blender")
+        assert document["environment"]["blender"] == bpy.app.version_string
+        assert len(json.loads(Path(path).read_text())["records"]) == len(GRID)
+        comparison = compare_results(benchmark_headless(GRID, repeats=1), records)
+        assert len(comparison) == len([c for c in GRID if c[2] == 0])
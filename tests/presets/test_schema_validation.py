@@ -0,0 +1,46 @@
+"""Validation tests for the bundled presets and schema.
+
+Every preset in src/presets/ must pass the full validator, and the compiled
+schema checks must agree with the reference ``jsonschema`` implementation.
+"""
+
+import json
+
+import pytest
+
+from src.utils.preset_loader import PRESETS_DIR, iter_preset_files, load_preset
+from src.utils.validator import SCHEMA_PATH, validate_file, validate_preset
+
+BUNDLED_PRESETS = sorted(iter_preset_files(PRESETS_DIR))
+
+
+@pytest.mark.parametrize("preset_file", BUNDLED_PRESETS, ids=lambda p: p.name)
+def test_all_presets_validate(preset_file):
+    """Ensure all presets in the repository are valid."""
+    _, issues = validate_file(preset_file)
+    assert issues == []
+
+
+def test_barnsley_preset_structure():
+    """Test the Barnsley Fern weight distribution (stem gets 1%)."""
+    preset = load_preset("barnsley")
+    weights = [t["weight"] for t in preset["transforms"]]
+    assert preset["name"] == "Barnsley Fern"
+    assert sorted(weights) == [0.01, 0.07, 0.07, 0.85]
+    assert sum(weights) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("fixture_dir", ["valid_presets", "invalid_presets"], ids=str)
+def test_compiled_schema_agrees_with_jsonschema(project_root, fixture_dir):
+    """Test that schema verdicts match the reference implementation."""
+    jsonschema = pytest.importorskip("jsonschema")
+    schema = json.loads(SCHEMA_PATH.read_text())
+    fixtures = project_root / "tests" / "fixtures" / fixture_dir
+    for path in sorted(fixtures.glob("*.json")):
+        try:
+            preset = json.loads(path.read_text())
+        except ValueError:
+            continue
+        reference_valid = jsonschema.Draft7Validator(schema).is_valid(preset)
+        schema_issues = [i for i in validate_preset(preset) if i.rule == "schema"]
+        assert reference_valid == (not schema_issues), path.name
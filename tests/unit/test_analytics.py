@@ -0,0 +1,96 @@
+"""Unit tests for fractal dimension analytics."""
+
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.utils.analytics import (  # noqa: E402
+    analyze_preset,
+    box_counting,
+    contraction_ratios,
+    similarity_dimension,
+)
+from src.utils.ifs_engine import compile_preset, expand_exhaustive  # noqa: E402
+from src.utils.preset_loader import load_preset  # noqa: E402
+
+
+class TestBoxCounting:
+    """Test multi-scale box counts."""
+
+    def test_counts_match_naive_grids(self):
+        """Test every level matches counting unique cells directly."""
+        points = np.random.default_rng(0).random((2000, 3))
+        result = box_counting(points, max_bits=6)
+        lo, extent = points.min(axis=0), np.ptp(points, axis=0).max()
+        for bits, count in zip(result.bits, result.counts):
+            cells = np.minimum(((points - lo) / extent * 64).astype(int), 63)
+            assert count == len(np.unique(cells >> (6 - bits), axis=0))
+
+    def test_sierpinski_dimension(self):
+        """Test the exhaustive triangle gives about log 3 / log 2."""
+        matrices = compile_preset(load_preset("sierpinski")).matrices
+        points = expand_exhaustive(matrices, 9)
+        result = box_counting(points, max_bits=9, fit_bits=(3, 8))
+        assert result.dimension == pytest.approx(math.log2(3), abs=0.03)
+        assert result.r_squared > 0.99
+
+    def test_plane_and_coverage(self):
+        """Test a filled square has dimension 2 and full coverage."""
+        grid = np.stack(np.meshgrid(np.arange(256), np.arange(256)), -1)
+        points = np.column_stack([grid.reshape(-1, 2) / 255.0, np.zeros(256**2)])
+        result = box_counting(points, max_bits=8, fit_bits=(1, 8))
+        assert result.dimension == pytest.approx(2.0)
+        np.testing.assert_allclose(result.coverage, 1.0)
+
+    def test_saturated_levels_are_not_fitted(self):
+        """Test levels with nearly one point per cell are excluded."""
+        points = np.random.default_rng(0).random((1000, 3))
+        result = box_counting(points, max_bits=10)
+        assert result.fit_bits[1] <= 2
+
+    def test_invalid_input(self):
+        """Test empty, coincident and non-finite clouds are rejected."""
+        with pytest.raises(ValueError, match="non-empty"):
+            box_counting(np.zeros((0, 3)))
+        with pytest.raises(ValueError, match="coincide"):
+            box_counting(np.ones((5, 3)))
+        with pytest.raises(ValueError, match="finite"):
+            box_counting(np.array([[0.0, 0, 0], [np.nan, 0, 0]]))
+
+
+class TestSimilarityDimension:
+    """Test the Moran equation solver."""
+
+    def test_known_values(self):
+        """Test classic self-similar sets."""
+        assert similarity_dimension([1 / 3, 1 / 3]) == pytest.approx(math.log(2, 3))
+        assert similarity_dimension([0.5] * 4) == pytest.approx(2.0)
+        assert similarity_dimension([0.5]) == 0.0
+
+    def test_overlapping_sets_exceed_one(self):
+        """Test the bracket grows for large ratio sums."""
+        assert similarity_dimension([0.9] * 100) > 40
+
+    def test_non_contractive_rejected(self):
+        """Test ratios of 1 or more are rejected."""
+        with pytest.raises(ValueError, match="Contraction ratios"):
+            similarity_dimension([0.5, 1.0])
+
+    def test_preset_ratios(self):
+        """Test the triangle's ratios come from its planar scales."""
+        matrices = compile_preset(load_preset("sierpinski")).matrices
+        np.testing.assert_allclose(contraction_ratios(matrices), 0.5)
+
+
+class TestAnalyzePreset:
+    """Test the per-preset report."""
+
+    def test_report(self):
+        """Test the box estimate tracks the similarity dimension."""
+        report = analyze_preset(load_preset("sierpinski"), n_points=200_000)
+        assert report["point_count"] == 200_000
+        assert report["similarity_dimension"] == pytest.approx(math.log2(3))
+        assert report["box_dimension"] == pytest.approx(math.log2(3), abs=0.05)
+        assert 0 < report["coverage"] < 1
@@ -0,0 +1,131 @@
+"""Unit tests for keyframed animation sequencing."""
+
+import copy
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.utils.animation import (  # noqa: E402
+    FrameWriter,
+    IncrementalExpander,
+    frame_presets,
+    interpolate_presets,
+    render_animation,
+)
+from src.utils.ifs_engine import compile_preset, expand_exhaustive  # noqa: E402
+from src.utils.preset_loader import load_preset  # noqa: E402
+
+
+@pytest.fixture
+def keyframes():
+    """Provide a fern whose third transform rotates by 30 degrees."""
+    start = load_preset("barnsley")
+    start["iterations"] = 5
+    end = copy.deepcopy(start)
+    end["transforms"][2]["rotation"][2] += 30
+    return [(0, start), (10, end)]
+
+
+class TestInterpolation:
+    """Test preset blending between keyframes."""
+
+    def test_midpoint(self, keyframes):
+        """Test components are blended and iterations rounded."""
+        (_, start), (_, end) = keyframes
+        end = copy.deepcopy(end)
+        end["iterations"] = 8
+        middle = interpolate_presets(start, end, 0.5)
+        rotation = start["transforms"][2]["rotation"][2] + 15
+        assert middle["transforms"][2]["rotation"][2] == pytest.approx(rotation)
+        assert middle["iterations"] == 6
+        assert middle["name"] == start["name"]
+
+    def test_held_values_are_exact(self, keyframes):
+        """Test components equal at both keys are not perturbed."""
+        (_, start), (_, end) = keyframes
+        middle = interpolate_presets(start, end, 0.3)
+        assert middle["transforms"][0] == start["transforms"][0]
+
+    def test_transform_count_mismatch(self, keyframes):
+        """Test keyframes with different transform counts are rejected."""
+        (_, start), _ = keyframes
+        other = load_preset("sierpinski")
+        with pytest.raises(ValueError, match="same transform count"):
+            interpolate_presets(start, other, 0.5)
+
+    def test_frame_sequence(self, keyframes):
+        """Test every frame from first to last key is produced once."""
+        frames = list(frame_presets(keyframes, easing="smoothstep"))
+        assert [frame for frame, _ in frames] == list(range(11))
+        assert frames[-1][1]["transforms"] == keyframes[1][1]["transforms"]
+
+
+class TestIncrementalExpander:
+    """Test temporal reuse of expansion levels."""
+
+    def test_matches_full_evaluation(self, keyframes):
+        """Test every frame equals an independent exhaustive expansion."""
+        expander = IncrementalExpander()
+        for _, preset in frame_presets(keyframes):
+            compiled = compile_preset(preset)
+            points = expander.expand(compiled.matrices, compiled.iterations)
+            expected = expand_exhaustive(compiled.matrices, compiled.iterations)
+            np.testing.assert_allclose(points, expected, atol=1e-12)
+
+    def test_unchanged_frame_is_free(self, keyframes):
+        """Test repeating a frame evaluates nothing."""
+        compiled = compile_preset(keyframes[0][1])
+        expander = IncrementalExpander()
+        first = expander.expand(compiled.matrices, 5)
+        computed = expander.computed
+        assert expander.expand(compiled.matrices, 5) is first
+        assert expander.computed == computed
+
+    def test_only_affected_addresses_recomputed(self):
+        """Test changing one of four transforms skips the other subtrees.
+
+        At depth 2, 9 of the 16 addresses avoid the changed transform.
+        """
+        compiled = compile_preset(load_preset("barnsley"))
+        expander = IncrementalExpander()
+        expander.expand(compiled.matrices, 2)
+        matrices = compiled.matrices.copy()
+        matrices[3, :3, 3] += 0.5
+        computed = expander.computed
+        points = expander.expand(matrices, 2)
+        assert expander.computed - computed == 1 + 4 + 3
+        np.testing.assert_allclose(points, expand_exhaustive(matrices, 2))
+
+    def test_returned_arrays_are_not_modified(self, keyframes):
+        """Test earlier results survive later updates."""
+        compiled = compile_preset(keyframes[0][1])
+        expander = IncrementalExpander()
+        first = expander.expand(compiled.matrices, 3)
+        snapshot = first.copy()
+        expander.expand(compiled.matrices * 0.5, 3)
+        np.testing.assert_array_equal(first, snapshot)
+
+
+class TestRenderAnimation:
+    """Test frame export."""
+
+    def test_frames_written(self, keyframes, tmp_path):
+        """Test one file per frame and reuse on a held segment."""
+        held = keyframes + [(15, keyframes[1][1])]
+        pattern = str(tmp_path / "frame_{frame:03d}.npy")
+        stats = render_animation(held, pattern)
+        assert stats["frames"] == 16
+        assert stats["points_reused"] >= 5 * sum(4**k for k in range(1, 6))
+        last = np.load(tmp_path / "frame_015.npy")
+        compiled = compile_preset(keyframes[1][1])
+        np.testing.assert_allclose(
+            last, expand_exhaustive(compiled.matrices, 5).astype(np.float32)
+        )
+
+    def test_writer_errors_surface(self, tmp_path):
+        """Test a failed background write is raised on close."""
+        writer = FrameWriter()
+        writer.submit(str(tmp_path / "missing" / "frame.ply"), np.zeros((1, 3)))
+        with pytest.raises(OSError):
+            writer.close()
@@ -0,0 +1,180 @@
+"""Unit tests for the IFS_Generator bake cache helpers."""
+
+from types import SimpleNamespace
+
+from src.utils import bake_cache
+from src.utils.bake_cache import (
+    NODE_GROUP_NAME,
+    bake_directory,
+    bake_root,
+    ifs_modifiers,
+    is_baked,
+    modifier_fingerprint,
+    modifier_values,
+    node_tree_signature,
+    parameter_fingerprint,
+    refresh_bake,
+)
+
+
+def _socket(identifier, value=None, linked=False):
+    return SimpleNamespace(identifier=identifier, default_value=value, is_linked=linked)
+
+
+def _tree(count=1):
+    repeat = SimpleNamespace(
+        name="Repeat Output", bl_idname="GeometryNodeRepeatOutput", inputs=[]
+    )
+    line = SimpleNamespace(
+        name="Single Point Init",
+        bl_idname="GeometryNodeMeshLine",
+        inputs=[_socket("Count", count), _socket("Offset", (0.0, 0.0, 0.0))],
+    )
+    link = SimpleNamespace(
+        from_node=line,
+        from_socket=_socket("Mesh"),
+        to_node=repeat,
+        to_socket=_socket("Geometry"),
+    )
+    return SimpleNamespace(nodes=[line, repeat], links=[link])
+
+
+class FakeModifier(dict):
+    """Modifier storing inputs as ID properties keyed by identifier."""
+
+    def __init__(self, group_name=NODE_GROUP_NAME, **values):
+        super().__init__(values)
+        self.type = "NODES"
+        items = [
+            SimpleNamespace(in_out="INPUT", name="Iterations", identifier="Socket_1"),
+            SimpleNamespace(in_out="INPUT", name="Seed", identifier="Socket_2"),
+            SimpleNamespace(in_out="OUTPUT", name="Geometry", identifier="Socket_3"),
+        ]
+        tree = _tree()
+        self.node_group = SimpleNamespace(
+            name=group_name,
+            interface=SimpleNamespace(items_tree=items),
+            nodes=tree.nodes,
+            links=tree.links,
+        )
+
+
+class FakeCollection(list):
+    """Mesh element collection supporting ``foreach_get``."""
+
+    def __init__(self, values, width):
+        super().__init__(range(len(values) // width))
+        self.values = values
+
+    def foreach_get(self, attribute, buffer):
+        buffer[:] = type(buffer)(buffer.typecode, self.values)
+
+
+class FakeMesh:
+    """Mesh data-block with coordinates and face corners."""
+
+    session_uid = 1
+
+    def __init__(self, coordinates, corners=(0, 1, 2)):
+        self.name = "Leaf"
+        self.vertices = FakeCollection(list(coordinates), 3)
+        self.loops = FakeCollection(list(corners), 1)
+        self.edges = [0, 1, 2]
+        self.polygons = [0]
+
+
+class TestFingerprint:
+    """Test fingerprint stability and sensitivity."""
+
+    def test_independent_of_key_order(self):
+        """Test equal inputs give equal fingerprints."""
+        a = parameter_fingerprint({"Iterations": 8, "Seed": 1}, "tree")
+        b = parameter_fingerprint({"Seed": 1, "Iterations": 8}, "tree")
+        assert a == b
+
+    def test_sensitive_to_inputs_and_tree(self):
+        """Test any input or tree change gives a new fingerprint."""
+        base = parameter_fingerprint({"Iterations": 8, "Seed": 1}, "tree")
+        assert parameter_fingerprint({"Iterations": 9, "Seed": 1}, "tree") != base
+        assert parameter_fingerprint({"Iterations": 8, "Seed": 1}, "other") != base
+
+    def test_sequences_match_lists(self):
+        """Test ID property arrays hash like the lists they hold."""
+        values = {"Transform 1 Scale": (0.5, 0.5, 0.5)}
+        as_list = {"Transform 1 Scale": [0.5, 0.5, 0.5]}
+        assert parameter_fingerprint(values) == parameter_fingerprint(as_list)
+
+    def test_mesh_inputs_hash_their_content(self):
+        """Test editing an instanced mesh changes the fingerprint."""
+        triangle = [0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0, 0.0]
+        base = parameter_fingerprint({"Instance Mesh": FakeMesh(triangle)})
+        assert parameter_fingerprint({"Instance Mesh": FakeMesh(triangle)}) == base
+        moved = triangle[:-1] + [2.0]
+        assert parameter_fingerprint({"Instance Mesh": FakeMesh(moved)}) != base
+        flipped = FakeMesh(triangle, corners=(0, 2, 1))
+        assert parameter_fingerprint({"Instance Mesh": flipped}) != base
+
+    def test_tree_signature(self):
+        """Test tree signatures follow node defaults."""
+        assert node_tree_signature(_tree()) == node_tree_signature(_tree())
+        assert node_tree_signature(_tree(2)) != node_tree_signature(_tree())
+
+
+class TestCacheEntries:
+    """Test cache layout and modifier helpers."""
+
+    def test_is_baked(self, tmp_path):
+        """Test entries count as baked once Blender metadata exists."""
+        entry = bake_directory(tmp_path, "abc")
+        assert entry == tmp_path / "abc"
+        assert not is_baked(entry)
+        meta = entry / "bake_1" / "meta"
+        meta.mkdir(parents=True)
+        (meta / "1.json").write_text("{}")
+        assert is_baked(entry)
+
+    def test_modifier_values(self):
+        """Test stored inputs are read by socket name."""
+        modifier = FakeModifier(Socket_1=8, Socket_2=3)
+        assert modifier_values(modifier) == {"Iterations": 8, "Seed": 3}
+
+    def test_ifs_modifiers(self):
+        """Test only IFS_Generator modifiers are returned."""
+        ifs, other = FakeModifier(), FakeModifier("Other")
+        obj = SimpleNamespace(name="Fractal", modifiers=[other, ifs])
+        assert list(ifs_modifiers([obj])) == [(obj, ifs)]
+
+
+class TestRefreshBake:
+    """Test baked modifiers follow input changes."""
+
+    def test_bake_root(self, tmp_path):
+        """Test only cache entry directories count as bakes."""
+        modifier = FakeModifier(Socket_1=8)
+        assert bake_root(modifier) is None
+        modifier.bake_directory = str(tmp_path / "manual")
+        assert bake_root(modifier) is None
+        modifier.bake_directory = str(tmp_path / modifier_fingerprint(modifier))
+        assert bake_root(modifier) == tmp_path
+
+    def test_unchanged_inputs_keep_bake(self, tmp_path, monkeypatch):
+        """Test unbaked and up-to-date modifiers are left alone."""
+        monkeypatch.setattr(bake_cache, "bake_modifier", None)
+        modifier = FakeModifier(Socket_1=8)
+        assert refresh_bake(None, modifier) is None
+        modifier.bake_directory = str(tmp_path / modifier_fingerprint(modifier))
+        assert refresh_bake(None, modifier) is None
+
+    def test_changed_inputs_rebake(self, tmp_path, monkeypatch):
+        """Test a stale bake is moved to the entry of the new inputs."""
+        calls = []
+        monkeypatch.setattr(
+            bake_cache,
+            "bake_modifier",
+            lambda obj, modifier, root: calls.append(root) or {"reused": False},
+        )
+        modifier = FakeModifier(Socket_1=8)
+        modifier.bake_directory = str(tmp_path / modifier_fingerprint(modifier))
+        modifier["Socket_1"] = 9
+        assert refresh_bake(None, modifier) == {"reused": False}
+        assert calls == [tmp_path]
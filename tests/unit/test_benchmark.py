@@ -0,0 +1,77 @@
+"""Unit tests for evaluation benchmarks."""
+
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.utils.benchmark import (  # noqa: E402
+    BenchmarkRecord,
+    benchmark_grid,
+    benchmark_headless,
+    compare_results,
+    load_results,
+    main,
+    synthetic_preset,
+    write_results,
+)
+from src.utils.validator import validate_preset  # noqa: E402
+
+
+class TestGrid:
+    """Test configurations and synthetic presets."""
+
+    def test_grid_order_and_limits(self):
+        """Test the grid varies output mode fastest and enforces limits."""
+        configs = benchmark_grid([4, 6], [2, 3], [0, 1])
+        assert configs[:3] == [(2, 4, 0), (2, 4, 1), (2, 6, 0)]
+        assert len(configs) == 8
+        with pytest.raises(ValueError, match="transforms"):
+            benchmark_grid([4], [9], [0])
+        with pytest.raises(ValueError, match="output mode"):
+            benchmark_grid([4], [2], [3])
+
+    def test_synthetic_presets_are_valid(self):
+        """Test every transform count yields a valid preset for both stages."""
+        for count in range(1, 9):
+            preset = synthetic_preset(count, 5, output_mode=1)
+            assert validate_preset(preset) == []
+            assert len(preset["transforms"]) == count
+            assert preset["performance"]["preview_output_mode"] == 1
+
+
+class TestHeadless:
+    """Test headless timing and result files."""
+
+    def test_point_configs_only(self):
+        """Test instanced modes are skipped and counts match the merge."""
+        records = benchmark_headless(benchmark_grid([3], [2, 4], [0, 2]), repeats=2)
+        assert [record.config for record in records] == [(2, 3, 0), (4, 3, 0)]
+        assert [record.points for record in records] == [15, 85]
+        assert all(len(record.runs) == 2 for record in records)
+        assert all(record.memory_bytes > 0 for record in records)
+
+    def test_round_trip_and_compare(self, tmp_path):
+        """Test results reload and compare by configuration."""
+        path = tmp_path / "headless.json"
+        baseline = [BenchmarkRecord("headless", 3, 8, 0, 0.01, points=9841)]
+        document = write_results(baseline, path)
+        assert document["records"][0]["meets_frame_budget"] is True
+        assert load_results(path) == baseline
+        current = [
+            BenchmarkRecord("blender", 3, 8, 0, 0.02, points=9841),
+            BenchmarkRecord("blender", 3, 8, 2, 0.05, vertices=78728),
+        ]
+        (entry,) = compare_results(load_results(path), current)
+        assert entry["ratio"] == pytest.approx(2.0)
+        assert entry["meets_frame_budget"] is False and entry["same_points"]
+
+    def test_main(self, tmp_path, capsys):
+        """Test the CLI prints a table and writes a file."""
+        path = tmp_path / "out.json"
+        argv = ["--iterations", "3", "--transforms", "2", "--repeats", "1"]
+        assert main(argv + ["--json", str(path)]) == 0
+        assert json.loads(path.read_text())["records"][0]["points"] == 15
+        assert main(argv + ["--baseline", str(path)]) == 0
+        assert "T=2 iter=3 mode=0" in capsys.readouterr().out
@@ -0,0 +1,148 @@
+"""Unit tests for the warm Blender worker pool.
+
+Workers are ``src.utils.fake_blender_worker`` processes, which speak the
+Blender worker protocol without Blender.
+"""
+
+import io
+import json
+import os
+import signal
+import sys
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+from src.utils.blender_pool import (
+    RESPONSE_PREFIX,
+    WorkerCrashed,
+    WorkerError,
+    WorkerPool,
+    _Job,
+    serve_worker,
+)
+
+REPO_ROOT = Path(__file__).parent.parent.parent
+FAKE_WORKER = [sys.executable, "-m", "src.utils.fake_blender_worker"]
+
+
+def make_pool(**options):
+    """Create a pool of fake workers rooted at the repository."""
+    options.setdefault("startup_timeout", 30)
+    return WorkerPool(FAKE_WORKER, cwd=str(REPO_ROOT), **options)
+
+
+class TestServeWorker:
+    """Test the worker side of the protocol in-process."""
+
+    def test_requests_and_errors(self):
+        """Test dispatch, error reporting and shutdown."""
+        requests = [
+            {"id": 1, "op": "double", "params": {"x": 2}},
+            {"id": 2, "op": "double", "params": {}},
+            {"id": 3, "op": "missing"},
+            {"id": 4, "op": "shutdown"},
+            {"id": 5, "op": "double", "params": {"x": 1}},
+        ]
+        stdin = io.StringIO("".join(json.dumps(r) + "\n" for r in requests))
+        stdout = io.StringIO()
+        jobs = serve_worker({"double": lambda p: p["x"] * 2}, stdin, stdout)
+        lines = stdout.getvalue().splitlines()
+        assert all(line.startswith(RESPONSE_PREFIX) for line in lines)
+        messages = [json.loads(line[len(RESPONSE_PREFIX) :]) for line in lines]
+        assert messages[0]["ready"] is True
+        assert messages[1] == {"id": 1, "ok": True, "result": 4}
+        assert messages[2]["ok"] is False and "KeyError" in messages[2]["error"]
+        assert "Unknown op" in messages[3]["error"]
+        assert messages[4]["result"] == {"jobs": 3}
+        assert len(messages) == 5  # nothing served after shutdown
+        assert jobs == 3
+
+
+class TestWorkerPool:
+    """Test scheduling, recycling, health checks and failure handling."""
+
+    def test_jobs_keep_scene_state(self, tmp_path):
+        """Test a warm worker keeps the applied preset between jobs."""
+        with make_pool(size=1) as pool:
+            applied = pool.run("apply_preset", {"preset": "sierpinski"})
+            assert applied["transform_count"] == 3
+            out = tmp_path / "render.png"
+            pool.run("render", {"filepath": str(out), "size": 32})
+            assert out.read_bytes().startswith(b"\x89PNG")
+
+    def test_parallel_jobs_use_all_workers(self):
+        """Test concurrent jobs spread across the pool."""
+        with make_pool(size=2) as pool:
+            futures = [pool.submit("sleep", {"seconds": 0.3}) for _ in range(2)]
+            for future in futures:
+                future.result(timeout=10)
+            pids = pool.pids
+            assert len(set(pids)) == 2 and None not in pids
+
+    def test_workers_are_recycled(self):
+        """Test a worker is replaced after max_jobs_per_worker jobs."""
+        with make_pool(size=1, max_jobs_per_worker=2) as pool:
+            pool.run("sleep")
+            first = pool.pids[0]
+            pool.run("sleep")
+            pool.run("sleep")  # served by the replacement worker
+            assert pool.stats["recycled"] == 1
+            assert pool.pids[0] not in (None, first)
+
+    def test_job_errors_keep_worker(self):
+        """Test a failing job reports its error without losing the worker."""
+        with make_pool(size=1) as pool:
+            pool.run("sleep")
+            pid = pool.pids[0]
+            with pytest.raises(WorkerError, match="boom"):
+                pool.run("fail", {"message": "boom"})
+            assert pool.run("sleep") == {"slept": 0}
+            assert pool.pids[0] == pid
+
+    def test_unencodable_params(self):
+        """Test bad parameters are rejected and never stall a slot."""
+        with make_pool(size=1) as pool:
+            with pytest.raises(TypeError, match="JSON"):
+                pool.submit("sleep", {"seconds": object()})
+            future = Future()
+            pool._jobs.put(_Job("sleep", {"seconds": {1, 2}}, 5.0, future))
+            with pytest.raises(TypeError):
+                future.result(timeout=30)
+            assert pool.run("sleep") == {"slept": 0}
+
+    def test_crash_is_reported_and_worker_replaced(self):
+        """Test a crashing job fails after retries and the pool recovers."""
+        with make_pool(size=1, retries=1) as pool:
+            with pytest.raises(WorkerCrashed):
+                pool.run("crash")
+            assert pool.stats["started"] >= 2
+            assert pool.run("sleep") == {"slept": 0}
+
+    def test_timeout_kills_worker(self):
+        """Test a job over its timeout fails and its worker is replaced."""
+        with make_pool(size=1) as pool:
+            pool.run("sleep")
+            pid = pool.pids[0]
+            with pytest.raises(TimeoutError):
+                pool.run("sleep", {"seconds": 5}, timeout=0.2)
+            assert pool.run("sleep") == {"slept": 0}
+            assert pool.pids[0] != pid
+            assert pool.stats["replaced"] == 1
+
+    @pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="POSIX only")
+    def test_dead_idle_worker_is_replaced(self):
+        """Test a worker killed while idle is replaced before the next job."""
+        with make_pool(size=1, health_check_interval=0) as pool:
+            pool.run("sleep")
+            os.kill(pool.pids[0], signal.SIGKILL)
+            assert pool.run("apply_preset", {"preset": "barnsley"})["name"]
+            assert pool.stats["replaced"] == 1
+
+    def test_closed_pool_rejects_jobs(self):
+        """Test submitting after close raises."""
+        pool = make_pool(size=1, prewarm=False)
+        pool.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            pool.submit("sleep")
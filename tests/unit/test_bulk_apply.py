@@ -0,0 +1,130 @@
+"""Unit tests for bulk preset application."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.bulk_apply import MODIFIER_NAME, bulk_apply
+from src.utils.memory_guard import MemoryLimitExceeded
+from src.utils.preset_loader import load_preset
+
+INPUTS = (
+    "Iterations",
+    "Preview Iterations",
+    "Seed",
+    "Output Mode",
+    "Preview Output Mode",
+)
+
+
+def _node_group(name="IFS_Generator", inputs=INPUTS):
+    items = [
+        SimpleNamespace(in_out="INPUT", name=n, identifier=f"Socket_{i}")
+        for i, n in enumerate(inputs, start=2)
+    ]
+    items.append(SimpleNamespace(in_out="OUTPUT", name="Geometry", identifier="X"))
+    return SimpleNamespace(name=name, interface=SimpleNamespace(items_tree=items))
+
+
+class FakeModifier(dict):
+    """Modifier storing inputs as ID properties keyed by identifier."""
+
+    def __init__(self, name, node_group=None):
+        super().__init__()
+        self.name = name
+        self.type = "NODES"
+        self.node_group = node_group
+
+
+class FakeModifiers(list):
+    """``Object.modifiers`` collection."""
+
+    def new(self, name, type):
+        modifier = FakeModifier(name)
+        self.append(modifier)
+        return modifier
+
+
+class FakeObject:
+    """Object counting depsgraph tags."""
+
+    def __init__(self, name):
+        self.name = name
+        self.modifiers = FakeModifiers()
+        self.tags = 0
+
+    def update_tag(self):
+        self.tags += 1
+
+
+class TestBulkApply:
+    """Test modifier reuse, sharing and failure handling."""
+
+    def test_forest(self):
+        """Test many objects share one group and one input computation."""
+        group = _node_group()
+        resolved = []
+
+        def resolver(count):
+            resolved.append(count)
+            return group
+
+        fern, triangle = load_preset("barnsley"), load_preset("sierpinski")
+        objects = [FakeObject(f"Tree {i}") for i in range(300)]
+        items = [(obj, fern if i % 3 else triangle) for i, obj in enumerate(objects)]
+        result = bulk_apply(items, node_group_for=resolver, memory_limit=2**40)
+        assert (result.objects, result.modifiers_added) == (300, 300)
+        assert result.distinct_presets == 2
+        assert sorted(resolved) == [3, 4]
+        assert result.node_groups == {3: "IFS_Generator", 4: "IFS_Generator"}
+        assert result.writes == 300 * len(INPUTS)
+        modifier = objects[1].modifiers[0]
+        assert modifier.name == MODIFIER_NAME and modifier.node_group is group
+        assert modifier["Socket_2"] == fern["performance"]["final_iterations"]
+        assert modifier["Socket_4"] == fern["seed"]
+        assert objects[0].modifiers[0]["Socket_4"] == triangle["seed"]
+        assert all(obj.tags == 1 for obj in objects)
+
+    def test_existing_modifiers_are_reused(self):
+        """Test objects keep their IFS modifier and other modifiers."""
+        group = _node_group()
+        obj = FakeObject("Fern")
+        obj.modifiers.append(FakeModifier("Subdivision", _node_group("Other")))
+        obj.modifiers.append(FakeModifier("Mine", group))
+        result = bulk_apply(
+            [(obj, load_preset("barnsley"))], node_group_for=lambda count: group
+        )
+        assert result.modifiers_added == 0
+        assert len(obj.modifiers) == 2
+        assert obj.modifiers[0] == {} and obj.modifiers[1]["Socket_4"] == 42
+
+    def test_output_mode_and_downgrades(self):
+        """Test memory plans apply per preset and are reported per object."""
+        group = _node_group()
+        objects = [FakeObject("A"), FakeObject("B")]
+        preset = load_preset("barnsley")
+        result = bulk_apply(
+            [(obj, preset) for obj in objects],
+            node_group_for=lambda count: group,
+            output_mode=2,
+            memory_limit=2**20,
+        )
+        assert set(result.downgrades) == {"A", "B"}
+        assert objects[0].modifiers[0]["Socket_5"] < 2
+
+    def test_nothing_changes_on_failure(self):
+        """Test missing inputs and memory errors leave the scene untouched."""
+        objects = [FakeObject("A"), FakeObject("B")]
+        preset = load_preset("barnsley")
+        small = _node_group(inputs=("Iterations",))
+        with pytest.raises(KeyError, match="Seed"):
+            bulk_apply(
+                [(obj, preset) for obj in objects], node_group_for=lambda c: small
+            )
+        with pytest.raises(MemoryLimitExceeded):
+            bulk_apply(
+                [(obj, preset) for obj in objects],
+                node_group_for=lambda c: _node_group(),
+                memory_limit=16,
+            )
+        assert all(not obj.modifiers and obj.tags == 0 for obj in objects)
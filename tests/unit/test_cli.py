@@ -0,0 +1,138 @@
+"""Unit tests for the ifs-gen command-line entry point."""
+
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.cli import main  # noqa: E402
+from src.utils.ifs_engine import compile_preset, expand_exhaustive  # noqa: E402
+from src.utils.preset_loader import load_preset  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _run_fresh(argv):
+    """Run ifs-gen in a new interpreter; returns whether NumPy was imported."""
+    code = (
+        "import sys\n"
+        "from src.cli import main\n"
+        f"code = main({argv!r}, stdout=open('/dev/null', 'wb'))\n"
+        "print(code, 'numpy' in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    code, imported = result.stdout.split()
+    assert code == "0"
+    return imported == "True"
+
+
+class TestStreaming:
+    """Test binary output on stdout."""
+
+    def test_raw_stream(self):
+        """Test raw output is the float32 expansion."""
+        stdout = io.BytesIO()
+        assert main(["sierpinski", "--iterations", "5", "-q"], stdout=stdout) == 0
+        points = np.frombuffer(stdout.getvalue(), dtype="<f4").reshape(-1, 3)
+        expected = expand_exhaustive(
+            compile_preset(load_preset("sierpinski")).matrices, 5
+        )
+        np.testing.assert_allclose(points, expected, atol=1e-6)
+
+    def test_npy_stream(self):
+        """Test npy output loads as a (N, 3) array."""
+        stdout = io.BytesIO()
+        argv = ["barnsley", "--engine", "chaos", "--points", "1000", "--format", "npy"]
+        assert main(argv + ["-q"], stdout=stdout) == 0
+        stdout.seek(0)
+        assert np.load(stdout).shape == (1000, 3)
+
+    def test_files_and_stdout_together(self, tmp_path):
+        """Test one run fills file outputs and stdout."""
+        stdout = io.BytesIO()
+        out = tmp_path / "fern.ply"
+        argv = ["barnsley", "--iterations", "4", "-o", str(out), "-o", "-", "-q"]
+        assert main(argv, stdout=stdout) == 0
+        assert out.read_bytes().startswith(b"ply\n")
+        assert len(stdout.getvalue()) == 4**4 * 12
+
+    def test_errors_are_reported(self, capsys):
+        """Test unknown presets fail with a message, not a traceback."""
+        assert main(["no_such_preset"], stdout=io.BytesIO()) == 1
+        assert "ifs-gen: error" in capsys.readouterr().err
+
+
+class TestStartup:
+    """Test the lazy-import and cache paths."""
+
+    def test_help_does_not_import_numpy(self):
+        """Test --help stays on the standard library."""
+        code = (
+            "import sys\n"
+            "from src.cli import main\n"
+            "try:\n"
+            "    main(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print('numpy' in sys.modules, file=sys.stderr)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True
+        )
+        assert "usage: ifs-gen" in result.stdout
+        assert result.stderr.strip() == "False"
+
+    def test_cache_hit_skips_generation(self, tmp_path):
+        """Test a repeated request is served from the cache without NumPy."""
+        out = tmp_path / "tri.npy"
+        argv = ["sierpinski", "--iterations", "6", "-o", str(out), "-q"]
+        argv += ["--cache", str(tmp_path / "cache")]
+        assert _run_fresh(argv) is True
+        first = out.read_bytes()
+        out.unlink()
+        assert _run_fresh(argv) is False
+        assert out.read_bytes() == first
+        assert len(list((tmp_path / "cache").iterdir())) == 1
+
+    def test_cache_key_covers_options(self, tmp_path):
+        """Test different options do not share cache entries."""
+        cache = str(tmp_path / "cache")
+        for depth in ("4", "5"):
+            argv = ["sierpinski", "--iterations", depth, "--cache", cache, "-q"]
+            stdout = io.BytesIO()
+            assert main(argv, stdout=stdout) == 0
+            assert len(stdout.getvalue()) == 3 ** int(depth) * 12
+        assert len(list((tmp_path / "cache").iterdir())) == 2
+
+    def test_chaos_cache_key_covers_chunk_size(self, tmp_path):
+        """Test chaos outputs drawn in different RNG blocks are cached apart."""
+        cache = str(tmp_path / "cache")
+        argv = ["sierpinski", "--engine", "chaos", "--points", "1000"]
+        argv += ["--seed", "1", "--cache", cache, "-q"]
+        outputs = set()
+        for chunk in ("100", "300"):
+            stdout = io.BytesIO()
+            assert main(argv + ["--chunk-points", chunk], stdout=stdout) == 0
+            outputs.add(stdout.getvalue())
+        assert len(outputs) == 2
+        assert len(list((tmp_path / "cache").iterdir())) == 2
+
+    def test_downgraded_output_is_not_cached(self, tmp_path):
+        """Test outputs reduced to fit memory are never served from the cache."""
+        cache = tmp_path / "cache"
+        argv = ["barnsley", "--iterations", "12", "--cache", str(cache), "-q"]
+        stdout = io.BytesIO()
+        assert main(argv + ["--memory-limit", "32"], stdout=stdout) == 0
+        assert len(stdout.getvalue()) < 4**12 * 12
+        assert not any(cache.iterdir())
+        assert main(argv + ["--memory-policy", "raise", "--memory-limit", "32"]) == 1
@@ -0,0 +1,116 @@
+"""Unit tests for palette coloring."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.utils.color import (  # noqa: E402
+    blender_color_data,
+    build_lut,
+    density_scalars,
+    hex_to_rgb,
+    map_scalars,
+    palette_colors,
+    transform_indices,
+)
+from src.utils.exporters import export_points  # noqa: E402
+
+STOPS = [[0.0, "#000000"], [1.0, "#FF8000"]]
+
+
+class TestLookupTable:
+    """Test LUT construction from palette stops."""
+
+    def test_hex_to_rgb(self):
+        """Test hex codes parse to byte triples."""
+        assert hex_to_rgb("#1A2b3C") == (0x1A, 0x2B, 0x3C)
+        with pytest.raises(ValueError, match="#RRGGBB"):
+            hex_to_rgb("1A2B3C")
+
+    def test_lut_interpolates_stops(self):
+        """Test the table runs from the first stop to the last."""
+        lut = build_lut(STOPS, size=5)
+        assert lut.shape == (5, 4) and lut.dtype == np.uint8
+        np.testing.assert_array_equal(lut[0], [0, 0, 0, 255])
+        np.testing.assert_array_equal(lut[-1], [255, 128, 0, 255])
+        np.testing.assert_array_equal(lut[2], [128, 64, 0, 255])
+
+    def test_unordered_stops_and_clamping(self):
+        """Test stops are sorted and ends clamp to the outer colors."""
+        lut = build_lut([[0.75, "#FFFFFF"], [0.25, "#000000"]], size=5)
+        np.testing.assert_array_equal(lut[:2, 0], [0, 0])
+        np.testing.assert_array_equal(lut[3:, 0], [255, 255])
+
+
+class TestMapScalars:
+    """Test scalar to RGBA mapping."""
+
+    def test_range_maps_to_table_ends(self):
+        """Test vmin and vmax select the first and last entries."""
+        lut = build_lut(STOPS)
+        rgba = map_scalars(np.array([-1, 0, 10, 20]), lut, vmin=0, vmax=10)
+        np.testing.assert_array_equal(rgba, lut[[0, 0, -1, -1]])
+
+    def test_chunked_matches_single_pass(self, monkeypatch):
+        """Test chunking does not change the result."""
+        lut = build_lut(STOPS)
+        values = np.random.default_rng(0).random(1000)
+        expected = map_scalars(values, lut)
+        monkeypatch.setattr("src.utils.color.COLOR_CHUNK_POINTS", 64)
+        np.testing.assert_array_equal(map_scalars(values, lut), expected)
+
+    def test_constant_values(self):
+        """Test a zero-width range maps everything to the first entry."""
+        lut = build_lut(STOPS)
+        np.testing.assert_array_equal(map_scalars(np.full(3, 7), lut), lut[[0, 0, 0]])
+
+
+class TestPaletteColors:
+    """Test preset palette modes."""
+
+    def test_iteration_depth(self):
+        """Test depth 0 gets the first stop and the final iteration the last."""
+        palette = {"mode": "iteration_depth", "stops": STOPS}
+        depths = np.array([0, 1, 2, 2])
+        rgba = palette_colors(palette, np.zeros((4, 3)), depths=depths, iterations=2)
+        np.testing.assert_array_equal(rgba[0], [0, 0, 0, 255])
+        np.testing.assert_array_equal(rgba[2], [255, 128, 0, 255])
+
+    def test_transform_index_blocks(self):
+        """Test the leading address digit selects the color."""
+        np.testing.assert_array_equal(
+            transform_indices(9, 3), [0, 0, 0, 1, 1, 1, 2, 2, 2]
+        )
+        palette = {"mode": "transform_index", "stops": STOPS}
+        rgba = palette_colors(palette, np.zeros((9, 3)), transform_count=3)
+        assert len(np.unique(rgba, axis=0)) == 3
+
+    def test_density(self):
+        """Test clustered points are colored brighter than isolated ones."""
+        points = np.vstack([np.zeros((10, 3)), np.ones((1, 3))])
+        np.testing.assert_array_equal(density_scalars(points)[[0, 10]], [10, 1])
+        palette = {"mode": "density", "stops": STOPS}
+        rgba = palette_colors(palette, points)
+        assert rgba[0, 0] == 255 and rgba[10, 0] == 0
+
+    def test_unknown_mode_raises(self):
+        """Test unsupported modes are rejected."""
+        with pytest.raises(ValueError, match="Palette mode"):
+            palette_colors({"mode": "radial", "stops": STOPS}, np.zeros((1, 3)))
+
+
+class TestConsumers:
+    """Test the RGBA layout fits exporters and Blender attributes."""
+
+    def test_exported_ply_colors(self, tmp_path):
+        """Test palette colors are written as PLY vertex colors."""
+        rgba = palette_colors(None, np.zeros((2, 3)), depths=np.array([0, 1]))
+        path = tmp_path / "cloud.ply"
+        export_points(path, np.zeros((2, 3)), colors=rgba)
+        assert path.read_bytes()[-4:] == bytes(rgba[1])
+
+    def test_blender_color_data(self):
+        """Test conversion to flat float32 values in [0, 1]."""
+        data = blender_color_data(np.array([[255, 0, 51, 255]], dtype=np.uint8))
+        assert data.dtype == np.float32
+        np.testing.assert_allclose(data, [1.0, 0.0, 0.2, 1.0])
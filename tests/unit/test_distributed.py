@@ -0,0 +1,131 @@
+"""Unit tests for distributed generation over localhost TCP workers."""
+
+import socket
+import zlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.utils.distributed import (  # noqa: E402
+    DistributedError,
+    WorkerServer,
+    choose_prefix_depth,
+    generate_distributed,
+    generate_preset_distributed,
+    main,
+    send_frame,
+)
+from src.utils.ifs_engine import compile_preset, expand_exhaustive  # noqa: E402
+from src.utils.preset_loader import load_preset  # noqa: E402
+
+
+class FlakyWorkerServer(WorkerServer):
+    """Worker that drops the connection mid-stream once per listed shard."""
+
+    def __init__(self, address, fail_shards=()):
+        super().__init__(address)
+        self.fail_shards = set(fail_shards)
+
+    def run_shard(self, sock, request):
+        shard = int(request["shard"])
+        if shard not in self.fail_shards:
+            return super().run_shard(sock, request)
+        self.fail_shards.discard(shard)
+        partial = np.zeros((1, 3), dtype=request.get("dtype", "float32"))
+        send_frame(
+            sock,
+            {"shard": shard, "offset": 0, "count": 1},
+            zlib.compress(partial.tobytes(), 1),
+        )
+        return False  # simulate a crash after a partial stream
+
+
+@pytest.fixture
+def start_workers():
+    """Start localhost workers; shut them down after the test."""
+    servers = []
+
+    def start(count, server_class=WorkerServer, **options):
+        for _ in range(count):
+            server = server_class(("127.0.0.1", 0), **options)
+            server.start_background()
+            servers.append(server)
+        return servers[-count:]
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def unused_address():
+    """An address with nothing listening."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()
+
+
+class TestPrefixDepth:
+    """Test shard count selection."""
+
+    def test_depth_targets_shards_per_worker(self):
+        """Test enough shards are created to balance the workers."""
+        assert choose_prefix_depth(4, 8, 3) == 2  # 16 shards >= 12
+        assert choose_prefix_depth(3, 2, 100) == 2  # capped at iterations
+
+
+class TestGenerateDistributed:
+    """Test sharding, assembly order and retries."""
+
+    def test_matches_local_expansion(self, start_workers):
+        """Test the assembled cloud equals the local expansion, in order."""
+        workers = start_workers(3)
+        compiled = compile_preset(load_preset("barnsley"))
+        points = generate_distributed(
+            compiled.matrices,
+            6,
+            [w.address for w in workers],
+            dtype="float64",
+            chunk_points=100,
+        )
+        np.testing.assert_allclose(points, expand_exhaustive(compiled.matrices, 6))
+        assert sum(w.shards_served for w in workers) == 16
+
+    def test_failed_shards_are_retried(self, start_workers):
+        """Test shards dropped mid-stream are recomputed elsewhere."""
+        flaky = start_workers(1, FlakyWorkerServer, fail_shards=range(16))
+        workers = flaky + start_workers(1)
+        compiled = compile_preset(load_preset("sierpinski"))
+        points = generate_distributed(
+            compiled.matrices, 7, [w.address for w in workers], chunk_points=50
+        )
+        expected = expand_exhaustive(compiled.matrices, 7).astype(np.float32)
+        np.testing.assert_allclose(points, expected, atol=1e-6)
+
+    def test_unreachable_workers_are_skipped(self, start_workers):
+        """Test a dead worker address does not stop the generation."""
+        (worker,) = start_workers(1)
+        preset = load_preset("sierpinski")
+        points = generate_preset_distributed(
+            preset, [unused_address(), worker.address], iterations=5
+        )
+        assert points.shape == (3**5, 3)
+
+    def test_no_reachable_workers_raises(self):
+        """Test generation fails cleanly when every worker is down."""
+        compiled = compile_preset(load_preset("sierpinski"))
+        with pytest.raises(DistributedError, match="no reachable worker"):
+            generate_distributed(compiled.matrices, 4, [unused_address()])
+
+    def test_cli_generate(self, start_workers, tmp_path, capsys):
+        """Test the coordinator command writes the assembled points."""
+        workers = start_workers(2)
+        out = tmp_path / "points.npy"
+        spec = ",".join(f"{host}:{port}" for host, port in (w.address for w in workers))
+        assert (
+            main(["generate", "sierpinski", "--workers", spec, "--output", str(out)])
+            == 0
+        )
+        assert np.load(out).shape == (3**8, 3)
+        assert "6561 points" in capsys.readouterr().out
@@ -0,0 +1,117 @@
+"""Unit tests for the batched random fractal explorer."""
+
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.utils.explorer import (  # noqa: E402
+    contractive_mask,
+    explore,
+    main,
+    sample_candidates,
+    score_points,
+)
+from src.utils.ifs_engine import (  # noqa: E402
+    affine_matrices,
+    chaos_game,
+    compile_preset,
+)
+from src.utils.preset_loader import load_preset  # noqa: E402
+from src.utils.validator import validate_preset  # noqa: E402
+
+
+class TestRejection:
+    """Test batched singular-value rejection."""
+
+    def _matrices(self, scales):
+        scales = np.asarray(scales, dtype=float)
+        zeros = np.zeros_like(scales)
+        return affine_matrices(scales, zeros, zeros)
+
+    def test_contractive_sets_pass(self):
+        """Test well-conditioned contractive sets are accepted."""
+        mask = contractive_mask(self._matrices([[[0.5, 0.5, 0.5]] * 3]), 2)
+        assert mask.tolist() == [True]
+
+    def test_non_contractive_and_degenerate_sets_fail(self):
+        """Test expanding and collapsing transforms are rejected."""
+        matrices = self._matrices(
+            [
+                [[0.5, 0.5, 0.5], [1.1, 0.5, 0.5]],
+                [[0.5, 0.5, 0.5], [0.5, 0.001, 0.5]],
+                [[0.5, 0.4, 0.5], [0.3, 0.6, 0.5]],
+            ]
+        )
+        assert contractive_mask(matrices, 2).tolist() == [False, False, True]
+
+    def test_planar_check_ignores_z_scale(self):
+        """Test 2D candidates only inspect the XY block."""
+        mask = contractive_mask(self._matrices([[[0.5, 0.5, 0.0]]]), 2)
+        assert mask.tolist() == [True]
+
+
+class TestScoring:
+    """Test coverage and fill-ratio scoring."""
+
+    def test_degenerate_clouds_score_negative_infinity(self):
+        """Test collapsed and line-like clouds are rejected."""
+        rng = np.random.default_rng(0)
+        point = np.zeros((1, 256, 3))
+        line = np.zeros((1, 256, 3))
+        line[0, :, 0] = rng.random(256)
+        scores = score_points(np.concatenate([point, line]), 2)["score"]
+        assert np.all(np.isneginf(scores))
+
+    def test_solid_square_scores_below_fractal_detail(self):
+        """Test a uniformly filled square loses to the Sierpinski triangle."""
+        rng = np.random.default_rng(0)
+        solid = np.zeros((1, 4096, 3))
+        solid[0, :, :2] = rng.random((4096, 2))
+        compiled = compile_preset(load_preset("sierpinski"))
+        triangle = chaos_game(compiled.matrices, compiled.weights, 4096)[None]
+        scores = score_points(np.concatenate([solid, triangle]), 2)
+        assert scores["fill_ratio"][0] > 0.95
+        assert scores["score"][1] > scores["score"][0]
+
+
+class TestExplore:
+    """Test end-to-end exploration."""
+
+    def test_sample_planar_candidates(self):
+        """Test 2D candidates stay in the XY plane."""
+        batch = sample_candidates(np.random.default_rng(0), 10, 3, 2)
+        assert batch.scale.shape == (10, 3, 3)
+        assert np.all(batch.rotation[..., :2] == 0)
+        assert np.all(batch.translation[..., 2] == 0)
+        np.testing.assert_allclose(batch.weights.sum(axis=1), 1.0)
+
+    @pytest.mark.parametrize("dimensions", [2, 3])
+    def test_results_are_valid_presets(self, dimensions):
+        """Test emitted presets validate and are ordered best first."""
+        results = explore(500, top_k=4, dimensions=dimensions, batch_size=200)
+        assert 0 < len(results) <= 4
+        scores = [r.score for r in results]
+        assert scores == sorted(scores, reverse=True)
+        for result in results:
+            assert validate_preset(result.preset) == []
+
+    def test_exploration_is_deterministic(self):
+        """Test a fixed seed reproduces the same presets."""
+        a = explore(300, top_k=3, seed=5)
+        b = explore(300, top_k=3, seed=5)
+        assert [r.preset for r in a] == [r.preset for r in b]
+
+    def test_invalid_dimensions_raise(self):
+        """Test only 2D and 3D exploration is supported."""
+        with pytest.raises(ValueError, match="Dimensions"):
+            explore(10, dimensions=4)
+
+    def test_main_writes_presets(self, tmp_path, capsys):
+        """Test the CLI writes one JSON file per result."""
+        argv = ["--count", "200", "--top-k", "2", "--output-dir", str(tmp_path)]
+        assert main(argv) == 0
+        files = sorted(tmp_path.glob("*.json"))
+        assert len(files) == 2
+        assert validate_preset(json.loads(files[0].read_text())) == []
@@ -0,0 +1,181 @@
+"""Unit tests for the multi-sink export pipeline."""
+
+import json
+import struct
+import threading
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.utils.export_pipeline import (  # noqa: E402
+    ExportSink,
+    export_preset,
+    run_pipeline,
+    sink_for_path,
+)
+from src.utils.exporters import export_points  # noqa: E402
+from src.utils.ifs_engine import compile_preset, expand_exhaustive  # noqa: E402
+from src.utils.preset_loader import load_preset  # noqa: E402
+
+
+class RecordingSink(ExportSink):
+    """Sink collecting chunks, optionally slow or failing."""
+
+    def __init__(self, delay=0.0, fail_at=None):
+        super().__init__("memory")
+        self.delay = delay
+        self.fail_at = fail_at
+        self.starts = []
+
+    def write(self, points, start):
+        if self.fail_at is not None and len(self.starts) == self.fail_at:
+            raise RuntimeError("disk full")
+        time.sleep(self.delay)
+        self.starts.append(start)
+
+    def close(self):
+        return {"path": "memory", "bytes": 0, "chunks": len(self.starts)}
+
+
+class TestExportPreset:
+    """Test every format is written from one generation."""
+
+    def test_outputs_match_single_format_exporters(self, tmp_path):
+        """Test PLY and NPY are byte-identical to the one-shot exporters."""
+        preset = load_preset("barnsley")
+        paths = [tmp_path / name for name in ("f.ply", "f.npy", "f.glb", "f.png")]
+        result = export_preset(preset, paths, iterations=6, chunk_points=100)
+        assert result["point_count"] == 4**6
+        assert [output["path"] for output in result["outputs"]] == list(map(str, paths))
+
+        points = expand_exhaustive(compile_preset(preset).matrices, 6)
+        for name in ("f.ply", "f.npy"):
+            export_points(tmp_path / f"ref_{name}", points)
+            reference = (tmp_path / f"ref_{name}").read_bytes()
+            assert (tmp_path / name).read_bytes() == reference
+        assert (tmp_path / "f.png").read_bytes().startswith(b"\x89PNG")
+
+    def test_glb_layout(self, tmp_path):
+        """Test the GLB header, accessor bounds and position buffer."""
+        path = tmp_path / "triangle.glb"
+        export_preset(load_preset("sierpinski"), [path], iterations=5)
+        data = path.read_bytes()
+        magic, version, length = struct.unpack("<III", data[:12])
+        json_length, _ = struct.unpack("<II", data[12:20])
+        assert (magic, version, length) == (0x46546C67, 2, len(data))
+        assert json_length % 4 == 0
+        document = json.loads(data[20 : 20 + json_length])
+        accessor = document["accessors"][0]
+        positions = np.frombuffer(data[28 + json_length :], dtype="<f4")
+        positions = positions.reshape(-1, 3)
+        assert accessor["count"] == len(positions) == 3**5
+        np.testing.assert_allclose(accessor["min"], positions.min(axis=0))
+        np.testing.assert_allclose(accessor["max"], positions.max(axis=0))
+
+    def test_chaos_mode(self, tmp_path):
+        """Test chaos exports stream fixed-size blocks."""
+        path = tmp_path / "fern.npy"
+        export_preset(
+            load_preset("barnsley"),
+            [path],
+            mode="chaos",
+            n_points=1000,
+            chunk_points=64,
+        )
+        assert np.load(path).shape == (1000, 3)
+
+    def test_stratified_mode(self, tmp_path):
+        """Test stratified exports write the exact point budget."""
+        path = tmp_path / "fern.npy"
+        export_preset(load_preset("barnsley"), [path], mode="stratified", n_points=500)
+        assert np.load(path).shape == (500, 3)
+
+    def test_unsupported_extension(self, tmp_path):
+        """Test unknown outputs are rejected before generating."""
+        with pytest.raises(ValueError, match="Unsupported output"):
+            sink_for_path(tmp_path / "fern.obj")
+
+
+class TestRunPipeline:
+    """Test fan-out, backpressure and failure handling."""
+
+    def test_every_sink_sees_every_chunk(self):
+        """Test chunks arrive in order with their start offsets."""
+        sinks = [RecordingSink(), RecordingSink(delay=0.001)]
+        chunks = (np.zeros((10, 3)) for _ in range(5))
+        results = run_pipeline(chunks, 50, sinks)
+        assert [r["chunks"] for r in results] == [5, 5]
+        assert sinks[1].starts == [0, 10, 20, 30, 40]
+
+    def test_backpressure_bounds_buffered_chunks(self):
+        """Test a slow sink stalls generation at the queue size."""
+        sink = RecordingSink(delay=0.01)
+        produced = []
+
+        def chunks():
+            for index in range(20):
+                # Chunks generated but not yet written by the sink
+                produced.append(index - len(sink.starts))
+                yield np.zeros((1, 3))
+
+        run_pipeline(chunks(), 20, [sink], queue_chunks=2)
+        assert max(produced) <= 2 + 2
+
+    def test_sink_failure_stops_generation(self):
+        """Test a failing sink raises and the producer stops early."""
+        generated = []
+
+        def chunks():
+            for index in range(1000):
+                generated.append(index)
+                yield np.zeros((1, 3))
+
+        sinks = [RecordingSink(fail_at=3), RecordingSink()]
+        with pytest.raises(RuntimeError, match="disk full"):
+            run_pipeline(chunks(), 1000, sinks, queue_chunks=2)
+        assert len(generated) < 1000
+        assert threading.active_count() < 10
+
+    def test_chunk_total_mismatch(self):
+        """Test a short generator is reported."""
+        with pytest.raises(ValueError, match="expected 5"):
+            run_pipeline([np.zeros((3, 3))], 5, [RecordingSink()])
+
+    def test_failing_sink_leaves_no_partial_files(self, tmp_path):
+        """Test file outputs are discarded when another sink fails."""
+        paths = [tmp_path / "a.ply", tmp_path / "a.glb", tmp_path / "a.npy"]
+        sinks = [sink_for_path(path) for path in paths] + [RecordingSink(fail_at=2)]
+        chunks = (np.zeros((100, 3)) for _ in range(50))
+        with pytest.raises(RuntimeError, match="disk full"):
+            run_pipeline(chunks, 5000, sinks, queue_chunks=2)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_producer_error_leaves_no_partial_files(self, tmp_path):
+        """Test a generation error aborts every sink."""
+
+        def chunks():
+            yield np.zeros((100, 3))
+            raise MemoryError("out of memory")
+
+        sinks = [sink_for_path(tmp_path / "a.ply"), RecordingSink()]
+        with pytest.raises(MemoryError):
+            run_pipeline(chunks(), 200, sinks)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_short_generator_leaves_no_partial_files(self, tmp_path):
+        """Test outputs whose header would overstate the count are discarded."""
+        with pytest.raises(ValueError, match="expected 5"):
+            run_pipeline([np.zeros((3, 3))], 5, [sink_for_path(tmp_path / "a.npy")])
+        assert list(tmp_path.iterdir()) == []
+
+    def test_chunks_are_read_only(self):
+        """Test sinks cannot modify the chunk other sinks share."""
+
+        class MutatingSink(RecordingSink):
+            def write(self, points, start):
+                points[0] = 1.0
+
+        with pytest.raises(ValueError, match="read-only"):
+            run_pipeline([np.zeros((3, 3))], 3, [MutatingSink()])
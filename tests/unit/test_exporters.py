@@ -0,0 +1,44 @@
+"""Unit tests for point cloud exporters."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.utils.exporters import export_points, ply_header  # noqa: E402
+
+
+class TestExportPoints:
+    """Test format dispatch and file layout."""
+
+    def test_ply_layout(self, tmp_path):
+        """Test the PLY header and float32 vertex records."""
+        points = np.arange(12, dtype=float).reshape(4, 3)
+        path = tmp_path / "cloud.ply"
+        size = export_points(path, points)
+        data = path.read_bytes()
+        header = ply_header(4)
+        assert size == len(data) == len(header) + 4 * 12
+        assert b"element vertex 4" in header
+        body = np.frombuffer(data[len(header) :], dtype="<f4").reshape(4, 3)
+        np.testing.assert_array_equal(body, points)
+
+    def test_ply_with_colors(self, tmp_path):
+        """Test colored vertices pack XYZ followed by RGBA."""
+        points = np.ones((2, 3))
+        colors = np.array([[255, 0, 0, 255], [0, 255, 0, 128]], dtype=np.uint8)
+        path = tmp_path / "cloud.ply"
+        size = export_points(path, points, colors)
+        assert size == len(ply_header(2, with_colors=True)) + 2 * 16
+        assert path.read_bytes()[-4:] == bytes([0, 255, 0, 128])
+
+    def test_npy_roundtrip(self, tmp_path):
+        """Test NPY export loads back as float32."""
+        points = np.random.default_rng(0).random((10, 3))
+        path = tmp_path / "cloud.bin"
+        export_points(path, points, fmt="npy")
+        np.testing.assert_allclose(np.load(path), points.astype(np.float32))
+
+    def test_unknown_format_raises(self, tmp_path):
+        """Test unsupported extensions are rejected."""
+        with pytest.raises(ValueError, match="Unsupported export format"):
+            export_points(tmp_path / "cloud.xyz", np.zeros((1, 3)))
@@ -0,0 +1,342 @@
+"""Unit tests for the headless NumPy IFS engine.
+
+Covers matrix construction (Blender XYZ Euler convention), preset
+compilation, the chaos game and exhaustive expansion.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.utils.ifs_engine import (  # noqa: E402
+    affine_matrices,
+    chaos_game,
+    chaos_game_batched,
+    chaos_game_multi,
+    chaos_game_parallel,
+    compile_preset,
+    compose_matrices,
+    compose_table,
+    expand_exhaustive,
+    expand_levels,
+    expand_stratified,
+    fixed_point,
+    iter_chaos_blocks,
+    iter_exhaustive_chunks,
+    rotation_matrices,
+    stack_presets,
+    summarize_points,
+)
+from src.utils.preset_loader import load_preset  # noqa: E402
+
+
+class TestMatrices:
+    """Test transform matrix construction."""
+
+    def test_rotation_about_z(self):
+        """Test a 90 degree Z rotation maps X onto Y."""
+        rot = rotation_matrices(np.array([0.0, 0.0, 90.0]))
+        np.testing.assert_allclose(rot @ [1, 0, 0], [0, 1, 0], atol=1e-12)
+
+    def test_euler_order_is_xyz(self):
+        """Test R = Rz @ Ry @ Rx as in Blender's XYZ Euler mode."""
+        rx = rotation_matrices(np.array([30.0, 0, 0]))
+        ry = rotation_matrices(np.array([0, 40.0, 0]))
+        rz = rotation_matrices(np.array([0, 0, 50.0]))
+        combined = rotation_matrices(np.array([30.0, 40.0, 50.0]))
+        np.testing.assert_allclose(combined, rz @ ry @ rx, atol=1e-12)
+
+    def test_affine_applies_scale_rotation_translation(self):
+        """Test scale is applied before rotation, then translation."""
+        matrix = affine_matrices(
+            np.array([2.0, 1.0, 1.0]), np.array([0, 0, 90.0]), np.array([1.0, 0, 0])
+        )
+        point = matrix @ [1, 0, 0, 1]
+        np.testing.assert_allclose(point, [1, 2, 0, 1], atol=1e-12)
+
+    def test_batched_shapes(self):
+        """Test stacked inputs produce stacked matrices."""
+        shape = (5, 3, 3)
+        matrices = affine_matrices(np.ones(shape), np.zeros(shape), np.zeros(shape))
+        assert matrices.shape == (5, 3, 4, 4)
+
+    def test_compose_matrices_from_transforms(self):
+        """Test a preset transform list becomes a (T, 4, 4) stack."""
+        preset = load_preset("sierpinski")
+        matrices = compose_matrices(preset["transforms"])
+        assert matrices.shape == (3, 4, 4)
+        np.testing.assert_allclose(matrices[0, :3, 3], [-0.5, -0.433, 0])
+
+
+class TestCompilePreset:
+    """Test preset compilation."""
+
+    def test_weights_are_normalised(self):
+        """Test weights become probabilities."""
+        compiled = compile_preset(load_preset("sierpinski"))
+        assert compiled.transform_count == 3
+        assert compiled.weights.sum() == pytest.approx(1.0)
+        assert compiled.iterations == 8
+        assert compiled.seed == 42
+
+    def test_zero_weights_raise(self):
+        """Test that all-zero weights cannot be compiled."""
+        preset = load_preset("sierpinski")
+        for transform in preset["transforms"]:
+            transform["weight"] = 0
+        with pytest.raises(ValueError, match="positive"):
+            compile_preset(preset)
+
+
+class TestChaosGame:
+    """Test chaos game sampling."""
+
+    def test_points_stay_on_sierpinski_attractor(self):
+        """Test points fall inside the Sierpinski triangle's bounding box."""
+        compiled = compile_preset(load_preset("sierpinski"))
+        points = chaos_game(compiled.matrices, compiled.weights, 5000, seed=1)
+        assert points.shape == (5000, 3)
+        assert np.all(np.abs(points[:, :2]) <= 1.0 + 1e-9)
+        np.testing.assert_allclose(points[:, 2], 0.0)
+
+    def test_seed_is_deterministic(self):
+        """Test equal seeds give identical points and different seeds do not."""
+        compiled = compile_preset(load_preset("barnsley"))
+        a = chaos_game(compiled.matrices, compiled.weights, 1000, seed=3)
+        b = chaos_game(compiled.matrices, compiled.weights, 1000, seed=3)
+        c = chaos_game(compiled.matrices, compiled.weights, 1000, seed=4)
+        np.testing.assert_array_equal(a, b)
+        assert not np.array_equal(a, c)
+
+    def test_weights_drive_selection(self):
+        """Test a zero-weight transform is never selected."""
+        matrices = affine_matrices(
+            np.full((2, 3), 0.5),
+            np.zeros((2, 3)),
+            np.array([[1.0, 0, 0], [-1.0, 0, 0]]),
+        )
+        points = chaos_game(matrices, np.array([1.0, 0.0]), 500, burn_in=40)
+        np.testing.assert_allclose(points[:, 0], 2.0, atol=1e-9)
+
+    def test_batched_runs_each_transform_set(self):
+        """Test batches do not mix transform sets."""
+        shift = np.array([[[1.0, 0, 0]], [[0, 1.0, 0]]])
+        matrices = affine_matrices(np.full((2, 1, 3), 0.5), np.zeros((2, 1, 3)), shift)
+        points = chaos_game_batched(
+            matrices, np.ones((2, 1)), 4, np.random.default_rng(0), walkers=8
+        )
+        assert points.shape == (2, 32, 3)
+        np.testing.assert_allclose(points[0, :, 0], 2.0, atol=1e-5)
+        np.testing.assert_allclose(points[1, :, 1], 2.0, atol=1e-5)
+
+
+class TestPresetBatches:
+    """Test multi-preset and multi-seed batches."""
+
+    def test_padding_to_common_transform_count(self):
+        """Test shorter transform sets get zero-weight identity padding."""
+        fern = compile_preset(load_preset("barnsley"))
+        triangle = compile_preset(load_preset("sierpinski"))
+        batch = stack_presets([fern, triangle])
+        assert batch.matrices.shape == (2, 4, 4, 4)
+        assert batch.transform_counts.tolist() == [4, 3]
+        assert batch.weights[1, 3] == 0.0
+        np.testing.assert_array_equal(batch.matrices[1, 3], np.eye(4))
+        assert batch.seeds.tolist() == [fern.seed, triangle.seed]
+
+    def test_rows_match_single_runs(self):
+        """Test each entry equals chaos_game on its preset and seed."""
+        fern = compile_preset(load_preset("barnsley"))
+        triangle = compile_preset(load_preset("sierpinski"))
+        batch = stack_presets([fern, triangle], seeds=[3, 4])
+        points = chaos_game_multi(batch, 2500, walkers=256)
+        assert points.shape == (2, 2500, 3)
+        for row, (preset, seed) in enumerate([(fern, 3), (triangle, 4)]):
+            expected = chaos_game(
+                preset.matrices, preset.weights, 2500, seed=seed, walkers=256
+            )
+            np.testing.assert_array_equal(points[row], expected)
+
+    def test_seed_sweep(self):
+        """Test one preset is repeated for every seed."""
+        compiled = compile_preset(load_preset("sierpinski"))
+        batch = stack_presets([compiled], seeds=range(50))
+        points = chaos_game_multi(batch, 200)
+        assert points.shape == (50, 200, 3)
+        np.testing.assert_array_equal(
+            points[7], chaos_game(compiled.matrices, compiled.weights, 200, seed=7)
+        )
+        assert not np.array_equal(points[7], points[8])
+
+    def test_mismatched_lengths(self):
+        """Test presets and seeds must pair up."""
+        compiled = compile_preset(load_preset("sierpinski"))
+        with pytest.raises(ValueError, match="one seed per preset"):
+            stack_presets([compiled, compiled], seeds=[1, 2, 3])
+        with pytest.raises(ValueError, match="one seed per preset"):
+            stack_presets([])
+
+
+class TestExhaustiveExpansion:
+    """Test the deterministic T^n expansion."""
+
+    def test_point_count_and_order(self):
+        """Test points are ordered by address, first transform most significant."""
+        compiled = compile_preset(load_preset("sierpinski"))
+        points = expand_exhaustive(compiled.matrices, 3)
+        assert points.shape == (27, 3)
+        table = compose_table(compiled.matrices, 3)
+        np.testing.assert_allclose(points, table[:, :3, 3], atol=1e-12)
+
+    def test_prefix_gives_subtree(self):
+        """Test a prefix matrix reproduces the matching block of the full expansion."""
+        compiled = compile_preset(load_preset("barnsley"))
+        full = expand_exhaustive(compiled.matrices, 4)
+        prefixes = compose_table(compiled.matrices, 1)
+        for index, prefix in enumerate(prefixes):
+            block = expand_exhaustive(compiled.matrices, 3, prefix=prefix)
+            np.testing.assert_allclose(block, full[index * 64 : (index + 1) * 64])
+
+    def test_levels_concatenate_each_iteration(self):
+        """Test every iteration's points are kept with their depth."""
+        matrices = compile_preset(load_preset("sierpinski")).matrices
+        points, depths = expand_levels(matrices, 2)
+        assert len(points) == 1 + 3 + 9
+        np.testing.assert_array_equal(depths, [0] + [1] * 3 + [2] * 9)
+        np.testing.assert_allclose(points[4:], expand_exhaustive(matrices, 2))
+
+    def test_chunks_concatenate_to_expansion(self):
+        """Test chunked expansion matches the one-shot expansion."""
+        matrices = compile_preset(load_preset("barnsley")).matrices
+        chunks = list(iter_exhaustive_chunks(matrices, 5, 100))
+        assert len(chunks) == 16 and all(len(chunk) == 64 for chunk in chunks)
+        np.testing.assert_allclose(
+            np.concatenate(chunks), expand_exhaustive(matrices, 5), atol=1e-12
+        )
+
+    def test_summary(self):
+        """Test point statistics, including the empty cloud."""
+        summary = summarize_points(np.array([[0.0, 0, 0], [2.0, 4.0, -2.0]]))
+        assert summary == {
+            "point_count": 2,
+            "bbox_min": [0.0, 0.0, -2.0],
+            "bbox_max": [2.0, 4.0, 0.0],
+            "centroid": [1.0, 2.0, -1.0],
+        }
+        assert summarize_points(np.empty((0, 3)))["bbox_min"] is None
+
+
+class TestParallelChaosGame:
+    """Test worker-count independent chaos game sampling."""
+
+    def test_blocks_stream_the_same_sample(self):
+        """Test streamed blocks concatenate to the parallel sample."""
+        compiled = compile_preset(load_preset("barnsley"))
+        args = (compiled.matrices, compiled.weights, 2500)
+        blocks = list(iter_chaos_blocks(*args, seed=3, block_points=1000))
+        assert [len(block) for block in blocks] == [1000, 1000, 500]
+        np.testing.assert_array_equal(
+            np.concatenate(blocks),
+            chaos_game_parallel(*args, seed=3, block_points=1000),
+        )
+
+    def test_identical_for_any_worker_count(self):
+        """Test 1, 2 and 3 workers give bit-identical points."""
+        compiled = compile_preset(load_preset("barnsley"))
+        runs = [
+            chaos_game_parallel(
+                compiled.matrices,
+                compiled.weights,
+                2500,
+                seed=7,
+                workers=workers,
+                block_points=512,
+            )
+            for workers in (1, 2, 3)
+        ]
+        assert runs[0].shape == (2500, 3)
+        np.testing.assert_array_equal(runs[0], runs[1])
+        np.testing.assert_array_equal(runs[0], runs[2])
+
+    def test_blocks_use_independent_streams(self):
+        """Test blocks differ from each other and seeds change the output."""
+        compiled = compile_preset(load_preset("sierpinski"))
+        a = chaos_game_parallel(
+            compiled.matrices, compiled.weights, 1024, seed=1, block_points=512
+        )
+        b = chaos_game_parallel(
+            compiled.matrices, compiled.weights, 1024, seed=2, block_points=512
+        )
+        assert not np.array_equal(a[:512], a[512:])
+        assert not np.array_equal(a, b)
+        assert np.all(np.abs(a[:, :2]) <= 1.0 + 1e-9)
+
+    def test_prefix_of_larger_sample(self):
+        """Test a smaller sample is a prefix of a larger one."""
+        compiled = compile_preset(load_preset("sierpinski"))
+        small = chaos_game_parallel(
+            compiled.matrices, compiled.weights, 700, seed=3, block_points=256
+        )
+        large = chaos_game_parallel(
+            compiled.matrices, compiled.weights, 1500, seed=3, block_points=256
+        )
+        np.testing.assert_array_equal(small, large[:700])
+
+
+class TestStratifiedExpansion:
+    """Test deterministic weighted point allocation."""
+
+    def test_equal_weights_reproduce_exhaustive(self):
+        """Test T^n points over equal weights give the exhaustive expansion."""
+        matrices = compile_preset(load_preset("sierpinski")).matrices
+        points = expand_stratified(matrices, np.ones(3) / 3, 3**6, anchor=np.zeros(3))
+        np.testing.assert_allclose(points, expand_exhaustive(matrices, 6), atol=1e-12)
+
+    def test_budget_splits_by_weight(self):
+        """Test the Barnsley stem gets its 1% share instead of 25%.
+
+        Points are in address order, so the stem branch is the contiguous
+        block [85%, 86%) of the output, and by self-similarity it equals
+        the stem transform applied to a stratified expansion of its share.
+        """
+        compiled = compile_preset(load_preset("barnsley"))
+        budget = 20000
+        points = expand_stratified(compiled.matrices, compiled.weights, budget)
+        assert points.shape == (budget, 3)
+        assert len(np.unique(points, axis=0)) == budget
+        stem = compiled.matrices[1]
+        share = expand_stratified(compiled.matrices, compiled.weights, 200)
+        np.testing.assert_allclose(
+            points[17000:17200], share @ stem[:3, :3].T + stem[:3, 3], atol=1e-9
+        )
+
+    def test_deterministic_and_on_attractor(self):
+        """Test repeated calls agree and points stay near the attractor."""
+        compiled = compile_preset(load_preset("sierpinski"))
+        a = expand_stratified(compiled.matrices, compiled.weights, 5000)
+        b = expand_stratified(compiled.matrices, compiled.weights, 5000)
+        np.testing.assert_array_equal(a, b)
+        assert np.all(np.abs(a[:, :2]) <= 1.0 + 1e-9)
+
+    def test_depths(self):
+        """Test returned depths are address lengths."""
+        matrices = compile_preset(load_preset("sierpinski")).matrices
+        _, depths = expand_stratified(matrices, np.ones(3) / 3, 27, return_depths=True)
+        np.testing.assert_array_equal(depths, np.full(27, 3))
+        weights = compile_preset(load_preset("barnsley")).weights
+        _, depths = expand_stratified(
+            matrices[:1].repeat(4, axis=0), weights, 1000, return_depths=True
+        )
+        assert depths.min() >= 1 and depths.max() > depths.min()
+
+    def test_empty_budget_raises(self):
+        """Test a budget below one point is rejected."""
+        compiled = compile_preset(load_preset("sierpinski"))
+        with pytest.raises(ValueError, match="budget must be positive"):
+            expand_stratified(compiled.matrices, compiled.weights, 0)
+
+    def test_fixed_point(self):
+        """Test the default anchor is fixed by its transform."""
+        matrix = compile_preset(load_preset("barnsley")).matrices[0]
+        point = fixed_point(matrix)
+        np.testing.assert_allclose(matrix[:3, :3] @ point + matrix[:3, 3], point)
@@ -8,8 +8,10 @@ See docs/architecture.md §4 for constraint details.
 
 import pytest
 from src.utils.math_helpers import (
+    calculate_contractivity,
     calculate_point_count,
     enforce_iteration_limits,
+    infer_dimensionality,
 )
 
 
@@ -124,3 +126,46 @@ class TestEnforceIterationLimits:
         with pytest.raises(ValueError):
             enforce_iteration_limits(10, 15)
 
+
+class TestCalculateContractivity:
+    """Test transform-set contraction factor (largest singular value)."""
+
+    def test_uniform_scale(self):
+        """Test that uniform half-scale transforms contract by 0.5."""
+        transforms = [{"scale": [0.5, 0.5, 0.5]}] * 3
+        assert calculate_contractivity(transforms) == 0.5
+
+    def test_largest_component_wins(self):
+        """Test that the largest absolute scale component across transforms wins."""
+        transforms = [{"scale": [0.85, 0.85, 0.85]}, {"scale": [0.2, -0.9, 0.2]}]
+        assert calculate_contractivity(transforms) == 0.9
+
+    def test_non_contractive(self):
+        """Test that scales above 1 are reported as non-contractive."""
+        assert calculate_contractivity([{"scale": [1.2, 0.5, 0.5]}]) > 1
+
+    def test_empty_transform_set(self):
+        """Test edge case: empty transform set."""
+        assert calculate_contractivity([]) == 0.0
+
+
+class TestInferDimensionality:
+    """Test planar vs volumetric transform set detection."""
+
+    def test_planar_transform_set(self):
+        """Test that Z rotations and XY translations stay in the plane."""
+        transforms = [
+            {"rotation": [0, 0, 45], "translation": [1, 0.5, 0]},
+            {"rotation": [0, 0, -50], "translation": [0, 1.6, 0]},
+        ]
+        assert infer_dimensionality(transforms) == 2
+
+    def test_z_translation_is_3d(self):
+        """Test that any Z translation leaves the plane."""
+        transforms = [{"rotation": [0, 0, 0], "translation": [0, 0, 0.5]}]
+        assert infer_dimensionality(transforms) == 3
+
+    def test_x_rotation_is_3d(self):
+        """Test that rotation about X tilts the plane."""
+        transforms = [{"rotation": [10, 0, 0], "translation": [0, 0, 0]}]
+        assert infer_dimensionality(transforms) == 3
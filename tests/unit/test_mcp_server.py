@@ -0,0 +1,387 @@
+"""Unit tests for the asyncio MCP server and its job queue.
+
+Job-queue behaviour (limits, dedup, timeouts, cancellation) is exercised
+with a thread pool and blocking functions gated on events; end-to-end
+tests talk JSON-RPC to the server over a Unix socket.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.mcp.server import (  # noqa: E402
+    REQUEST_CANCELLED,
+    REQUEST_TIMEOUT,
+    FractalServer,
+    JobQueue,
+)
+from src.mcp.tools import (  # noqa: E402
+    export_geometry,
+    modify_preset,
+    refinement_levels,
+)
+
+
+@pytest.fixture
+def executor():
+    """Provide a thread pool large enough to expose limit violations."""
+    pool = ThreadPoolExecutor(max_workers=8)
+    yield pool
+    pool.shutdown(wait=True, cancel_futures=True)
+
+
+class Gate:
+    """Blocking job whose calls and concurrency are recorded."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, value):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        self.release.wait(5)
+        with self._lock:
+            self.active -= 1
+        return value
+
+
+class TestJobQueue:
+    """Test concurrency limits, dedup, timeouts and cancellation."""
+
+    def test_concurrency_is_bounded(self, executor):
+        """Test no more than max_concurrent jobs run at once."""
+        gate = Gate()
+
+        async def scenario():
+            jobs = JobQueue(executor, max_concurrent=2)
+            tasks = [
+                asyncio.ensure_future(jobs.submit(str(i), gate, i)) for i in range(6)
+            ]
+            await asyncio.sleep(0.1)
+            assert gate.active == 2
+            gate.release.set()
+            return await asyncio.gather(*tasks)
+
+        assert asyncio.run(scenario()) == list(range(6))
+        assert gate.peak == 2
+
+    def test_identical_requests_share_one_job(self, executor):
+        """Test deduplication of in-flight jobs."""
+        gate = Gate()
+
+        async def scenario():
+            jobs = JobQueue(executor, max_concurrent=4)
+            tasks = [
+                asyncio.ensure_future(jobs.submit("same", gate, 7)) for _ in range(5)
+            ]
+            await asyncio.sleep(0.05)
+            assert jobs.in_flight == 1
+            gate.release.set()
+            results = await asyncio.gather(*tasks)
+            assert jobs.in_flight == 0
+            return results
+
+        assert asyncio.run(scenario()) == [7] * 5
+        assert gate.calls == 1
+
+    def test_timeout_raises(self, executor):
+        """Test per-request timeouts."""
+        gate = Gate()
+
+        async def scenario():
+            jobs = JobQueue(executor, max_concurrent=1)
+            with pytest.raises(asyncio.TimeoutError):
+                await jobs.submit("slow", gate, 1, timeout=0.05)
+            gate.release.set()
+
+        asyncio.run(scenario())
+
+    def test_cancelled_queued_job_never_runs(self, executor):
+        """Test a cancelled request drops its queued job."""
+        gate = Gate()
+        never = Gate()
+
+        async def scenario():
+            jobs = JobQueue(executor, max_concurrent=1)
+            running = asyncio.ensure_future(jobs.submit("a", gate, 1))
+            queued = asyncio.ensure_future(jobs.submit("b", never, 2))
+            await asyncio.sleep(0.05)
+            queued.cancel()
+            await asyncio.sleep(0.01)
+            gate.release.set()
+            assert await running == 1
+            assert jobs.in_flight == 0
+
+        asyncio.run(scenario())
+        assert never.calls == 0
+
+    def test_shared_job_survives_one_cancellation(self, executor):
+        """Test cancelling one waiter keeps the job for the others."""
+        gate = Gate()
+
+        async def scenario():
+            jobs = JobQueue(executor, max_concurrent=1)
+            first = asyncio.ensure_future(jobs.submit("k", gate, 3))
+            second = asyncio.ensure_future(jobs.submit("k", gate, 3))
+            await asyncio.sleep(0.05)
+            first.cancel()
+            await asyncio.sleep(0.01)
+            gate.release.set()
+            return await second
+
+        assert asyncio.run(scenario()) == 3
+        assert gate.calls == 1
+
+
+def _request(request_id, name, arguments, **meta):
+    params = {"name": name, "arguments": arguments}
+    if meta:
+        params["_meta"] = meta
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": params,
+    }
+
+
+async def _session(tmp_path, executor, messages, expect, **queue_options):
+    """Send messages over a Unix socket and collect ``expect`` responses."""
+    server = FractalServer(JobQueue(executor, **queue_options))
+    path = str(tmp_path / "mcp.sock")
+    listener = await asyncio.start_unix_server(server.serve, path=path)
+    async with listener:
+        reader, writer = await asyncio.open_unix_connection(path)
+        for message in messages:
+            if isinstance(message, (int, float)):
+                await asyncio.sleep(message)
+                continue
+            writer.write(json.dumps(message).encode() + b"\n")
+            await writer.drain()
+        responses = [json.loads(await reader.readline()) for _ in range(expect)]
+        writer.close()
+        return responses
+
+
+class TestFractalServer:
+    """End-to-end JSON-RPC tests."""
+
+    def test_initialize_and_list_tools(self, tmp_path, executor):
+        """Test the MCP handshake and tool listing."""
+        responses = asyncio.run(
+            _session(
+                tmp_path,
+                executor,
+                [
+                    {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {}},
+                    {"jsonrpc": "2.0", "id": 2, "method": "tools/list"},
+                ],
+                2,
+            )
+        )
+        by_id = {r["id"]: r for r in responses}
+        assert by_id[1]["result"]["serverInfo"]["name"] == "ifs-fractal-generator"
+        names = {tool["name"] for tool in by_id[2]["result"]["tools"]}
+        assert names == {"generate_fractal", "modify_preset", "export_geometry"}
+
+    def test_generate_fractal(self, tmp_path, executor):
+        """Test a generation request returns point statistics."""
+        (response,) = asyncio.run(
+            _session(
+                tmp_path,
+                executor,
+                [
+                    _request(
+                        1, "generate_fractal", {"preset": "sierpinski", "iterations": 5}
+                    )
+                ],
+                1,
+            )
+        )
+        result = response["result"]
+        assert result["isError"] is False
+        assert result["structuredContent"]["point_count"] == 3**5
+
+    def test_export_geometry(self, tmp_path, executor):
+        """Test exports are written to disk."""
+        out = tmp_path / "fern.ply"
+        (response,) = asyncio.run(
+            _session(
+                tmp_path,
+                executor,
+                [
+                    _request(
+                        1,
+                        "export_geometry",
+                        {"preset": "barnsley", "path": str(out), "iterations": 4},
+                    )
+                ],
+                1,
+            )
+        )
+        assert response["result"]["structuredContent"]["point_count"] == 4**4
+        assert out.read_bytes().startswith(b"ply\n")
+
+    def test_invalid_preset_is_tool_error(self, tmp_path, executor):
+        """Test validation failures come back as isError results."""
+        (response,) = asyncio.run(
+            _session(
+                tmp_path,
+                executor,
+                [_request(1, "generate_fractal", {"preset": {"name": "Broken"}})],
+                1,
+            )
+        )
+        assert response["result"]["isError"] is True
+        assert "Invalid preset" in response["result"]["structuredContent"]["error"]
+
+    def test_superseded_request_is_cancelled(self, tmp_path, executor, monkeypatch):
+        """Test a newer request with the same supersedeKey cancels the older."""
+        from src.mcp import tools
+
+        gate = Gate()
+        monkeypatch.setitem(
+            tools.TOOLS,
+            "generate_fractal",
+            tools.ToolSpec(lambda **kwargs: gate(kwargs), "", {}, True),
+        )
+        threading.Timer(0.3, gate.release.set).start()
+        responses = asyncio.run(
+            _session(
+                tmp_path,
+                executor,
+                [
+                    _request(1, "generate_fractal", {"v": 1}, supersedeKey="agent"),
+                    0.05,
+                    _request(2, "generate_fractal", {"v": 2}, supersedeKey="agent"),
+                ],
+                2,
+            )
+        )
+        by_id = {r["id"]: r for r in responses}
+        assert by_id[1]["error"]["code"] == REQUEST_CANCELLED
+        assert by_id[2]["result"]["structuredContent"] == {"v": 2}
+
+    def test_request_timeout(self, tmp_path, executor, monkeypatch):
+        """Test a slow job produces a timeout error, not a hang."""
+        from src.mcp import tools
+
+        monkeypatch.setitem(
+            tools.TOOLS,
+            "generate_fractal",
+            tools.ToolSpec(lambda **kw: time.sleep(0.5) or kw, "", {}, True),
+        )
+        (response,) = asyncio.run(
+            _session(
+                tmp_path,
+                executor,
+                [_request(1, "generate_fractal", {}, timeout=0.05)],
+                1,
+            )
+        )
+        assert response["error"]["code"] == REQUEST_TIMEOUT
+
+    def test_timeout_covers_every_refinement_level(
+        self, tmp_path, executor, monkeypatch
+    ):
+        """Test one deadline applies to the whole progressive request."""
+        from src.mcp import tools
+
+        monkeypatch.setitem(
+            tools.TOOLS,
+            "generate_fractal",
+            tools.ToolSpec(
+                lambda **kw: time.sleep(0.15) or kw,
+                "",
+                {},
+                True,
+                lambda arguments: [{"v": 1}, {"v": 2}, {"v": 3}],
+            ),
+        )
+        request = _request(1, "generate_fractal", {}, timeout=0.4, progressToken="t")
+        messages = asyncio.run(_session(tmp_path, executor, [request], 3))
+        assert [m.get("method") for m in messages[:2]] == ["notifications/progress"] * 2
+        assert messages[2]["error"]["code"] == REQUEST_TIMEOUT
+
+
+class TestModifyPreset:
+    """Test the inline modify_preset tool."""
+
+    def test_path_based_changes_are_validated(self):
+        """Test changes apply by path and issues are reported."""
+        result = modify_preset(
+            "sierpinski", {"iterations": 6, "transforms/0/scale": [1.5, 1.5, 1.5]}
+        )
+        assert result["preset"]["iterations"] == 6
+        assert result["preset"]["transforms"][0]["scale"] == [1.5, 1.5, 1.5]
+        assert [issue["rule"] for issue in result["issues"]] == ["contractivity"]
+
+
+class TestExportGeometry:
+    """Test the export tool outside the server."""
+
+    def test_colors_from_palette(self, tmp_path):
+        """Test colored exports include every iteration and vertex colors."""
+        out = tmp_path / "triangle.ply"
+        result = export_geometry("sierpinski", str(out), iterations=3, colors=True)
+        assert result["point_count"] == 1 + 3 + 9 + 27
+        assert result["merged_iterations"] is True
+        assert b"property uchar red" in out.read_bytes()
+
+    def test_colors_change_point_count_only_when_merged(self, tmp_path):
+        """Test the documented difference between colored and plain exports."""
+        out = str(tmp_path / "triangle.ply")
+        plain = export_geometry("sierpinski", out, iterations=3)
+        assert (plain["point_count"], plain["merged_iterations"]) == (27, False)
+        sampled = {"mode": "stratified", "n_points": 500}
+        colored = export_geometry("sierpinski", out, colors=True, **sampled)
+        assert (colored["point_count"], colored["merged_iterations"]) == (500, False)
+
+
+class TestProgressiveRefinement:
+    """Test progress notifications for progressive requests."""
+
+    def test_levels_arrive_before_final_result(self, tmp_path, executor):
+        """Test each coarser level is sent as a progress notification."""
+        request = _request(
+            1, "generate_fractal", {"preset": "sierpinski"}, progressToken="tok"
+        )
+        messages = asyncio.run(_session(tmp_path, executor, [request], 3))
+        progress, final = messages[:2], messages[2]
+        assert [m["params"]["progress"] for m in progress] == [1, 2]
+        assert all(m["params"]["total"] == 3 for m in progress)
+        counts = [
+            m["params"]["result"]["structuredContent"]["point_count"] for m in progress
+        ]
+        assert counts == [3**6, 3**7]
+        assert final["id"] == 1
+        content = final["result"]["content"]
+        assert final["result"]["structuredContent"]["point_count"] == 3**8
+        assert len(content) == 1
+        images = [m["params"]["result"]["content"][1] for m in progress]
+        assert all(image["mimeType"] == "image/png" for image in images)
+
+    def test_final_level_keeps_caller_arguments(self):
+        """Test only the coarser levels force a preview."""
+        levels = refinement_levels({"preset": "sierpinski", "preview": False})
+        assert [level["preview"] for level in levels] == [True, True, False]
+        assert levels[-1] == {"preset": "sierpinski", "preview": False}
+
+    def test_without_token_returns_single_result(self, tmp_path, executor):
+        """Test plain requests are not split into levels."""
+        request = _request(1, "generate_fractal", {"preset": "sierpinski"})
+        (response,) = asyncio.run(_session(tmp_path, executor, [request], 1))
+        assert response["result"]["structuredContent"]["point_count"] == 3**8
+        assert len(response["result"]["content"]) == 1
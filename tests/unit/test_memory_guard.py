@@ -0,0 +1,205 @@
+"""Unit tests for memory prediction, downgrading and monitoring."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.mcp.tools import export_geometry, generate_fractal  # noqa: E402
+from src.utils.export_pipeline import export_preset  # noqa: E402
+from src.utils.ifs_engine import (  # noqa: E402
+    compile_preset,
+    expand_exhaustive,
+    expand_levels,
+)
+from src.utils.memory_guard import (  # noqa: E402
+    MemoryGuard,
+    MemoryLimitExceeded,
+    guarded_expand,
+    guarded_levels,
+    plan_blender_output,
+    plan_generation,
+    predict_generation_bytes,
+)
+from src.utils.preset_loader import load_preset  # noqa: E402
+from src.utils.progressive import progressive_generate  # noqa: E402
+from src.utils.sweep import run_sweep  # noqa: E402
+
+MiB = 2**20
+
+
+class TestPlanGeneration:
+    """Test request planning against a limit."""
+
+    def test_fitting_request_is_unchanged(self):
+        """Test requests within the limit are planned as given."""
+        plan = plan_generation(3, 6, limit_bytes=MiB)
+        assert (plan.mode, plan.iterations, plan.downgrade) == ("exhaustive", 6, None)
+        assert plan.predicted_bytes == predict_generation_bytes(3, 6)
+
+    def test_reduce_iterations(self):
+        """Test the deepest fitting depth is chosen."""
+        limit = predict_generation_bytes(4, 7)
+        plan = plan_generation(4, 10, limit_bytes=limit)
+        assert plan.iterations == 7
+        assert "reduced iterations from 10 to 7" in plan.downgrade
+
+    def test_points_policy_keeps_depth(self):
+        """Test the points policy switches to a stratified budget."""
+        plan = plan_generation(4, 12, limit_bytes=10 * MiB, policy="points")
+        assert (plan.mode, plan.iterations) == ("stratified", 12)
+        assert plan.predicted_bytes <= 10 * MiB
+        assert 0 < plan.n_points < 4**12
+
+    def test_sampled_budget_shrinks(self):
+        """Test chaos requests get the largest budget that fits."""
+        plan = plan_generation(3, 10, "chaos", 10**9, limit_bytes=10 * MiB)
+        assert plan.mode == "chaos"
+        assert plan.n_points == 10 * MiB // predict_generation_bytes(3, 10, "chaos", 1)
+
+    def test_raise_policy(self):
+        """Test the raise policy rejects oversized requests."""
+        with pytest.raises(MemoryLimitExceeded, match="limit 1 MiB"):
+            plan_generation(8, 8, limit_bytes=MiB, policy="raise")
+
+    def test_unknown_policy(self):
+        """Test unknown policies are rejected."""
+        with pytest.raises(ValueError, match="Policy"):
+            plan_generation(3, 4, policy="ignore")
+
+
+class TestPlanBlenderOutput:
+    """Test node-group output downgrading."""
+
+    def test_realized_steps_down_to_instances(self):
+        """Test realized output is replaced by instances when they fit."""
+        plan = plan_blender_output(3, 8, output_mode=2, limit_bytes=3 * MiB)
+        assert (plan.output_mode, plan.iterations) == (1, 8)
+        assert "switched to instanced output" in plan.downgrade
+
+    def test_points_then_iterations(self):
+        """Test iterations are reduced once bare points do not fit."""
+        plan = plan_blender_output(4, 12, output_mode=1, limit_bytes=64 * MiB)
+        assert plan.output_mode == 0
+        assert plan.iterations < 12
+        assert plan.predicted_bytes <= 64 * MiB
+
+    def test_nothing_fits(self):
+        """Test a limit below one iteration raises."""
+        with pytest.raises(MemoryLimitExceeded):
+            plan_blender_output(4, 3, limit_bytes=16)
+
+
+class TestGuardedExpand:
+    """Test monitored expansion."""
+
+    def test_matches_exhaustive_within_limit(self):
+        """Test unconstrained runs equal the plain expansion."""
+        matrices = compile_preset(load_preset("sierpinski")).matrices
+        with MemoryGuard(64 * MiB, use_tracemalloc=True) as guard:
+            points, depth = guarded_expand(matrices, 6, guard)
+        assert depth == 6
+        np.testing.assert_allclose(points, expand_exhaustive(matrices, 6))
+        assert guard.peak > 0
+
+    def test_downgrades_before_exceeding(self):
+        """Test expansion stops at the last level that fits."""
+        matrices = compile_preset(load_preset("barnsley")).matrices
+        with MemoryGuard(2 * MiB, use_tracemalloc=True) as guard:
+            points, depth = guarded_expand(matrices, 12, guard)
+        assert 0 < depth < 12
+        assert len(points) == 4**depth
+
+    def test_raises_without_downgrade(self):
+        """Test the limit raises when downgrading is off."""
+        matrices = compile_preset(load_preset("barnsley")).matrices
+        with MemoryGuard(2 * MiB, use_tracemalloc=True) as guard:
+            with pytest.raises(MemoryLimitExceeded, match="Iteration"):
+                guarded_expand(matrices, 12, guard, downgrade=False)
+
+    def test_levels_match_merge(self):
+        """Test guarded levels equal expand_levels and stop over the limit."""
+        matrices = compile_preset(load_preset("barnsley")).matrices
+        with MemoryGuard(64 * MiB, use_tracemalloc=True) as guard:
+            points, depths = guarded_levels(matrices, 5, guard)
+        expected_points, expected_depths = expand_levels(matrices, 5)
+        np.testing.assert_allclose(points, expected_points)
+        np.testing.assert_array_equal(depths, expected_depths)
+        with MemoryGuard(2 * MiB, use_tracemalloc=True) as guard:
+            with pytest.raises(MemoryLimitExceeded, match="Iteration"):
+                guarded_levels(matrices, 12, guard)
+
+    def test_check_reports_exceeded_limit(self):
+        """Test check raises once usage has gone over the limit."""
+        with MemoryGuard(MiB, use_tracemalloc=True) as guard:
+            block = np.ones(MiB)  # noqa: F841 (8 MiB held while checking)
+            with pytest.raises(MemoryLimitExceeded, match="limit 1 MiB"):
+                guard.check()
+
+
+class TestToolLimits:
+    """Test server tools reject oversized requests."""
+
+    def test_oversized_request_raises_memory_error(self):
+        """Test predictions over the limit fail before allocating."""
+        with pytest.raises(MemoryError):
+            generate_fractal("sierpinski", mode="chaos", n_points=10**15)
+
+    def test_colored_export_is_planned(self, tmp_path):
+        """Test colored exports go through the same memory check."""
+        path = tmp_path / "tri.ply"
+        with pytest.raises(MemoryError):
+            export_geometry(
+                "sierpinski", str(path), mode="stratified", n_points=10**15, colors=True
+            )
+        assert not path.exists()
+
+
+class TestGenerationPaths:
+    """Test headless generation paths plan and guard their runs."""
+
+    def test_export_downgrades_or_rejects(self, tmp_path):
+        """Test exports are planned against the limit before streaming."""
+        preset = load_preset("barnsley")
+        result = export_preset(
+            preset, [tmp_path / "fern.npy"], iterations=12, memory_limit=32 * MiB
+        )
+        assert result["downgrade"] and "reduced iterations" in result["downgrade"]
+        assert result["point_count"] < 4**12
+        assert np.load(tmp_path / "fern.npy").shape == (result["point_count"], 3)
+        with pytest.raises(MemoryLimitExceeded):
+            export_preset(
+                preset,
+                [tmp_path / "fern.npy"],
+                iterations=12,
+                memory_limit=32 * MiB,
+                memory_policy="raise",
+            )
+
+    def test_export_within_limit_is_unchanged(self, tmp_path):
+        """Test fitting exports report no downgrade."""
+        result = export_preset(load_preset("sierpinski"), [tmp_path / "t.npy"])
+        assert result["downgrade"] is None
+        assert result["point_count"] == 3**8
+
+    def test_progressive_stops_at_planned_depth(self):
+        """Test progressive refinement ends at the deepest level that fits."""
+        levels = list(
+            progressive_generate(
+                load_preset("barnsley"),
+                iterations=12,
+                preview_size=None,
+                memory_limit=32 * MiB,
+            )
+        )
+        assert levels[-1].final
+        assert levels[-1].stats["iterations"] < 12
+
+    def test_sweep_rejects_oversized_variants(self):
+        """Test sweeps fail before generating variants over the limit."""
+        with pytest.raises(MemoryLimitExceeded):
+            run_sweep(
+                load_preset("barnsley"),
+                {"iterations": [6, 12]},
+                thumbnails=False,
+                memory_limit=32 * MiB,
+            )
@@ -0,0 +1,145 @@
+"""Unit tests for coalesced modifier parameter injection."""
+
+import threading
+
+from src.utils.parameter_injector import (
+    EVALUATION_TIMEOUT,
+    ParameterInjector,
+    preset_inputs,
+)
+from src.utils.preset_loader import load_preset
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _injector(min_interval=0.1):
+    calls = []
+    clock = FakeClock()
+    injector = ParameterInjector(
+        lambda target, values: calls.append((target, dict(values))),
+        min_interval=min_interval,
+        clock=clock,
+    )
+    return injector, calls, clock
+
+
+def _twenty_transforms():
+    preset = dict(load_preset("sierpinski"))
+    preset["transforms"] = [dict(preset["transforms"][0]) for _ in range(20)]
+    return preset
+
+
+class TestPresetInputs:
+    """Test preset to input-name mapping."""
+
+    def test_names(self):
+        """Test scalar and per-transform inputs are produced."""
+        values = preset_inputs(load_preset("sierpinski"))
+        assert values["Seed"] == 42
+        assert values["Transform 1 Scale"] == [0.5, 0.5, 0.5]
+        assert values["Transform 3 Weight"] == 0.34
+        assert len(values) == 4 + 3 * 4
+
+    def test_preview_and_final_quality(self):
+        """Test performance settings drive viewport and render inputs."""
+        values = preset_inputs(load_preset("sierpinski"))
+        assert (values["Preview Iterations"], values["Iterations"]) == (6, 10)
+        assert values["Preview Output Mode"] == 0
+        assert "Output Mode" not in values
+
+        preset = dict(load_preset("sierpinski"))
+        preset["performance"] = {"preview_output_mode": 0, "final_output_mode": 1}
+        values = preset_inputs(preset)
+        assert values["Preview Iterations"] == values["Iterations"] == 8
+        assert (values["Preview Output Mode"], values["Output Mode"]) == (0, 1)
+
+
+class TestParameterInjector:
+    """Test batching, dropping and debouncing."""
+
+    def test_large_preset_is_one_evaluation(self):
+        """Test a 20-transform preset triggers exactly one apply."""
+        injector, calls, _ = _injector()
+        values = preset_inputs(_twenty_transforms())
+        injector.submit("Fractal", values)
+        assert injector.flush() == 1
+        assert len(calls) == 1
+        assert calls[0] == ("Fractal", values)
+        assert injector.evaluations == 1
+
+    def test_burst_keeps_latest_value(self):
+        """Test intermediate slider values are dropped."""
+        injector, calls, clock = _injector()
+        injector.flush()
+        for seed in range(50):
+            injector.submit("Fractal", {"Seed": seed})
+            assert injector.flush() == 0
+        clock.now = 1.0
+        injector.evaluation_done()
+        assert injector.flush() == 1
+        assert calls == [("Fractal", {"Seed": 49})]
+        assert (injector.submitted, injector.dropped) == (50, 49)
+
+    def test_waits_for_running_evaluation(self):
+        """Test flushes hold off until the evaluation reports completion."""
+        injector, calls, clock = _injector()
+        injector.submit("Fractal", {"Seed": 1})
+        injector.flush()
+        injector.submit("Fractal", {"Seed": 2})
+        clock.now = 1.0
+        assert injector.due() > 0
+        assert injector.flush() == 0
+        injector.evaluation_done()
+        assert injector.flush() == 1
+        injector.submit("Fractal", {"Seed": 3})
+        clock.now = 2.0 + EVALUATION_TIMEOUT
+        assert injector.flush() == 1
+        assert [values["Seed"] for _, values in calls] == [1, 2, 3]
+
+    def test_unchanged_values_skip_evaluation(self):
+        """Test re-submitting applied values triggers nothing."""
+        injector, calls, _ = _injector()
+        injector.submit("Fractal", {"Seed": 1, "Iterations": 6})
+        injector.flush(force=True)
+        injector.submit("Fractal", {"Seed": 1, "Iterations": 7})
+        injector.flush(force=True)
+        assert calls[1] == ("Fractal", {"Iterations": 7})
+        injector.submit("Fractal", {"Seed": 1})
+        assert injector.flush(force=True) == 0
+        injector.forget()
+        injector.submit("Fractal", {"Seed": 1})
+        assert injector.flush(force=True) == 1
+
+    def test_targets_are_batched_separately(self):
+        """Test each modifier gets its own batch."""
+        injector, calls, _ = _injector()
+        injector.submit("A", {"Seed": 1})
+        injector.submit("B", {"Seed": 2})
+        injector.submit("A", {"Iterations": 5})
+        assert injector.flush(force=True) == 2
+        assert dict(calls) == {"A": {"Seed": 1, "Iterations": 5}, "B": {"Seed": 2}}
+
+    def test_concurrent_submits(self):
+        """Test submits from many threads are all accounted for."""
+        injector, calls, _ = _injector()
+
+        def burst(offset):
+            for i in range(200):
+                injector.submit("Fractal", {f"Input {offset}": i})
+
+        threads = [threading.Thread(target=burst, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        injector.flush(force=True)
+        assert calls == [("Fractal", {f"Input {n}": 199 for n in range(4)})]
+        assert injector.submitted - injector.dropped == injector.applied == 4
@@ -0,0 +1,201 @@
+"""Unit tests for the SQLite preset catalog.
+
+Covers derived fields, incremental refresh (add/update/touch/remove) and
+indexed queries over a small preset library copied into a temp directory.
+"""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from src.utils.preset_catalog import PresetCatalog, derive_catalog_fields
+
+
+@pytest.fixture
+def library(tmp_path, valid_presets_dir):
+    """Copy the valid preset fixtures into a writable library directory."""
+    root = tmp_path / "presets"
+    shutil.copytree(valid_presets_dir, root)
+    (root / "schema.json").write_text("{}")
+    return root
+
+
+@pytest.fixture
+def catalog(tmp_path, library):
+    """Provide a refreshed catalog over the fixture library."""
+    with PresetCatalog(tmp_path / "catalog.sqlite", library) as cat:
+        cat.refresh()
+        yield cat
+
+
+def _bump(path, preset):
+    """Rewrite a preset file and force a different mtime."""
+    path.write_text(json.dumps(preset))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+class TestDeriveCatalogFields:
+    """Test derived fields computed for a single preset."""
+
+    def test_point_estimates_use_performance_block(self, valid_presets_dir):
+        """Test preview/final point counts follow performance settings."""
+        preset = json.loads((valid_presets_dir / "complex_3d.json").read_text())
+        fields = derive_catalog_fields(preset)
+        assert fields["transform_count"] == 4
+        assert fields["dimensionality"] == 3
+        assert fields["contractivity"] == 0.5
+        assert fields["preview_points"] == 4**6
+        assert fields["final_points"] == 4**12
+
+    def test_point_estimates_fall_back_to_iterations(self, valid_presets_dir):
+        """Test presets without a performance block use iterations."""
+        preset = json.loads((valid_presets_dir / "minimal.json").read_text())
+        fields = derive_catalog_fields(preset)
+        assert fields["preview_iterations"] == fields["final_iterations"] == 3
+        assert fields["final_points"] == 1
+
+    def test_oversized_point_estimates_are_null(self, valid_presets_dir):
+        """Test point counts beyond SQLite's INTEGER range are dropped."""
+        preset = json.loads((valid_presets_dir / "complex_3d.json").read_text())
+        preset["performance"]["final_iterations"] = 40
+        fields = derive_catalog_fields(preset)
+        assert fields["preview_points"] == 4**6
+        assert fields["final_points"] is None
+
+    def test_missing_transforms_raises(self):
+        """Test that presets without transforms are rejected."""
+        with pytest.raises(ValueError, match="transforms"):
+            derive_catalog_fields({"name": "Empty", "iterations": 4})
+
+
+class TestPresetCatalogRefresh:
+    """Test incremental catalog refresh."""
+
+    def test_initial_refresh_indexes_all_presets(self, tmp_path, library):
+        """Test that every preset (but not schema.json) is catalogued."""
+        with PresetCatalog(":memory:", library) as cat:
+            update = cat.refresh()
+            assert sorted(update.added) == [
+                "complex_3d.json",
+                "minimal.json",
+                "simple_2d.json",
+            ]
+            assert len(cat) == 3
+
+    def test_unchanged_refresh_is_noop(self, catalog):
+        """Test that a second refresh with no edits changes nothing."""
+        update = catalog.refresh()
+        assert not update.changed
+        assert update.errors == []
+
+    def test_edited_preset_is_updated(self, catalog, library):
+        """Test that content changes are re-derived."""
+        path = library / "minimal.json"
+        preset = json.loads(path.read_text())
+        preset["transforms"].append(dict(preset["transforms"][0]))
+        _bump(path, preset)
+
+        update = catalog.refresh()
+        assert update.updated == ["minimal.json"]
+        assert catalog.get("minimal.json").transform_count == 2
+
+    def test_touched_preset_is_not_reported(self, catalog, library):
+        """Test that an mtime-only change with identical content is silent."""
+        path = library / "minimal.json"
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert not catalog.refresh().changed
+
+    def test_added_and_removed_presets(self, catalog, library):
+        """Test that new files are added and deleted files removed."""
+        nested = library / "community"
+        nested.mkdir()
+        shutil.copy(library / "simple_2d.json", nested / "copy.json")
+        (library / "minimal.json").unlink()
+
+        update = catalog.refresh()
+        assert update.added == ["community/copy.json"]
+        assert update.removed == ["minimal.json"]
+
+    def test_malformed_preset_is_reported(self, catalog, library):
+        """Test that parse errors are collected rather than raised."""
+        (library / "broken.json").write_text("{not json")
+        update = catalog.refresh()
+        assert [path for path, _ in update.errors] == ["broken.json"]
+        assert catalog.get("broken.json") is None
+
+    def test_oversized_preset_is_indexed(self, catalog, library):
+        """Test a preset with an overflowing point count does not abort refresh."""
+        path = library / "complex_3d.json"
+        preset = json.loads(path.read_text())
+        preset["performance"]["final_iterations"] = 40
+        _bump(path, preset)
+        update = catalog.refresh()
+        assert update.updated == ["complex_3d.json"]
+        assert update.errors == []
+
+    def test_non_object_transforms_are_reported(self, catalog, library):
+        """Test presets with malformed transforms or performance are skipped."""
+        (library / "strings.json").write_text(
+            json.dumps({"transforms": ["x"], "iterations": 3})
+        )
+        (library / "perf.json").write_text(
+            json.dumps({"transforms": [{}], "iterations": 3, "performance": "x"})
+        )
+        update = catalog.refresh()
+        assert sorted(path for path, _ in update.errors) == [
+            "perf.json",
+            "strings.json",
+        ]
+        assert update.added == []
+
+    def test_catalog_persists_between_sessions(self, tmp_path, library):
+        """Test that a reopened catalog does not re-read unchanged files."""
+        db = tmp_path / "persist.sqlite"
+        with PresetCatalog(db, library) as cat:
+            cat.refresh()
+        with PresetCatalog(db, library) as cat:
+            assert len(cat) == 3
+            assert not cat.refresh().changed
+
+
+class TestPresetCatalogQuery:
+    """Test indexed catalog queries."""
+
+    def test_query_by_dimensionality_and_final_points(self, catalog):
+        """Test '3D presets under 1M points at final_iterations'."""
+        assert catalog.query(dimensionality=3, max_points=1_000_000) == []
+        assert [e.path for e in catalog.query(dimensionality=3)] == ["complex_3d.json"]
+
+    def test_query_by_preview_points(self, catalog):
+        """Test that points_at selects the preview estimate."""
+        entries = catalog.query(max_points=5_000, points_at="preview")
+        assert [e.path for e in entries] == [
+            "complex_3d.json",
+            "minimal.json",
+            "simple_2d.json",
+        ]
+
+    def test_query_by_category_and_transforms(self, catalog):
+        """Test category and transform-count filters combine."""
+        entries = catalog.query(category="classic_2d", min_transforms=3)
+        assert [e.name for e in entries] == ["Sierpinski Triangle"]
+        assert catalog.query(category="classic_2d", max_transforms=2) == []
+
+    def test_query_by_content_hash(self, catalog):
+        """Test lookup of a preset by its content hash."""
+        entry = catalog.get("simple_2d.json")
+        assert catalog.query(content_hash=entry.content_hash) == [entry]
+
+    def test_invalid_points_at_raises(self, catalog):
+        """Test that unknown points_at values are rejected."""
+        with pytest.raises(ValueError, match="points_at"):
+            catalog.query(max_points=10, points_at="render")
+
+    def test_load_metadata_roundtrip(self, catalog, library):
+        """Test that stored metadata matches the source file."""
+        original = json.loads((library / "simple_2d.json").read_text())
+        assert catalog.load_metadata("simple_2d.json") == original
@@ -0,0 +1,199 @@
+"""Unit tests for the polling preset watcher."""
+
+import json
+import os
+import shutil
+import time
+
+import pytest
+
+from src.utils.preset_catalog import PresetCatalog
+from src.utils.preset_loader import PRESETS_DIR
+from src.utils.preset_watcher import PresetWatcher
+
+
+def _write(path, preset, bump=0):
+    """Write a preset and move its mtime forward so every write is seen."""
+    path.write_text(json.dumps(preset))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump * 10**9))
+
+
+@pytest.fixture
+def library(tmp_path):
+    """Preset library of 200 copies of sierpinski."""
+    preset = json.loads((PRESETS_DIR / "sierpinski.json").read_text())
+    for i in range(200):
+        preset["name"] = f"Preset {i}"
+        (tmp_path / f"p{i:03d}.json").write_text(json.dumps(preset))
+    shutil.copy(PRESETS_DIR / "schema.json", tmp_path)
+    return tmp_path
+
+
+def _wait_for(condition, timeout=5.0):
+    """Wait until ``condition()`` holds or the timeout passes."""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def _watcher(library):
+    pushed = []
+    watcher = PresetWatcher(
+        library, on_update=lambda target, preset: pushed.append((target, preset))
+    )
+    return watcher, pushed
+
+
+class TestPoll:
+    """Test change detection and incremental reload."""
+
+    def test_snapshot_reads_nothing(self, library):
+        """Test construction and idle polls do not open any file."""
+        watcher, _ = _watcher(library)
+        assert not watcher.poll()
+        assert watcher.reads == 0
+
+    def test_edit_reads_one_file(self, library):
+        """Test one edit is one read and one push to its targets."""
+        watcher, pushed = _watcher(library)
+        preset = watcher.bind("Fractal", "p007.json")
+        assert watcher.reads == 1
+        edited = dict(preset, iterations=7)
+        _write(library / "p007.json", edited, bump=1)
+        changes = watcher.poll()
+        assert changes.modified == ["p007.json"]
+        assert watcher.reads == 2
+        assert pushed == [("Fractal", edited)]
+        assert watcher.get("p007.json")["iterations"] == 7
+
+    def test_touch_without_change(self, library):
+        """Test an mtime bump with identical content is not reported."""
+        watcher, pushed = _watcher(library)
+        preset = watcher.bind("Fractal", "p001.json")
+        _write(library / "p001.json", preset, bump=1)
+        assert not watcher.poll()
+        assert pushed == []
+
+    def test_invalid_edit_keeps_last_valid(self, library):
+        """Test broken saves are reported and never pushed."""
+        watcher, pushed = _watcher(library)
+        preset = watcher.bind("Fractal", "p002.json")
+        (library / "p002.json").write_text('{"name": ')
+        changes = watcher.poll()
+        assert [path for path, _ in changes.invalid] == ["p002.json"]
+        assert changes.invalid[0][1][0].rule == "json"
+        _write(library / "p002.json", dict(preset, iterations=99), bump=1)
+        assert watcher.poll().invalid[0][0] == "p002.json"
+        assert pushed == []
+        assert watcher.get("p002.json") == preset
+
+    def test_added_and_removed(self, library):
+        """Test new and deleted files are detected without a rescan."""
+        watcher, _ = _watcher(library)
+        watcher.get("p003.json")
+        shutil.copy(library / "p003.json", library / "new.json")
+        (library / "p003.json").unlink()
+        changes = watcher.poll()
+        assert (changes.added, changes.removed) == (["new.json"], ["p003.json"])
+        assert watcher.reads == 2
+        with pytest.raises(KeyError):
+            watcher.get("p003.json")
+
+    def test_rebinding_moves_target(self, library):
+        """Test a target follows only the preset it was last bound to."""
+        watcher, pushed = _watcher(library)
+        preset = watcher.bind("Fractal", "p004.json")
+        watcher.bind("Fractal", "p005.json")
+        _write(library / "p004.json", dict(preset, iterations=5), bump=1)
+        watcher.poll()
+        assert pushed == []
+        watcher.unbind("Fractal")
+        _write(library / "p005.json", dict(preset, iterations=5), bump=1)
+        assert watcher.poll().pushed == 0
+
+
+class TestPollErrors:
+    """Test failing polls are logged and retried."""
+
+    def test_background_thread_survives_errors(self, library):
+        """Test a raising callback does not stop the polling thread."""
+        pushed = []
+
+        def on_update(target, preset):
+            pushed.append(preset["name"])
+            if len(pushed) == 1:
+                raise RuntimeError("scene locked")
+
+        watcher = PresetWatcher(library, on_update=on_update, interval=0.01)
+        preset = watcher.bind("Fractal", "p000.json")
+        with watcher:
+            _write(library / "p000.json", dict(preset, name="First"), bump=1)
+            assert _wait_for(lambda: watcher.last_error is not None)
+            _write(library / "p000.json", dict(preset, name="Second"), bump=2)
+            assert _wait_for(lambda: "Second" in pushed)
+        assert isinstance(watcher.last_error, RuntimeError)
+
+    def test_failed_refresh_is_retried(self, library):
+        """Test paths whose catalog refresh failed are refreshed next poll."""
+
+        class FlakyCatalog:
+            def __init__(self):
+                self.calls = []
+
+            def refresh(self, paths):
+                self.calls.append(paths)
+                if len(self.calls) == 1:
+                    raise OSError("database is locked")
+
+        catalog = FlakyCatalog()
+        watcher = PresetWatcher(library, catalog=catalog)
+        (library / "p001.json").unlink()
+        with pytest.raises(OSError):
+            watcher.poll()
+        assert not watcher.poll()
+        assert catalog.calls == [["p001.json"], ["p001.json"]]
+        watcher.poll()
+        assert len(catalog.calls) == 2
+
+
+class TestCatalogRefresh:
+    """Test targeted catalog updates."""
+
+    def test_refresh_changed_paths_only(self, library, tmp_path_factory):
+        """Test the catalog re-reads only the paths the watcher reports."""
+        db = tmp_path_factory.mktemp("db") / "catalog.sqlite"
+        with PresetCatalog(db, library) as catalog:
+            assert len(catalog.refresh().added) == 200
+            watcher = PresetWatcher(library, catalog=catalog)
+            preset = watcher.get("p010.json")
+            _write(library / "p010.json", dict(preset, name="Renamed"), bump=1)
+            (library / "p011.json").unlink()
+            watcher.poll()
+            assert catalog.get("p010.json").name == "Renamed"
+            assert catalog.get("p011.json") is None
+            assert len(catalog) == 199
+
+    def test_half_written_preset(self, library, tmp_path_factory):
+        """Test a file with non-object transforms is reported, not raised."""
+        db = tmp_path_factory.mktemp("db") / "catalog.sqlite"
+        with PresetCatalog(db, library) as catalog:
+            catalog.refresh()
+            watcher = PresetWatcher(library, catalog=catalog)
+            (library / "new.json").write_text(
+                json.dumps({"transforms": ["x"], "iterations": 3})
+            )
+            assert [path for path, _ in watcher.poll().invalid] == ["new.json"]
+            assert catalog.get("new.json") is None
+
+    def test_refresh_paths_argument(self, library, tmp_path_factory):
+        """Test refresh(paths=...) ignores unlisted changes."""
+        db = tmp_path_factory.mktemp("db") / "catalog.sqlite"
+        with PresetCatalog(db, library) as catalog:
+            catalog.refresh()
+            (library / "p020.json").unlink()
+            (library / "p021.json").unlink()
+            update = catalog.refresh(paths=["p020.json"])
+            assert update.removed == ["p020.json"]
+            assert catalog.get("p021.json") is not None
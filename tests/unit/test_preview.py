@@ -0,0 +1,63 @@
+"""Unit tests for density preview rendering."""
+
+import struct
+import zlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.utils.preview import (  # noqa: E402
+    density_image,
+    project_points,
+    render_preview,
+)
+
+
+class TestDensityImage:
+    """Test projection and binning."""
+
+    def test_projection_keeps_largest_axes(self):
+        """Test flat XY clouds project onto X and Y, YZ clouds onto Y and Z."""
+        xy = np.array([[0.0, 0, 0], [2.0, 1.0, 0]])
+        np.testing.assert_array_equal(project_points(xy), xy[:, :2])
+        yz = np.array([[0.0, 0, 0], [0.1, 2.0, 1.0]])
+        np.testing.assert_array_equal(project_points(yz), yz[:, 1:])
+
+    def test_corners_and_orientation(self):
+        """Test extreme points land in the corners with +Y at the top."""
+        points = np.array([[0.0, 0, 0], [1.0, 1.0, 0], [1.0, 1.0, 0]])
+        image = density_image(points, size=8)
+        assert image[7, 0] > 0  # origin at the bottom left
+        assert image[0, 7] == 255  # densest pixel at the top right
+        assert np.count_nonzero(image) == 2
+
+    def test_empty_cloud(self):
+        """Test an empty cloud renders a blank image."""
+        assert not density_image(np.empty((0, 3)), size=4).any()
+
+
+class TestRenderPreview:
+    """Test PNG encoding."""
+
+    def test_png_decodes(self):
+        """Test the PNG chunks are well formed and the pixels round-trip."""
+        points = np.random.default_rng(0).random((500, 3)) * [1, 1, 0]
+        data = render_preview(points, size=16)
+        assert data.startswith(b"\x89PNG\r\n\x1a\n")
+        offset, chunks = 8, {}
+        while offset < len(data):
+            (length,) = struct.unpack(">I", data[offset : offset + 4])
+            tag = data[offset + 4 : offset + 8]
+            body = data[offset + 8 : offset + 8 + length]
+            (crc,) = struct.unpack(
+                ">I", data[offset + 8 + length : offset + 12 + length]
+            )
+            assert crc == zlib.crc32(tag + body)
+            chunks[tag] = body
+            offset += 12 + length
+        assert struct.unpack(">II", chunks[b"IHDR"][:8]) == (16, 16)
+        rows = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), np.uint8)
+        rows = rows.reshape(16, 17)
+        assert not rows[:, 0].any()
+        np.testing.assert_array_equal(rows[:, 1:], density_image(points, size=16))
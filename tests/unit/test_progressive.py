@@ -0,0 +1,94 @@
+"""Unit tests for progressive-refinement generation."""
+
+import itertools
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.utils.ifs_engine import (  # noqa: E402
+    chaos_game,
+    compile_preset,
+    expand_exhaustive,
+)
+from src.utils.preset_loader import load_preset  # noqa: E402
+from src.utils.progressive import (  # noqa: E402
+    chaos_schedule,
+    exhaustive_schedule,
+    progressive_generate,
+)
+
+
+class TestSchedules:
+    """Test level schedules."""
+
+    def test_exhaustive_starts_at_first_useful_depth(self):
+        """Test shallow depths below the point threshold are skipped."""
+        assert exhaustive_schedule(3, 8, first_points=256) == [6, 7, 8]
+        assert exhaustive_schedule(4, 4, first_points=256) == [4]
+        assert exhaustive_schedule(8, 2, first_points=10**6) == [2]
+
+    def test_chaos_budgets_grow_to_target(self):
+        """Test budgets grow geometrically and end at the target."""
+        assert chaos_schedule(5000, first_points=256) == [256, 1024, 4096, 5000]
+        assert chaos_schedule(100, first_points=256) == [100]
+        with pytest.raises(ValueError, match="Growth"):
+            chaos_schedule(1000, growth=1)
+
+
+class TestProgressiveGenerate:
+    """Test refinement sequences."""
+
+    def test_exhaustive_levels_match_one_shot(self):
+        """Test every level equals a direct expansion at that depth."""
+        preset = load_preset("sierpinski")
+        matrices = compile_preset(preset).matrices
+        results = list(progressive_generate(preset, first_points=20))
+        assert [r.stats["iterations"] for r in results] == [3, 4, 5, 6, 7, 8]
+        assert [r.final for r in results] == [False] * 5 + [True]
+        for result in results:
+            depth = result.stats["iterations"]
+            np.testing.assert_allclose(
+                result.points, expand_exhaustive(matrices, depth)
+            )
+            assert result.stats["point_count"] == 3**depth
+            assert result.preview.startswith(b"\x89PNG")
+
+    def test_chaos_levels_match_one_shot(self):
+        """Test chaos levels equal direct chaos-game calls with the seed."""
+        preset = load_preset("barnsley")
+        compiled = compile_preset(preset)
+        results = list(
+            progressive_generate(preset, mode="chaos", n_points=3000, seed=5)
+        )
+        assert [r.stats["n_points"] for r in results] == [256, 1024, 3000]
+        expected = chaos_game(compiled.matrices, compiled.weights, 3000, seed=5)
+        np.testing.assert_array_equal(results[-1].points, expected)
+
+    def test_stopping_early_skips_deeper_levels(self):
+        """Test only the consumed levels are computed."""
+        preset = load_preset("sierpinski")
+        preset["iterations"] = 12
+        first = next(progressive_generate(preset, preview_size=None))
+        assert first.stats["iterations"] == 6
+        assert first.preview is None
+        assert first.elapsed < 1.0
+        levels = itertools.takewhile(
+            lambda r: r.stats["point_count"] < 10**4,
+            progressive_generate(preset, preview_size=None),
+        )
+        assert [r.stats["iterations"] for r in levels] == [6, 7, 8]
+
+    def test_stratified_levels_hit_exact_budgets(self):
+        """Test stratified refinement returns exactly each budget."""
+        results = list(
+            progressive_generate(
+                load_preset("barnsley"), mode="stratified", n_points=2000
+            )
+        )
+        assert [len(r.points) for r in results] == [256, 1024, 2000]
+
+    def test_unknown_mode_raises(self):
+        """Test invalid modes are rejected."""
+        with pytest.raises(ValueError, match="Mode"):
+            next(progressive_generate(load_preset("sierpinski"), mode="random"))
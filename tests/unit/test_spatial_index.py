@@ -0,0 +1,114 @@
+"""Unit tests for the point cloud spatial index."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.utils.spatial_index import (  # noqa: E402
+    SpatialIndex,
+    frustum_planes,
+    index_path,
+    morton_codes,
+)
+
+
+@pytest.fixture
+def cloud():
+    """Provide random points and an index over them with small leaves."""
+    points = np.random.default_rng(0).random((5000, 3))
+    return points, SpatialIndex.build(points, leaf_size=16)
+
+
+class TestMortonCodes:
+    """Test bit interleaving."""
+
+    def test_interleaving(self):
+        """Test x, y and z bits alternate starting with x."""
+        cells = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1], [3, 0, 0], [7, 7, 7]])
+        np.testing.assert_array_equal(morton_codes(cells), [4, 2, 1, 36, 511])
+
+    def test_full_width(self):
+        """Test the top grid cell uses all 63 bits."""
+        top = (1 << 21) - 1
+        assert morton_codes(np.array([[top, top, top]]))[0] == (1 << 63) - 1
+
+
+class TestQueries:
+    """Test queries agree with brute-force scans."""
+
+    def test_box(self, cloud):
+        """Test box queries return exactly the enclosed points."""
+        points, index = cloud
+        lo, hi = np.array([0.2, 0.1, 0.4]), np.array([0.5, 0.3, 0.9])
+        expected = np.flatnonzero(np.all((points >= lo) & (points <= hi), axis=1))
+        np.testing.assert_array_equal(index.query_box(lo, hi), expected)
+
+    def test_radius(self, cloud):
+        """Test sphere queries return exactly the enclosed points."""
+        points, index = cloud
+        center = np.array([0.5, 0.5, 0.5])
+        distances = np.linalg.norm(points - center, axis=1)
+        expected = np.flatnonzero(distances <= 0.2)
+        np.testing.assert_array_equal(index.query_radius(center, 0.2), expected)
+
+    def test_frustum(self, cloud):
+        """Test an orthographic frustum matches the box it encloses."""
+        points, index = cloud
+        # Maps [0.25, 0.75]^3 to the [-1, 1] clip cube
+        view_projection = np.diag([4.0, 4.0, 4.0, 1.0])
+        view_projection[:3, 3] = -2.0
+        planes = frustum_planes(view_projection)
+        expected = index.query_box(np.full(3, 0.25), np.full(3, 0.75))
+        np.testing.assert_array_equal(index.query_frustum(planes), expected)
+
+    def test_knn(self, cloud):
+        """Test nearest neighbors match a full distance sort."""
+        points, index = cloud
+        queries = np.random.default_rng(1).random((20, 3)) * 1.2 - 0.1
+        distances, indices = index.query_knn(queries, k=4)
+        full = np.linalg.norm(points[None] - queries[:, None], axis=2)
+        np.testing.assert_allclose(distances, np.sort(full, axis=1)[:, :4])
+        np.testing.assert_allclose(np.take_along_axis(full, indices, axis=1), distances)
+
+    def test_knn_single_query(self, cloud):
+        """Test a single point returns flat arrays and finds itself."""
+        points, index = cloud
+        distances, indices = index.query_knn(points[123], k=1)
+        assert indices.tolist() == [123] and distances.tolist() == [0.0]
+
+    def test_invalid_k(self, cloud):
+        """Test k outside the point count is rejected."""
+        with pytest.raises(ValueError, match="k must be"):
+            cloud[1].query_knn(np.zeros(3), k=0)
+
+
+class TestBuild:
+    """Test construction and persistence."""
+
+    def test_hierarchy_bounds_its_points(self, cloud):
+        """Test leaves enclose their points and the root encloses everything."""
+        points, index = cloud
+        lo, hi = index.levels[0]
+        first = index.points[:16]
+        np.testing.assert_array_equal(lo[0], first.min(axis=0))
+        np.testing.assert_array_equal(hi[0], first.max(axis=0))
+        root_lo, root_hi = index.levels[-1]
+        assert len(root_lo) <= 8
+        np.testing.assert_array_equal(root_lo.min(axis=0), points.min(axis=0))
+
+    def test_rejects_empty(self):
+        """Test an empty cloud cannot be indexed."""
+        with pytest.raises(ValueError, match="non-empty"):
+            SpatialIndex.build(np.zeros((0, 3)))
+
+    def test_save_and_load(self, cloud, tmp_path):
+        """Test a reloaded index answers queries identically."""
+        _, index = cloud
+        path = index_path(tmp_path / "cloud.ply")
+        assert path.name == "cloud.ply.index.npz"
+        index.save(path)
+        loaded = SpatialIndex.load(path)
+        assert len(loaded.levels) == len(index.levels)
+        assert loaded.leaf_size == 16
+        lo, hi = np.full(3, 0.1), np.full(3, 0.3)
+        np.testing.assert_array_equal(loaded.query_box(lo, hi), index.query_box(lo, hi))
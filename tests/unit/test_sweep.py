@@ -0,0 +1,131 @@
+"""Unit tests for parameter sweeps."""
+
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.utils.ifs_engine import (  # noqa: E402
+    chaos_game,
+    compile_preset,
+    expand_exhaustive,
+    summarize_points,
+)
+from src.utils.preset_loader import load_preset  # noqa: E402
+from src.utils.sweep import (  # noqa: E402
+    main,
+    run_sweep,
+    set_parameter,
+    sweep_presets,
+    sweep_values,
+)
+from src.utils.validator import PresetValidationError  # noqa: E402
+
+
+def _sorted(points):
+    """Rows in lexicographic order, for comparing clouds as sets."""
+    return points[np.lexsort(np.round(points, 9).T[::-1])]
+
+
+@pytest.fixture
+def fern():
+    """Provide the Barnsley fern at a small depth."""
+    preset = load_preset("barnsley")
+    preset["iterations"] = 5
+    return preset
+
+
+class TestVariants:
+    """Test parameter paths and combinations."""
+
+    def test_set_parameter(self, fern):
+        """Test paths reach whole vectors and single axes."""
+        rotated = set_parameter(fern, "transforms.2.rotation.2", 12.5)
+        assert rotated["transforms"][2]["rotation"][2] == 12.5
+        assert fern["transforms"][2]["rotation"][2] != 12.5
+        uniform = set_parameter(fern, "transforms.0.scale", 0.2)
+        assert uniform["transforms"][0]["scale"] == [0.2, 0.2, 0.2]
+        with pytest.raises(KeyError, match="transforms.9"):
+            set_parameter(fern, "transforms.9.scale", 0.2)
+
+    def test_product_order(self, fern):
+        """Test combinations vary the last parameter fastest."""
+        variants = sweep_presets(
+            fern, {"iterations": [3, 4], "transforms.1.weight": [0.5, 0.6, 0.7]}
+        )
+        assert len(variants) == 6
+        assert variants[1][0] == {"iterations": 3, "transforms.1.weight": 0.6}
+        assert variants[3][1]["iterations"] == 4
+
+    def test_sweep_values_vectors(self):
+        """Test ranges interpolate vectors per axis."""
+        values = sweep_values([0, 0, 0], [0, 0, 30], 4)
+        assert values[1] == [0.0, 0.0, 10.0]
+
+
+class TestRunSweep:
+    """Test sweep evaluation."""
+
+    def test_exhaustive_matches_independent_runs(self, fern):
+        """Test shared work does not change any variant."""
+        parameters = {
+            "transforms.2.rotation.2": sweep_values(40, 60, 5),
+            "iterations": [4, 5],
+        }
+        result = run_sweep(fern, parameters, keep_points=True)
+        assert result.swept_transforms == [2]
+        assert len(result.variants) == 10
+        for variant in result.variants:
+            expected = expand_exhaustive(
+                compile_preset(variant.preset).matrices, variant.preset["iterations"]
+            )
+            np.testing.assert_allclose(_sorted(variant.points), _sorted(expected))
+            assert variant.stats == summarize_points(variant.points)
+            assert variant.thumbnail.startswith(b"\x89PNG")
+
+    def test_unswept_subtrees_computed_once(self, fern):
+        """Test only addresses containing the swept transform are recomputed."""
+        parameters = {"transforms.3.scale": sweep_values(0.2, 0.25, 6)}
+        result = run_sweep(fern, parameters, thumbnails=False)
+        levels = sum(4**k for k in range(1, 6))
+        free = sum(3**k for k in range(1, 6))
+        assert result.computed == free + 6 * (levels - free)
+        assert result.reused == 6 * 3**5
+
+    def test_depth_sweep_reuses_levels(self, fern):
+        """Test each depth extends the previous one."""
+        result = run_sweep(fern, {"iterations": [3, 4, 5]}, thumbnails=False)
+        assert result.computed == sum(4**k for k in range(1, 6))
+        assert result.swept_transforms == []
+        assert [v.stats["point_count"] for v in result.variants] == [64, 256, 1024]
+
+    def test_chaos_mode_is_one_batch(self, fern):
+        """Test chaos variants match single runs with the base seed."""
+        result = run_sweep(
+            fern,
+            {"transforms.3.translation.1": [0.3, 0.44]},
+            mode="chaos",
+            n_points=500,
+            keep_points=True,
+        )
+        for variant in result.variants:
+            compiled = compile_preset(variant.preset)
+            expected = chaos_game(
+                compiled.matrices, compiled.weights, 500, seed=fern.get("seed", 0)
+            )
+            np.testing.assert_array_equal(variant.points, expected)
+
+    def test_invalid_variant_fails_before_generation(self, fern):
+        """Test non-contractive variants are rejected up front."""
+        with pytest.raises(PresetValidationError):
+            run_sweep(fern, {"transforms.0.scale": [0.5, 1.5]})
+
+    def test_main_writes_summary(self, tmp_path, capsys):
+        """Test the CLI writes thumbnails and a JSON summary."""
+        argv = ["sierpinski", "transforms.0.scale=0.4:0.5:3", "iterations=3;4"]
+        assert main(argv + ["--output", str(tmp_path)]) == 0
+        summary = json.loads((tmp_path / "sweep.json").read_text())
+        assert len(summary) == 6
+        assert (tmp_path / summary[0]["thumbnail"]).read_bytes()[:4] == b"\x89PNG"
+        assert "6 variants" in capsys.readouterr().out
@@ -0,0 +1,181 @@
+"""Unit tests for preset validation.
+
+Covers the compiled schema checks, the semantic rules layered on top,
+and the parallel bulk validator's aggregated report.
+"""
+
+import json
+
+import pytest
+
+from src.utils.validator import (
+    PresetValidationError,
+    assert_valid_preset,
+    compile_schema,
+    main,
+    validate_file,
+    validate_files,
+    validate_preset,
+)
+
+
+@pytest.fixture
+def invalid_presets_dir(project_root):
+    """Return the directory of invalid preset fixtures."""
+    return project_root / "tests" / "fixtures" / "invalid_presets"
+
+
+@pytest.fixture
+def preset(valid_presets_dir):
+    """Provide a fresh copy of a valid preset."""
+    return json.loads((valid_presets_dir / "simple_2d.json").read_text())
+
+
+def _rules(issues):
+    return sorted((issue.path, issue.rule) for issue in issues)
+
+
+class TestCompileSchema:
+    """Test the schema compiler in isolation."""
+
+    def test_unsupported_keyword_raises(self):
+        """Test that unknown keywords are rejected instead of ignored."""
+        with pytest.raises(ValueError, match="Unsupported schema keywords"):
+            compile_schema({"type": "object", "additionalProperties": False})
+
+    def test_collects_all_errors(self):
+        """Test that every violation is reported, not just the first."""
+        check = compile_schema(
+            {
+                "type": "object",
+                "required": ["a", "b"],
+                "properties": {"c": {"type": "integer", "minimum": 0}},
+            }
+        )
+        issues = list(check({"c": -1}, ""))
+        assert len(issues) == 3
+
+    def test_integer_rejects_bool(self):
+        """Test that JSON booleans do not pass as integers."""
+        check = compile_schema({"type": "integer"})
+        assert list(check(True, "x"))
+        assert not list(check(3, "x"))
+
+
+class TestValidatePreset:
+    """Test schema and semantic validation of single presets."""
+
+    def test_valid_preset_has_no_issues(self, preset):
+        """Test that a valid preset passes."""
+        assert validate_preset(preset) == []
+        assert_valid_preset(preset)
+
+    def test_multiple_problems_reported_together(self, preset):
+        """Test that unrelated problems in one preset are all reported."""
+        del preset["name"]
+        preset["transforms"][0]["weight"] = 2
+        preset["color_palette"]["stops"][1][1] = "green"
+        assert _rules(validate_preset(preset)) == [
+            ("", "schema"),
+            ("color_palette/stops/1/1", "schema"),
+            ("transforms/0/weight", "schema"),
+        ]
+
+    def test_iteration_limits_cover_performance_block(self, preset):
+        """Test that enforce_iteration_limits applies to final_iterations.
+
+        The bundled schema repeats these bounds, so a permissive schema is
+        used to exercise the semantic rule on its own.
+        """
+        preset["performance"]["final_iterations"] = 13
+        issues = validate_preset(preset, check=compile_schema({"type": "object"}))
+        assert _rules(issues) == [("performance/final_iterations", "iteration_limits")]
+
+    def test_output_modes_are_bounded(self, preset):
+        """Test that performance output modes must be 0-2."""
+        preset["performance"]["final_output_mode"] = 3
+        assert _rules(validate_preset(preset)) == [
+            ("performance/final_output_mode", "schema")
+        ]
+
+    def test_zero_weight_sum_is_rejected(self, preset):
+        """Test that weights must sum to a positive value."""
+        for transform in preset["transforms"]:
+            transform["weight"] = 0
+        assert _rules(validate_preset(preset)) == [("transforms", "weights")]
+
+    def test_non_contractive_transform_set_is_rejected(self, preset):
+        """Test that scales >= 1 are rejected."""
+        preset["transforms"][1]["scale"] = [1.0, 0.5, 0.5]
+        assert _rules(validate_preset(preset)) == [("transforms", "contractivity")]
+
+    def test_semantic_rules_skip_structurally_broken_transforms(self, preset):
+        """Test that semantic checks do not crash on malformed transforms."""
+        preset["transforms"][0] = "not a transform"
+        assert _rules(validate_preset(preset)) == [("transforms/0", "schema")]
+
+    def test_non_object_preset(self):
+        """Test that a non-object root yields a single schema issue."""
+        assert _rules(validate_preset([1, 2])) == [("", "schema")]
+
+    def test_assert_valid_preset_raises_with_issues(self, preset):
+        """Test that assert_valid_preset carries every issue."""
+        preset["iterations"] = 20
+        preset["seed"] = "abc"
+        with pytest.raises(PresetValidationError) as excinfo:
+            assert_valid_preset(preset)
+        assert len(excinfo.value.issues) == 2
+
+
+class TestBulkValidation:
+    """Test file-level and bulk validation."""
+
+    def test_validate_file_reports_malformed_json(self, invalid_presets_dir):
+        """Test that JSON syntax errors become 'json' issues."""
+        _, issues = validate_file(invalid_presets_dir / "malformed.json")
+        assert [issue.rule for issue in issues] == ["json"]
+
+    def test_fixture_rules(self, invalid_presets_dir):
+        """Test each invalid fixture fails for the expected reasons."""
+        _, issues = validate_file(invalid_presets_dir / "non_contractive.json")
+        assert {issue.rule for issue in issues} == {"weights", "contractivity"}
+        _, issues = validate_file(invalid_presets_dir / "invalid_weight.json")
+        assert _rules(issues) == [("transforms/0/weight", "schema")]
+
+    def test_report_aggregates_all_files(self, valid_presets_dir, invalid_presets_dir):
+        """Test the report summary and per-file issue lists."""
+        paths = sorted(valid_presets_dir.glob("*.json")) + sorted(
+            invalid_presets_dir.glob("*.json")
+        )
+        report = validate_files(paths, workers=1)
+        assert report["summary"]["checked"] == len(paths)
+        assert report["summary"]["invalid"] == 4
+        assert all(entry["issues"] for entry in report["files"])
+        json.dumps(report)
+
+    def test_parallel_matches_serial(self, tmp_path, valid_presets_dir, preset):
+        """Test that worker processes produce the same report as one process."""
+        preset["transforms"][0]["weight"] = -1
+        for i in range(200):
+            source = (
+                preset
+                if i % 3 == 0
+                else json.loads((valid_presets_dir / "minimal.json").read_text())
+            )
+            (tmp_path / f"p{i:03d}.json").write_text(json.dumps(source))
+        paths = sorted(tmp_path.glob("*.json"))
+
+        serial = validate_files(paths, workers=1)
+        parallel = validate_files(paths, workers=3)
+        assert parallel == serial
+        assert serial["summary"]["invalid"] == 67
+
+    def test_main_exit_status_and_output(
+        self, tmp_path, capsys, valid_presets_dir, invalid_presets_dir
+    ):
+        """Test CLI exit codes and report file output."""
+        assert main([str(valid_presets_dir)]) == 0
+        assert json.loads(capsys.readouterr().out)["summary"]["valid"] == 3
+        output = tmp_path / "report.json"
+        assert main([str(invalid_presets_dir), "--output", str(output)]) == 1
+        assert json.loads(output.read_text())["summary"]["invalid"] == 4
@@ -0,0 +1,127 @@
+"""Unit tests for time-sliced viewport generation."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.utils.ifs_engine import (  # noqa: E402
+    chaos_game_parallel,
+    compile_preset,
+    expand_exhaustive,
+)
+from src.utils.memory_guard import MemoryLimitExceeded  # noqa: E402
+from src.utils.preset_loader import load_preset  # noqa: E402
+from src.utils.viewport_generation import PUSH_GROWTH, SlicedGeneration  # noqa: E402
+
+
+class StepClock:
+    """Clock advancing a fixed step per call, so budgets count calls."""
+
+    def __init__(self, step):
+        self.step = step
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+class TestSlicedGeneration:
+    """Test incremental growth, budgets and cancellation."""
+
+    def test_exhaustive_matches_one_shot(self):
+        """Test the finished result equals the exhaustive expansion."""
+        preset = load_preset("barnsley")
+        pushes = []
+        generation = SlicedGeneration(
+            preset, iterations=7, chunk_points=256, push=pushes.append
+        )
+        points = generation.run()
+        matrices = compile_preset(preset).matrices
+        np.testing.assert_allclose(points, expand_exhaustive(matrices, 7))
+        assert generation.done and generation.progress == 1.0
+        sizes = [len(p) for p in pushes]
+        assert sizes[-1] == 4**7
+        assert all(b >= a * PUSH_GROWTH for a, b in zip(sizes, sizes[1:-1]))
+
+    def test_shallow_levels_shown_first(self):
+        """Test complete coarse levels precede the final-level chunks."""
+        pushes = []
+        generation = SlicedGeneration(
+            load_preset("sierpinski"),
+            iterations=8,
+            chunk_points=81,
+            tick_budget=0.0,
+            push=lambda points: pushes.append(len(points)),
+        )
+        generation.run()
+        assert pushes[:3] == [3, 9, 27]
+        assert pushes[-1] == 3**8
+
+    def test_chaos_matches_parallel_sample(self):
+        """Test chaos blocks concatenate to the parallel chaos game."""
+        preset = load_preset("barnsley")
+        compiled = compile_preset(preset)
+        generation = SlicedGeneration(
+            preset, mode="chaos", n_points=5000, seed=3, chunk_points=1024
+        )
+        expected = chaos_game_parallel(
+            compiled.matrices, compiled.weights, 5000, seed=3, block_points=1024
+        )
+        np.testing.assert_array_equal(generation.run(), expected)
+
+    def test_tick_budget_limits_work(self):
+        """Test each tick stops once its budget is spent."""
+        generation = SlicedGeneration(
+            load_preset("barnsley"),
+            iterations=8,
+            chunk_points=64,
+            tick_budget=2.5,
+            clock=StepClock(1.0),
+        )
+        generation.tick()
+        assert len(generation.points) == 64  # three increments: levels 1-3
+        for _ in range(3):
+            generation.tick()
+        assert 0 < generation.progress < 1
+        assert len(generation.run()) == 4**8
+        assert generation.ticks > 10
+
+    def test_cancel_stops_work(self):
+        """Test a cancelled generation does no more increments."""
+        generation = SlicedGeneration(
+            load_preset("barnsley"), iterations=8, chunk_points=64, tick_budget=0.0
+        )
+        generation.tick()
+        shown = len(generation.points)
+        generation.cancel()
+        assert generation.tick() is False
+        assert len(generation.points) == shown
+        assert not generation.done
+
+    def test_invalid_arguments(self):
+        """Test unknown modes and chunk sizes are rejected."""
+        with pytest.raises(ValueError, match="Mode"):
+            SlicedGeneration(load_preset("sierpinski"), mode="stratified")
+        with pytest.raises(ValueError, match="Chunk"):
+            SlicedGeneration(load_preset("sierpinski"), chunk_points=0)
+        with pytest.raises(ValueError, match="Memory policy"):
+            SlicedGeneration(load_preset("sierpinski"), memory_policy="points")
+
+    def test_request_is_planned_before_allocating(self):
+        """Test an oversized request is downgraded or rejected up front."""
+        preset = load_preset("barnsley")
+        generation = SlicedGeneration(preset, iterations=12, memory_limit=32 * 2**20)
+        assert generation.downgrade is not None
+        assert generation.total < 4**12
+        chaos = SlicedGeneration(
+            preset, mode="chaos", n_points=10**9, memory_limit=32 * 2**20
+        )
+        assert chaos.downgrade is not None and chaos.total < 10**9
+        with pytest.raises(MemoryLimitExceeded):
+            SlicedGeneration(
+                preset,
+                iterations=12,
+                memory_limit=32 * 2**20,
+                memory_policy="raise",
+            )